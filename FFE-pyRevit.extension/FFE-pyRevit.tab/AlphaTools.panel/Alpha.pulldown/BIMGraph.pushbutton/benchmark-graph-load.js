@@ -0,0 +1,73 @@
+// Compares viewer load time for the three export formats.
+//   python graph_writer.py <folder>
+//   node benchmark-graph-load.js <folder>
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const loader = require("./graph-loader.js");
+
+const folder = process.argv[2] || ".";
+const runs = 5;
+
+function bench(label, fileName, load) {
+  const filePath = path.join(folder, fileName);
+  if (!fs.existsSync(filePath)) {
+    console.log(label.padEnd(8) + "missing " + filePath);
+    return null;
+  }
+
+  let graph = null;
+  const timings = [];
+  for (let run = 0; run < runs; run += 1) {
+    const started = process.hrtime.bigint();
+    graph = load(filePath);
+    timings.push(Number(process.hrtime.bigint() - started) / 1e6);
+  }
+  timings.sort((a, b) => a - b);
+  console.log(
+    label.padEnd(8) +
+    String(fs.statSync(filePath).size).padStart(12) + " bytes  " +
+    "median " + timings[Math.floor(runs / 2)].toFixed(1).padStart(8) + " ms  " +
+    graph.nodes.length + " nodes / " + graph.edges.length + " edges"
+  );
+  return graph;
+}
+
+const fromJson = bench("json", "synthetic_graph.json", function (filePath) {
+  return loader.parseJsonGraph(fs.readFileSync(filePath, "utf8"));
+});
+
+const fromNdjson = bench("ndjson", "synthetic_graph.ndjson", function (filePath) {
+  const parser = loader.createNdjsonParser();
+  const fd = fs.openSync(filePath, "r");
+  const chunk = Buffer.alloc(1 << 20);
+  const decoder = new TextDecoder("utf-8");
+  let read = fs.readSync(fd, chunk, 0, chunk.length, null);
+  while (read > 0) {
+    parser.push(decoder.decode(chunk.subarray(0, read), { stream: true }));
+    read = fs.readSync(fd, chunk, 0, chunk.length, null);
+  }
+  fs.closeSync(fd);
+  parser.push(decoder.decode());
+  return parser.finish();
+});
+
+bench("bimg", "synthetic_graph.bimg", function (filePath) {
+  const file = fs.readFileSync(filePath);
+  const buffer = file.buffer.slice(file.byteOffset, file.byteOffset + file.byteLength);
+  return loader.parseBinaryGraph(buffer);
+});
+
+bench("bimg*", "synthetic_graph.bimg", function (filePath) {
+  // Columns only: what a typed-array renderer would touch before drawing.
+  const file = fs.readFileSync(filePath);
+  const buffer = file.buffer.slice(file.byteOffset, file.byteOffset + file.byteLength);
+  const parsed = loader.readBinaryColumns(buffer);
+  return { nodes: parsed.columns.nodeKey, edges: parsed.columns.edgeFrom };
+});
+
+if (fromJson && fromNdjson) {
+  const sameCounts = fromJson.nodes.length === fromNdjson.nodes.length && fromJson.edges.length === fromNdjson.edges.length;
+  console.log("json/ndjson node+edge counts match: " + sameCounts);
+}
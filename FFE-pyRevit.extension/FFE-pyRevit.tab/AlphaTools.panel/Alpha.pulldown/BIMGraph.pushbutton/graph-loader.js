@@ -0,0 +1,211 @@
+(function attachGraphLoader(globalScope) {
+  "use strict";
+
+  /*
+    Loaders for the three BIM Graph export formats written by graph_writer.py.
+    Each returns the same { meta, nodes, edges } object the viewer consumes.
+
+    - parseJsonGraph(text)          original single JSON document
+    - createNdjsonParser()          incremental: push(textChunk) ... finish()
+    - parseBinaryGraph(arrayBuffer) BIMG v1 columnar file; the columns are
+                                    typed-array views over the buffer (no copy)
+  */
+
+  const NONE_INDEX = 0xFFFFFFFF;
+  const BIMG_MAGIC = "BIMG";
+
+  function parseJsonGraph(text) {
+    const graph = JSON.parse(text);
+    return {
+      meta: graph.meta || {},
+      nodes: graph.nodes || [],
+      edges: graph.edges || []
+    };
+  }
+
+  function createNdjsonParser() {
+    const graph = { meta: {}, nodes: [], edges: [] };
+    let remainder = "";
+
+    function handleLine(line) {
+      if (!line) {
+        return;
+      }
+      const record = JSON.parse(line);
+      const kind = record.kind;
+      delete record.kind;
+      if (kind === "node") {
+        graph.nodes.push(record);
+      } else if (kind === "edge") {
+        graph.edges.push(record);
+      } else if (kind === "meta" || kind === "summary") {
+        Object.assign(graph.meta, record);
+      }
+    }
+
+    return {
+      push(chunk) {
+        const text = remainder + chunk;
+        let start = 0;
+        let newline = text.indexOf("\n", start);
+        while (newline !== -1) {
+          handleLine(text.slice(start, newline));
+          start = newline + 1;
+          newline = text.indexOf("\n", start);
+        }
+        remainder = text.slice(start);
+      },
+      finish() {
+        handleLine(remainder);
+        remainder = "";
+        return graph;
+      }
+    };
+  }
+
+  function parseNdjsonGraph(text) {
+    const parser = createNdjsonParser();
+    parser.push(text);
+    return parser.finish();
+  }
+
+  function readBinaryColumns(buffer) {
+    const bytes = new Uint8Array(buffer);
+    const magic = String.fromCharCode(bytes[0], bytes[1], bytes[2], bytes[3]);
+    if (magic !== BIMG_MAGIC) {
+      throw new Error("Not a BIMG graph file.");
+    }
+
+    const view = new DataView(buffer);
+    const version = view.getUint32(4, true);
+    if (version !== 1) {
+      throw new Error("Unsupported BIMG version " + version + ".");
+    }
+
+    const headerLength = view.getUint32(8, true);
+    const decoder = new TextDecoder("utf-8");
+    const header = JSON.parse(decoder.decode(bytes.subarray(12, 12 + headerLength)));
+
+    const columns = {};
+    header.sections.forEach(function (section) {
+      const name = section[0];
+      const offset = section[1];
+      const count = section[2];
+      if (name === "stringBytes" || name === "nodeType" || name === "edgeType") {
+        columns[name] = new Uint8Array(buffer, offset, count);
+      } else if (name === "nodePos") {
+        columns[name] = new Float32Array(buffer, offset, count);
+      } else {
+        columns[name] = new Uint32Array(buffer, offset, count);
+      }
+    });
+
+    return { header, columns, decoder };
+  }
+
+  function parseBinaryGraph(buffer) {
+    const parsed = readBinaryColumns(buffer);
+    const header = parsed.header;
+    const columns = parsed.columns;
+    const decoder = parsed.decoder;
+    const stringCache = new Array(header.stringCount);
+
+    function str(index) {
+      if (index === NONE_INDEX) {
+        return null;
+      }
+      let value = stringCache[index];
+      if (value === undefined) {
+        value = decoder.decode(columns.stringBytes.subarray(
+          columns.stringOffsets[index],
+          columns.stringOffsets[index + 1]
+        ));
+        stringCache[index] = value;
+      }
+      return value;
+    }
+
+    function json(index) {
+      return index === NONE_INDEX ? {} : JSON.parse(str(index));
+    }
+
+    const nodes = new Array(header.nodeCount);
+    for (let i = 0; i < header.nodeCount; i += 1) {
+      const elementId = str(columns.nodeElementId[i]);
+      nodes[i] = {
+        key: str(columns.nodeKey[i]),
+        type: header.nodeTypes[columns.nodeType[i]],
+        label: str(columns.nodeLabel[i]),
+        properties: json(columns.nodeProps[i]),
+        pos: { x: columns.nodePos[i * 2], y: columns.nodePos[i * 2 + 1] },
+        revit: elementId === null ? undefined : { elementId }
+      };
+    }
+
+    const edges = new Array(header.edgeCount);
+    for (let i = 0; i < header.edgeCount; i += 1) {
+      edges[i] = {
+        type: header.edgeTypes[columns.edgeType[i]],
+        from: str(columns.edgeFrom[i]),
+        to: str(columns.edgeTo[i]),
+        properties: json(columns.edgeProps[i])
+      };
+    }
+
+    return { meta: header.meta || {}, nodes, edges, columns };
+  }
+
+  function detectFormat(fileName) {
+    const lower = String(fileName || "").toLowerCase();
+    if (lower.endsWith(".bimg")) {
+      return "bimg";
+    }
+    if (lower.endsWith(".ndjson")) {
+      return "ndjson";
+    }
+    return "json";
+  }
+
+  // Browser File -> graph. NDJSON is decoded chunk by chunk from the stream
+  // so the whole file never has to exist as one string.
+  async function loadGraphFile(file) {
+    const format = detectFormat(file.name);
+    if (format === "bimg") {
+      return parseBinaryGraph(await file.arrayBuffer());
+    }
+    if (format === "ndjson" && typeof file.stream === "function") {
+      const parser = createNdjsonParser();
+      const reader = file.stream().getReader();
+      const decoder = new TextDecoder("utf-8");
+      for (;;) {
+        const step = await reader.read();
+        if (step.done) {
+          break;
+        }
+        parser.push(decoder.decode(step.value, { stream: true }));
+      }
+      parser.push(decoder.decode());
+      return parser.finish();
+    }
+    const text = await file.text();
+    return format === "ndjson" ? parseNdjsonGraph(text) : parseJsonGraph(text);
+  }
+
+  const api = {
+    createNdjsonParser,
+    detectFormat,
+    loadGraphFile,
+    parseBinaryGraph,
+    parseJsonGraph,
+    parseNdjsonGraph,
+    readBinaryColumns
+  };
+
+  if (globalScope) {
+    globalScope.BimGraphLoader = api;
+  }
+
+  if (typeof module !== "undefined" && module.exports) {
+    module.exports = api;
+  }
+})(typeof window !== "undefined" ? window : globalThis);
@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+"""
+Graph writers for the BIM Graph export.
+
+Formats:
+- json   -> the original {"meta", "nodes", "edges"} document (compact separators).
+- ndjson -> one JSON record per line, streamed to disk in chunks while the
+            graph is collected:  {"kind": "meta"|"node"|"edge"|"summary", ...}
+- bimg   -> compact binary columnar file (string table + typed arrays) that
+            graph-loader.js reads with zero-copy ArrayBuffer views.
+
+BIMG v1 layout (little-endian, every section 8-byte aligned):
+    "BIMG"                      4 bytes magic
+    uint32 version              = 1
+    uint32 headerLength
+    header JSON (utf-8)         meta, counts, nodeTypes, edgeTypes, sections
+    sections listed in header.sections as [name, byteOffset, count]:
+        stringOffsets  uint32[stringCount + 1]
+        stringBytes    uint8[...]           utf-8 blob
+        nodeKey        uint32[nodeCount]    string index
+        nodeLabel      uint32[nodeCount]    string index
+        nodeType       uint8[nodeCount]     index into header.nodeTypes
+        nodePos        float32[nodeCount * 2]
+        nodeElementId  uint32[nodeCount]    string index or NONE
+        nodeProps      uint32[nodeCount]    string index of props JSON or NONE
+        edgeFrom       uint32[edgeCount]    string index of node key
+        edgeTo         uint32[edgeCount]    string index of node key
+        edgeType       uint8[edgeCount]     index into header.edgeTypes
+        edgeProps      uint32[edgeCount]    string index of props JSON or NONE
+
+Design decisions:
+-> Pure Python (array/struct/json only) so it runs in IronPython and can be
+   exercised on Linux: python graph_writer.py [output folder, default: a temp folder]
+-> Edge endpoints are stored as key string indices, not node indices, so
+   edges can be written before (or without) their nodes, as the exporter does.
+-> Every writer has close() for a finished export and abort() for a failed
+   one; abort() drops what was collected and deletes any partial file.
+"""
+
+#____________________________________________________________________ IMPORTS (SYSTEM)
+import io
+import json
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+
+
+#____________________________________________________________________ CONSTANTS
+FORMAT_JSON = "json"
+FORMAT_NDJSON = "ndjson"
+FORMAT_BIMG = "bimg"
+
+BIMG_MAGIC = b"BIMG"
+BIMG_VERSION = 1
+NONE_INDEX = 0xFFFFFFFF
+ALIGNMENT = 8
+
+COMPACT = (",", ":")
+
+
+#____________________________________________________________________ HELPERS
+def array_bytes(values):
+    """array -> little-endian bytes (tostring on IronPython, tobytes on CPython 3)."""
+    if sys.byteorder != "little" and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    if hasattr(values, "tobytes"):
+        return values.tobytes()
+    return values.tostring()
+
+
+def to_utf8(text):
+    if isinstance(text, bytes) and not isinstance(text, str):
+        return text
+    return text.encode("utf-8")
+
+
+def uint32_array():
+    # "I" is 4 bytes on every supported platform; "L" is 8 bytes on 64-bit Linux.
+    return array("I")
+
+
+def remove_partial_file(path):
+    """Delete a half-written graph file; a failed export never leaves one behind."""
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+    except OSError:
+        pass
+
+
+#____________________________________________________________________ JSON
+class JsonGraphWriter(object):
+    """Collects in memory and writes the original JSON document on close."""
+
+    def __init__(self, path, meta):
+        self.path = path
+        self.meta = dict(meta)
+        self.nodes = []
+        self.edges = []
+
+    def write_node(self, node):
+        self.nodes.append(node)
+
+    def write_edge(self, edge):
+        self.edges.append(edge)
+
+    def close(self, summary=None):
+        if summary:
+            self.meta.update(summary)
+        with open(self.path, "w") as f:
+            json.dump({"meta": self.meta, "nodes": self.nodes, "edges": self.edges}, f, separators=COMPACT)
+
+    def abort(self):
+        self.nodes = []
+        self.edges = []
+        remove_partial_file(self.path)
+
+
+#____________________________________________________________________ NDJSON
+class NdjsonGraphWriter(object):
+    """Streams one record per line; only the current chunk is held in memory."""
+
+    def __init__(self, path, meta, chunk_size=2000):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.buffer = []
+        self.node_count = 0
+        self.edge_count = 0
+        self.handle = io.open(path, "w", encoding="utf-8")
+        self._write_record("meta", meta)
+        self.flush()
+
+    def _write_record(self, kind, record):
+        line = dict(record)
+        line["kind"] = kind
+        self.buffer.append(json.dumps(line, separators=COMPACT, ensure_ascii=False))
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            text = "\n".join(self.buffer) + "\n"
+            if not isinstance(text, type(u"")):
+                text = text.decode("utf-8")
+            self.handle.write(text)
+            self.buffer = []
+
+    def write_node(self, node):
+        self.node_count += 1
+        self._write_record("node", node)
+
+    def write_edge(self, edge):
+        self.edge_count += 1
+        self._write_record("edge", edge)
+
+    def close(self, summary=None):
+        record = {"nodeCount": self.node_count, "edgeCount": self.edge_count}
+        record.update(summary or {})
+        self._write_record("summary", record)
+        self.flush()
+        self.handle.close()
+
+    def abort(self):
+        self.buffer = []
+        try:
+            self.handle.close()
+        except Exception:
+            pass
+        remove_partial_file(self.path)
+
+
+#____________________________________________________________________ BINARY COLUMNAR
+class BinaryGraphWriter(object):
+    """Accumulates typed columns (not dicts) and writes a BIMG file on close."""
+
+    def __init__(self, path, meta):
+        self.path = path
+        self.meta = dict(meta)
+        self.string_index = {}
+        self.string_blob = bytearray()
+        self.string_offsets = uint32_array()
+        self.string_offsets.append(0)
+
+        self.node_types = []
+        self.edge_types = []
+        self.node_key = uint32_array()
+        self.node_label = uint32_array()
+        self.node_type = array("B")
+        self.node_pos = array("f")
+        self.node_element_id = uint32_array()
+        self.node_props = uint32_array()
+        self.edge_from = uint32_array()
+        self.edge_to = uint32_array()
+        self.edge_type = array("B")
+        self.edge_props = uint32_array()
+
+    def intern(self, text):
+        if text is None:
+            return NONE_INDEX
+        if not isinstance(text, type(u"")):
+            text = u"{}".format(text)
+        index = self.string_index.get(text)
+        if index is None:
+            index = len(self.string_offsets) - 1
+            self.string_index[text] = index
+            self.string_blob.extend(to_utf8(text))
+            self.string_offsets.append(len(self.string_blob))
+        return index
+
+    def intern_json(self, value):
+        if not value:
+            return NONE_INDEX
+        return self.intern(json.dumps(value, separators=COMPACT, sort_keys=True))
+
+    @staticmethod
+    def type_code(type_list, name):
+        if name not in type_list:
+            if len(type_list) >= 255:
+                raise ValueError("BIMG supports at most 255 node or edge types.")
+            type_list.append(name)
+        return type_list.index(name)
+
+    def write_node(self, node):
+        pos = node.get("pos") or {}
+        revit = node.get("revit") or {}
+        self.node_key.append(self.intern(node["key"]))
+        self.node_label.append(self.intern(node.get("label") or ""))
+        self.node_type.append(self.type_code(self.node_types, node.get("type") or ""))
+        self.node_pos.append(float(pos.get("x", 0)))
+        self.node_pos.append(float(pos.get("y", 0)))
+        self.node_element_id.append(self.intern(revit.get("elementId")))
+        self.node_props.append(self.intern_json(node.get("properties")))
+
+    def write_edge(self, edge):
+        self.edge_from.append(self.intern(edge["from"]))
+        self.edge_to.append(self.intern(edge["to"]))
+        self.edge_type.append(self.type_code(self.edge_types, edge.get("type") or ""))
+        self.edge_props.append(self.intern_json(edge.get("properties")))
+
+    def close(self, summary=None):
+        if summary:
+            self.meta.update(summary)
+
+        sections = [
+            ("stringOffsets", self.string_offsets, len(self.string_offsets)),
+            ("stringBytes", bytes(self.string_blob), len(self.string_blob)),
+            ("nodeKey", self.node_key, len(self.node_key)),
+            ("nodeLabel", self.node_label, len(self.node_label)),
+            ("nodeType", self.node_type, len(self.node_type)),
+            ("nodePos", self.node_pos, len(self.node_pos)),
+            ("nodeElementId", self.node_element_id, len(self.node_element_id)),
+            ("nodeProps", self.node_props, len(self.node_props)),
+            ("edgeFrom", self.edge_from, len(self.edge_from)),
+            ("edgeTo", self.edge_to, len(self.edge_to)),
+            ("edgeType", self.edge_type, len(self.edge_type)),
+            ("edgeProps", self.edge_props, len(self.edge_props)),
+        ]
+        payloads = [(name, data if isinstance(data, bytes) else array_bytes(data), count) for name, data, count in sections]
+
+        def build_header(offsets):
+            return to_utf8(json.dumps({
+                "meta": self.meta,
+                "nodeCount": len(self.node_key),
+                "edgeCount": len(self.edge_from),
+                "stringCount": len(self.string_offsets) - 1,
+                "nodeTypes": self.node_types,
+                "edgeTypes": self.edge_types,
+                "sections": offsets,
+            }, separators=COMPACT))
+
+        # Offsets depend on the header length, which depends on the offsets:
+        # iterate until the padded header size is stable (normally twice).
+        header = build_header([[name, 0, count] for name, _data, count in payloads])
+        while True:
+            cursor = align(12 + len(header))
+            offsets = []
+            for name, data, count in payloads:
+                offsets.append([name, cursor, count])
+                cursor = align(cursor + len(data))
+            new_header = build_header(offsets)
+            if align(12 + len(new_header)) == align(12 + len(header)):
+                header = new_header
+                break
+            header = new_header
+
+        with open(self.path, "wb") as f:
+            f.write(BIMG_MAGIC)
+            f.write(struct.pack("<II", BIMG_VERSION, len(header)))
+            f.write(header)
+            written = 12 + len(header)
+            for (name, data, _count), (_name, offset, _n) in zip(payloads, offsets):
+                f.write(b"\0" * (offset - written))
+                f.write(data)
+                written = offset + len(data)
+
+    def abort(self):
+        remove_partial_file(self.path)
+
+
+def align(value):
+    return (value + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+#____________________________________________________________________ FACTORY
+def open_graph_writer(path, meta, file_format=None):
+    """Pick a writer from an explicit format or the file extension."""
+    if file_format is None:
+        file_format = os.path.splitext(path)[1].lstrip(".").lower() or FORMAT_JSON
+    if file_format == FORMAT_NDJSON:
+        return NdjsonGraphWriter(path, meta)
+    if file_format == FORMAT_BIMG:
+        return BinaryGraphWriter(path, meta)
+    return JsonGraphWriter(path, meta)
+
+
+#____________________________________________________________________ SYNTHETIC GRAPH (BENCHMARK INPUT)
+def write_synthetic_graph(writer, sheets=400, rooms=2000, equipment=20000, seed=5):
+    """Hospital-scale graph with the same node/edge types as the exporter."""
+    rng = random.Random(seed)
+    for index in range(sheets):
+        writer.write_node({"key": "sheet:{}".format(index), "type": "sheet", "label": "M-{:03d} - Mechanical Plan".format(index),
+                           "properties": {"sheetNumber": "M-{:03d}".format(index), "sheetName": "Mechanical Plan"},
+                           "pos": {"x": -600, "y": index * 60}, "revit": {"elementId": str(100000 + index)}})
+        for view_index in range(3):
+            view_key = "view:{}-{}".format(index, view_index)
+            writer.write_node({"key": view_key, "type": "view", "label": "Level {} - Area {}".format(index % 8, view_index),
+                               "properties": {"viewType": "FloorPlan"}, "pos": {"x": -200, "y": index * 180 + view_index * 60},
+                               "revit": {"elementId": str(200000 + index * 3 + view_index)}})
+            writer.write_edge({"type": "sheet_to_view", "from": "sheet:{}".format(index), "to": view_key, "properties": {"via": "Viewport"}})
+    for index in range(rooms):
+        writer.write_node({"key": "room:{}".format(index), "type": "room", "label": "Patient Room {}".format(index),
+                           "properties": {"number": str(index), "name": "Patient Room", "levelId": str(index % 8)},
+                           "pos": {"x": 200, "y": index * 60}, "revit": {"elementId": str(300000 + index)}})
+    for index in range(equipment):
+        key = "equip:{}".format(index)
+        writer.write_node({"key": key, "type": "equip", "label": "Medical Gas Outlet: Type {} [JSN-{}]".format(index % 12, index),
+                           "properties": {"family": "Medical Gas Outlet", "type": "Type {}".format(index % 12), "JSN": "JSN-{}".format(index), "category": "Mechanical Equipment"},
+                           "pos": {"x": 600, "y": index * 60}, "revit": {"elementId": str(400000 + index)}})
+        writer.write_edge({"type": "room_to_equip", "from": "room:{}".format(rng.randrange(rooms)), "to": key, "properties": {}})
+        writer.write_edge({"type": "equip_to_system", "from": key, "to": "system:{}".format(rng.randrange(300)), "properties": {}})
+    for index in range(300):
+        writer.write_node({"key": "system:{}".format(index), "type": "system", "label": "Supply Air {}".format(index),
+                           "properties": {"systemType": "MechanicalSystem"}, "pos": {"x": 1000, "y": index * 60},
+                           "revit": {"elementId": str(500000 + index)}})
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    # Default to a temp folder so a bare run never writes ~24 MB into the source tree
+    out_dir = sys.argv[1] if len(sys.argv) > 1 else tempfile.mkdtemp()
+    meta = {"sourceModelTitle": "Synthetic Hospital", "exportedAtUtc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "revitVersion": "synthetic"}
+    for file_format in (FORMAT_JSON, FORMAT_NDJSON, FORMAT_BIMG):
+        path = os.path.join(out_dir, "synthetic_graph.{}".format(file_format))
+        started = time.time()
+        writer = open_graph_writer(path, meta)
+        write_synthetic_graph(writer)
+        writer.close()
+        print("{:<7} {:>12,} bytes  {:.2f}s  {}".format(file_format, os.path.getsize(path), time.time() - started, path))
+
+    # A failed export removes its partial file (NDJSON has already streamed chunks to disk)
+    for file_format in (FORMAT_JSON, FORMAT_NDJSON, FORMAT_BIMG):
+        path = os.path.join(out_dir, "aborted_graph.{}".format(file_format))
+        writer = open_graph_writer(path, meta)
+        write_synthetic_graph(writer, sheets=10, rooms=10, equipment=5000)
+        writer.abort()
+        assert not os.path.exists(path), path
+    print("aborted exports leave no file behind")
@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
 """
-Export a BIM spatial/relationship graph to JSON for a PixiJS viewer.
+Export a BIM spatial/relationship graph for a PixiJS viewer.
+
+Output formats (picked by file extension in the save dialog):
+- .json   -> single JSON document (meta / nodes / edges)
+- .ndjson -> nodes and edges streamed to disk in chunks while collecting
+- .bimg   -> compact binary columnar file (see graph_writer.py)
 
 Nodes:
 - Sheets
@@ -15,13 +20,22 @@ Edges:
 - Room -> Equipment (contained)
 - Equipment -> Systems (connected)
 
+Performance:
+- Viewports are grouped by SheetId in one pass (no sheets x viewports scan).
+- Room containment uses a per-level XY grid of room bounding boxes, so
+  IsPointInRoom only runs on rooms whose extents contain the point.
+- Time per export stage is reported in the output window and in meta.
+- Nodes and edges go straight to the graph writer; only node keys are kept
+  in memory for de-duplication.
+- The writer is closed only after every stage finishes; if collection
+  fails the partial output file is removed.
+
 Tested pattern: Revit 2024/2025/2026 + pyRevit (IronPython).
 """
 
 
 #____________________________________________________________________ IMPORTS (SYSTEM)
 import os
-import json
 import time
 
 #____________________________________________________________________ IMPORTS (PYREVIT)
@@ -41,6 +55,11 @@ from Autodesk.Revit.DB import (
 )
 
 
+#____________________________________________________________________ IMPORTS (CUSTOM)
+from Spatial.grid_index import BoxGridIndex
+from graph_writer import open_graph_writer
+
+
 #____________________________________________________________________ VARIABLES
 doc     = __revit__.ActiveUIDocument.Document
 uiapp   = __revit__
@@ -143,6 +162,65 @@ def get_level_id_for_instance(familyinstance):
     return ElementId.InvalidElementId
 
 
+class StageTimer(object):
+    """
+    Record wall-clock seconds per export stage.
+    """
+    def __init__(self):
+        self.stages = []
+        self._name = None
+        self._started = None
+
+    def start(self, name):
+        self.stop()
+        self._name = name
+        self._started = time.time()
+
+    def stop(self):
+        if self._name is not None:
+            self.stages.append((self._name, time.time() - self._started))
+            self._name = None
+
+    def as_dict(self):
+        return dict((name, round(seconds, 3)) for name, seconds in self.stages)
+
+    def report(self):
+        self.stop()
+        rows = [[name, "{:.3f}".format(seconds)] for name, seconds in self.stages]
+        rows.append(["Total", "{:.3f}".format(sum(seconds for _name, seconds in self.stages))])
+        output_window.print_table(table_data=rows, columns=["Stage", "Seconds"], title="BIM Graph Export Timing")
+
+
+def build_room_index(room_list):
+    """
+    XY grid over room bounding boxes. Rooms without a bounding box
+    (unplaced / not enclosed) cannot contain a point and are skipped.
+    """
+    entries = []
+    for room in room_list:
+        try:
+            boundingbox = room.get_BoundingBox(None)
+        except Exception:
+            boundingbox = None
+        if boundingbox is None:
+            continue
+        entries.append((room, boundingbox.Min.X, boundingbox.Min.Y, boundingbox.Max.X, boundingbox.Max.Y))
+    return BoxGridIndex.build(entries)
+
+
+def equip_node_key(familyinstance):
+    """
+    Same key rule as the equipment nodes: JSN when present, else ElementId.
+    """
+    try:
+        p = familyinstance.LookupParameter("JSN")
+        if p and p.HasValue:
+            return node_key("equip", p.AsString())
+    except Exception:
+        pass
+    return node_key("equip", elementid_int(familyinstance.Id))
+
+
 #____________________________________________________________________ KEY EQUIPMENT CATEGORIES
 KEY_EQUIP_CATEGORIES = [
     BuiltInCategory.OST_MechanicalEquipment,
@@ -157,42 +235,46 @@ KEY_EQUIP_CATEGORIES = [
 
 
 #____________________________________________________________________ NODES + EDGES
-nodes = []
-edges = []
-
-node_index = {}  # key -> node dict (dedupe)
-
-
-def add_node(key, nodetype, label, element=None, properties=None, pos=None):
-    if key in node_index:
-        return node_index[key]
-
-    # Create node
-    node = {
-        "key": key,
-        "type": nodetype,
-        "label": label,
-        "properties": properties or {},
-        "pos": pos or {"x": 0, "y": 0}
-    }
-    if element is not None:
-        node["revit"] = {
-            "elementId": element.Id.ToString(),
-            # "uniqueId": safe_unique_id(element)
+class GraphCollector(object):
+    """
+    Streams nodes and edges to the graph writer; only node keys are kept
+    in memory for de-duplication.
+    """
+    def __init__(self, graph_writer):
+        self.graph_writer = graph_writer
+        self.node_keys = set()
+        self.counts = {"nodes": 0, "edges": 0}
+
+    def add_node(self, key, nodetype, label, element=None, properties=None, pos=None):
+        if key in self.node_keys:
+            return
+
+        # Create node
+        node = {
+            "key": key,
+            "type": nodetype,
+            "label": label,
+            "properties": properties or {},
+            "pos": pos or {"x": 0, "y": 0}
         }
-
-    node_index[key] = node
-    nodes.append(node)
-    return node
-
-
-def add_edge(element_type, from_key, to_key, properties=None):
-    edges.append({
-        "type": element_type,
-        "from": from_key,
-        "to": to_key,
-        "properties": properties or {}
-    })
+        if element is not None:
+            node["revit"] = {
+                "elementId": element.Id.ToString(),
+                # "uniqueId": safe_unique_id(element)
+            }
+
+        self.node_keys.add(key)
+        self.counts["nodes"] += 1
+        self.graph_writer.write_node(node)
+
+    def add_edge(self, element_type, from_key, to_key, properties=None):
+        self.counts["edges"] += 1
+        self.graph_writer.write_edge({
+            "type": element_type,
+            "from": from_key,
+            "to": to_key,
+            "properties": properties or {}
+        })
 
 
 #____________________________________________________________________ LAYOUT: SWIMLANES BY TYPE
@@ -219,185 +301,195 @@ def next_pos(nodetype):
 
 
 #____________________________________________________________________ 1) SHEETS -> VIEWS
-sheets = [s for s in FilteredElementCollector(doc).OfClass(ViewSheet) if not s.IsPlaceholder]
+def collect_sheets_and_views(graph):
+    sheets = [s for s in FilteredElementCollector(doc).OfClass(ViewSheet) if not s.IsPlaceholder]
 
-# Pre-collect all Viewports once
-all_viewports = list(FilteredElementCollector(doc).OfClass(Viewport))
+    # Group all Viewports by sheet in one pass
+    viewports_by_sheet = {}  # sheetId int -> [Viewport]
+    for vp in FilteredElementCollector(doc).OfClass(Viewport):
+        try:
+            viewports_by_sheet.setdefault(elementid_int(vp.SheetId), []).append(vp)
+        except Exception:
+            continue
 
-views_by_id = {}  # viewId int -> View
+    for sheet in sheets:
+        sheet_key = node_key("sheet", elementid_int(sheet.Id))
+        sheet_label = "{} - {}".format(sheet.SheetNumber, sheet.Name)
+        graph.add_node(
+            sheet_key, "sheet", sheet_label, element=sheet,
+            properties={"sheetNumber": sheet.SheetNumber, "sheetName": sheet.Name},
+            pos=next_pos("sheet")
+        )
 
-for sheet in sheets:
-    sheet_key = node_key("sheet", elementid_int(sheet.Id))
-    sheet_label = "{} - {}".format(sheet.SheetNumber, sheet.Name)
-    add_node(
-        sheet_key, "sheet", sheet_label, element=sheet,
-        properties={"sheetNumber": sheet.SheetNumber, "sheetName": sheet.Name},
-        pos=next_pos("sheet")
-    )
+        # Viewports on this sheet
+        for vp in viewports_by_sheet.get(elementid_int(sheet.Id), []):
+            try:
+                viewid = vp.ViewId
+                view = doc.GetElement(viewid)
+                if view is None:
+                    continue
+                viewid_int = elementid_int(viewid)
+                vkey = node_key("view", viewid_int)
+
+                vname = getattr(view, "Name", "View {}".format(viewid_int))
+                vtype = str(getattr(view, "ViewType", ""))
+
+                graph.add_node(
+                    vkey, "view", vname, element=view,
+                    properties={"viewType": vtype},
+                    pos=next_pos("view")
+                )
+
+                graph.add_edge("sheet_to_view", sheet_key, vkey, properties={"via": "Viewport"})
+            except Exception:
+                continue
+
+
+#____________________________________________________________________ 2) ROOMS
+def collect_rooms(graph):
+    """
+    Returns (rooms, rooms_by_level).
+    """
+    rooms = []
+    rooms_by_level = {}  # levelId int -> [room]
+    room_col = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Rooms).WhereElementIsNotElementType()
 
-    # Viewports on this sheet
-    for vp in all_viewports:
+    for r in room_col:
         try:
-            if vp.SheetId != sheet.Id:
+            # Rooms are SpatialElements
+            room = r
+            if room is None:
                 continue
-            viewid = vp.ViewId
-            view = doc.GetElement(viewid)
-            if view is None:
-                continue
-            viewid_int = elementid_int(viewid)
-            vkey = node_key("view", viewid_int)
+            room_id = elementid_int(room.Id)
+            room_key = node_key("room", room_id)
+
+            # Label: Number - Name
+            number = ""
+            name = ""
+            try:
+                number = room.Number
+            except Exception:
+                pass
+            try:
+                # name = room.Name
+                name = room.LookupParameter("Name").AsString()
+            except Exception:
+                output_window.print_md("### Warning: Room {} has no name.".format(room_id))
+                pass
+            room_label = "{}".format(name)
 
-            vname = getattr(view, "Name", "View {}".format(viewid_int))
-            vtype = str(getattr(view, "ViewType", ""))
+            # Level
+            lvlid = ElementId.InvalidElementId
+            try:
+                lvlid = room.LevelId
+            except Exception:
+                pass
+            lvl_int = elementid_int(lvlid) if lvlid and lvlid != ElementId.InvalidElementId else None
 
-            add_node(
-                vkey, "view", vname, element=view,
-                properties={"viewType": vtype},
-                pos=next_pos("view")
+            graph.add_node(
+                room_key, "room", room_label, element=room,
+                properties={"number": number, "name": name, "levelId": lvl_int},
+                pos=next_pos("room")
             )
 
-            views_by_id[viewid_int] = view
-            add_edge("sheet_to_view", sheet_key, vkey, properties={"via": "Viewport"})
+            rooms.append(room)
+            if lvl_int is not None:
+                rooms_by_level.setdefault(lvl_int, []).append(room)
         except Exception:
             continue
 
+    return rooms, rooms_by_level
 
-#____________________________________________________________________ 2) ROOMS
-rooms = []
-rooms_by_level = {}  # levelId int -> [room]
-room_col = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Rooms).WhereElementIsNotElementType()
 
-for r in room_col:
-    try:
-        # Rooms are SpatialElements
-        room = r
-        if room is None:
-            continue
-        room_id = elementid_int(room.Id)
-        room_key = node_key("room", room_id)
-
-        # Label: Number - Name
-        number = ""
-        name = ""
-        try:
-            number = room.Number
-        except Exception:
-            pass
-        try:
-            # name = room.Name
-            name = room.LookupParameter("Name").AsString()
-        except Exception:
-            output_window.print_md("### Warning: Room {} has no name.".format(room_id))
-            pass
-        room_label = "{}".format(name)
+#____________________________________________________________________ 3) ROOM -> EQUIPMENT
+def collect_equipment(graph):
+    """
+    Returns [(familyinstance, location point)] for every key equipment instance.
+    """
+    equip_instances = []
 
-        # Level
-        lvlid = ElementId.InvalidElementId
+    for built_in_category in KEY_EQUIP_CATEGORIES:
         try:
-            lvlid = room.LevelId
-        except Exception:
-            pass
-        lvl_int = elementid_int(lvlid) if lvlid and lvlid != ElementId.InvalidElementId else None
-
-        add_node(
-            room_key, "room", room_label, element=room,
-            properties={"number": number, "name": name, "levelId": lvl_int},
-            pos=next_pos("room")
-        )
-
-        rooms.append(room)
-        if lvl_int is not None:
-            rooms_by_level.setdefault(lvl_int, []).append(room)
-    except Exception:
-        continue
+            # Collect FamilyInstances in this category
+            familyinstance_collector = FilteredElementCollector(doc).OfCategory(built_in_category).WhereElementIsNotElementType()
+            for element in familyinstance_collector:
+                familyinstance = element  # typically FamilyInstance
+                if not isinstance(familyinstance, FamilyInstance):
+                    continue
+
+                pt = get_location_point(familyinstance)
+                if pt is None:
+                    continue
+
+                eid = elementid_int(familyinstance.Id)
+                ekey = node_key("equip", eid)
+
+                fam = ""
+                typ = ""
+                try:
+                    sym = familyinstance.Symbol
+                    if sym:
+                        typ = sym.Name
+                        fam = sym.Family.Name if sym.Family else ""
+                except Exception:
+                    pass
 
+                jsn = ""
+                try:
+                    p = familyinstance.LookupParameter("JSN")
+                    if p and p.HasValue:
+                        jsn = p.AsString()
+                        ekey = node_key("equip", jsn)
+                except Exception:
+                    pass
 
-#____________________________________________________________________ 3) ROOM -> EQUIPMENT
-equip_instances = []
+                label = familyinstance.Name or "Equipment"
+                if typ:
+                    label = "{}: {}".format(label, typ)
+                if jsn:
+                    label = "{} [{}]".format(label, jsn)
 
-for built_in_category in KEY_EQUIP_CATEGORIES:
-    try:
-        # Collect FamilyInstances in this category
-        familyinstance_collector = FilteredElementCollector(doc).OfCategory(built_in_category).WhereElementIsNotElementType()
-        for element in familyinstance_collector:
-            familyinstance = element  # typically FamilyInstance
-            if not isinstance(familyinstance, FamilyInstance):
-                continue
+                graph.add_node(
+                    ekey, "equip", label, element=familyinstance,
+                    properties={"family": fam, "type": typ, "JSN": jsn, "category": str(familyinstance.Category.Name if familyinstance.Category else "")},
+                    pos=next_pos("equip")
+                )
 
-            pt = get_location_point(familyinstance)
-            if pt is None:
-                continue
+                equip_instances.append((familyinstance, pt))
+        except Exception:
+            continue
 
-            eid = elementid_int(familyinstance.Id)
-            ekey = node_key("equip", eid)
+    return equip_instances
 
-            fam = ""
-            typ = ""
-            try:
-                sym = familyinstance.Symbol
-                if sym:
-                    typ = sym.Name
-                    fam = sym.Family.Name if sym.Family else ""
-            except Exception:
-                pass
 
-            jsn = ""
+def add_room_containment(graph, equip_instances, room_index_by_level, all_rooms_index):
+    """
+    Room -> Equip edges. Only rooms on the same level whose XY extents
+    contain the point are tested.
+    """
+    for familyinstance, pt in equip_instances:
+        try:
+            # Determine candidate rooms by level if possible
+            lvl_int = None
             try:
-                p = familyinstance.LookupParameter("JSN")
-                if p and p.HasValue:
-                    jsn = p.AsString()
-                    ekey = node_key("equip", jsn)
+                lid = familyinstance.LevelId
+                if lid and lid != ElementId.InvalidElementId:
+                    lvl_int = elementid_int(lid)
             except Exception:
                 pass
 
-            label = familyinstance.Name or "Equipment"
-            if typ:
-                label = "{}: {}".format(label, typ)
-            if jsn:
-                label = "{} [{}]".format(label, jsn)
+            room_index = room_index_by_level.get(lvl_int, all_rooms_index) if lvl_int is not None else all_rooms_index
+            ekey = equip_node_key(familyinstance)
 
-            add_node(
-                ekey, "equip", label, element=familyinstance,
-                properties={"family": fam, "type": typ, "JSN": jsn, "category": str(familyinstance.Category.Name if familyinstance.Category else "")},
-                pos=next_pos("equip")
-            )
-
-            equip_instances.append((familyinstance, pt))
-    except Exception:
-        continue
-
-# Room containment edges (Room -> Equip)
-# Optimization: only test rooms on same level when possible.
-for familyinstance, pt in equip_instances:
-    try:
-        # Determine candidate rooms by level if possible
-        lvl_int = None
-        try:
-            lid = familyinstance.LevelId
-            if lid and lid != ElementId.InvalidElementId:
-                lvl_int = elementid_int(lid)
+            for room in room_index.query_point(pt.X, pt.Y):
+                try:
+                    if room.IsPointInRoom(pt):
+                        rkey = node_key("room", elementid_int(room.Id))
+                        graph.add_edge("room_to_equip", rkey, ekey, properties={})
+                except Exception:
+                    continue
         except Exception:
-            pass
-
-        candidate_rooms = rooms_by_level.get(lvl_int, rooms) if lvl_int is not None else rooms
-
-        for room in candidate_rooms:
-            try:
-                if room and room.IsPointInRoom(pt):
-                    rkey = node_key("room", elementid_int(room.Id))
-                    jsn = ""
-                    try:
-                        p = familyinstance.LookupParameter("JSN")
-                        if p and p.HasValue:
-                            jsn = p.AsString()
-                            ekey = node_key("equip", jsn)
-                    except Exception:
-                        ekey = node_key("equip", elementid_int(familyinstance.Id))
-                    add_edge("room_to_equip", rkey, ekey, properties={})
-            except Exception:
-                continue
-    except Exception:
-        continue
+            continue
 
 
 #____________________________________________________________________ 4) EQUIPMENT -> SYSTEMS
@@ -445,82 +537,109 @@ def system_key_and_label(sys_obj):
     skey = "system:{}".format(hash(str(sys_obj)))
     return skey, "System", {"systemType": "Unknown"}
 
-# Track created systems to avoid duplicates
-for familyinstance, _pt in equip_instances:
-    try:
-        element_key = node_key("equip", elementid_int(familyinstance.Id))
-        conns = iter_connectors(familyinstance)
-        for c in conns:
-            system_obj = None
-
-            # Mechanical/Piping
-            try:
-                system_obj = getattr(c, "MEPSystem", None)
-            except Exception:
+def add_equipment_systems(graph, equip_instances):
+    # System nodes are de-duplicated by graph.add_node
+    for familyinstance, _pt in equip_instances:
+        try:
+            element_key = node_key("equip", elementid_int(familyinstance.Id))
+            conns = iter_connectors(familyinstance)
+            for c in conns:
                 system_obj = None
 
-            # Electrical (some builds expose ElectricalSystem)
-            if system_obj is None:
+                # Mechanical/Piping
                 try:
-                    system_obj = getattr(c, "ElectricalSystem", None)
+                    system_obj = getattr(c, "MEPSystem", None)
                 except Exception:
                     system_obj = None
 
-            if system_obj is None:
-                continue
+                # Electrical (some builds expose ElectricalSystem)
+                if system_obj is None:
+                    try:
+                        system_obj = getattr(c, "ElectricalSystem", None)
+                    except Exception:
+                        system_obj = None
 
-            system_key, system_name, system_properties = system_key_and_label(system_obj)
+                if system_obj is None:
+                    continue
 
-            # Create system node
-            add_node(
-                system_key, "system", system_name, element=(system_obj if hasattr(system_obj, "UniqueId") else None),
-                properties=system_properties,
-                pos=next_pos("system")
-            )
+                system_key, system_name, system_properties = system_key_and_label(system_obj)
 
-            add_edge("equip_to_system", element_key, system_key, properties={})
-    except Exception:
-        continue
+                # Create system node
+                graph.add_node(
+                    system_key, "system", system_name, element=(system_obj if hasattr(system_obj, "UniqueId") else None),
+                    properties=system_properties,
+                    pos=next_pos("system")
+                )
 
-"""
-#____________________________________________________________________ VIEWS -> ROOMS
-### phase-1: rooms on same GenLevel
-for viewid_int, view in views_by_id.items():
-    try:
-        vkey = node_key("view", viewid_int)
-        lvlid = get_level_id_for_view(view)
-        if not lvlid or lvlid == ElementId.InvalidElementId:
+                graph.add_edge("equip_to_system", element_key, system_key, properties={})
+        except Exception:
             continue
 
-        lvl_int = elementid_int(lvlid)
-        if lvl_int is None:
-            continue
 
-        for room in rooms_by_level.get(lvl_int, []):
-            rkey = node_key("room", elementid_int(room.Id))
-            add_edge("view_to_room", vkey, rkey, properties={"method": "GenLevel"})
-    except Exception:
-        continue
-"""
+#____________________________________________________________________ COLLECT
+def collect_graph(graph_writer, timer):
+    """
+    Run every export stage into graph_writer; returns the node / edge counts.
+    """
+    graph = GraphCollector(graph_writer)
 
-#____________________________________________________________________ EXPORT JSON
-default_name = "bim_graph.json"
-out_path = forms.save_file(file_ext="json", default_name=default_name)
+    timer.start("Sheets -> Views")
+    collect_sheets_and_views(graph)
 
-if not out_path:
-    script.exit()
+    timer.start("Rooms")
+    rooms, rooms_by_level = collect_rooms(graph)
 
-payload = {
-    "meta": {
-        "sourceModelTitle": doc.Title,
-        "exportedAtUtc": now_utc_iso(),
-        "revitVersion": getattr(app, "VersionNumber", None)
-    },
-    "nodes": nodes,
-    "edges": edges
-}
+    timer.start("Equipment")
+    equip_instances = collect_equipment(graph)
+
+    timer.start("Room Index")
+    all_rooms_index = build_room_index(rooms)
+    room_index_by_level = dict(
+        (lvl_int, build_room_index(level_rooms)) for lvl_int, level_rooms in rooms_by_level.items()
+    )
+
+    timer.start("Room Containment")
+    add_room_containment(graph, equip_instances, room_index_by_level, all_rooms_index)
 
-with open(out_path, "w") as f:
-    json.dump(payload, f, indent=2)
+    timer.start("Equipment -> Systems")
+    add_equipment_systems(graph, equip_instances)
 
-forms.alert("Exported graph:\n{}".format(out_path), title="BIM Graph Export", warn_icon=False)
+    timer.stop()
+    return graph.counts
+
+
+#____________________________________________________________________ OUTPUT FILE
+GRAPH_FILES_FILTER = "BIM Graph JSON (*.json)|*.json|BIM Graph NDJSON stream (*.ndjson)|*.ndjson|BIM Graph binary (*.bimg)|*.bimg"
+
+out_path = forms.save_file(files_filter=GRAPH_FILES_FILTER, default_name="bim_graph.json")
+
+if not out_path:
+    script.exit()
+
+graph_writer = open_graph_writer(out_path, {
+    "sourceModelTitle": doc.Title,
+    "exportedAtUtc": now_utc_iso(),
+    "revitVersion": getattr(app, "VersionNumber", None)
+})
+
+
+#____________________________________________________________________ EXPORT
+# Close on success; on any failure drop the partial file instead of leaving a truncated graph
+timer = StageTimer()
+try:
+    counts = collect_graph(graph_writer, timer)
+    # Meta gets the collection stages; the write itself is only in the timing table
+    stage_seconds = timer.as_dict()
+    timer.start("Write Graph")
+    graph_writer.close({"stageSeconds": stage_seconds})
+    timer.stop()
+except:
+    graph_writer.abort()
+    raise
+
+timer.report()
+
+forms.alert(
+    "Exported graph ({} nodes, {} edges):\n{}".format(counts["nodes"], counts["edges"], out_path),
+    title="BIM Graph Export", warn_icon=False
+)
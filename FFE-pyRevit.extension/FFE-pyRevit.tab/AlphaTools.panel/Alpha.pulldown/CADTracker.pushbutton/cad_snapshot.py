@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""Snapshot store for CAD Tracker.
+
+Keeps the last report per document as JSON, keyed by element UniqueId:
+{"fingerprint": ..., "row": [...], "creator": ...}.
+A run rebuilds every row from cheap reads, reuses the cached creator
+(worksharing tooltip, the expensive part) per element, and reports what
+was added, removed or changed since the previous run.
+
+Pure Python so it can be checked outside Revit: python cad_snapshot.py
+"""
+
+#IMPORTS
+import hashlib
+import json
+import os
+import random
+import time
+
+
+#VARIABLES
+SNAPSHOT_VERSION = 1
+
+
+#FUNCTIONS
+def make_fingerprint(state):
+    """Returns a short hash of the cheap-to-read values that describe a CAD instance"""
+    text = json.dumps(state, sort_keys=True, separators=(",", ":"))
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+def get_snapshot_path(folder, document_key):
+    """Returns the snapshot file for a document inside folder"""
+    name = hashlib.sha1(document_key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(folder, "{}.json".format(name))
+
+
+def load_snapshot(path, document_key):
+    """Returns the stored entries for document_key, or {} if missing / unreadable / outdated"""
+    try:
+        with open(path, "r") as snapshot_file:
+            data = json.load(snapshot_file)
+    except Exception:
+        return {}
+    if data.get("version") != SNAPSHOT_VERSION or data.get("documentKey") != document_key:
+        return {}
+    return data.get("entries") or {}
+
+
+def save_snapshot(path, document_key, entries):
+    """Writes entries next to a temp file first so a failed write keeps the old snapshot"""
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as snapshot_file:
+        json.dump({"version": SNAPSHOT_VERSION, "documentKey": document_key, "entries": entries}, snapshot_file)
+    if os.path.exists(path):
+        os.remove(path)
+    os.rename(temp_path, path)
+
+
+def diff_snapshot(previous_entries, current_fingerprints):
+    """Returns added, removed, changed and unchanged UniqueIds between two runs"""
+    result = {"added": [], "removed": [], "changed": [], "unchanged": []}
+    for unique_id, fingerprint in current_fingerprints.items():
+        previous = previous_entries.get(unique_id)
+        if previous is None:
+            result["added"].append(unique_id)
+        elif previous.get("fingerprint") != fingerprint:
+            result["changed"].append(unique_id)
+        else:
+            result["unchanged"].append(unique_id)
+    for unique_id in previous_entries:
+        if unique_id not in current_fingerprints:
+            result["removed"].append(unique_id)
+    return result
+
+
+#SELF-CHECK
+if __name__ == "__main__":
+    rng = random.Random(4)
+    states = {}
+    for index in range(20000):
+        states["uid-{}".format(index)] = [index % 300, index % 2 == 0, "dwg-{}".format(index % 50), "Visible"]
+
+    started = time.time()
+    first = dict((unique_id, {"fingerprint": make_fingerprint(state), "row": state}) for unique_id, state in states.items())
+    first_seconds = time.time() - started
+
+    for unique_id in rng.sample(sorted(states), 200):
+        states[unique_id][3] = "Hidden"
+    for unique_id in rng.sample(sorted(states), 100):
+        del states[unique_id]
+    for index in range(50):
+        states["new-{}".format(index)] = [1, False, "dwg-new", "Visible"]
+
+    started = time.time()
+    diff = diff_snapshot(first, dict((unique_id, make_fingerprint(state)) for unique_id, state in states.items()))
+    diff_seconds = time.time() - started
+
+    print("20000 instances: fingerprint {:.3f}s, diff {:.3f}s".format(first_seconds, diff_seconds))
+    print("  added {} / removed {} / changed {} / unchanged {}".format(
+        len(diff["added"]), len(diff["removed"]), len(diff["changed"]), len(diff["unchanged"])))
+    print("  rows reported changed: {} of {}".format(len(diff["added"]) + len(diff["changed"]), len(states)))
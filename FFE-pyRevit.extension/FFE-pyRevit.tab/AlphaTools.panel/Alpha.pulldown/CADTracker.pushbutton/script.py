@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 __title__ = "CAD Tracker"
-__doc__     = """Version = V1.4
-Date    = 2026.07.30
+__doc__     = """Version = V1.5
+Date    = 2026.10.18
 ________________________________________________________________
 Last Updates:
+- [2026.10.18] V1.5 Incremental audit: snapshot per document, creator cached, changes reported
 - [2026.07.30] V1.4 Added workset, hosted level, and offset from level to report
 - [2026.07.19] V1.3 Improved error handling inside functions
 - [2026.07.19] V1.2 Optimize removed viewtype filtering since cad.OwnerViewId already returns a valid view type
@@ -16,9 +17,11 @@ Author: Frederick"""
 
 
 #IMPORTS
+import os
 from Autodesk.Revit.DB import *
 from pyrevit import forms, script
 from collections import defaultdict
+from cad_snapshot import diff_snapshot, get_snapshot_path, load_snapshot, make_fingerprint, save_snapshot
 
 
 #FUNCTIONS
@@ -69,10 +72,64 @@ def get_parameter_value(element, built_in_parameter, doc=None):
         return "Unknown"
 
 
-def get_cad_properties(cad, doc, is_workshared, view = None):
-    """Returns the properties of the cad data"""
+def id_value(element_id):
+    """Returns the numeric value of an ElementId (Value in 2024+, IntegerValue before)"""
+    try:
+        return element_id.Value
+    except Exception:
+        return element_id.IntegerValue
+
+
+def get_document_key(doc):
+    """Returns the central path, file path or title that identifies the document between sessions"""
+    try:
+        if doc.IsWorkshared:
+            central_path = doc.GetWorksharingCentralModelPath()
+            if central_path:
+                return ModelPathUtils.ConvertModelPathToUserVisiblePath(central_path)
+    except Exception:
+        pass
+    return doc.PathName or doc.Title
+
+
+def get_visibility(cad, view):
+    """Returns Visible / Hidden / 3D object / Unknown for the cad in its owner view"""
+    if not view:
+        return "3D object"
+    try:
+        category_hidden = has_valid_category(cad) and view.GetCategoryHidden(cad.Category.Id)
+        if cad.IsHidden(view) or category_hidden:
+            return "Hidden"
+    except Exception:
+        return "Unknown"
+    return "Visible"
+
+
+def get_cad_state(cad, view, visibility):
+    """Returns the cheap raw values fingerprinted, with the displayed row, to detect changes since the last run"""
+    try:
+        level_id = id_value(cad.get_Parameter(BuiltInParameter.IMPORT_BASE_LEVEL).AsElementId())
+    except Exception:
+        level_id = None
+    try:
+        level_offset = round(cad.get_Parameter(BuiltInParameter.IMPORT_BASE_LEVEL_OFFSET).AsDouble(), 6)
+    except Exception:
+        level_offset = None
+    return [
+        id_value(view.Id) if view else None,
+        view.Name if view else None,
+        cad.IsLinked,
+        cad.Category.Name if has_valid_category(cad) else None,
+        id_value(cad.WorksetId),
+        level_id,
+        level_offset,
+        visibility,
+    ]
+
+
+def get_cad_properties(cad, doc, is_workshared, view = None, visibility = None, creator = None):
+    """Returns the report row for the cad data (without the element link)"""
 
-    cad_link   = output.linkify(cad.Id)
     name       = cad.Category.Name if has_valid_category(cad) else cad.Parameter[BuiltInParameter.IMPORT_SYMBOL_NAME].AsString() + " [ERROR: dwg not loaded]"
     view_name  = view.Name if view else "Global/3D"
 
@@ -84,24 +141,12 @@ def get_cad_properties(cad, doc, is_workshared, view = None):
     workset     = get_workset_name(doc=doc, cad=cad, is_workshared=is_workshared)
     hosted_level = get_parameter_value(cad, BuiltInParameter.IMPORT_BASE_LEVEL, doc)
     level_offset = get_parameter_value(cad, BuiltInParameter.IMPORT_BASE_LEVEL_OFFSET)
-    owner       = get_creator(doc = doc, cad = cad, is_workshared = is_workshared)
-
-    visibility = "Visible"
-    if not view:
-        visibility = "3D object"
-    else:
-        try:
-            category_hidden = has_valid_category(cad) and view.GetCategoryHidden(cad.Category.Id)
-            if cad.IsHidden(view) or category_hidden:
-                visibility = "Hidden"
-        except Exception:
-            visibility = "Unknown"
+    owner       = creator if creator is not None else get_creator(doc = doc, cad = cad, is_workshared = is_workshared)
 
     return [
-        cad_link,
         name,
         view_name,
-        visibility,
+        visibility if visibility is not None else get_visibility(cad, view),
         status,
         workset,
         hosted_level,
@@ -110,10 +155,29 @@ def get_cad_properties(cad, doc, is_workshared, view = None):
     ]
 
 
+def get_snapshot_folder():
+    """Returns %LOCALAPPDATA%/FFE-pyRevit/CADTracker"""
+    base_folder = os.environ.get("LOCALAPPDATA")
+    if not base_folder:
+        base_folder = os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    return os.path.join(base_folder, "FFE-pyRevit", "CADTracker")
+
+
 #VARIABLES
 doc    = __revit__.ActiveUIDocument.Document
 output = script.get_output()
 
+REPORT_COLUMNS = [
+    "NAME",
+    "VIEW",
+    "VISIBILITY",
+    "STATUS",
+    "WORKSET",
+    "HOSTED LEVEL",
+    "OFFSET FROM LEVEL",
+    "CREATED BY",
+]
+
 #Check if active document is workshared
 is_workshared =  doc.IsWorkshared
 
@@ -132,8 +196,36 @@ for cad in all_cads:
     else:
         ThreeD_cads.append(cad)
 
+# Previous run for this document
+document_key  = get_document_key(doc)
+snapshot_path = get_snapshot_path(get_snapshot_folder(), document_key)
+previous      = load_snapshot(snapshot_path, document_key)
+
 view_cache = {}
-data_report = []
+current = {}
+cads_by_uid = {}
+report_2d = []
+report_3d = []
+
+
+def audit_cad(cad, view, report):
+    """Rebuilds the row (cheap reads) and reuses the stored creator, the expensive worksharing lookup.
+    The fingerprint covers the raw state and the displayed values, so renamed worksets or levels
+    and changed project units are reported as changes"""
+    unique_id  = cad.UniqueId
+    visibility = get_visibility(cad, view)
+    stored = previous.get(unique_id) or {}
+
+    creator = stored.get("creator")
+    if creator in (None, "Unknown", "Not workshared"):
+        creator = get_creator(doc = doc, cad = cad, is_workshared = is_workshared)
+    row = get_cad_properties(cad= cad, doc= doc, is_workshared= is_workshared, view= view, visibility= visibility, creator= creator)
+    fingerprint = make_fingerprint(get_cad_state(cad, view, visibility) + row[:-1])
+
+    current[unique_id] = {"fingerprint": fingerprint, "row": row, "creator": creator}
+    cads_by_uid[unique_id] = cad
+    report.append([output.linkify(cad.Id)] + row)
+
 
 for view_id, cad_in_view in list_of_cads.items():
     if view_id not in view_cache:
@@ -145,27 +237,38 @@ for view_id, cad_in_view in list_of_cads.items():
         continue
 
     for cad in cad_in_view:
-        data_report.append(get_cad_properties(cad= cad, doc= doc, is_workshared= is_workshared, view= view))
+        audit_cad(cad, view, report_2d)
+
+report_2d.sort(key=lambda x: (x[1], x[2]))
+
+for cad in ThreeD_cads:
+    audit_cad(cad, None, report_3d)
+
+data_report = report_2d + report_3d
+
+changes = diff_snapshot(previous, dict((unique_id, entry["fingerprint"]) for unique_id, entry in current.items()))
+
+try:
+    save_snapshot(snapshot_path, document_key, current)
+except Exception as e:
+    output.print_md("**Could not save CAD snapshot:** {}".format(e))
 
-data_report.sort(key=lambda x: (x[1], x[2]))
+if previous:
+    change_report = []
+    for change, label in (("added", "Added"), ("changed", "Changed"), ("removed", "Removed")):
+        for unique_id in changes[change]:
+            if change == "removed":
+                change_report.append([label, "-"] + previous[unique_id]["row"])
+            else:
+                change_report.append([label, output.linkify(cads_by_uid[unique_id].Id)] + current[unique_id]["row"])
 
-if ThreeD_cads:
-    for cad in ThreeD_cads:
-        threeD_cad_properties = get_cad_properties(cad= cad, doc= doc, is_workshared= is_workshared)
-        data_report.append(threeD_cad_properties)
+    output.print_md("##CHANGES SINCE LAST RUN: {} added, {} changed, {} removed, {} unchanged".format(
+        len(changes["added"]), len(changes["changed"]), len(changes["removed"]), len(changes["unchanged"])))
+    if change_report:
+        output.print_table(table_data=change_report, columns=["CHANGE", "CAD"] + REPORT_COLUMNS)
 
 output.print_md("##CAD LINKS REPORT:")
 output.print_table(
     table_data=data_report,
-    columns=[
-        "CAD",
-        "NAME",
-        "VIEW",
-        "VISIBILITY",
-        "STATUS",
-        "WORKSET",
-        "HOSTED LEVEL",
-        "OFFSET FROM LEVEL",
-        "CREATED BY",
-    ],
+    columns=["CAD"] + REPORT_COLUMNS,
 )
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 __title__     = "Keynote To Symbol"
-__version__   = 'Version = 0.1'
-__doc__       = """Version = 0.1
+__version__   = 'Version = 0.2'
+__doc__       = """Version = 0.2
 Date    = 09.22.2025
 # ______________________________________________________________
 # Description:
@@ -18,6 +18,7 @@ Date    = 09.22.2025
 # ______________________________________________________________
 # Last update:
 # - [09.22.2025] - 0.10 Initialized
+# - [10.18.2026] - 0.2 Types synced from one plan (symbol_sync.py) in a single transaction; reruns are no-ops
 # ______________________________________________________________
 Author: Kyle Guggenheim"""
 
@@ -26,6 +27,7 @@ Author: Kyle Guggenheim"""
 # from math import e
 # import re
 # from unittest import result
+import sys
 import clr
 clr.AddReference("System")
 from Autodesk.Revit.DB import *
@@ -40,6 +42,9 @@ from pyrevit import revit, DB
 from pyrevit.script import output
 from pyrevit import forms
 
+#____________________________________________________________________ IMPORTS (CUSTOM)
+from symbol_sync import ExistingType, plan_type_sync
+
 
 #____________________________________________________________________ VARIABLES
 app         = __revit__.Application
@@ -71,6 +76,9 @@ PARAM_NAME_KEYNOTE_2 = "Keynote Text"
 PARAM_NAME_1 = "Number"
 PARAM_NAME_2 = "Text"
 
+### Offer to delete unused types that match no keynote anywhere in the project
+PURGE_UNUSED_TYPES = False
+
 
 
 def get_all_elements_of_category_in_view():
@@ -100,25 +108,35 @@ output_window.print_md("---")
 #         val2 = "None"
 
 
-# Get unique keynote values from the elements
-keynote_values = set()
-for elem in get_all_elements_of_category_in_view():
-    keynote_param_1 = elem.LookupParameter(PARAM_NAME_KEYNOTE_1)
-    keynote_param_2 = elem.LookupParameter(PARAM_NAME_KEYNOTE_2)
-    
-    if keynote_param_1 and keynote_param_1.HasValue:
-        val1 = keynote_param_1.AsString()
-    else:
-        val1 = "None"
-    
-    if keynote_param_2 and keynote_param_2.HasValue:
-        val2 = keynote_param_2.AsString()
-    else:
-        val2 = "None"
-    
-    keynote_values.add((val1, val2))
+def get_keynote_pairs(elements):
+    """Unique (Key Value, Keynote Text) pairs of the keynote tags."""
+    keynote_values = set()
+    for elem in elements:
+        keynote_param_1 = elem.LookupParameter(PARAM_NAME_KEYNOTE_1)
+        keynote_param_2 = elem.LookupParameter(PARAM_NAME_KEYNOTE_2)
+
+        if keynote_param_1 and keynote_param_1.HasValue:
+            val1 = keynote_param_1.AsString()
+        else:
+            val1 = "None"
+
+        if keynote_param_2 and keynote_param_2.HasValue:
+            val2 = keynote_param_2.AsString()
+        else:
+            val2 = "None"
 
-keynote_values = list(keynote_values)
+        keynote_values.add((val1, val2))
+    return list(keynote_values)
+
+
+def get_project_keynote_pairs():
+    """Keynote pairs of every view, so a type used by a keynote elsewhere is never an orphan."""
+    collector = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_KeynoteTags).WhereElementIsNotElementType()
+    return get_keynote_pairs(collector)
+
+
+# Get unique keynote values from the elements
+keynote_values = get_keynote_pairs(get_all_elements_of_category_in_view())
 
 
 # Create new types in the FFE_Symbol_Keynote family
@@ -136,95 +154,121 @@ collector = FilteredElementCollector(doc).OfClass(Family)
 family_collector = []
 for f in collector:
     if f.IsEditable and f.FamilyCategory and f.FamilyCategory.Id == ElementId(BuiltInCategory.OST_GenericAnnotation):
-        output_window.print_md("f: {}".format(f.Name))
         family_collector.append(f)
 
 family = next((f for f in family_collector if f.Name == family_name), None)
 
-output_window.print_md("family name: {}".format(family.Name))
-output_window.print_md("family id: {}".format(family.Id))
-
 if not family:
     output_window.print_md("### ❌ Family '{}' not found in the document.".format(family_name))
     output_window.print_md("### Please load the family and try again.")
     sys.exit()
 
+output_window.print_md("family name: {}".format(family.Name))
+output_window.print_md("family id: {}".format(family.Id))
 
 
 
+def id_value(element_id):
+    try:
+        return element_id.Value
+    except:
+        return element_id.IntegerValue
 
-# Create family types based on unique keynote values
+
+def get_param_text(element, param_name):
+    param = element.LookupParameter(param_name)
+    if param and param.HasValue:
+        return param.AsString()
+    return None
+
+
+def read_existing_types(family):
+    """ExistingType record per symbol in the family, read once."""
+    used_type_ids = set()
+    instances = FilteredElementCollector(doc).OfClass(FamilyInstance).OfCategory(BuiltInCategory.OST_GenericAnnotation)
+    for instance in instances:
+        used_type_ids.add(id_value(instance.GetTypeId()))
+
+    existing_types = []
+    for sym_id in family.GetFamilySymbolIds():
+        symbol = doc.GetElement(sym_id)
+        existing_types.append(ExistingType(
+            id_value(sym_id),
+            symbol.get_Parameter(BuiltInParameter.SYMBOL_NAME_PARAM).AsString(),
+            get_param_text(symbol, PARAM_NAME_1),
+            get_param_text(symbol, PARAM_NAME_2),
+            id_value(sym_id) in used_type_ids,
+        ))
+    return existing_types
+
+
+def set_type_values(symbol, planned):
+    symbol.LookupParameter(PARAM_NAME_1).Set(planned.number)
+    symbol.LookupParameter(PARAM_NAME_2).Set(planned.text)
+
+
+# Create / update family types based on unique keynote values
 def create_types_in_family(family, keynote_values):
-    # doc = revit.doc
-    created_types = []
-    with Transaction(doc, "Create Keynote Symbol Types") as t:
+    symbol_ids = list(family.GetFamilySymbolIds())
+    if not symbol_ids:
+        output_window.print_md("### ❌ No FamilySymbols found in family '{}'.".format(family.Name))
+        return
+
+    base_symbol = doc.GetElement(symbol_ids[0])
+    symbol_ids_by_value = dict((id_value(sym_id), sym_id) for sym_id in symbol_ids)
+    existing_types = read_existing_types(family)
+    plan = plan_type_sync(
+        keynote_values, existing_types,
+        purge_orphans=PURGE_UNUSED_TYPES,
+        base_symbol_id=id_value(base_symbol.Id),
+        protected_pairs=get_project_keynote_pairs() if PURGE_UNUSED_TYPES else None,
+    )
+
+    if plan.purge and not forms.alert(
+            "{} unused type(s) in '{}' match no keynote in the project.\nPurge them?".format(len(plan.purge), family.Name),
+            yes=True, no=True):
+        plan.purge = []
+
+    if plan.is_noop:
+        output_window.print_md("### ✅ All {} keynote types are already in sync".format(len(plan.keep)))
+        return
+
+    results = []
+    with Transaction(doc, "Sync Keynote Symbol Types") as t:
         t.Start()
-        for val1, val2 in keynote_values:
-            # Create a new type name based on the keynote values
-            new_type_name = "{} {}".format(val1, val2)
-
-            keynote_param_1 = val1
-            keynote_param_2 = val2
-            
-            output_window.print_md("keynote_param_1: {}".format(keynote_param_1))
-            output_window.print_md("keynote_param_2: {}".format(keynote_param_2))
-            output_window.print_md("---")
-
-            # Check if the type already exists
-            existing_type = None
-            for sym_id in family.GetFamilySymbolIds():
-                symbol = doc.GetElement(sym_id)
-                symbol_name = symbol.get_Parameter(BuiltInParameter.SYMBOL_NAME_PARAM).AsString()
-                if symbol_name == new_type_name:
-                    existing_type = symbol
-                    break
-
-            
-            
-            if not existing_type:
-                # Create a new family symbol (type)
-                try:
-                    # Duplicate the first available symbol in the family
-                    symbol_ids = family.GetFamilySymbolIds()
-                    output_window.print_md("symbol_ids: {}".format(symbol_ids))
-
-                    if symbol_ids is None or symbol_ids.Count == 0:
-                        raise Exception("No FamilySymbols found in family '{}'.".format(family.Name))
-                    
-                    base_symbol_id = next(iter(symbol_ids))
-                    base_symbol = doc.GetElement(base_symbol_id)
-                    output_window.print_md("Base Symbol: {}".format(base_symbol))
-
-                    # Duplicate the base symbol to create a new type
-                    new_symbol_id = base_symbol.Duplicate(new_type_name)
-                    output_window.print_md("new_symbol_id: {}".format(new_symbol_id))
-
-                    new_symbol = doc.GetElement(new_symbol_id)
-                    output_window.print_md("### ✅ Created Type: {}".format(new_symbol))
-
-                    # Set the symbol parameters
-                    param_number = new_symbol.LookupParameter(PARAM_NAME_1)                    
-                    param_text = new_symbol.LookupParameter(PARAM_NAME_2)
-                    
-                    param_number.Set(keynote_param_1)
-                    param_text.Set(keynote_param_2)
-
-                    
-                    created_types.append([family.Name, new_type_name])
-                except Exception as e:
-                    output_window.print_md("### ❌ Error Creating Type: {} : {}".format(new_type_name, str(e)))
-        
+        for planned in plan.create:
+            try:
+                new_symbol = doc.GetElement(base_symbol.Duplicate(planned.name))
+                set_type_values(new_symbol, planned)
+                results.append(["Created", planned.name, ""])
+            except Exception as e:
+                results.append(["❌ Error", planned.name, str(e)])
+
+        for planned in plan.update:
+            try:
+                set_type_values(doc.GetElement(symbol_ids_by_value[planned.symbol_id]), planned)
+                results.append(["Updated", planned.name, ", ".join(planned.changes)])
+            except Exception as e:
+                results.append(["❌ Error", planned.name, str(e)])
+
+        for existing in plan.purge:
+            try:
+                doc.Delete(symbol_ids_by_value[existing.symbol_id])
+                results.append(["Purged", existing.name, ""])
+            except Exception as e:
+                results.append(["❌ Error", existing.name, str(e)])
         t.Commit()
 
-    if created_types:
-        output_window.print_md("### ✅ Created Types")
-        output_window.print_table(
-            table_data=created_types,
-            title="Family Type Renames",
-            columns=["Family", "Name"]
-        )
-    else:
-        output_window.print_md("### ⚠️ No Types Created")
+    counts = dict((action, len([row for row in results if row[0] == action])) for action in ("Created", "Updated", "Purged", "❌ Error"))
+    output_window.print_md("### {} Synced Types: {} created, {} updated, {} unchanged, {} purged, {} failed".format(
+        "❌" if counts["❌ Error"] else "✅", counts["Created"], counts["Updated"], len(plan.keep), counts["Purged"], counts["❌ Error"]))
+    for name, number, text in plan.conflicts:
+        output_window.print_md("⚠️ Skipped '{}' / '{}': type name '{}' is already used by another keynote.".format(number, text, name))
+    output_window.print_table(
+        table_data=results,
+        title="Family Type Sync",
+        columns=["Action", "Name", "Details"]
+    )
 
 
 #_____________________________________________________________________ 🏃‍➡️ RUN 
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Type-sync planner for Keynote To Symbol.
+
+Purpose:
+-> Turn a list of (number, text) keynote pairs into one plan against the
+   types that already exist in the FFE_Symbol_Keynote family, instead of
+   rescanning every family symbol for every pair.
+
+Key behaviors:
+-> Existing types are indexed by name once.
+-> Each pair becomes "create" (no type with that name), "update" (type
+   exists but Number / Text differ) or "keep" (already in sync), so a rerun
+   plans nothing but keeps.
+-> Two pairs that produce the same type name keep the first and report the
+   second as a conflict.
+-> With purge enabled, types that match no pair and have no placed
+   instances are planned for deletion. The base type used for duplication
+   is never purged, nor is a type named after one of protected_pairs
+   (script.py passes the keynotes of the whole project, so types for
+   keynotes in other views survive a run from one view).
+
+Design decisions:
+-> Pure Python (no Revit imports); script.py reads the family into
+   ExistingType records and executes the plan in one transaction.
+   python symbol_sync.py compares the planner with the per-pair scan.
+"""
+
+#____________________________________________________________________ IMPORTS (SYSTEM)
+import random
+import time
+from collections import namedtuple
+
+
+#____________________________________________________________________ RECORDS
+ExistingType = namedtuple("ExistingType", ["symbol_id", "name", "number", "text", "in_use"])
+PlannedType = namedtuple("PlannedType", ["name", "number", "text", "symbol_id", "changes"])
+
+
+def make_type_name(number, text):
+    return "{} {}".format(number, text)
+
+
+class TypeSyncPlan(object):
+    """create / update / keep lists of PlannedType, purge of ExistingType, conflicts of (name, number, text)."""
+
+    def __init__(self):
+        self.create = []
+        self.update = []
+        self.keep = []
+        self.purge = []
+        self.conflicts = []
+
+    @property
+    def is_noop(self):
+        return not (self.create or self.update or self.purge)
+
+    def summary(self):
+        return {
+            "create": len(self.create),
+            "update": len(self.update),
+            "keep": len(self.keep),
+            "purge": len(self.purge),
+            "conflicts": len(self.conflicts),
+        }
+
+
+#____________________________________________________________________ PLAN
+def plan_type_sync(keynote_pairs, existing_types, purge_orphans=False, base_symbol_id=None, protected_pairs=None):
+    """Plan the family types for keynote_pairs against existing_types (ExistingType records)."""
+    plan = TypeSyncPlan()
+    by_name = {}
+    for existing in existing_types:
+        by_name.setdefault(existing.name, existing)
+
+    planned_names = set()
+    for number, text in keynote_pairs:
+        name = make_type_name(number, text)
+        if name in planned_names:
+            plan.conflicts.append((name, number, text))
+            continue
+        planned_names.add(name)
+
+        existing = by_name.get(name)
+        if existing is None:
+            plan.create.append(PlannedType(name, number, text, None, ("Number", "Text")))
+            continue
+
+        changes = []
+        if existing.number != number:
+            changes.append("Number")
+        if existing.text != text:
+            changes.append("Text")
+        planned = PlannedType(name, number, text, existing.symbol_id, tuple(changes))
+        if changes:
+            plan.update.append(planned)
+        else:
+            plan.keep.append(planned)
+
+    if purge_orphans:
+        protected_names = set(make_type_name(number, text) for number, text in (protected_pairs or []))
+        for existing in existing_types:
+            if existing.name in planned_names or existing.name in protected_names or existing.in_use:
+                continue
+            if base_symbol_id is not None and existing.symbol_id == base_symbol_id:
+                continue
+            plan.purge.append(existing)
+
+    return plan
+
+
+def apply_plan_to_records(plan, existing_types, next_symbol_id):
+    """Expected family contents after executing plan; used by the self-check."""
+    purged = set(existing.symbol_id for existing in plan.purge)
+    records = {}
+    for existing in existing_types:
+        if existing.symbol_id not in purged:
+            records[existing.symbol_id] = existing
+    for planned in plan.update:
+        old = records[planned.symbol_id]
+        records[planned.symbol_id] = ExistingType(old.symbol_id, old.name, planned.number, planned.text, old.in_use)
+    for planned in plan.create:
+        records[next_symbol_id] = ExistingType(next_symbol_id, planned.name, planned.number, planned.text, False)
+        next_symbol_id += 1
+    return [records[key] for key in sorted(records.keys())]
+
+
+#____________________________________________________________________ SELF-CHECK (SYNTHETIC FAMILY)
+def generate_synthetic_family(pair_count=4000, existing_count=3000, seed=3):
+    rng = random.Random(seed)
+    pairs = [("{0}.{1:02d}".format(index // 50 + 1, index % 50), "NOTE {0}".format(index)) for index in range(pair_count)]
+    existing = []
+    for index in range(existing_count):
+        if index < pair_count and rng.random() < 0.8:
+            number, text = pairs[index]
+            if rng.random() < 0.1:
+                text = text + " (OLD)"
+            name = make_type_name(*pairs[index])
+        else:
+            number, text = "X{0}".format(index), "ORPHAN"
+            name = make_type_name(number, text)
+        existing.append(ExistingType(1000 + index, name, number, text, rng.random() < 0.3))
+    rng.shuffle(pairs)
+    return pairs, existing
+
+
+def count_scan_comparisons(keynote_pairs, existing_types):
+    """Name comparisons made by the per-pair GetFamilySymbolIds() scan (pre-plan behaviour)."""
+    names = [existing.name for existing in existing_types]
+    comparisons = 0
+    for number, text in keynote_pairs:
+        name = make_type_name(number, text)
+        for existing_name in names:
+            comparisons += 1
+            if existing_name == name:
+                break
+        else:
+            names.append(name)
+    return comparisons
+
+
+if __name__ == "__main__":
+    pairs, existing = generate_synthetic_family()
+
+    started = time.time()
+    comparisons = count_scan_comparisons(pairs, existing)
+    scan_seconds = time.time() - started
+
+    started = time.time()
+    plan = plan_type_sync(pairs, existing, purge_orphans=True, base_symbol_id=existing[0].symbol_id)
+    plan_seconds = time.time() - started
+
+    after = apply_plan_to_records(plan, existing, 10 ** 6)
+    rerun = plan_type_sync(pairs, after, purge_orphans=True, base_symbol_id=existing[0].symbol_id)
+
+    print("{0} keynote pairs / {1} existing types".format(len(pairs), len(existing)))
+    print("  per-pair scan : {0:>9} name comparisons  {1:.3f}s".format(comparisons, scan_seconds))
+    print("  indexed plan  : {0:>9} lookups           {1:.3f}s  {2}".format(len(pairs), plan_seconds, plan.summary()))
+    print("  rerun no-op   : {0}  {1}".format(rerun.is_noop, rerun.summary()))
+
+    # A run from one view: only its pairs are planned, the project's protect the rest.
+    view_pairs = pairs[:200]
+    view_run = plan_type_sync(view_pairs, after, purge_orphans=True, base_symbol_id=existing[0].symbol_id,
+                              protected_pairs=pairs)
+    print("  one-view run  : {0} purged with project pairs protected ({1} without)".format(
+        len(view_run.purge),
+        len(plan_type_sync(view_pairs, after, purge_orphans=True, base_symbol_id=existing[0].symbol_id).purge)))
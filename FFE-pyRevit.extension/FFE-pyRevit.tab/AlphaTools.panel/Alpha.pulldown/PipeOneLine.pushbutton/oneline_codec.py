@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""
+Storage codec for Pipe One-Line diagram payloads.
+
+Purpose:
+-> Keep the ExtensibleStorage copy of a diagram small and cheap to open.
+   The payload used to be one JSON string that grew with every node, edge
+   and drawn element and had to be parsed in full on every read.
+
+Format (version 1):
+-> header: small JSON string with the format name, version, every scalar
+   payload field ("meta") and a section table.
+-> chunks: list of strings. Each section (nodes, edges, symbols, labels,
+   drawing) is compact-encoded, JSON dumped, zlib compressed, base64'd and
+   split into CHUNK_SIZE pieces; the section table records its chunk span.
+-> Lists of dicts are stored as one field list plus value rows, so keys are
+   written once per section instead of once per item. A key a record does
+   not have is listed in a separate "m" presence table (row -> absent field
+   indexes) rather than marked by a value inside the row, so any JSON value
+   a record holds round-trips. The drawing map is stored as parallel
+   key / id / shape arrays.
+
+Key behaviors:
+-> PayloadReader decodes a section only when it is asked for, so reading
+   the previous drawing (or just the meta) never touches nodes or edges.
+-> The drawing map (one entry per detail line / text note) is passed to
+   encode_payload() separately and read back with PayloadReader.drawing();
+   it is never part of the payload dict the web editor sends and receives.
+-> encode_payload() / PayloadReader.payload() round-trip exactly.
+
+Design decisions:
+-> Pure Python, zlib + base64 only (both ship with IronPython):
+   python oneline_codec.py round-trips and measures a synthetic system.
+"""
+
+#____________________________________________________________________ IMPORTS (SYSTEM)
+import base64
+import json
+import time
+import zlib
+
+
+#____________________________________________________________________ CONSTANTS
+CODEC_FORMAT = "ffe-pipe-oneline"
+CODEC_VERSION = 1
+CHUNK_SIZE = 1000000
+COMPRESSION_LEVEL = 6
+
+TABLE_SECTIONS = ("nodes", "edges", "symbols", "labels")
+DRAWING_SECTION = "drawing"
+SECTIONS = TABLE_SECTIONS + (DRAWING_SECTION,)
+
+#____________________________________________________________________ TEXT HELPERS
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=True, separators=(",", ":"))
+
+
+def _pack(value):
+    raw = _dumps(value)
+    if not isinstance(raw, bytes):
+        raw = raw.encode("utf-8")
+    packed = base64.b64encode(zlib.compress(raw, COMPRESSION_LEVEL))
+    if not isinstance(packed, str):
+        packed = packed.decode("ascii")
+    return packed
+
+
+def _unpack(text):
+    if not isinstance(text, bytes):
+        text = text.encode("ascii")
+    raw = zlib.decompress(base64.b64decode(text))
+    if not isinstance(raw, str):
+        raw = raw.decode("utf-8")
+    return json.loads(raw)
+
+
+#____________________________________________________________________ COMPACT ENCODING
+def encode_records(records):
+    """[{...}, ...] -> {"f": fields, "r": rows, "m": absent}; anything else is kept as-is.
+
+    absent maps a row index (as text) to the field indexes that record lacks.
+    Their slots in the row hold null, and trailing absent fields are trimmed.
+    """
+    if not all(isinstance(record, dict) for record in records):
+        return {"raw": records}
+    fields = []
+    field_index = {}
+    for record in records:
+        for key in record:
+            if key not in field_index:
+                field_index[key] = len(fields)
+                fields.append(key)
+    rows = []
+    absent = {}
+    for row_index, record in enumerate(records):
+        present = [field in record for field in fields]
+        while present and not present[-1]:
+            present.pop()
+        rows.append([record[field] if field in record else None for field in fields[:len(present)]])
+        missing = [index for index, is_present in enumerate(present) if not is_present]
+        if missing:
+            absent[str(row_index)] = missing
+    encoded = {"f": fields, "r": rows}
+    if absent:
+        encoded["m"] = absent
+    return encoded
+
+
+def decode_records(encoded):
+    if "raw" in encoded:
+        return encoded["raw"]
+    fields = encoded["f"]
+    absent = encoded.get("m") or {}
+    records = []
+    for row_index, row in enumerate(encoded["r"]):
+        missing = set(absent.get(str(row_index)) or [])
+        record = {}
+        for index, value in enumerate(row):
+            if index in missing:
+                continue
+            record[fields[index]] = value
+        records.append(record)
+    return records
+
+
+def encode_drawing(drawing):
+    elements = drawing.get("elements") if isinstance(drawing, dict) else None
+    if not isinstance(elements, dict) or set(drawing.keys()) - set(["viewId", "elements"]):
+        return {"raw": drawing}
+    keys = []
+    ids = []
+    shapes = []
+    for key, element in elements.items():
+        if not isinstance(element, dict) or set(element.keys()) != set(["id", "shape"]):
+            return {"raw": drawing}
+        keys.append(key)
+        ids.append(element["id"])
+        shapes.append(element["shape"])
+    return {"v": drawing.get("viewId"), "k": keys, "i": ids, "s": shapes}
+
+
+def decode_drawing(encoded):
+    if "raw" in encoded:
+        return encoded["raw"]
+    elements = {}
+    for index, key in enumerate(encoded["k"]):
+        elements[key] = {"id": encoded["i"][index], "shape": encoded["s"][index]}
+    return {"viewId": encoded["v"], "elements": elements}
+
+
+#____________________________________________________________________ ENCODE
+def encode_payload(payload, drawing=None, chunk_size=CHUNK_SIZE):
+    """Return (header_text, chunks) for a payload dict plus its drawing map.
+
+    A "drawing" key inside payload is ignored; the drawing is only stored
+    from the drawing argument.
+    """
+    meta = {}
+    sections = {}
+    chunks = []
+
+    items = [(key, value) for key, value in payload.items() if key != DRAWING_SECTION]
+    if drawing is not None:
+        items.append((DRAWING_SECTION, drawing))
+
+    for key, value in items:
+        if key in TABLE_SECTIONS and isinstance(value, list):
+            encoded = encode_records(value)
+        elif key == DRAWING_SECTION:
+            encoded = encode_drawing(value)
+        else:
+            meta[key] = value
+            continue
+
+        packed = _pack(encoded)
+        first = len(chunks)
+        for start in range(0, len(packed), chunk_size):
+            chunks.append(packed[start:start + chunk_size])
+        if not packed:
+            chunks.append("")
+        sections[key] = [first, len(chunks) - first]
+
+    header = {
+        "format": CODEC_FORMAT,
+        "version": CODEC_VERSION,
+        "meta": meta,
+        "sections": sections,
+    }
+    return _dumps(header), chunks
+
+
+#____________________________________________________________________ DECODE
+class PayloadReader(object):
+    """Lazy view over (header_text, chunks); chunks only need len() and indexing."""
+
+    def __init__(self, header_text, chunks):
+        header = json.loads(header_text)
+        if header.get("format") != CODEC_FORMAT:
+            raise ValueError("Not a Pipe One-Line payload.")
+        if header.get("version") != CODEC_VERSION:
+            raise ValueError("Unsupported Pipe One-Line payload version {0}.".format(header.get("version")))
+        self.meta = header.get("meta") or {}
+        self.sections = header.get("sections") or {}
+        self.chunks = chunks
+        self._decoded = {}
+
+    def section(self, name):
+        """Decoded section value, or None if the payload has no such section."""
+        if name in self._decoded:
+            return self._decoded[name]
+        span = self.sections.get(name)
+        if span is None:
+            return None
+        first, count = span
+        packed = "".join(self.chunks[index] for index in range(first, first + count))
+        encoded = _unpack(packed)
+        value = decode_drawing(encoded) if name == DRAWING_SECTION else decode_records(encoded)
+        self._decoded[name] = value
+        return value
+
+    def payload(self, sections=None):
+        """Meta plus the requested table sections (all of them when sections is None).
+
+        The drawing map is never included; read it with drawing().
+        """
+        payload = dict(self.meta)
+        for name in self.sections:
+            if name == DRAWING_SECTION:
+                continue
+            if sections is None or name in sections:
+                payload[name] = self.section(name)
+        return payload
+
+    def drawing(self):
+        """Stored drawing map {"viewId", "elements"}, or None."""
+        return self.section(DRAWING_SECTION)
+
+
+def decode_payload(header_text, chunks, sections=None):
+    return PayloadReader(header_text, chunks).payload(sections)
+
+
+#____________________________________________________________________ SELF-CHECK (SYNTHETIC SYSTEM)
+def build_synthetic_payload(raw_node_count=60000):
+    """Returns (payload, drawing) for a synthetic system."""
+    from oneline_graph import compact_system_graph, generate_synthetic_network
+    from oneline_layout import apply_schematic_layout
+    from oneline_drawing import build_drawing_primitives
+
+    raw_nodes, raw_adjacency = generate_synthetic_network(raw_node_count)
+    nodes, edges, warnings = compact_system_graph(raw_nodes, raw_adjacency)
+    width, height = apply_schematic_layout(nodes, edges, "1")
+    payload = {
+        "schemaVersion": 1,
+        "generationMode": "compact-significant-nodes",
+        "documentTitle": "Synthetic",
+        "systemId": 1,
+        "systemUniqueId": "synthetic",
+        "systemName": "Synthetic System",
+        "viewId": 42,
+        "warnings": warnings,
+        "nodes": [nodes[key] for key in sorted(nodes.keys())],
+        "edges": [edges[key] for key in sorted(edges.keys())],
+        "symbols": [],
+        "labels": [{"id": "title", "kind": "title", "text": "Synthetic System", "x": 90, "y": 46}],
+        "canvas": {"width": width, "height": height},
+    }
+    elements = {}
+    for index, (key, shape) in enumerate(build_drawing_primitives(payload).items()):
+        elements[key] = {"id": 500000 + index, "shape": list(shape)}
+    return payload, {"viewId": 42, "elements": elements}
+
+
+if __name__ == "__main__":
+    payload, drawing = build_synthetic_payload()
+    plain = _dumps(payload)
+
+    started = time.time()
+    header_text, chunks = encode_payload(payload, drawing, chunk_size=250000)
+    encode_seconds = time.time() - started
+
+    started = time.time()
+    json.loads(plain)
+    plain_seconds = time.time() - started
+
+    started = time.time()
+    full = decode_payload(header_text, chunks)
+    full_seconds = time.time() - started
+
+    started = time.time()
+    drawing_reader = PayloadReader(header_text, chunks)
+    stored_drawing = drawing_reader.drawing()
+    drawing_seconds = time.time() - started
+
+    stored = len(header_text) + sum(len(chunk) for chunk in chunks)
+    print("{0} nodes / {1} edges / {2} drawn elements".format(
+        len(payload["nodes"]), len(payload["edges"]), len(drawing["elements"])))
+    print("  plain JSON : {0:>9} chars, parse {1:.3f}s".format(len(plain), plain_seconds))
+    print("  codec v{0}   : {1:>9} chars in {2} chunks, encode {3:.3f}s, full decode {4:.3f}s, drawing only {5:.3f}s".format(
+        CODEC_VERSION, stored, len(chunks), encode_seconds, full_seconds, drawing_seconds))
+    print("  round trip : {0}".format(full == json.loads(plain) and stored_drawing == json.loads(_dumps(drawing))))
+    print("  lazy meta  : {0}".format(set(drawing_reader._decoded) == set([DRAWING_SECTION]) and sorted(drawing_reader.payload([]).keys()) == sorted(set(payload.keys()) - set(TABLE_SECTIONS))))
+    print("  UI payload without drawing: {0} chars (drawing map stored separately: {1} chars)".format(
+        len(plain), len(_dumps(drawing))))
+
+    # Absent keys are kept apart from values: null and any dict are ordinary values
+    records = [{"id": "a", "note": {"~": 0}}, {"id": "b", "note": None}, {"id": "c"}, {"note": "x", "id": "d", "tag": 1}]
+    header_text, chunks = encode_payload({"nodes": records})
+    print("  presence   : {0}".format(decode_payload(header_text, chunks)["nodes"] == records))
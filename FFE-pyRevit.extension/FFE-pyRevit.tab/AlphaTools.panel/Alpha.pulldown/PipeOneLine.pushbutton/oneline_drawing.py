@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""
+Drafting view redraw planner for the Pipe One-Line editor.
+
+Purpose:
+-> Saving a diagram used to clear the drafting view and recreate every
+   detail line and text note. This module turns a payload into keyed
+   drawing primitives and diffs them against what was drawn last time, so
+   only changed elements are touched.
+
+Key behaviors:
+-> build_drawing_primitives(payload) returns an ordered {key: primitive}
+   map. Keys are stable per payload item ("edge/<id>/<n>", "node/<id>/<n>",
+   "node-label/<id>" ...), primitives are ("line", x1, y1, x2, y2) or
+   ("text", x, y, text) in SVG units, rounded so float noise is no change.
+-> plan_redraw(previous, primitives) compares them with the stored
+   {key: {"id": element id, "shape": primitive}} map and returns which
+   elements to keep, update in place (move / reshape / retext), delete,
+   and create. A kind change (line <-> text) is a delete + create.
+
+Design decisions:
+-> Pure Python (no Revit imports); the Revit side applies a plan in one
+   transaction. python oneline_drawing.py runs a synthetic self-check.
+"""
+
+#____________________________________________________________________ IMPORTS (SYSTEM)
+import math
+from collections import OrderedDict
+
+#____________________________________________________________________ IMPORTS (CUSTOM)
+from oneline_graph import SIZE_CHANGE_KIND, normalize_for_label, safe_str
+
+
+#____________________________________________________________________ CONSTANTS
+SVG_TO_FEET = 1.0 / 24.0
+MIN_DETAIL_LINE_LENGTH = 0.0005
+MIN_SVG_LINE_LENGTH = MIN_DETAIL_LINE_LENGTH / SVG_TO_FEET
+COORDINATE_PRECISION = 3
+
+
+#____________________________________________________________________ PAYLOAD HELPERS
+def build_payload_node_index(payload):
+    """{node id: node} for one payload; build once per load/draw, not per lookup."""
+    node_index = {}
+    for node in payload.get("nodes") or []:
+        node_id = safe_str(node.get("id"))
+        if node_id not in node_index:
+            node_index[node_id] = node
+    return node_index
+
+
+def find_payload_node(node_index, node_id):
+    return node_index.get(safe_str(node_id))
+
+
+def default_edge_points(from_node, to_node):
+    x1 = float(from_node.get("x") or 0)
+    y1 = float(from_node.get("y") or 0)
+    x2 = float(to_node.get("x") or 0)
+    y2 = float(to_node.get("y") or 0)
+    mid_x = (x1 + x2) / 2.0
+    return [{"x": x1, "y": y1}, {"x": mid_x, "y": y1}, {"x": mid_x, "y": y2}, {"x": x2, "y": y2}]
+
+
+#____________________________________________________________________ SHAPES
+def get_flow_arrow_points(points):
+    if not points or len(points) < 2:
+        return None
+
+    normalized = []
+    for point in points:
+        try:
+            normalized.append({"x": float(point.get("x", 0)), "y": float(point.get("y", 0))})
+        except:
+            pass
+    if len(normalized) < 2:
+        return None
+
+    lengths = []
+    total_length = 0.0
+    for index in range(len(normalized) - 1):
+        point_a = normalized[index]
+        point_b = normalized[index + 1]
+        dx = point_b["x"] - point_a["x"]
+        dy = point_b["y"] - point_a["y"]
+        length = math.sqrt(dx * dx + dy * dy)
+        lengths.append(length)
+        total_length += length
+
+    if total_length < 1.0:
+        return None
+
+    target = total_length / 2.0
+    distance_so_far = 0.0
+    for index, length in enumerate(lengths):
+        if length <= 0.0:
+            continue
+        if distance_so_far + length >= target:
+            point_a = normalized[index]
+            point_b = normalized[index + 1]
+            ratio = (target - distance_so_far) / length
+            tip_x = point_a["x"] + (point_b["x"] - point_a["x"]) * ratio
+            tip_y = point_a["y"] + (point_b["y"] - point_a["y"]) * ratio
+            dir_x = (point_b["x"] - point_a["x"]) / length
+            dir_y = (point_b["y"] - point_a["y"]) / length
+            base_x = tip_x - dir_x * 12.0
+            base_y = tip_y - dir_y * 12.0
+            perp_x = -dir_y
+            perp_y = dir_x
+            return [
+                {"x": base_x + perp_x * 5.0, "y": base_y + perp_y * 5.0},
+                {"x": tip_x, "y": tip_y},
+                {"x": base_x - perp_x * 5.0, "y": base_y - perp_y * 5.0},
+            ]
+        distance_so_far += length
+    return None
+
+
+def polygon_points(cx, cy, radius, sides):
+    points = []
+    for index in range(sides):
+        angle = (math.pi * 2.0 * index / float(sides)) - (math.pi / 2.0)
+        points.append({"x": cx + math.cos(angle) * radius, "y": cy + math.sin(angle) * radius})
+    points.append(points[0])
+    return points
+
+
+def box_points(cx, cy, width, height):
+    left = cx - width / 2.0
+    right = cx + width / 2.0
+    top = cy - height / 2.0
+    bottom = cy + height / 2.0
+    return [
+        {"x": left, "y": top},
+        {"x": right, "y": top},
+        {"x": right, "y": bottom},
+        {"x": left, "y": bottom},
+        {"x": left, "y": top},
+    ]
+
+
+def symbol_polylines(kind, cx, cy):
+    kind = safe_str(kind) or "junction"
+    if kind == "valve":
+        return [
+            [{"x": cx - 18, "y": cy - 10}, {"x": cx, "y": cy}, {"x": cx - 18, "y": cy + 10}, {"x": cx - 18, "y": cy - 10}],
+            [{"x": cx + 18, "y": cy - 10}, {"x": cx, "y": cy}, {"x": cx + 18, "y": cy + 10}, {"x": cx + 18, "y": cy - 10}],
+            [{"x": cx, "y": cy - 16}, {"x": cx, "y": cy - 26}, {"x": cx + 12, "y": cy - 26}],
+        ]
+    if kind == SIZE_CHANGE_KIND:
+        return [
+            [{"x": cx - 18, "y": cy - 9}, {"x": cx + 18, "y": cy - 9}, {"x": cx + 8, "y": cy + 9}, {"x": cx - 8, "y": cy + 9}, {"x": cx - 18, "y": cy - 9}],
+            [{"x": cx - 20, "y": cy + 14}, {"x": cx + 20, "y": cy - 14}],
+        ]
+    if kind == "accessory":
+        return [
+            box_points(cx, cy, 32, 20),
+            [{"x": cx - 12, "y": cy + 8}, {"x": cx + 12, "y": cy - 8}],
+        ]
+    if kind == "pump":
+        return [
+            polygon_points(cx, cy, 18, 12),
+            [{"x": cx - 7, "y": cy - 10}, {"x": cx + 12, "y": cy}, {"x": cx - 7, "y": cy + 10}, {"x": cx - 7, "y": cy - 10}],
+        ]
+    if kind == "strainer":
+        return [
+            [{"x": cx, "y": cy - 18}, {"x": cx + 18, "y": cy}, {"x": cx, "y": cy + 18}, {"x": cx - 18, "y": cy}, {"x": cx, "y": cy - 18}],
+            [{"x": cx - 9, "y": cy + 9}, {"x": cx + 9, "y": cy - 9}],
+            [{"x": cx - 3, "y": cy + 15}, {"x": cx + 15, "y": cy - 3}],
+        ]
+    if kind == "meter":
+        return [
+            box_points(cx, cy, 32, 20),
+            [{"x": cx - 10, "y": cy}, {"x": cx - 2, "y": cy - 7}, {"x": cx + 2, "y": cy + 7}, {"x": cx + 10, "y": cy}],
+        ]
+    if kind == "equipment":
+        return [box_points(cx, cy, 42, 26)]
+    if kind == "pipe":
+        return [[{"x": cx - 10, "y": cy}, {"x": cx + 10, "y": cy}]]
+    if kind == "branch":
+        return [
+            [{"x": cx - 7, "y": cy - 7}, {"x": cx + 7, "y": cy + 7}],
+            [{"x": cx - 7, "y": cy + 7}, {"x": cx + 7, "y": cy - 7}],
+        ]
+    return [polygon_points(cx, cy, 8, 8)]
+
+
+#____________________________________________________________________ PRIMITIVES
+class PrimitiveSet(object):
+    """Ordered {key: primitive}; repeated keys get a #n suffix so nothing is lost."""
+
+    def __init__(self):
+        self.items = OrderedDict()
+
+    def _unique(self, key):
+        if key not in self.items:
+            return key
+        suffix = 2
+        while "{0}#{1}".format(key, suffix) in self.items:
+            suffix += 1
+        return "{0}#{1}".format(key, suffix)
+
+    def add_polyline(self, prefix, points):
+        """One line primitive per drawable segment: prefix/0, prefix/1 ..."""
+        if not points or len(points) < 2:
+            return
+        for index in range(len(points) - 1):
+            try:
+                x1 = float(points[index].get("x", 0))
+                y1 = float(points[index].get("y", 0))
+                x2 = float(points[index + 1].get("x", 0))
+                y2 = float(points[index + 1].get("y", 0))
+            except:
+                x1 = y1 = x2 = y2 = 0.0
+            if math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2) <= MIN_SVG_LINE_LENGTH:
+                continue
+            key = self._unique("{0}/{1}".format(prefix, index))
+            self.items[key] = (
+                "line",
+                round(x1, COORDINATE_PRECISION), round(y1, COORDINATE_PRECISION),
+                round(x2, COORDINATE_PRECISION), round(y2, COORDINATE_PRECISION),
+            )
+
+    def add_text(self, key, text, x, y):
+        clean_text = normalize_for_label(text)
+        if not clean_text:
+            return
+        try:
+            x = float(x)
+            y = float(y)
+        except:
+            return
+        self.items[self._unique(key)] = (
+            "text", round(x, COORDINATE_PRECISION), round(y, COORDINATE_PRECISION), clean_text)
+
+
+def build_drawing_primitives(payload):
+    """Every detail line and text note the drafting view should contain, keyed."""
+    primitives = PrimitiveSet()
+    canvas = payload.get("canvas") or {}
+    width = float(canvas.get("width") or 900)
+    height = float(canvas.get("height") or 600)
+
+    primitives.add_polyline("frame", [
+        {"x": 20, "y": 20},
+        {"x": width - 20, "y": 20},
+        {"x": width - 20, "y": height - 20},
+        {"x": 20, "y": height - 20},
+        {"x": 20, "y": 20},
+    ])
+
+    node_index = build_payload_node_index(payload)
+    for edge_number, edge in enumerate(payload.get("edges") or []):
+        edge_id = safe_str(edge.get("id")) or "#{0}".format(edge_number)
+        points = edge.get("points") or []
+        if not points:
+            from_node = find_payload_node(node_index, edge.get("from"))
+            to_node = find_payload_node(node_index, edge.get("to"))
+            if from_node and to_node:
+                points = default_edge_points(from_node, to_node)
+        primitives.add_polyline("edge/{0}".format(edge_id), points)
+        primitives.add_polyline("arrow/{0}".format(edge_id), get_flow_arrow_points(points))
+
+        label = normalize_for_label(edge.get("label"))
+        if label and points:
+            try:
+                point = points[int(len(points) / 2)]
+                primitives.add_text("edge-label/{0}".format(edge_id), label,
+                                    float(point.get("x", 0)) + 8, float(point.get("y", 0)) - 10)
+            except:
+                pass
+
+    for node_number, node in enumerate(payload.get("nodes") or []):
+        node_id = safe_str(node.get("id")) or "#{0}".format(node_number)
+        try:
+            cx = float(node.get("x") or 0)
+            cy = float(node.get("y") or 0)
+        except:
+            continue
+        for part, points in enumerate(symbol_polylines(node.get("kind"), cx, cy)):
+            primitives.add_polyline("node/{0}/{1}".format(node_id, part), points)
+        primitives.add_text("node-label/{0}".format(node_id), node.get("label"), cx - 24, cy - 28)
+        if node.get("kind") == "pipe":
+            primitives.add_text("node-diameter/{0}".format(node_id), node.get("diameter"), cx - 24, cy + 20)
+
+    for symbol_number, symbol in enumerate(payload.get("symbols") or []):
+        symbol_id = safe_str(symbol.get("id")) or "#{0}".format(symbol_number)
+        try:
+            cx = float(symbol.get("x") or 0)
+            cy = float(symbol.get("y") or 0)
+        except:
+            continue
+        for part, points in enumerate(symbol_polylines(symbol.get("kind"), cx, cy)):
+            primitives.add_polyline("symbol/{0}/{1}".format(symbol_id, part), points)
+        primitives.add_text("symbol-label/{0}".format(symbol_id), symbol.get("label"), cx - 24, cy - 28)
+
+    for label_number, label in enumerate(payload.get("labels") or []):
+        label_id = safe_str(label.get("id")) or "#{0}".format(label_number)
+        primitives.add_text("label/{0}".format(label_id), label.get("text"), label.get("x") or 0, label.get("y") or 0)
+
+    return primitives.items
+
+
+#____________________________________________________________________ PLANNER
+def plan_redraw(previous, primitives):
+    """Diff the stored drawing against new primitives.
+
+    previous:   {key: {"id": element id, "shape": [kind, ...]}} from the last save
+    primitives: {key: (kind, ...)} from build_drawing_primitives()
+
+    Returns {"keep": [(key, id, shape)], "update": [(key, id, shape)],
+             "delete": [(key, id)], "create": [(key, shape)]}, each in
+    primitive order (deletes in stored order).
+    """
+    plan = {"keep": [], "update": [], "delete": [], "create": []}
+    previous = previous or {}
+
+    for key, shape in primitives.items():
+        stored = previous.get(key)
+        if not stored or stored.get("id") is None:
+            plan["create"].append((key, shape))
+            continue
+        stored_shape = tuple(stored.get("shape") or ())
+        if stored_shape == tuple(shape):
+            plan["keep"].append((key, stored["id"], shape))
+        elif stored_shape[:1] == tuple(shape)[:1]:
+            plan["update"].append((key, stored["id"], shape))
+        else:
+            plan["delete"].append((key, stored["id"]))
+            plan["create"].append((key, shape))
+
+    for key, stored in previous.items():
+        if key not in primitives and stored and stored.get("id") is not None:
+            plan["delete"].append((key, stored["id"]))
+
+    return plan
+
+
+def summarize_plan(plan):
+    return dict((name, len(plan.get(name) or [])) for name in ("keep", "update", "delete", "create"))
+
+
+#____________________________________________________________________ SELF-CHECK (SYNTHETIC PAYLOADS)
+def _synthetic_payload(node_count=200):
+    nodes = []
+    edges = []
+    for index in range(node_count):
+        nodes.append({"id": str(index), "kind": ["branch", "valve", "pump", "pipe"][index % 4],
+                      "label": "N{0}".format(index), "diameter": '2"', "x": 70 + (index % 10) * 120, "y": 88 + (index // 10) * 56})
+        if index:
+            edges.append({"id": "{0}:{1}".format(index - 1, index), "from": str(index - 1), "to": str(index),
+                          "label": "10 GPM", "points": []})
+    return {"canvas": {"width": 1400, "height": 1400}, "nodes": nodes, "edges": edges,
+            "symbols": [], "labels": [{"id": "title", "text": "System", "x": 90, "y": 46}]}
+
+
+def _fake_apply(plan, next_id):
+    """Stand-in for the Revit executor: returns the stored map the real one would."""
+    stored = {}
+    for key, element_id, shape in plan["keep"] + plan["update"]:
+        stored[key] = {"id": element_id, "shape": list(shape)}
+    for key, shape in plan["create"]:
+        next_id[0] += 1
+        stored[key] = {"id": next_id[0], "shape": list(shape)}
+    return stored
+
+
+if __name__ == "__main__":
+    next_id = [1000]
+    payload = _synthetic_payload()
+    first = plan_redraw({}, build_drawing_primitives(payload))
+    stored = _fake_apply(first, next_id)
+    print("first save      : {0}".format(summarize_plan(first)))
+
+    unchanged = plan_redraw(stored, build_drawing_primitives(payload))
+    print("unchanged save  : {0}".format(summarize_plan(unchanged)))
+
+    payload["nodes"][5]["x"] += 24
+    payload["nodes"][7]["label"] = "Renamed"
+    payload["nodes"][9]["kind"] = "equipment"
+    del payload["edges"][-1]
+    payload["nodes"].pop()
+    edited = plan_redraw(stored, build_drawing_primitives(payload))
+    print("small edit      : {0}".format(summarize_plan(edited)))
+    stored = _fake_apply(edited, next_id)
+    settled = plan_redraw(stored, build_drawing_primitives(payload))
+    print("after edit      : {0}".format(summarize_plan(settled)))
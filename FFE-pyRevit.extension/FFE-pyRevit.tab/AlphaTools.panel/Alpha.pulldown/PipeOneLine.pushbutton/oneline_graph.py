@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+"""
+Graph compaction for the Pipe One-Line editor.
+
+Purpose:
+-> Turn the raw connector graph of a piping system (every pipe, elbow,
+   reducer, tee, valve ...) into the compact one-line graph: only the
+   significant nodes stay, and each run of hidden elements between two of
+   them becomes a single edge with aggregated diameter / flow / element ids.
+
+Key behaviors:
+-> compact_system_graph() walks out of every visible node once per
+   neighbor. Paths are parent-pointer entries (key, edge, parent), so a
+   step is O(1) instead of copying the whole path list; the path is only
+   unwound when a visible node is reached and an edge is emitted.
+-> A walk through plain degree-2 chains is remembered from its far end, so
+   the same chain is never walked a second time from the other side.
+   Networks made of chains compact in O(V + E).
+-> Size changes inside a run still split the edge at a "sizeChange" node.
+-> compact_system_graph_reference() is the original path-copying BFS, kept
+   so the benchmark can check both produce identical nodes and edges.
+
+Design decisions:
+-> Pure Python (no Revit imports): python oneline_graph.py benchmarks
+   synthetic networks of 10k - 100k raw nodes.
+"""
+
+#____________________________________________________________________ IMPORTS (SYSTEM)
+import random
+import re
+import time
+from collections import deque
+
+
+#____________________________________________________________________ CONSTANTS
+VISIBLE_NODE_KINDS = ["branch", "equipment", "accessory", "valve", "pump", "strainer", "meter"]
+SIZE_CHANGE_KIND = "sizeChange"
+
+
+#____________________________________________________________________ BASIC HELPERS
+def safe_str(value):
+    if value is None:
+        return ""
+    try:
+        return unicode(value)  # noqa: F821 - IronPython
+    except:
+        try:
+            return str(value)
+        except:
+            return ""
+
+
+def normalize_for_label(value):
+    text = safe_str(value).strip()
+    text = re.sub(r"\s+", " ", text)
+    return text
+
+
+def should_show_node(node_data):
+    return safe_str(node_data.get("kind")) in VISIBLE_NODE_KINDS
+
+
+def pair_key(key_a, key_b):
+    parts = sorted([key_a, key_b])
+    return "{0}:{1}".format(parts[0], parts[1])
+
+
+#____________________________________________________________________ COMPACTION
+def _visible_nodes(raw_nodes, fallback_key, warnings):
+    visible_keys = [key for key, node in raw_nodes.items() if should_show_node(node)]
+    if visible_keys:
+        return visible_keys, None
+    if fallback_key not in raw_nodes:
+        fallback_key = sorted(raw_nodes.keys())[0]
+    warnings.append("No tees, equipment, or pipe accessories were found; showing the selected element only.")
+    return None, {fallback_key: raw_nodes[fallback_key]}
+
+
+def _unwind_path(entry):
+    """Parent-pointer entry -> (path_keys, path_edges) from the start node."""
+    path_keys = []
+    path_edges = []
+    while entry is not None:
+        path_keys.append(entry[0])
+        if entry[1] is not None:
+            path_edges.append(entry[1])
+        entry = entry[2]
+    path_keys.reverse()
+    path_edges.reverse()
+    return path_keys, path_edges
+
+
+def compact_system_graph(raw_nodes, raw_adjacency, fallback_key=""):
+    """Return (nodes, edges, warnings) for the compact one-line graph."""
+    warnings = []
+    if not raw_nodes:
+        return {}, {}, warnings
+
+    visible_keys, fallback_nodes = _visible_nodes(raw_nodes, fallback_key, warnings)
+    if fallback_nodes is not None:
+        return fallback_nodes, {}, warnings
+
+    visible_set = set(visible_keys)
+    nodes = dict((key, raw_nodes[key]) for key in visible_keys)
+    edges = {}
+    processed_visible_pairs = set()
+    # (visible key, first step) walks already covered by a chain walked from the other end.
+    walked_chains = set()
+
+    for start_key in visible_keys:
+        for neighbor_key, raw_edge in raw_adjacency.get(start_key, {}).items():
+            if (start_key, neighbor_key) in walked_chains:
+                continue
+
+            queue = deque()
+            queue.append((neighbor_key, raw_edge, (start_key, None, None)))
+            visited_hidden = set([start_key])
+            is_chain = True
+
+            while queue:
+                entry = queue.popleft()
+                current_key = entry[0]
+                if current_key in visible_set:
+                    if current_key != start_key:
+                        visible_pair = tuple(sorted([start_key, current_key]))
+                        if visible_pair not in processed_visible_pairs:
+                            processed_visible_pairs.add(visible_pair)
+                            path_keys, path_edges = _unwind_path(entry)
+                            add_compact_edges(edges, nodes, start_key, current_key, path_keys, path_edges, raw_nodes)
+                        if is_chain:
+                            walked_chains.add((current_key, entry[2][0]))
+                    continue
+
+                if current_key in visited_hidden:
+                    continue
+                visited_hidden.add(current_key)
+
+                neighbors = raw_adjacency.get(current_key, {})
+                if len(neighbors) != 2:
+                    is_chain = False
+                for next_key, next_edge in neighbors.items():
+                    # Every node on the current path is the start or an already
+                    # visited hidden node, so this matches "next_key in path_keys".
+                    if next_key == start_key:
+                        continue
+                    if next_key not in visible_set and next_key in visited_hidden:
+                        continue
+                    queue.append((next_key, next_edge, entry))
+
+    if len(nodes) == 1:
+        warnings.append("Only one tee, equipment item, or pipe accessory was found in this piping system.")
+    return nodes, edges, warnings
+
+
+def compact_system_graph_reference(raw_nodes, raw_adjacency, fallback_key=""):
+    """Original BFS that copies path lists at every step (quadratic on long runs)."""
+    warnings = []
+    if not raw_nodes:
+        return {}, {}, warnings
+
+    visible_keys, fallback_nodes = _visible_nodes(raw_nodes, fallback_key, warnings)
+    if fallback_nodes is not None:
+        return fallback_nodes, {}, warnings
+
+    visible_set = set(visible_keys)
+    nodes = dict((key, raw_nodes[key]) for key in visible_keys)
+    edges = {}
+    processed_visible_pairs = set()
+
+    for start_key in visible_keys:
+        for neighbor_key, raw_edge in raw_adjacency.get(start_key, {}).items():
+            queue = deque()
+            queue.append((neighbor_key, [start_key, neighbor_key], [raw_edge]))
+            visited_hidden = set([start_key])
+
+            while queue:
+                current_key, path_keys, path_edges = queue.popleft()
+                if current_key in visible_set:
+                    if current_key != start_key:
+                        visible_pair = tuple(sorted([start_key, current_key]))
+                        if visible_pair not in processed_visible_pairs:
+                            processed_visible_pairs.add(visible_pair)
+                            add_compact_edges(edges, nodes, start_key, current_key, path_keys, path_edges, raw_nodes)
+                    continue
+
+                if current_key in visited_hidden:
+                    continue
+                visited_hidden.add(current_key)
+
+                for next_key, next_edge in raw_adjacency.get(current_key, {}).items():
+                    if next_key in path_keys:
+                        continue
+                    queue.append((next_key, path_keys + [next_key], path_edges + [next_edge]))
+
+    if len(nodes) == 1:
+        warnings.append("Only one tee, equipment item, or pipe accessory was found in this piping system.")
+    return nodes, edges, warnings
+
+
+#____________________________________________________________________ COMPACT EDGES
+def add_compact_edges(edges, nodes, from_key, to_key, path_keys, path_edges, raw_nodes):
+    stops = [{"id": from_key, "rawIndex": 0}]
+    for stop in find_size_change_stops(path_keys, raw_nodes):
+        if stop["id"] not in nodes:
+            nodes[stop["id"]] = stop["node"]
+        stops.append({"id": stop["id"], "rawIndex": stop["rawIndex"]})
+    stops.append({"id": to_key, "rawIndex": len(path_keys) - 1})
+
+    for index in range(len(stops) - 1):
+        start = stops[index]
+        end = stops[index + 1]
+        segment_start = start["rawIndex"]
+        segment_end = end["rawIndex"]
+        segment_keys = path_keys[segment_start:segment_end + 1]
+        segment_edges = path_edges[segment_start:segment_end]
+        add_compact_edge(edges, start["id"], end["id"], segment_keys, segment_edges, raw_nodes)
+
+
+def find_size_change_stops(path_keys, raw_nodes):
+    stops = []
+    last_diameter = ""
+    last_index = len(path_keys) - 1
+    for index, key in enumerate(path_keys):
+        node = raw_nodes.get(key) or {}
+        diameter = normalize_for_label(node.get("diameter"))
+        if not diameter:
+            continue
+        if last_diameter and diameter != last_diameter and index != 0 and index != last_index:
+            stop_id = "sizechange-{0}".format(key)
+            stops.append({
+                "id": stop_id,
+                "rawIndex": index,
+                "node": build_size_change_node(stop_id, key, node, last_diameter, diameter),
+            })
+        last_diameter = diameter
+    return stops
+
+
+def build_size_change_node(stop_id, raw_key, raw_node, from_diameter, to_diameter):
+    label = "{0} to {1}".format(from_diameter, to_diameter)
+    return {
+        "id": stop_id,
+        "kind": SIZE_CHANGE_KIND,
+        "elementId": raw_node.get("elementId"),
+        "uniqueId": raw_node.get("uniqueId"),
+        "sourceElementId": raw_node.get("elementId"),
+        "sourceNodeId": raw_key,
+        "label": label,
+        "diameter": to_diameter,
+        "fromDiameter": from_diameter,
+        "toDiameter": to_diameter,
+        "flow": raw_node.get("flow") or "",
+        "x": 0,
+        "y": 0,
+    }
+
+
+def add_compact_edge(edges, from_key, to_key, path_keys, path_edges, raw_nodes):
+    edge_key = pair_key(from_key, to_key)
+    if edge_key in edges:
+        return
+    edge = build_compact_edge_data(edge_key, from_key, to_key, path_keys, path_edges, raw_nodes)
+    edges[edge_key] = edge
+
+
+def first_compact_value(path_keys, path_edges, raw_nodes, field_name):
+    for edge in path_edges:
+        value = normalize_for_label(edge.get(field_name))
+        if value:
+            return value
+    for key in path_keys:
+        value = normalize_for_label((raw_nodes.get(key) or {}).get(field_name))
+        if value:
+            return value
+    return ""
+
+
+def build_compact_edge_data(edge_id, from_key, to_key, path_keys, path_edges, raw_nodes):
+    diameter = first_compact_value(path_keys, path_edges, raw_nodes, "diameter")
+    flow = first_compact_value(path_keys, path_edges, raw_nodes, "flow")
+    label_parts = []
+    if flow:
+        label_parts.append(flow)
+    if diameter:
+        label_parts.append(diameter)
+
+    element_ids = []
+    seen_ids = set()
+    for key in path_keys:
+        element_id = (raw_nodes.get(key) or {}).get("elementId")
+        if element_id is not None and element_id not in seen_ids:
+            seen_ids.add(element_id)
+            element_ids.append(element_id)
+
+    return {
+        "id": edge_id,
+        "from": from_key,
+        "to": to_key,
+        "elementIds": element_ids,
+        "label": " | ".join(label_parts),
+        "diameter": diameter,
+        "flow": flow,
+        "points": [],
+        "collapsedElementCount": max(0, len(path_keys) - 2),
+    }
+
+
+#____________________________________________________________________ BENCHMARK (SYNTHETIC NETWORKS)
+def generate_synthetic_network(node_count, run_length=60, tap_ratio=0.02, loop_ratio=0.03, seed=3):
+    """Raw nodes + adjacency shaped like a piping system.
+
+    Tees / equipment / valves are joined by runs of pipes, elbows and reducers
+    (hidden). A few runs get a pipe tap (hidden branch) or close a loop back
+    into an earlier tee, so both the chain and the general search are exercised.
+    """
+    rng = random.Random(seed)
+    sizes = ['1"', '1 1/4"', '1 1/2"', '2"', '2 1/2"', '3"', '4"']
+    raw_nodes = {}
+    raw_adjacency = {}
+    counter = [0]
+
+    def add_node(kind, diameter):
+        counter[0] += 1
+        key = str(counter[0])
+        raw_nodes[key] = {
+            "id": key,
+            "kind": kind,
+            "elementId": counter[0],
+            "uniqueId": "uid-{0}".format(counter[0]),
+            "label": "{0} {1}".format(kind, key),
+            "diameter": diameter,
+            "flow": "{0} GPM".format(rng.randint(1, 400)),
+            "x": 0,
+            "y": 0,
+        }
+        raw_adjacency[key] = {}
+        return key
+
+    def connect(key_a, key_b):
+        edge_id = pair_key(key_a, key_b)
+        raw_edge = {
+            "id": edge_id,
+            "from": key_a,
+            "to": key_b,
+            "elementIds": [raw_nodes[key_a]["elementId"], raw_nodes[key_b]["elementId"]],
+            "label": "",
+            "diameter": raw_nodes[key_a]["diameter"],
+            "flow": raw_nodes[key_a]["flow"],
+            "points": [],
+        }
+        raw_adjacency[key_a][key_b] = raw_edge
+        raw_adjacency[key_b][key_a] = raw_edge
+
+    significant = [add_node("equipment", sizes[-1])]
+    while counter[0] < node_count:
+        parent = rng.choice(significant)
+        diameter = raw_nodes[parent]["diameter"]
+        previous = parent
+        for _ in range(rng.randint(max(1, run_length // 2), run_length * 3 // 2)):
+            if rng.random() < 0.04:
+                diameter = rng.choice(sizes)
+            kind = rng.choice(["pipe", "pipe", "pipe", "fitting"])
+            current = add_node(kind, diameter)
+            connect(previous, current)
+            if kind == "pipe" and rng.random() < tap_ratio:
+                tap = add_node("pipe", diameter)
+                connect(current, tap)
+                connect(tap, add_node("accessory", diameter))
+            previous = current
+        if rng.random() < loop_ratio and len(significant) > 2:
+            connect(previous, rng.choice(significant))
+        else:
+            end = add_node(rng.choice(["branch", "branch", "valve", "equipment"]), diameter)
+            connect(previous, end)
+            significant.append(end)
+
+    return raw_nodes, raw_adjacency
+
+
+def run_benchmark(cases=((10000, 60), (30000, 60), (100000, 60), (30000, 400))):
+    """(raw node count, mean run length) cases; long runs are where path copying hurts."""
+    rows = []
+    for node_count, run_length in cases:
+        raw_nodes, raw_adjacency = generate_synthetic_network(node_count, run_length)
+
+        started = time.time()
+        reference = compact_system_graph_reference(raw_nodes, raw_adjacency)
+        reference_seconds = time.time() - started
+
+        started = time.time()
+        compacted = compact_system_graph(raw_nodes, raw_adjacency)
+        compact_seconds = time.time() - started
+
+        identical = (
+            reference[0] == compacted[0] and reference[1] == compacted[1] and
+            list(reference[0].keys()) == list(compacted[0].keys()) and
+            list(reference[1].keys()) == list(compacted[1].keys()) and
+            reference[2] == compacted[2]
+        )
+        rows.append({
+            "rawNodes": len(raw_nodes),
+            "runLength": run_length,
+            "nodes": len(compacted[0]),
+            "edges": len(compacted[1]),
+            "referenceSeconds": reference_seconds,
+            "compactSeconds": compact_seconds,
+            "identical": identical,
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    for result in run_benchmark():
+        print("{rawNodes:>7} raw nodes (runs ~{runLength:>3}) -> {nodes:>5} nodes / {edges:>5} edges | "
+              "path-copy BFS {referenceSeconds:.3f}s | parent pointers {compactSeconds:.3f}s | "
+              "identical {identical}".format(**result))
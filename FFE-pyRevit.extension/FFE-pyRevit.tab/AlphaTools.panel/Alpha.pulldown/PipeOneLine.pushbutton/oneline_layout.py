@@ -0,0 +1,403 @@
+# -*- coding: utf-8 -*-
+"""
+Schematic layout for the Pipe One-Line editor.
+
+Purpose:
+-> Place the compact one-line graph as a left-to-right tree: columns are
+   the BFS depth from the root (base equipment), rows come from the tree.
+
+Key behaviors:
+-> The BFS spanning tree is built once; children are ordered by label.
+-> measure() is one post-order pass: a node's extent is the number of rows
+   its subtree needs (sum of its children's extents, at least 1).
+-> place() is one pre-order pass: each child gets the next band of rows
+   inside its parent's band, so a parent lines up with its first child and
+   every subtree stays contiguous.
+-> relayout(key) re-measures only the changed subtree, walks up until an
+   ancestor's extent is unchanged, and re-places just that band. Only the
+   moved nodes' edges are re-routed.
+-> No .index() lookups anywhere: layout is O(n) after the per-node child
+   sort.
+
+Design decisions:
+-> Pure Python and iterative (no recursion), so deep systems are fine under
+   IronPython: python oneline_layout.py benchmarks synthetic systems.
+-> apply_schematic_layout_reference() is the previous level-by-level
+   layout, kept for the benchmark.
+"""
+
+#____________________________________________________________________ IMPORTS (SYSTEM)
+import random
+import time
+from collections import deque
+
+
+#____________________________________________________________________ CONSTANTS
+COLUMN_X = 70
+COLUMN_STEP = 120
+ROW_Y = 88
+ROW_STEP = 56
+
+
+def _text(value):
+    if value is None:
+        return ""
+    return "{0}".format(value)
+
+
+#____________________________________________________________________ LAYOUT
+class SchematicLayout(object):
+    """Tree layout over payload-style nodes {key: node} and edges {key: edge}."""
+
+    def __init__(self, nodes, edges, root_key):
+        self.nodes = nodes
+        self.edges = edges
+        self.root_key = root_key if root_key in nodes else (sorted(nodes.keys())[0] if nodes else None)
+
+        self.adjacency = dict((key, []) for key in nodes)
+        self.incident_edges = dict((key, []) for key in nodes)
+        for edge_key, edge in edges.items():
+            from_key = _text(edge.get("from"))
+            to_key = _text(edge.get("to"))
+            if from_key in self.adjacency and to_key in self.adjacency:
+                self.adjacency[from_key].append(to_key)
+                self.adjacency[to_key].append(from_key)
+                self.incident_edges[from_key].append(edge_key)
+                self.incident_edges[to_key].append(edge_key)
+
+        self.roots = []
+        self.parent = {}
+        self.children = {}
+        self.depth = {}
+        self.extent = {}
+        self.row = {}
+
+    # ---------------------------------------------------------------- tree
+    def _sorted_neighbors(self, key):
+        nodes = self.nodes
+        return sorted(self.adjacency.get(key, []), key=lambda item: nodes[item].get("label", item))
+
+    def build_tree(self):
+        """BFS spanning forest: the root first, then any unreached node in key order."""
+        self.roots = []
+        self.parent = {}
+        self.children = dict((key, []) for key in self.nodes)
+        self.depth = {}
+
+        starts = [self.root_key] if self.root_key is not None else []
+        starts.extend(sorted(self.nodes.keys()))
+        for start in starts:
+            if start in self.depth:
+                continue
+            self.roots.append(start)
+            self.parent[start] = None
+            self.depth[start] = 0
+            queue = deque([start])
+            while queue:
+                current = queue.popleft()
+                for neighbor in self._sorted_neighbors(current):
+                    if neighbor in self.depth:
+                        continue
+                    self.depth[neighbor] = self.depth[current] + 1
+                    self.parent[neighbor] = current
+                    self.children[current].append(neighbor)
+                    queue.append(neighbor)
+        return self
+
+    # ---------------------------------------------------------------- passes
+    def _subtree_post_order(self, key):
+        order = []
+        stack = [key]
+        while stack:
+            current = stack.pop()
+            order.append(current)
+            stack.extend(self.children.get(current, []))
+        order.reverse()
+        return order
+
+    def measure(self, key):
+        """Post-order: rows needed by every node in the subtree under key."""
+        extent = self.extent
+        children = self.children
+        for current in self._subtree_post_order(key):
+            total = 0
+            for child in children.get(current, []):
+                total += extent[child]
+            extent[current] = total or 1
+        return extent[key]
+
+    def place(self, key, first_row):
+        """Pre-order: assign rows and coordinates under key. Returns the placed keys."""
+        placed = []
+        stack = [(key, first_row)]
+        while stack:
+            current, row = stack.pop()
+            self.row[current] = row
+            node = self.nodes[current]
+            node["x"] = COLUMN_X + self.depth[current] * COLUMN_STEP
+            node["y"] = ROW_Y + row * ROW_STEP
+            placed.append(current)
+
+            child_row = row
+            bands = []
+            for child in self.children.get(current, []):
+                bands.append((child, child_row))
+                child_row += self.extent[child]
+            # Reverse so the first child is popped (and placed) first.
+            stack.extend(reversed(bands))
+        return placed
+
+    def _place_roots_from(self, root_index):
+        if root_index > 0:
+            previous = self.roots[root_index - 1]
+            next_row = self.row[previous] + self.extent[previous]
+        else:
+            next_row = 0
+        placed = []
+        for root in self.roots[root_index:]:
+            placed.extend(self.place(root, next_row))
+            next_row += self.extent[root]
+        return placed
+
+    # ---------------------------------------------------------------- edges
+    def route_edge(self, edge):
+        from_key = _text(edge.get("from"))
+        to_key = _text(edge.get("to"))
+        if self.depth.get(to_key, 0) < self.depth.get(from_key, 0):
+            edge["from"], edge["to"] = edge.get("to"), edge.get("from")
+        edge["flowDirection"] = "fromTo"
+
+        from_node = self.nodes.get(_text(edge.get("from")))
+        to_node = self.nodes.get(_text(edge.get("to")))
+        if not from_node or not to_node:
+            return
+        x1 = float(from_node.get("x") or 0)
+        y1 = float(from_node.get("y") or 0)
+        x2 = float(to_node.get("x") or 0)
+        y2 = float(to_node.get("y") or 0)
+        mid_x = (x1 + x2) / 2.0
+        edge["points"] = [
+            {"x": x1, "y": y1},
+            {"x": mid_x, "y": y1},
+            {"x": mid_x, "y": y2},
+            {"x": x2, "y": y2},
+        ]
+
+    def route_edges(self, moved_keys=None):
+        if moved_keys is None:
+            edge_keys = self.edges.keys()
+        else:
+            edge_keys = set()
+            for key in moved_keys:
+                edge_keys.update(self.incident_edges.get(key, []))
+        for edge_key in edge_keys:
+            self.route_edge(self.edges[edge_key])
+
+    # ---------------------------------------------------------------- entry points
+    def canvas_size(self):
+        max_x = 0
+        max_y = 0
+        for node in self.nodes.values():
+            max_x = max(max_x, node.get("x") or 0)
+            max_y = max(max_y, node.get("y") or 0)
+        return max(760, int(max_x + 140)), max(460, int(max_y + 110))
+
+    def layout(self):
+        """Full layout: tree, one post-order, one pre-order, every edge routed."""
+        if not self.nodes:
+            return 900, 600
+        self.build_tree()
+        for root in self.roots:
+            self.measure(root)
+        self._place_roots_from(0)
+        self.route_edges()
+        return self.canvas_size()
+
+    def set_children(self, key, child_keys):
+        """Replace the tree children of key (e.g. after an edit) and fix their depths."""
+        for child in self.children.get(key, []):
+            if self.parent.get(child) == key:
+                self.parent[child] = None
+        self.children[key] = list(child_keys)
+        for child in child_keys:
+            self.parent[child] = key
+        stack = [key]
+        while stack:
+            current = stack.pop()
+            for child in self.children.get(current, []):
+                self.depth[child] = self.depth[current] + 1
+                stack.append(child)
+
+    def relayout(self, key):
+        """Re-place the smallest band that contains the changed subtree under key.
+
+        Returns the keys whose coordinates were reassigned.
+        """
+        previous_extent = self.extent.get(key)
+        band_fixed = self.measure(key) == previous_extent
+        anchor = key
+        while not band_fixed and self.parent.get(anchor) is not None:
+            parent = self.parent[anchor]
+            total = 0
+            for child in self.children[parent]:
+                total += self.extent[child]
+            total = total or 1
+            # An unchanged parent band only needs its children shifted inside it.
+            band_fixed = total == self.extent[parent]
+            self.extent[parent] = total
+            anchor = parent
+
+        if band_fixed:
+            moved = self.place(anchor, self.row[anchor])
+        else:
+            moved = self._place_roots_from(self.roots.index(anchor))
+        self.route_edges(moved)
+        return moved
+
+
+def apply_schematic_layout(nodes, edges, root_key):
+    """Lay out nodes/edges in place and return the canvas (width, height)."""
+    return SchematicLayout(nodes, edges, root_key).layout()
+
+
+#____________________________________________________________________ REFERENCE (PREVIOUS LAYOUT)
+def apply_schematic_layout_reference(nodes, edges, root_key):
+    """Previous level-by-level layout; order.index() makes it O(n^2)."""
+    if not nodes:
+        return 900, 600
+
+    adjacency = {}
+    for key in nodes:
+        adjacency[key] = []
+    for edge in edges.values():
+        from_key = _text(edge.get("from"))
+        to_key = _text(edge.get("to"))
+        if from_key in adjacency and to_key in adjacency:
+            adjacency[from_key].append(to_key)
+            adjacency[to_key].append(from_key)
+
+    if root_key not in nodes:
+        root_key = sorted(nodes.keys())[0]
+
+    levels = {}
+    order = []
+    queue = deque([root_key])
+    levels[root_key] = 0
+
+    while queue:
+        current = queue.popleft()
+        order.append(current)
+        neighbors = sorted(adjacency.get(current, []), key=lambda item: nodes[item].get("label", item))
+        for neighbor in neighbors:
+            if neighbor in levels:
+                continue
+            levels[neighbor] = levels[current] + 1
+            queue.append(neighbor)
+
+    for key in sorted(nodes.keys()):
+        if key not in levels:
+            levels[key] = max(levels.values() or [0]) + 1
+            order.append(key)
+
+    level_groups = {}
+    for key, level in levels.items():
+        level_groups.setdefault(level, []).append(key)
+    for level in level_groups:
+        level_groups[level].sort(key=lambda item: order.index(item) if item in order else 9999)
+
+    row_index = {}
+    next_row = 0
+    for level in sorted(level_groups.keys()):
+        for key in level_groups[level]:
+            row_index[key] = next_row
+            next_row += 1
+
+    max_x = 0
+    max_y = 0
+    for key, node in nodes.items():
+        node["x"] = COLUMN_X + levels.get(key, 0) * COLUMN_STEP
+        node["y"] = ROW_Y + row_index.get(key, 0) * ROW_STEP
+        max_x = max(max_x, node["x"])
+        max_y = max(max_y, node["y"])
+    return max(760, int(max_x + 140)), max(460, int(max_y + 110))
+
+
+#____________________________________________________________________ BENCHMARK (SYNTHETIC SYSTEMS)
+def generate_synthetic_system(node_count, seed=9):
+    """Random tree of tees/equipment with a few loop-closing edges."""
+    rng = random.Random(seed)
+    nodes = {}
+    edges = {}
+    for index in range(node_count):
+        key = str(index)
+        nodes[key] = {"id": key, "label": "N{0:05d}".format(rng.randrange(100000)), "x": 0, "y": 0}
+        if index:
+            parent = str(rng.randrange(max(0, index - 40), index))
+            edges["{0}:{1}".format(parent, key)] = {"from": parent, "to": key, "points": []}
+    for _ in range(node_count // 50):
+        a = str(rng.randrange(node_count))
+        b = str(rng.randrange(node_count))
+        if a != b:
+            edges["{0}:{1}".format(a, b)] = {"from": a, "to": b, "points": []}
+    return nodes, edges
+
+
+def snapshot_positions(nodes):
+    return dict((key, (node["x"], node["y"])) for key, node in nodes.items())
+
+
+def run_benchmark(node_counts=(1000, 5000, 20000)):
+    rows = []
+    for node_count in node_counts:
+        nodes, edges = generate_synthetic_system(node_count)
+
+        started = time.time()
+        apply_schematic_layout_reference(nodes, edges, "0")
+        reference_seconds = time.time() - started
+
+        nodes, edges = generate_synthetic_system(node_count)
+        started = time.time()
+        layout = SchematicLayout(nodes, edges, "0")
+        layout.layout()
+        layout_seconds = time.time() - started
+
+        # Incremental: drop the first child of a mid-tree node and relayout it.
+        target = None
+        for key in sorted(nodes.keys(), key=int)[node_count // 2:]:
+            if layout.children.get(key):
+                target = key
+                break
+        removed = layout.children[target][0]
+        started = time.time()
+        layout.set_children(target, layout.children[target][1:] + [removed])
+        moved = layout.relayout(target)
+        relayout_seconds = time.time() - started
+        incremental = snapshot_positions(nodes)
+
+        # Same change applied to a fresh layout, placed in full.
+        full = SchematicLayout(nodes, edges, "0").build_tree()
+        full.children = layout.children
+        full.parent = layout.parent
+        full.depth = layout.depth
+        for root in full.roots:
+            full.measure(root)
+        full._place_roots_from(0)
+
+        positions = list(incremental.values())
+        rows.append({
+            "nodes": node_count,
+            "referenceSeconds": reference_seconds,
+            "layoutSeconds": layout_seconds,
+            "relayoutSeconds": relayout_seconds,
+            "moved": len(moved),
+            "unique": len(set(positions)) == len(positions),
+            "incrementalMatches": incremental == snapshot_positions(nodes),
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    for result in run_benchmark():
+        print("{nodes:>6} nodes | previous {referenceSeconds:.3f}s | tree layout {layoutSeconds:.3f}s | "
+              "relayout {relayoutSeconds:.4f}s ({moved} moved) | unique positions {unique} | "
+              "incremental == full {incrementalMatches}".format(**result))
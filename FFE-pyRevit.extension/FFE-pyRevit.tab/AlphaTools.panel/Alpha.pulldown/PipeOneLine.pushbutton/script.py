@@ -18,6 +18,12 @@ system.
 __________________________________________________________________
 Last update:
 - [06.05.2026] - v0.1 BETA
+- [10.18.2026] - Graph compaction moved to oneline_graph.py (parent-pointer walks, linear on long pipe runs)
+- [10.18.2026] - Tree layout in oneline_layout.py (subtree row bands, O(n), incremental relayout)
+- [10.18.2026] - Saved diagrams found through a registry instead of scanning DataStorage
+- [10.18.2026] - Saving redraws only changed detail lines / text notes (oneline_drawing.py planner)
+- [10.18.2026] - Diagrams stored compressed and chunked (oneline_codec.py), sections decoded on demand
+- [10.18.2026] - Drawn element map stored beside the diagram, never sent to the web editor
 __________________________________________________________________
 Author: Kyle Guggenheim"""
 
@@ -34,8 +40,8 @@ clr.AddReference("PresentationCore")
 clr.AddReference("PresentationFramework")
 clr.AddReference("WindowsBase")
 
-from System import Guid, String, Uri
-from System.Collections.Generic import List
+from System import Guid, Int64, String, Uri
+from System.Collections.Generic import Dictionary, IDictionary, IList, List
 from System.Windows import Thickness, Visibility, Window
 from System.Windows.Controls import Grid, TextBlock
 from System.Windows.Media import Brushes
@@ -43,6 +49,7 @@ from System.Windows.Media import Brushes
 from Autodesk.Revit.DB import (
     BuiltInCategory,
     BuiltInParameter,
+    CheckoutStatus,
     ConnectorType,
     CurveElement,
     ElementId,
@@ -50,6 +57,8 @@ from Autodesk.Revit.DB import (
     FamilyInstance,
     FilteredElementCollector,
     Line,
+    LogicalOrFilter,
+    ModelUpdatesStatus,
     TextNote,
     TextNoteType,
     Transaction,
@@ -57,15 +66,38 @@ from Autodesk.Revit.DB import (
     ViewFamily,
     ViewFamilyType,
     ViewType,
+    WorksharingUtils,
     XYZ,
 )
-from Autodesk.Revit.DB.ExtensibleStorage import AccessLevel, DataStorage, Entity, Schema, SchemaBuilder
+from Autodesk.Revit.DB.ExtensibleStorage import (
+    AccessLevel,
+    DataStorage,
+    Entity,
+    ExtensibleStorageFilter,
+    Schema,
+    SchemaBuilder,
+)
 from Autodesk.Revit.DB.Plumbing import PipingSystem
 from Autodesk.Revit.UI import ExternalEvent, IExternalEventHandler
 from Autodesk.Revit.UI.Selection import ISelectionFilter, ObjectType
 
 from pyrevit import forms, revit, script
 
+from oneline_graph import (
+    compact_system_graph,
+    normalize_for_label,
+    safe_str,
+)
+from oneline_layout import apply_schematic_layout
+from oneline_drawing import (
+    MIN_DETAIL_LINE_LENGTH,
+    SVG_TO_FEET,
+    build_drawing_primitives,
+    plan_redraw,
+    summarize_plan,
+)
+from oneline_codec import DRAWING_SECTION, PayloadReader, encode_payload
+
 
 # ____________________________________________________________________ CONSTANTS
 APP_NAME = "FFE Pipe One-Line Editor"
@@ -75,45 +107,45 @@ PATH_SCRIPT = os.path.dirname(__file__)
 PATH_SUPPORT = os.path.join(PATH_SCRIPT, "support")
 PATH_INDEX = os.path.join(PATH_SUPPORT, "index.html")
 
-SCHEMA_GUID = Guid("79f6634a-37bb-4c54-a843-2e7f92379e55")
-SCHEMA_NAME = "FFEPipeOneLineDiagram"
+SCHEMA_GUID = Guid("3d0b8f52-6a1e-4c7d-9e43-b5f18a2c7d61")
+SCHEMA_NAME = "FFEPipeOneLineDiagramV2"
 SCHEMA_FIELD_TOOL = "Tool"
 SCHEMA_FIELD_SYSTEM_UNIQUE_ID = "SystemUniqueId"
 SCHEMA_FIELD_SYSTEM_ID = "SystemId"
 SCHEMA_FIELD_DOCUMENT_TITLE = "DocumentTitle"
-SCHEMA_FIELD_PAYLOAD = "Payload"
+SCHEMA_FIELD_PAYLOAD_HEADER = "PayloadHeader"
+SCHEMA_FIELD_PAYLOAD_CHUNKS = "PayloadChunks"
+
+# v0.1 schema: whole payload as one JSON string. Read-only; replaced on the next save.
+LEGACY_SCHEMA_GUID = Guid("79f6634a-37bb-4c54-a843-2e7f92379e55")
+LEGACY_SCHEMA_FIELD_PAYLOAD = "Payload"
+
+# Registry entity on the tool's own DataStorage: system UniqueId -> diagram DataStorage ElementId.
+REGISTRY_SCHEMA_GUID = Guid("68c3f909-c10c-4a00-bfac-b32020998c27")
+REGISTRY_SCHEMA_NAME = "FFEPipeOneLineRegistry"
+REGISTRY_FIELD_DIAGRAMS = "Diagrams"
 
 SCHEMA_VERSION = 1
 GENERATION_MODE = "compact-significant-nodes"
 DRAWING_VIEW_PREFIX = "FFE Pipe One-Line"
-SVG_TO_FEET = 1.0 / 24.0
-MIN_DETAIL_LINE_LENGTH = 0.0005
-VISIBLE_NODE_KINDS = ["branch", "equipment", "accessory", "valve", "pump", "strainer", "meter"]
-SIZE_CHANGE_KIND = "sizeChange"
 
 try:
     WINDOW_REFS
 except NameError:
     WINDOW_REFS = []
 
+# Persistent engine: keeps (document, system UniqueId) -> DataStorage id between runs.
+try:
+    STORAGE_ID_CACHE
+except NameError:
+    STORAGE_ID_CACHE = {}
+
 uidoc = revit.uidoc
 doc = revit.doc
 LOGGER = script.get_logger()
 
 
 # ____________________________________________________________________ BASIC HELPERS
-def safe_str(value):
-    if value is None:
-        return ""
-    try:
-        return unicode(value)  # noqa: F821 - IronPython
-    except:
-        try:
-            return str(value)
-        except:
-            return ""
-
-
 def json_dumps(value):
     return json.dumps(value, ensure_ascii=True, separators=(",", ":"))
 
@@ -177,12 +209,6 @@ def get_category_name(element):
         return ""
 
 
-def normalize_for_label(value):
-    text = safe_str(value).strip()
-    text = re.sub(r"\s+", " ", text)
-    return text
-
-
 def number_to_label(value, precision):
     try:
         number = float(value)
@@ -492,10 +518,6 @@ def pick_piping_system_element(active_uidoc):
     return active_uidoc.Document.GetElement(picked_ref.ElementId)
 
 
-def should_show_node(node_data):
-    return safe_str(node_data.get("kind")) in VISIBLE_NODE_KINDS
-
-
 def collect_system_graph(seed_element, mep_system):
     raw_nodes = {}
     raw_adjacency = {}
@@ -561,164 +583,11 @@ def collect_system_graph(seed_element, mep_system):
         raw_nodes[element_key(seed_element)] = build_node_data(seed_element, mep_system)
         warnings.append("Only the selected element could be read from this piping system.")
 
-    nodes, edges, compact_warnings = compact_system_graph(raw_nodes, raw_adjacency, seed_element)
+    nodes, edges, compact_warnings = compact_system_graph(raw_nodes, raw_adjacency, element_key(seed_element))
     warnings.extend(compact_warnings)
     return nodes, edges, warnings
 
 
-def compact_system_graph(raw_nodes, raw_adjacency, seed_element):
-    warnings = []
-    if not raw_nodes:
-        return {}, {}, warnings
-
-    visible_keys = [key for key, node in raw_nodes.items() if should_show_node(node)]
-    if not visible_keys:
-        fallback_key = element_key(seed_element)
-        if fallback_key not in raw_nodes:
-            fallback_key = sorted(raw_nodes.keys())[0]
-        warnings.append("No tees, equipment, or pipe accessories were found; showing the selected element only.")
-        return {fallback_key: raw_nodes[fallback_key]}, {}, warnings
-
-    visible_set = set(visible_keys)
-    nodes = dict((key, raw_nodes[key]) for key in visible_keys)
-    edges = {}
-    processed_visible_pairs = set()
-
-    for start_key in visible_keys:
-        for neighbor_key, raw_edge in raw_adjacency.get(start_key, {}).items():
-            queue = deque()
-            queue.append((neighbor_key, [start_key, neighbor_key], [raw_edge]))
-            visited_hidden = set([start_key])
-
-            while queue:
-                current_key, path_keys, path_edges = queue.popleft()
-                if current_key in visible_set:
-                    if current_key != start_key:
-                        visible_pair = tuple(sorted([start_key, current_key]))
-                        if visible_pair not in processed_visible_pairs:
-                            processed_visible_pairs.add(visible_pair)
-                            add_compact_edges(edges, nodes, start_key, current_key, path_keys, path_edges, raw_nodes)
-                    continue
-
-                if current_key in visited_hidden:
-                    continue
-                visited_hidden.add(current_key)
-
-                for next_key, next_edge in raw_adjacency.get(current_key, {}).items():
-                    if next_key in path_keys:
-                        continue
-                    queue.append((next_key, path_keys + [next_key], path_edges + [next_edge]))
-
-    if len(nodes) == 1:
-        warnings.append("Only one tee, equipment item, or pipe accessory was found in this piping system.")
-    return nodes, edges, warnings
-
-
-def add_compact_edges(edges, nodes, from_key, to_key, path_keys, path_edges, raw_nodes):
-    stops = [{"id": from_key, "rawIndex": 0}]
-    for stop in find_size_change_stops(path_keys, raw_nodes):
-        if stop["id"] not in nodes:
-            nodes[stop["id"]] = stop["node"]
-        stops.append({"id": stop["id"], "rawIndex": stop["rawIndex"]})
-    stops.append({"id": to_key, "rawIndex": len(path_keys) - 1})
-
-    for index in range(len(stops) - 1):
-        start = stops[index]
-        end = stops[index + 1]
-        segment_start = start["rawIndex"]
-        segment_end = end["rawIndex"]
-        segment_keys = path_keys[segment_start:segment_end + 1]
-        segment_edges = path_edges[segment_start:segment_end]
-        add_compact_edge(edges, start["id"], end["id"], segment_keys, segment_edges, raw_nodes)
-
-
-def find_size_change_stops(path_keys, raw_nodes):
-    stops = []
-    last_diameter = ""
-    for index, key in enumerate(path_keys):
-        node = raw_nodes.get(key) or {}
-        diameter = normalize_for_label(node.get("diameter"))
-        if not diameter:
-            continue
-        if last_diameter and diameter != last_diameter and index not in [0, len(path_keys) - 1]:
-            stop_id = "sizechange-{0}".format(key)
-            stops.append({
-                "id": stop_id,
-                "rawIndex": index,
-                "node": build_size_change_node(stop_id, key, node, last_diameter, diameter),
-            })
-        last_diameter = diameter
-    return stops
-
-
-def build_size_change_node(stop_id, raw_key, raw_node, from_diameter, to_diameter):
-    label = "{0} to {1}".format(from_diameter, to_diameter)
-    return {
-        "id": stop_id,
-        "kind": SIZE_CHANGE_KIND,
-        "elementId": raw_node.get("elementId"),
-        "uniqueId": raw_node.get("uniqueId"),
-        "sourceElementId": raw_node.get("elementId"),
-        "sourceNodeId": raw_key,
-        "label": label,
-        "diameter": to_diameter,
-        "fromDiameter": from_diameter,
-        "toDiameter": to_diameter,
-        "flow": raw_node.get("flow") or "",
-        "x": 0,
-        "y": 0,
-    }
-
-
-def add_compact_edge(edges, from_key, to_key, path_keys, path_edges, raw_nodes):
-    edge_key_parts = sorted([from_key, to_key])
-    edge_key = "{0}:{1}".format(edge_key_parts[0], edge_key_parts[1])
-    if edge_key in edges:
-        return
-    edge = build_compact_edge_data(edge_key, from_key, to_key, path_keys, path_edges, raw_nodes)
-    edges[edge_key] = edge
-
-
-def first_compact_value(path_keys, path_edges, raw_nodes, field_name):
-    for edge in path_edges:
-        value = normalize_for_label(edge.get(field_name))
-        if value:
-            return value
-    for key in path_keys:
-        value = normalize_for_label((raw_nodes.get(key) or {}).get(field_name))
-        if value:
-            return value
-    return ""
-
-
-def build_compact_edge_data(edge_id, from_key, to_key, path_keys, path_edges, raw_nodes):
-    diameter = first_compact_value(path_keys, path_edges, raw_nodes, "diameter")
-    flow = first_compact_value(path_keys, path_edges, raw_nodes, "flow")
-    label_parts = []
-    if flow:
-        label_parts.append(flow)
-    if diameter:
-        label_parts.append(diameter)
-
-    element_ids = []
-    for key in path_keys:
-        element_id = (raw_nodes.get(key) or {}).get("elementId")
-        if element_id is not None and element_id not in element_ids:
-            element_ids.append(element_id)
-
-    return {
-        "id": edge_id,
-        "from": from_key,
-        "to": to_key,
-        "elementIds": element_ids,
-        "label": " | ".join(label_parts),
-        "diameter": diameter,
-        "flow": flow,
-        "points": [],
-        "collapsedElementCount": max(0, len(path_keys) - 2),
-    }
-
-
 def element_kind(element):
     category = get_category_name(element).lower()
     name_bundle = " ".join([
@@ -810,97 +679,6 @@ def build_edge_data(edge_id, element_a, element_b, mep_system):
     }
 
 
-def apply_schematic_layout(nodes, edges, root_key):
-    if not nodes:
-        return 900, 600
-
-    adjacency = {}
-    for key in nodes:
-        adjacency[key] = []
-    for edge in edges.values():
-        from_key = safe_str(edge.get("from"))
-        to_key = safe_str(edge.get("to"))
-        if from_key in adjacency and to_key in adjacency:
-            adjacency[from_key].append(to_key)
-            adjacency[to_key].append(from_key)
-
-    if root_key not in nodes:
-        root_key = sorted(nodes.keys())[0]
-
-    levels = {}
-    parent = {}
-    order = []
-    queue = deque([root_key])
-    levels[root_key] = 0
-    parent[root_key] = None
-
-    while queue:
-        current = queue.popleft()
-        order.append(current)
-        neighbors = sorted(adjacency.get(current, []), key=lambda item: nodes[item].get("label", item))
-        for neighbor in neighbors:
-            if neighbor in levels:
-                continue
-            levels[neighbor] = levels[current] + 1
-            parent[neighbor] = current
-            queue.append(neighbor)
-
-    for key in sorted(nodes.keys()):
-        if key not in levels:
-            levels[key] = max(levels.values() or [0]) + 1
-            parent[key] = None
-            order.append(key)
-
-    level_groups = {}
-    for key, level in levels.items():
-        level_groups.setdefault(level, []).append(key)
-    for level in level_groups:
-        level_groups[level].sort(key=lambda item: order.index(item) if item in order else 9999)
-
-    row_index = {}
-    next_row = 0
-    for level in sorted(level_groups.keys()):
-        for key in level_groups[level]:
-            row_index[key] = next_row
-            next_row += 1
-
-    max_x = 0
-    max_y = 0
-    for key, node in nodes.items():
-        level = levels.get(key, 0)
-        row = row_index.get(key, 0)
-        node["x"] = 70 + level * 120
-        node["y"] = 88 + row * 56
-        max_x = max(max_x, node["x"])
-        max_y = max(max_y, node["y"])
-
-    for edge in edges.values():
-        from_key = safe_str(edge.get("from"))
-        to_key = safe_str(edge.get("to"))
-        if levels.get(to_key, 0) < levels.get(from_key, 0):
-            edge["from"], edge["to"] = edge.get("to"), edge.get("from")
-        edge["flowDirection"] = "fromTo"
-
-    for edge in edges.values():
-        from_node = nodes.get(safe_str(edge.get("from")))
-        to_node = nodes.get(safe_str(edge.get("to")))
-        if not from_node or not to_node:
-            continue
-        x1 = float(from_node.get("x") or 0)
-        y1 = float(from_node.get("y") or 0)
-        x2 = float(to_node.get("x") or 0)
-        y2 = float(to_node.get("y") or 0)
-        mid_x = (x1 + x2) / 2.0
-        edge["points"] = [
-            {"x": x1, "y": y1},
-            {"x": mid_x, "y": y1},
-            {"x": mid_x, "y": y2},
-            {"x": x2, "y": y2},
-        ]
-
-    return max(760, int(max_x + 140)), max(460, int(max_y + 110))
-
-
 def build_empty_payload(active_doc, warnings):
     return {
         "schemaVersion": SCHEMA_VERSION,
@@ -1046,10 +824,20 @@ def get_storage_schema():
     builder.AddSimpleField(SCHEMA_FIELD_SYSTEM_UNIQUE_ID, String)
     builder.AddSimpleField(SCHEMA_FIELD_SYSTEM_ID, String)
     builder.AddSimpleField(SCHEMA_FIELD_DOCUMENT_TITLE, String)
-    builder.AddSimpleField(SCHEMA_FIELD_PAYLOAD, String)
+    builder.AddSimpleField(SCHEMA_FIELD_PAYLOAD_HEADER, String)
+    builder.AddArrayField(SCHEMA_FIELD_PAYLOAD_CHUNKS, String)
     return builder.Finish()
 
 
+def get_diagram_schemas():
+    """Current schema first, then the legacy one if this model ever used it."""
+    schemas = [get_storage_schema()]
+    legacy_schema = Schema.Lookup(LEGACY_SCHEMA_GUID)
+    if legacy_schema is not None:
+        schemas.append(legacy_schema)
+    return schemas
+
+
 def entity_get_string(entity, schema, field_name):
     if entity is None or schema is None:
         return ""
@@ -1075,22 +863,183 @@ def entity_set_string(entity, schema, field_name, value):
         entity.Set(field, safe_str(value))
 
 
-def find_diagram_storage(active_doc, system_unique_id):
-    schema = get_storage_schema()
-    for data_storage in FilteredElementCollector(active_doc).OfClass(DataStorage).ToElements():
+def entity_get_string_list(entity, schema, field_name):
+    """The stored IList[String] as-is, so callers can index single chunks."""
+    if entity is None or schema is None:
+        return []
+    field = schema.GetField(field_name)
+    if field is None:
+        return []
+    try:
+        return entity.Get[IList[String]](field)
+    except:
+        return []
+
+
+def entity_set_string_list(entity, schema, field_name, values):
+    field = schema.GetField(field_name)
+    if field is None:
+        return
+    items = List[String]()
+    for value in values:
+        items.Add(safe_str(value))
+    entity.Set[IList[String]](field, items)
+
+
+def get_registry_schema():
+    schema = Schema.Lookup(REGISTRY_SCHEMA_GUID)
+    if schema is not None:
+        return schema
+    builder = SchemaBuilder(REGISTRY_SCHEMA_GUID)
+    builder.SetSchemaName(REGISTRY_SCHEMA_NAME)
+    builder.SetReadAccessLevel(AccessLevel.Public)
+    builder.SetWriteAccessLevel(AccessLevel.Public)
+    builder.AddMapField(REGISTRY_FIELD_DIAGRAMS, String, ElementId)
+    return builder.Finish()
+
+
+def document_cache_key(active_doc):
+    try:
+        return "doc:{0}".format(active_doc.GetHashCode())
+    except:
+        return "doc:{0}".format(safe_str(getattr(active_doc, "Title", "")))
+
+
+def can_edit_element(active_doc, element_id):
+    """
+    False when editing the element would fail at Commit in a workshared model:
+    another user owns it, or central has a newer version than this local copy.
+    """
+    if not active_doc.IsWorkshared:
+        return True
+    try:
+        if WorksharingUtils.GetCheckoutStatus(active_doc, element_id) == CheckoutStatus.OwnedByOtherUser:
+            return False
+        return WorksharingUtils.GetModelUpdatesStatus(active_doc, element_id) not in (
+            ModelUpdatesStatus.DeletedInCentral,
+            ModelUpdatesStatus.UpdatedInCentral,
+        )
+    except:
+        return False
+
+
+def find_registry_storages(active_doc):
+    """DataStorage elements carrying the registry (normally one; two users may each have created one)."""
+    return list(
+        FilteredElementCollector(active_doc)
+        .OfClass(DataStorage)
+        .WherePasses(ExtensibleStorageFilter(REGISTRY_SCHEMA_GUID))
+        .ToElements()
+    )
+
+
+def read_registry_entity(element, schema, registry):
+    try:
+        entity = element.GetEntity(schema)
+        if entity is None or not entity.IsValid():
+            return
+        stored = entity.Get[IDictionary[String, ElementId]](schema.GetField(REGISTRY_FIELD_DIAGRAMS))
+        for pair in stored:
+            registry.setdefault(safe_str(pair.Key), pair.Value)
+    except:
         try:
-            entity = data_storage.GetEntity(schema)
+            LOGGER.debug(traceback.format_exc())
         except:
-            entity = None
+            pass
+
+
+def read_storage_registry(active_doc, registry_storages=None):
+    """Return {system UniqueId: DataStorage ElementId} merged from the registry storages."""
+    registry = {}
+    schema = get_registry_schema()
+    if registry_storages is None:
+        registry_storages = find_registry_storages(active_doc)
+    for registry_storage in registry_storages:
+        read_registry_entity(registry_storage, schema, registry)
+    return registry
+
+
+def register_diagram_storage(active_doc, system_unique_id, data_storage):
+    """
+    Record the DataStorage for a system in the registry. Needs an open transaction.
+    The registry is best-effort: when its element cannot be edited (borrowed by
+    another user or out of date) the write is skipped before it can fail the
+    diagram save at Commit, and lookups fall back to the cache and a scan.
+    """
+    STORAGE_ID_CACHE[(document_cache_key(active_doc), system_unique_id)] = data_storage.Id
+    registry_storages = find_registry_storages(active_doc)
+    registry = read_storage_registry(active_doc, registry_storages)
+    if registry.get(system_unique_id) == data_storage.Id:
+        return
+
+    editable = [storage for storage in registry_storages if can_edit_element(active_doc, storage.Id)]
+    if registry_storages and not editable:
+        LOGGER.debug("Diagram registry is not editable; skipped registering {0}.".format(system_unique_id))
+        return
+    registry_storage = editable[0] if editable else DataStorage.Create(active_doc)
+    registry[system_unique_id] = data_storage.Id
+
+    schema = get_registry_schema()
+    mapping = Dictionary[String, ElementId]()
+    for unique_id, storage_id in registry.items():
+        if active_doc.GetElement(storage_id) is not None:
+            mapping[unique_id] = storage_id
+    entity = Entity(schema)
+    entity.Set[IDictionary[String, ElementId]](schema.GetField(REGISTRY_FIELD_DIAGRAMS), mapping)
+    registry_storage.SetEntity(entity)
+
+
+def get_storage_entity(data_storage, schemas, system_unique_id):
+    """(entity, schema) for the first schema whose entity on data_storage belongs to system_unique_id."""
+    if data_storage is None:
+        return None, None
+    for schema in schemas:
         try:
+            entity = data_storage.GetEntity(schema)
             if entity is None or not entity.IsValid():
                 continue
         except:
             continue
-        stored_unique_id = entity_get_string(entity, schema, SCHEMA_FIELD_SYSTEM_UNIQUE_ID)
-        if stored_unique_id == safe_str(system_unique_id):
+        if entity_get_string(entity, schema, SCHEMA_FIELD_SYSTEM_UNIQUE_ID) == system_unique_id:
+            return entity, schema
+    return None, None
+
+
+def find_diagram_storage(active_doc, system_unique_id):
+    """Session cache, then the registry, then a filtered scan (older models)."""
+    schemas = get_diagram_schemas()
+    system_unique_id = safe_str(system_unique_id)
+    cache_key = (document_cache_key(active_doc), system_unique_id)
+
+    lookups = [
+        lambda: STORAGE_ID_CACHE.get(cache_key),
+        lambda: read_storage_registry(active_doc).get(system_unique_id),
+    ]
+    for lookup in lookups:
+        storage_id = lookup()
+        if storage_id is None:
+            continue
+        data_storage = active_doc.GetElement(storage_id)
+        entity, schema = get_storage_entity(data_storage, schemas, system_unique_id)
+        if entity is not None:
+            STORAGE_ID_CACHE[cache_key] = storage_id
+            return data_storage, entity, schema
+    STORAGE_ID_CACHE.pop(cache_key, None)
+
+    storage_filter = ExtensibleStorageFilter(SCHEMA_GUID)
+    if len(schemas) > 1:
+        storage_filter = LogicalOrFilter(storage_filter, ExtensibleStorageFilter(LEGACY_SCHEMA_GUID))
+    collector = (
+        FilteredElementCollector(active_doc)
+        .OfClass(DataStorage)
+        .WherePasses(storage_filter)
+    )
+    for data_storage in collector.ToElements():
+        entity, schema = get_storage_entity(data_storage, schemas, system_unique_id)
+        if entity is not None:
+            STORAGE_ID_CACHE[cache_key] = data_storage.Id
             return data_storage, entity, schema
-    return None, None, schema
+    return None, None, None
 
 
 def read_saved_diagram(active_doc, mep_system):
@@ -1098,16 +1047,31 @@ def read_saved_diagram(active_doc, mep_system):
         system_unique_id = safe_str(mep_system.UniqueId)
     except:
         system_unique_id = safe_str(element_id_value(mep_system.Id))
+    return read_saved_payload(active_doc, system_unique_id)
+
+
+def read_saved_storage(active_doc, system_unique_id, read_drawing=False):
+    """Saved web editor payload for a system, or its drawing map when read_drawing is set.
+
+    The drawing map is kept apart from the payload; only the redraw planner reads it.
+    """
     try:
         data_storage, entity, schema = find_diagram_storage(active_doc, system_unique_id)
         if data_storage is None or entity is None:
             return None
-        payload_text = entity_get_string(entity, schema, SCHEMA_FIELD_PAYLOAD)
+        if schema.GUID == SCHEMA_GUID:
+            reader = PayloadReader(
+                entity_get_string(entity, schema, SCHEMA_FIELD_PAYLOAD_HEADER),
+                entity_get_string_list(entity, schema, SCHEMA_FIELD_PAYLOAD_CHUNKS),
+            )
+            return reader.drawing() if read_drawing else reader.payload()
+        payload_text = entity_get_string(entity, schema, LEGACY_SCHEMA_FIELD_PAYLOAD)
         if not payload_text:
             return None
         payload = json.loads(payload_text)
         if isinstance(payload, dict):
-            return payload
+            drawing = payload.pop(DRAWING_SECTION, None)
+            return drawing if read_drawing else payload
     except:
         try:
             LOGGER.debug(traceback.format_exc())
@@ -1116,25 +1080,36 @@ def read_saved_diagram(active_doc, mep_system):
     return None
 
 
-def save_diagram_storage(active_doc, payload):
+def read_saved_payload(active_doc, system_unique_id):
+    return read_saved_storage(active_doc, system_unique_id)
+
+
+def read_saved_drawing(active_doc, system_unique_id):
+    return read_saved_storage(active_doc, system_unique_id, read_drawing=True)
+
+
+def save_diagram_storage(active_doc, payload, drawing):
     schema = get_storage_schema()
     system_unique_id = safe_str(payload.get("systemUniqueId"))
     if not system_unique_id:
         raise Exception("No piping system is loaded. Use Select System before saving.")
 
-    data_storage, entity, schema = find_diagram_storage(active_doc, system_unique_id)
+    data_storage, stored_entity, stored_schema = find_diagram_storage(active_doc, system_unique_id)
     if data_storage is None:
         data_storage = DataStorage.Create(active_doc)
-        entity = Entity(schema)
-    else:
-        entity = Entity(schema)
+    elif stored_schema is not None and stored_schema.GUID != SCHEMA_GUID:
+        data_storage.DeleteEntity(stored_schema)
 
+    header_text, chunks = encode_payload(payload, drawing)
+    entity = Entity(schema)
     entity_set_string(entity, schema, SCHEMA_FIELD_TOOL, APP_NAME)
     entity_set_string(entity, schema, SCHEMA_FIELD_SYSTEM_UNIQUE_ID, system_unique_id)
     entity_set_string(entity, schema, SCHEMA_FIELD_SYSTEM_ID, safe_str(payload.get("systemId")))
     entity_set_string(entity, schema, SCHEMA_FIELD_DOCUMENT_TITLE, safe_str(payload.get("documentTitle")))
-    entity_set_string(entity, schema, SCHEMA_FIELD_PAYLOAD, json_dumps(payload))
+    entity_set_string(entity, schema, SCHEMA_FIELD_PAYLOAD_HEADER, header_text)
+    entity_set_string_list(entity, schema, SCHEMA_FIELD_PAYLOAD_CHUNKS, chunks)
     data_storage.SetEntity(entity)
+    register_diagram_storage(active_doc, system_unique_id, data_storage)
 
 
 # ____________________________________________________________________ REVIT DRAFTING OUTPUT
@@ -1233,75 +1208,6 @@ def draw_detail_line(active_doc, view, point_a, point_b):
     return active_doc.Create.NewDetailCurve(view, line)
 
 
-def draw_svg_polyline(active_doc, view, points):
-    if not points or len(points) < 2:
-        return
-    for index in range(len(points) - 1):
-        point_a = svg_point_to_revit(points[index])
-        point_b = svg_point_to_revit(points[index + 1])
-        draw_detail_line(active_doc, view, point_a, point_b)
-
-
-def get_flow_arrow_points(points):
-    if not points or len(points) < 2:
-        return None
-
-    normalized = []
-    for point in points:
-        try:
-            normalized.append({"x": float(point.get("x", 0)), "y": float(point.get("y", 0))})
-        except:
-            pass
-    if len(normalized) < 2:
-        return None
-
-    lengths = []
-    total_length = 0.0
-    for index in range(len(normalized) - 1):
-        point_a = normalized[index]
-        point_b = normalized[index + 1]
-        dx = point_b["x"] - point_a["x"]
-        dy = point_b["y"] - point_a["y"]
-        length = math.sqrt(dx * dx + dy * dy)
-        lengths.append(length)
-        total_length += length
-
-    if total_length < 1.0:
-        return None
-
-    target = total_length / 2.0
-    distance_so_far = 0.0
-    for index, length in enumerate(lengths):
-        if length <= 0.0:
-            continue
-        if distance_so_far + length >= target:
-            point_a = normalized[index]
-            point_b = normalized[index + 1]
-            ratio = (target - distance_so_far) / length
-            tip_x = point_a["x"] + (point_b["x"] - point_a["x"]) * ratio
-            tip_y = point_a["y"] + (point_b["y"] - point_a["y"]) * ratio
-            dir_x = (point_b["x"] - point_a["x"]) / length
-            dir_y = (point_b["y"] - point_a["y"]) / length
-            base_x = tip_x - dir_x * 12.0
-            base_y = tip_y - dir_y * 12.0
-            perp_x = -dir_y
-            perp_y = dir_x
-            return [
-                {"x": base_x + perp_x * 5.0, "y": base_y + perp_y * 5.0},
-                {"x": tip_x, "y": tip_y},
-                {"x": base_x - perp_x * 5.0, "y": base_y - perp_y * 5.0},
-            ]
-        distance_so_far += length
-    return None
-
-
-def draw_flow_arrow(active_doc, view, points):
-    arrow_points = get_flow_arrow_points(points)
-    if not arrow_points:
-        return
-    draw_svg_polyline(active_doc, view, arrow_points)
-
-
 def get_default_text_note_type_id(active_doc):
     try:
         type_id = active_doc.GetDefaultElementTypeId(ElementTypeGroup.TextNoteType)
@@ -1323,145 +1229,104 @@ def create_text_note(active_doc, view, text, x, y, text_type_id):
     return TextNote.Create(active_doc, view.Id, point, clean_text, text_type_id)
 
 
-def polygon_points(cx, cy, radius, sides):
-    points = []
-    for index in range(sides):
-        angle = (math.pi * 2.0 * index / float(sides)) - (math.pi / 2.0)
-        points.append({"x": cx + math.cos(angle) * radius, "y": cy + math.sin(angle) * radius})
-    points.append(points[0])
-    return points
-
-
-def draw_box(active_doc, view, cx, cy, width, height):
-    left = cx - width / 2.0
-    right = cx + width / 2.0
-    top = cy - height / 2.0
-    bottom = cy + height / 2.0
-    draw_svg_polyline(active_doc, view, [
-        {"x": left, "y": top},
-        {"x": right, "y": top},
-        {"x": right, "y": bottom},
-        {"x": left, "y": bottom},
-        {"x": left, "y": top},
-    ])
-
-
-def draw_symbol(active_doc, view, kind, cx, cy):
-    kind = safe_str(kind) or "junction"
-    if kind == "valve":
-        draw_svg_polyline(active_doc, view, [{"x": cx - 18, "y": cy - 10}, {"x": cx, "y": cy}, {"x": cx - 18, "y": cy + 10}, {"x": cx - 18, "y": cy - 10}])
-        draw_svg_polyline(active_doc, view, [{"x": cx + 18, "y": cy - 10}, {"x": cx, "y": cy}, {"x": cx + 18, "y": cy + 10}, {"x": cx + 18, "y": cy - 10}])
-        draw_svg_polyline(active_doc, view, [{"x": cx, "y": cy - 16}, {"x": cx, "y": cy - 26}, {"x": cx + 12, "y": cy - 26}])
-    elif kind == SIZE_CHANGE_KIND:
-        draw_svg_polyline(active_doc, view, [{"x": cx - 18, "y": cy - 9}, {"x": cx + 18, "y": cy - 9}, {"x": cx + 8, "y": cy + 9}, {"x": cx - 8, "y": cy + 9}, {"x": cx - 18, "y": cy - 9}])
-        draw_svg_polyline(active_doc, view, [{"x": cx - 20, "y": cy + 14}, {"x": cx + 20, "y": cy - 14}])
-    elif kind == "accessory":
-        draw_box(active_doc, view, cx, cy, 32, 20)
-        draw_svg_polyline(active_doc, view, [{"x": cx - 12, "y": cy + 8}, {"x": cx + 12, "y": cy - 8}])
-    elif kind == "pump":
-        draw_svg_polyline(active_doc, view, polygon_points(cx, cy, 18, 12))
-        draw_svg_polyline(active_doc, view, [{"x": cx - 7, "y": cy - 10}, {"x": cx + 12, "y": cy}, {"x": cx - 7, "y": cy + 10}, {"x": cx - 7, "y": cy - 10}])
-    elif kind == "strainer":
-        draw_svg_polyline(active_doc, view, [{"x": cx, "y": cy - 18}, {"x": cx + 18, "y": cy}, {"x": cx, "y": cy + 18}, {"x": cx - 18, "y": cy}, {"x": cx, "y": cy - 18}])
-        draw_svg_polyline(active_doc, view, [{"x": cx - 9, "y": cy + 9}, {"x": cx + 9, "y": cy - 9}])
-        draw_svg_polyline(active_doc, view, [{"x": cx - 3, "y": cy + 15}, {"x": cx + 15, "y": cy - 3}])
-    elif kind == "meter":
-        draw_box(active_doc, view, cx, cy, 32, 20)
-        draw_svg_polyline(active_doc, view, [{"x": cx - 10, "y": cy}, {"x": cx - 2, "y": cy - 7}, {"x": cx + 2, "y": cy + 7}, {"x": cx + 10, "y": cy}])
-    elif kind == "equipment":
-        draw_box(active_doc, view, cx, cy, 42, 26)
-    elif kind == "pipe":
-        draw_svg_polyline(active_doc, view, [{"x": cx - 10, "y": cy}, {"x": cx + 10, "y": cy}])
-    elif kind == "branch":
-        draw_svg_polyline(active_doc, view, [{"x": cx - 7, "y": cy - 7}, {"x": cx + 7, "y": cy + 7}])
-        draw_svg_polyline(active_doc, view, [{"x": cx - 7, "y": cy + 7}, {"x": cx + 7, "y": cy - 7}])
-    else:
-        draw_svg_polyline(active_doc, view, polygon_points(cx, cy, 8, 8))
-
-
-def draw_edge_label(active_doc, view, edge, text_type_id):
-    label = normalize_for_label(edge.get("label"))
-    if not label:
-        return
-    points = edge.get("points") or []
-    if not points:
-        return
-    mid_index = int(len(points) / 2)
+def get_drawn_element(active_doc, view, id_value):
+    """Element from a stored id, only if it still lives in the diagram view."""
     try:
-        point = points[mid_index]
-        create_text_note(active_doc, view, label, float(point.get("x", 0)) + 8, float(point.get("y", 0)) - 10, text_type_id)
+        element = active_doc.GetElement(ElementId(Int64(int(id_value))))
     except:
-        pass
+        return None
+    if element is None:
+        return None
+    try:
+        if element.OwnerViewId != view.Id:
+            return None
+    except:
+        return None
+    return element
 
 
-def draw_diagram_to_view(active_doc, view, payload):
-    text_type_id = get_default_text_note_type_id(active_doc)
-    canvas = payload.get("canvas") or {}
-    width = float(canvas.get("width") or 900)
-    height = float(canvas.get("height") or 600)
-
-    draw_svg_polyline(active_doc, view, [
-        {"x": 20, "y": 20},
-        {"x": width - 20, "y": 20},
-        {"x": width - 20, "y": height - 20},
-        {"x": 20, "y": height - 20},
-        {"x": 20, "y": 20},
-    ])
-
-    for edge in payload.get("edges") or []:
-        points = edge.get("points") or []
-        if not points:
-            from_node = find_payload_node(payload, edge.get("from"))
-            to_node = find_payload_node(payload, edge.get("to"))
-            if from_node and to_node:
-                x1 = float(from_node.get("x") or 0)
-                y1 = float(from_node.get("y") or 0)
-                x2 = float(to_node.get("x") or 0)
-                y2 = float(to_node.get("y") or 0)
-                mid_x = (x1 + x2) / 2.0
-                points = [{"x": x1, "y": y1}, {"x": mid_x, "y": y1}, {"x": mid_x, "y": y2}, {"x": x2, "y": y2}]
-        draw_svg_polyline(active_doc, view, points)
-        draw_flow_arrow(active_doc, view, points)
-        draw_edge_label(active_doc, view, edge, text_type_id)
-
-    for node in payload.get("nodes") or []:
-        try:
-            cx = float(node.get("x") or 0)
-            cy = float(node.get("y") or 0)
-        except:
-            continue
-        draw_symbol(active_doc, view, node.get("kind"), cx, cy)
-        label = normalize_for_label(node.get("label"))
-        if label:
-            create_text_note(active_doc, view, label, cx - 24, cy - 28, text_type_id)
-        diameter = normalize_for_label(node.get("diameter"))
-        if diameter and node.get("kind") == "pipe":
-            create_text_note(active_doc, view, diameter, cx - 24, cy + 20, text_type_id)
-
-    for symbol in payload.get("symbols") or []:
-        try:
-            cx = float(symbol.get("x") or 0)
-            cy = float(symbol.get("y") or 0)
-        except:
-            continue
-        draw_symbol(active_doc, view, symbol.get("kind"), cx, cy)
-        label = normalize_for_label(symbol.get("label"))
-        if label:
-            create_text_note(active_doc, view, label, cx - 24, cy - 28, text_type_id)
+def shape_points(shape):
+    return (
+        svg_point_to_revit({"x": shape[1], "y": shape[2]}),
+        svg_point_to_revit({"x": shape[3], "y": shape[4]}),
+    )
 
-    for label in payload.get("labels") or []:
-        try:
-            create_text_note(active_doc, view, label.get("text"), float(label.get("x") or 0), float(label.get("y") or 0), text_type_id)
-        except:
-            pass
 
+def create_drawing_element(active_doc, view, shape, text_type_id):
+    if shape[0] == "line":
+        point_a, point_b = shape_points(shape)
+        return draw_detail_line(active_doc, view, point_a, point_b)
+    return create_text_note(active_doc, view, shape[3], shape[1], shape[2], text_type_id)
 
-def find_payload_node(payload, node_id):
-    node_id = safe_str(node_id)
-    for node in payload.get("nodes") or []:
-        if safe_str(node.get("id")) == node_id:
-            return node
-    return None
+
+def update_drawing_element(element, shape):
+    """Move / reshape / retext in place. Raises if the element cannot take the shape."""
+    if shape[0] == "line":
+        point_a, point_b = shape_points(shape)
+        element.GeometryCurve = Line.CreateBound(point_a, point_b)
+        return element
+    element.Coord = svg_point_to_revit({"x": shape[1], "y": shape[2]})
+    if normalize_for_label(element.Text) != shape[3]:
+        element.Text = shape[3]
+    return element
+
+
+def apply_redraw_plan(active_doc, view, plan, text_type_id):
+    """Apply a plan_redraw() result; returns the new {key: {"id", "shape"}} map."""
+    drawn = {}
+
+    def record(key, element, shape):
+        if element is not None:
+            drawn[key] = {"id": element_id_value(element.Id), "shape": list(shape)}
+
+    delete_ids = List[ElementId]()
+    for key, id_value in plan["delete"]:
+        element = get_drawn_element(active_doc, view, id_value)
+        if element is not None:
+            delete_ids.Add(element.Id)
+
+    for key, id_value, shape in plan["update"]:
+        element = get_drawn_element(active_doc, view, id_value)
+        if element is not None:
+            try:
+                record(key, update_drawing_element(element, shape), shape)
+                continue
+            except:
+                delete_ids.Add(element.Id)
+        record(key, create_drawing_element(active_doc, view, shape, text_type_id), shape)
+
+    if delete_ids.Count > 0:
+        active_doc.Delete(delete_ids)
+
+    for key, id_value, shape in plan["keep"]:
+        element = get_drawn_element(active_doc, view, id_value)
+        if element is None:
+            # Deleted by hand since the last save.
+            element = create_drawing_element(active_doc, view, shape, text_type_id)
+        record(key, element, shape)
+
+    for key, shape in plan["create"]:
+        record(key, create_drawing_element(active_doc, view, shape, text_type_id), shape)
+
+    return drawn
+
+
+def redraw_diagram_view(active_doc, view, payload, previous_drawing):
+    """Diff the view against the last saved drawing; a view without one is cleared once.
+
+    Returns (plan summary, new drawing map). The drawing map is stored next
+    to the payload, never inside it.
+    """
+    view_id = element_id_value(view.Id)
+    previous_elements = {}
+    if isinstance(previous_drawing, dict) and previous_drawing.get("viewId") == view_id:
+        previous_elements = previous_drawing.get("elements") or {}
+    else:
+        clear_view_contents(active_doc, view)
+
+    plan = plan_redraw(previous_elements, build_drawing_primitives(payload))
+    drawn = apply_redraw_plan(active_doc, view, plan, get_default_text_note_type_id(active_doc))
+    return summarize_plan(plan), {"viewId": view_id, "elements": drawn}
 
 
 def save_payload_to_revit(active_doc, payload):
@@ -1469,18 +1334,20 @@ def save_payload_to_revit(active_doc, payload):
         raise Exception("The web editor did not send a valid diagram.")
     if not payload.get("systemUniqueId"):
         raise Exception("No piping system is loaded. Use Select System before saving.")
+    payload.pop(DRAWING_SECTION, None)
     payload["schemaVersion"] = SCHEMA_VERSION
     payload["generationMode"] = GENERATION_MODE
 
+    previous_drawing = read_saved_drawing(active_doc, safe_str(payload.get("systemUniqueId")))
+
     transaction = Transaction(active_doc, "Save Pipe One-Line Diagram")
     transaction.Start()
     try:
         view = ensure_diagram_view(active_doc, payload)
-        clear_view_contents(active_doc, view)
         payload["viewId"] = element_id_value(view.Id)
         payload["documentTitle"] = safe_str(getattr(active_doc, "Title", ""))
-        draw_diagram_to_view(active_doc, view, payload)
-        save_diagram_storage(active_doc, payload)
+        redraw, drawing = redraw_diagram_view(active_doc, view, payload, previous_drawing)
+        save_diagram_storage(active_doc, payload, drawing)
         transaction.Commit()
     except Exception:
         try:
@@ -1491,7 +1358,8 @@ def save_payload_to_revit(active_doc, payload):
 
     return {
         "status": "ready",
-        "message": "Saved one-line diagram to drafting view '{0}'.".format(view.Name),
+        "message": "Saved one-line diagram to drafting view '{0}' ({1} created, {2} updated, {3} removed, {4} unchanged).".format(
+            view.Name, redraw["create"], redraw["update"], redraw["delete"], redraw["keep"]),
         "payload": payload,
         "viewId": payload.get("viewId"),
         "viewName": view.Name,
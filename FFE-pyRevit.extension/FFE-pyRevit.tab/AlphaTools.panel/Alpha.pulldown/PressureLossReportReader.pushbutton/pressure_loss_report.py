@@ -0,0 +1,516 @@
+# -*- coding: utf-8 -*-
+"""Streaming reader for Revit's duct Pressure Loss Report (HTML).
+
+The report has three section tables, each starting with a title row:
+a section row is [section number, embedded table, section total] and the
+embedded table lists that section's elements (header row first). The parser
+is fed the file in chunks and keeps only the open tables' current rows:
+section tables are recognised by their title row while parsing, every
+embedded table is paired with its section row as it is read (nested inside
+the section row, or, for reports that close the outer table early, in
+order after it), and each element row becomes a record as soon as it
+closes. Records are indexed by section and by element id.
+
+Pure Python so it can be checked outside Revit: python pressure_loss_report.py
+"""
+
+import io
+import re
+from collections import OrderedDict, deque
+
+try:
+    from HTMLParser import HTMLParser  # IronPython 2.7
+except ImportError:
+    from html.parser import HTMLParser
+
+try:
+    unichr
+except NameError:
+    unichr = chr
+
+
+TITLE_TOTAL = u"Total Pressure Loss Calculations by Sections"
+TITLE_STRAIGHT = u"Detail Information of Straight Segment by Sections"
+TITLE_FITTINGS = u"Fitting and Accessory Loss Coefficient Summary by Sections"
+REPORT_TITLES = (TITLE_TOTAL, TITLE_STRAIGHT, TITLE_FITTINGS)
+
+COLUMN_ORDER = [u"System Name", u"Category", u"Element ID", u"Type Mark", u"ASHRAE Table", u"Critical Path",
+                u"Section", u"Size", u"Flow", u"Length", u"Velocity", u"Friction", u"Pressure Loss"]
+
+_TITLES_BY_TEXT = dict((title.lower(), title) for title in REPORT_TITLES)
+_WHITESPACE = re.compile(r"\s+", re.UNICODE)
+_NUMBER = re.compile(r"^\s*(-?[\d,]*\.?\d+)")
+_CRITICAL_PATH = re.compile(r"Critical Path\s*:?\s*(\d+(?:\s*-\s*\d+)*)", re.IGNORECASE)
+_FEET_INCHES = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*'\s*(?:-\s*)?(?:(\d+(?:\.\d+)?)?\s*(?:(\d+)\s*/\s*(\d+))?\s*\"?)?\s*$")
+_ENTITIES = {"nbsp": u"\xa0", "amp": u"&", "lt": u"<", "gt": u">", "quot": u"\"", "apos": u"'"}
+
+_TABLE = "table"
+_SECTION_TABLE = "section"
+_ELEMENT_TABLE = "elements"
+
+
+# -----------------------------------------------------------------------------
+# Values
+# -----------------------------------------------------------------------------
+
+def clean_text(text):
+    if text is None:
+        return u""
+    return _WHITESPACE.sub(u" ", text.replace(u"\xa0", u" ")).strip()
+
+
+def parse_number(text):
+    """Leading number of a value with a unit suffix ("1,250 CFM" -> 1250.0); None if there is none."""
+    match = _NUMBER.match(text or u"")
+    if not match:
+        return None
+    return float(match.group(1).replace(u",", u""))
+
+
+def parse_feet_inches(text):
+    """Decimal feet from 12' - 6 1/2", 12'-6", 12' or a plain number; None if unreadable."""
+    text = clean_text(text)
+    if not text:
+        return None
+    match = _FEET_INCHES.match(text)
+    if not match:
+        return parse_number(text) if u"'" not in text and u"\"" not in text else None
+    feet, inches, numerator, denominator = match.groups()
+    inches = float(inches) if inches else 0.0
+    if numerator and denominator and float(denominator):
+        inches += float(numerator) / float(denominator)
+    value = abs(float(feet)) + inches / 12.0
+    return round(-value if feet.startswith(u"-") else value, 4)
+
+
+def parse_critical_path(text):
+    """Section numbers from "Critical Path : 1-3-5 ; ..."; [] if the text has no critical path."""
+    match = _CRITICAL_PATH.search(text or u"")
+    if not match:
+        return []
+    return [part.strip() for part in match.group(1).split(u"-") if part.strip()]
+
+
+# -----------------------------------------------------------------------------
+# Report
+# -----------------------------------------------------------------------------
+
+class PressureLossReport(object):
+    """Records of the three section tables, indexed by section and element id."""
+
+    def __init__(self):
+        self.critical_path = []
+        self.sections = dict((title, OrderedDict()) for title in REPORT_TITLES)
+        self.columns = dict((title, []) for title in REPORT_TITLES)
+        self.records = dict((title, []) for title in REPORT_TITLES)
+        self.by_section = dict((title, {}) for title in REPORT_TITLES)
+        self.by_element = dict((title, {}) for title in REPORT_TITLES)
+        self.found_titles = []
+        self.unpaired_tables = 0
+
+    def add_section(self, title, section, total):
+        self.sections[title][section] = total
+
+    def add_record(self, title, record):
+        self.records[title].append(record)
+        self.by_section[title].setdefault(record[u"Section"], []).append(record)
+        element_id = record.get(u"Element ID")
+        if element_id:
+            self.by_element[title].setdefault(element_id, []).append(record)
+
+    def section_records(self, title, section):
+        return self.by_section[title].get(section, [])
+
+    def element_records(self, title, element_id):
+        return self.by_element[title].get(element_id, [])
+
+    def is_critical(self, section):
+        return section in self.critical_path
+
+    def element_ids(self):
+        ids = set()
+        for title in (TITLE_STRAIGHT, TITLE_FITTINGS):
+            ids.update(self.by_element[title])
+        return ids
+
+
+def combine_duct_data(report, critical_only=False):
+    """Straight segments and fittings as rows in COLUMN_ORDER.
+
+    Flow, Velocity, Friction and Pressure Loss become numbers and Length
+    decimal feet. Fittings take their section's largest duct Flow, looked up
+    per section rather than searched per element.
+    """
+    critical = set(report.critical_path)
+    section_flow = {}
+    for record in report.records[TITLE_STRAIGHT]:
+        flow = parse_number(record.get(u"Flow"))
+        if flow is not None:
+            section = record[u"Section"]
+            section_flow[section] = max(flow, section_flow.get(section, flow))
+
+    rows = []
+    for title, category in ((TITLE_FITTINGS, u"Fitting"), (TITLE_STRAIGHT, u"Duct")):
+        for record in report.records[title]:
+            section = record[u"Section"]
+            if critical_only and section not in critical:
+                continue
+            row = OrderedDict((column, record.get(column, u"")) for column in COLUMN_ORDER)
+            row[u"Category"] = category
+            row[u"Critical Path"] = u"Yes" if section in critical else u""
+            row[u"Flow"] = section_flow.get(section, parse_number(record.get(u"Flow")))
+            for column in (u"Velocity", u"Friction", u"Pressure Loss"):
+                row[column] = parse_number(record.get(column))
+            row[u"Length"] = parse_feet_inches(record.get(u"Length"))
+            rows.append(row)
+    return rows
+
+
+# -----------------------------------------------------------------------------
+# Parser
+# -----------------------------------------------------------------------------
+
+class _OpenTable(object):
+    __slots__ = ("kind", "title", "section", "row", "row_has_table", "cell")
+
+    def __init__(self):
+        self.kind = _TABLE
+        self.title = None
+        self.section = None
+        self.row = None
+        self.row_has_table = False
+        self.cell = None
+
+
+class PressureLossReportParser(HTMLParser):
+    """Feed the report HTML in any number of chunks; read .report after close()."""
+
+    def __init__(self):
+        HTMLParser.__init__(self)
+        self.report = PressureLossReport()
+        self._stack = []
+        self._title = None
+        self._pending_sections = deque()
+
+    # ---------------- HTML events ----------------
+    def handle_starttag(self, tag, attrs):
+        tag = tag.lower()
+        if tag == "table":
+            self._start_table()
+        elif not self._stack:
+            return
+        elif tag == "tr":
+            self._end_row(self._stack[-1])
+            self._stack[-1].row = []
+        elif tag in ("td", "th"):
+            table = self._stack[-1]
+            self._end_cell(table)
+            if table.row is None:
+                table.row = []
+            table.cell = []
+
+    def handle_endtag(self, tag):
+        tag = tag.lower()
+        if not self._stack:
+            return
+        if tag == "table":
+            table = self._stack.pop()
+            self._end_row(table)
+        elif tag == "tr":
+            self._end_row(self._stack[-1])
+        elif tag in ("td", "th"):
+            self._end_cell(self._stack[-1])
+
+    def handle_data(self, data):
+        if data and self._stack and self._stack[-1].cell is not None:
+            self._stack[-1].cell.append(data)
+
+    def handle_entityref(self, name):
+        self.handle_data(_ENTITIES.get(name, u""))
+
+    def handle_charref(self, name):
+        try:
+            if name.lower().startswith("x"):
+                self.handle_data(unichr(int(name[1:], 16)))
+            else:
+                self.handle_data(unichr(int(name)))
+        except (ValueError, OverflowError):
+            pass
+
+    # ---------------- Tables ----------------
+    def _start_table(self):
+        table = _OpenTable()
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None and parent.kind == _SECTION_TABLE:
+            # Nested layout: the section number is the first cell of the row holding this table.
+            self._end_cell(parent)
+            section = clean_text(parent.row[0]) if parent.row else u""
+            if section.isdigit():
+                table.kind = _ELEMENT_TABLE
+                table.title = parent.title
+                table.section = section
+                parent.row_has_table = True
+        elif self._pending_sections:
+            # Flat layout: the section is taken when the table's first non-empty row closes.
+            table.kind = _ELEMENT_TABLE
+            table.title = self._title
+        self._stack.append(table)
+
+    def _end_cell(self, table):
+        if table.cell is not None:
+            if table.row is None:
+                table.row = []
+            table.row.append(clean_text(u"".join(table.cell)))
+            table.cell = None
+
+    def _end_row(self, table):
+        self._end_cell(table)
+        cells, has_table = table.row, table.row_has_table
+        table.row, table.row_has_table = None, False
+        if not cells or not any(cells):
+            return
+
+        title = self._match_title(cells)
+        if title is not None:
+            table.kind = _SECTION_TABLE
+            table.title = title
+            self._title = title
+            self._pending_sections.clear()
+            if title not in self.report.found_titles:
+                self.report.found_titles.append(title)
+        elif table.kind == _SECTION_TABLE:
+            self._section_row(table, cells, has_table)
+        elif table.kind == _ELEMENT_TABLE:
+            self._element_row(table, cells)
+
+    def _match_title(self, cells):
+        for cell in cells:
+            title = _TITLES_BY_TEXT.get(cell.lower())
+            if title is not None:
+                return title
+        return None
+
+    def _section_row(self, table, cells, has_table):
+        if not self.report.critical_path:
+            for cell in cells:
+                path = parse_critical_path(cell)
+                if path:
+                    self.report.critical_path = path
+                    return
+        section = cells[0]
+        if not section.isdigit():
+            return
+        total = u""
+        for cell in reversed(cells[1:]):
+            if cell:
+                total = cell
+                break
+        self.report.add_section(table.title, section, total)
+        if not has_table:
+            self._pending_sections.append(section)
+
+    def _element_row(self, table, cells):
+        if table.section is None:
+            if not self._pending_sections:
+                table.kind = _TABLE
+                self.report.unpaired_tables += 1
+                return
+            table.section = self._pending_sections.popleft()
+
+        # The first embedded table's header names the columns; later tables
+        # may repeat it or start straight with element rows.
+        columns = self.report.columns[table.title]
+        if not columns:
+            columns.extend(cell or u"Col{0}".format(index + 1) for index, cell in enumerate(cells))
+            return
+        if cells == columns:
+            return
+
+        record = {u"Section": table.section}
+        for index, column in enumerate(columns):
+            record[column] = cells[index] if index < len(cells) else u""
+        self.report.add_record(table.title, record)
+
+
+def read_report_chunks(chunks):
+    """Parse an iterable of text chunks and return the PressureLossReport."""
+    parser = PressureLossReportParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return parser.report
+
+
+def iter_file_chunks(path, chunk_size=1 << 16, encoding="utf-8"):
+    with io.open(path, "r", encoding=encoding, errors="replace") as report_file:
+        while True:
+            chunk = report_file.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def read_report(path, chunk_size=1 << 16, encoding="utf-8"):
+    return read_report_chunks(iter_file_chunks(path, chunk_size, encoding))
+
+
+# -----------------------------------------------------------------------------
+# Fixtures
+# -----------------------------------------------------------------------------
+
+STRAIGHT_COLUMNS = [u"Element ID", u"Type Mark", u"Comments", u"Size", u"Flow", u"Length",
+                    u"Velocity", u"Friction", u"System Name", u"Pressure Loss"]
+FITTING_COLUMNS = [u"Element ID", u"Type Mark", u"Comments", u"ASHRAE Table", u"Size",
+                   u"System Name", u"Pressure Loss"]
+TOTAL_COLUMNS = [u"Element", u"Flow", u"Size", u"Velocity", u"Length", u"Friction", u"Total Pressure Loss"]
+
+
+def iter_fixture_html(section_count, rows_per_section, nested=True, seed=1):
+    """Yield a synthetic report in chunks, shaped like Revit's export.
+
+    nested=False closes each section table before its element tables, the
+    way some exports are read. Element ids run 100000, 100001, ...; section
+    s is on the critical path when s % 3 == 1.
+    """
+    import random
+    rng = random.Random(seed)
+    next_id = [100000]
+    critical = u"-".join(str(section) for section in range(1, section_count + 1) if section % 3 == 1)
+
+    def element_table(columns, section, title):
+        rows = [u"<table border=\"1\"><tr>" + u"".join(u"<th>{0}</th>".format(column) for column in columns) + u"</tr>"]
+        for _ in range(rows_per_section):
+            element_id = next_id[0]
+            next_id[0] += 1
+            values = {
+                u"Element ID": str(element_id),
+                u"Element": u"Duct" if title != TITLE_FITTINGS else u"Fitting",
+                u"Type Mark": u"TM-{0}".format(section),
+                u"Comments": u"",
+                u"ASHRAE Table": u"SD5-{0}".format(rng.randint(1, 40)),
+                u"Size": u"{0}\"x{1}\"".format(rng.choice((8, 10, 12, 14)), rng.choice((6, 8, 10))),
+                u"Flow": u"{0} CFM".format(200 + section * 5 + rng.randint(0, 50)),
+                u"Length": u"{0}' - {1} {2}/8\"".format(rng.randint(0, 30), rng.randint(0, 11), rng.randint(1, 7)),
+                u"Velocity": u"{0} FPM".format(rng.randint(300, 1500)),
+                u"Friction": u"{0:.3f} in-wg/100ft".format(rng.uniform(0.02, 0.2)),
+                u"System Name": u"SA-{0}".format(section % 4 + 1),
+                u"Pressure Loss": u"{0:.4f} in-wg".format(rng.uniform(0.0, 0.1)),
+                u"Total Pressure Loss": u"{0:.4f} in-wg".format(rng.uniform(0.0, 0.1)),
+            }
+            rows.append(u"<tr>" + u"".join(u"<td>{0}</td>".format(values[column].replace(u"\"", u"&quot;"))
+                                           for column in columns) + u"</tr>\n")
+        rows.append(u"</table>")
+        return u"".join(rows)
+
+    yield u"<html><head><title>Duct Pressure Loss Report</title></head><body>\n"
+    for title, columns in ((TITLE_TOTAL, TOTAL_COLUMNS), (TITLE_STRAIGHT, STRAIGHT_COLUMNS), (TITLE_FITTINGS, FITTING_COLUMNS)):
+        yield u"<h2>{0}</h2>\n<table border=\"1\"><tr><td colspan=\"3\">{0}</td></tr>\n".format(title)
+        yield u"<tr><th>Section</th><th>Elements</th><th>Total Pressure Loss</th></tr>\n"
+        flat_tables = []
+        for section in range(1, section_count + 1):
+            embedded = element_table(columns, section, title)
+            total = u"{0:.4f}&nbsp;in-wg".format(rng.uniform(0.01, 0.5))
+            if nested:
+                yield u"<tr><td>{0}</td><td>{1}</td><td>{2}</td></tr>\n".format(section, embedded, total)
+            else:
+                yield u"<tr><td>{0}</td><td></td><td>{1}</td></tr>\n".format(section, total)
+                flat_tables.append(embedded)
+        if title == TITLE_TOTAL:
+            yield u"<tr><td colspan=\"3\">Critical Path : {0} ; Total Pressure Loss : 0.4500 in-wg</td></tr>\n".format(critical)
+        yield u"</table>\n"
+        for embedded in flat_tables:
+            yield embedded + u"\n"
+    yield u"</body></html>\n"
+
+
+# -----------------------------------------------------------------------------
+# Self-check
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import os
+    import shutil
+    import tempfile
+    import time
+
+    assert parse_feet_inches(u"12' - 6 1/2\"") == round(12 + 6.5 / 12.0, 4)
+    assert parse_feet_inches(u"3'-0\"") == 3.0 and parse_feet_inches(u"7'") == 7.0
+    assert parse_feet_inches(u"0' - 0 3/8\"") == round(0.375 / 12.0, 4) and parse_feet_inches(u"") is None
+    assert parse_number(u"1,250 CFM") == 1250.0 and parse_number(u"0.082 in-wg/100ft") == 0.082
+    assert parse_critical_path(u"Critical Path : 1-4-7 ; Total Pressure Loss : 0.45 in-wg") == [u"1", u"4", u"7"]
+
+    def check(report, section_count, rows_per_section):
+        for title in REPORT_TITLES:
+            assert len(report.sections[title]) == section_count, title
+            assert len(report.records[title]) == section_count * rows_per_section, title
+        first_id = 100000 + section_count * rows_per_section
+        assert report.element_records(TITLE_STRAIGHT, str(first_id))[0][u"Section"] == u"1"
+        assert report.element_records(TITLE_STRAIGHT, str(first_id + rows_per_section))[0][u"Section"] == u"2"
+        assert len(report.section_records(TITLE_FITTINGS, str(section_count))) == rows_per_section
+        assert report.critical_path[:2] == [u"1", u"4"] and report.unpaired_tables == 0
+        assert report.columns[TITLE_STRAIGHT] == STRAIGHT_COLUMNS
+
+    def old_join_seconds(report, sample):
+        """The pre-streaming join: search every section's text for each element id."""
+        details = [(section, u" ".join(u" ".join(record.values()) for record in records))
+                   for section, records in report.by_section[TITLE_STRAIGHT].items()]
+        started = time.time()
+        for element_id in sample:
+            [section for section, text in details if element_id in text]
+        return time.time() - started
+
+    # Both layouts, and chunk boundaries anywhere in a tag or entity.
+    for nested in (True, False):
+        text = u"".join(iter_fixture_html(12, 4, nested=nested))
+        whole = read_report_chunks([text])
+        check(whole, 12, 4)
+        tiny = read_report_chunks(text[index:index + 7] for index in range(0, len(text), 7))
+        assert tiny.records == whole.records and tiny.sections == whole.sections
+    combined = combine_duct_data(whole)
+    assert len(combined) == 12 * 4 * 2 and list(combined[0].keys()) == COLUMN_ORDER
+    assert all(row[u"Flow"] == combined[-1][u"Flow"] for row in combined if row[u"Section"] == combined[-1][u"Section"])
+    assert len(combine_duct_data(whole, critical_only=True)) == 4 * 4 * 2
+
+    root = tempfile.mkdtemp()
+    try:
+        timings = []
+        for section_count in (1000, 4000):
+            path = os.path.join(root, "report_{0}.html".format(section_count))
+            with io.open(path, "w", encoding="utf-8") as fixture:
+                for chunk in iter_fixture_html(section_count, 6):
+                    fixture.write(chunk)
+            started = time.time()
+            report = read_report(path)
+            seconds = time.time() - started
+            check(report, section_count, 6)
+            timings.append((section_count, os.path.getsize(path), seconds, report))
+
+        for section_count, size, seconds, report in timings:
+            print("{0} sections, {1:.1f} MB: {2:.2f}s ({3} element rows)".format(
+                section_count, size / 1048576.0, seconds, sum(len(records) for records in report.records.values())))
+
+        report = timings[-1][3]
+        sample = sorted(report.by_element[TITLE_STRAIGHT])[::60]
+        started = time.time()
+        for element_id in sample:
+            report.element_records(TITLE_STRAIGHT, element_id)
+        print("  section lookup for {0} ids: dict {1:.4f}s, text search {2:.2f}s".format(
+            len(sample), time.time() - started, old_join_seconds(report, sample)))
+
+        try:
+            import tracemalloc
+        except ImportError:
+            tracemalloc = None
+        if tracemalloc is not None:
+            parser = PressureLossReportParser()
+            parser.report.add_record = lambda title, record: None
+            tracemalloc.start()
+            for chunk in iter_file_chunks(os.path.join(root, "report_4000.html")):
+                parser.feed(chunk)
+            parser.close()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print("  parser peak memory without records: {0:.0f} KB for a {1:.1f} MB file".format(
+                peak / 1024.0, timings[-1][1] / 1048576.0))
+    finally:
+        shutil.rmtree(root)
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+__title__     = "Pressure Loss \nReport Reader"
+__version__   = 'Version = v0.6'
+__doc__       = """Version = v0.6
+Date    = 12.17.2025
+_________________________________________________________________
+Description:
+Read a Duct Pressure Loss Report HTML file exported from Revit and
+list every straight segment and fitting by section, with the
+critical path marked and element links back to the model.
+
+_________________________________________________________________
+How-to:
+- Export the Duct Pressure Loss Report as HTML
+- Run the tool and pick the .html file
+- CSVs are written next to the report
+
+_________________________________________________________________
+Last update:
+- [12.17.2025] - v0.1 BETA RELEASE
+- [12.19.2025] - v0.5 BETA RELEASE
+- [10.18.2026] - v0.6 Streaming parser; sections and elements joined by id
+_________________________________________________________________
+Author: Kyle Guggenheim"""
+"""
+Reads these 3 report tables from the Pressure Loss Report HTML:
+
+Table1 = 'Total Pressure Loss Calculations by Sections'
+Table2 = 'Detail Information of Straight Segment by Sections'
+Table3 = 'Fitting and Accessory Loss Coefficient Summary by Sections'
+
+Outputs (written next to the selected .html file):
+- <name>__straight_segments.csv
+- <name>__fittings_accessories.csv
+- <name>__total_pressure_loss.csv
+- <name>__ductdata_all.csv
+"""
+
+#____________________________________________________________________ IMPORTS (SYSTEM)
+import os
+import re
+import csv
+import codecs
+
+#____________________________________________________________________ IMPORTS (PYREVIT)
+from pyrevit import script
+from pyrevit.script import output
+
+#____________________________________________________________________ IMPORTS (AUTODESK)
+from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory
+
+#____________________________________________________________________ IMPORTS (CUSTOM)
+from pressure_loss_report import (
+    COLUMN_ORDER,
+    REPORT_TITLES,
+    TITLE_FITTINGS,
+    TITLE_STRAIGHT,
+    TITLE_TOTAL,
+    combine_duct_data,
+    read_report,
+)
+
+
+#____________________________________________________________________ VARIABLES
+uidoc       = __revit__.ActiveUIDocument
+doc         = __revit__.ActiveUIDocument.Document   #type: Document
+
+output_window = output.get_output()
+logger = script.get_logger()
+
+action = "Pressure Loss Report Reader"
+
+CSV_SUFFIXES = {
+    TITLE_TOTAL: "__total_pressure_loss.csv",
+    TITLE_STRAIGHT: "__straight_segments.csv",
+    TITLE_FITTINGS: "__fittings_accessories.csv",
+}
+
+REPORT_CATEGORIES = [
+    BuiltInCategory.OST_DuctCurves,
+    BuiltInCategory.OST_FlexDuctCurves,
+    BuiltInCategory.OST_DuctFitting,
+    BuiltInCategory.OST_DuctAccessory,
+]
+
+try:
+    from System.Windows.Forms import OpenFileDialog, DialogResult
+except Exception:
+    OpenFileDialog = None
+
+
+#____________________________________________________________________ UTILITIES
+def safe_filename(s):
+    return re.sub(r"[^\w\-\.]+", "_", s)
+
+def write_csv(path, headers, rows):
+    with codecs.open(path, "w", "utf-8") as f:
+        w = csv.writer(f)
+        w.writerow([h for h in headers])
+        for r in rows:
+            w.writerow(["" if v is None else v for v in r])
+
+def pick_html_file():
+    if OpenFileDialog is None:
+        return None
+    dlg = OpenFileDialog()
+    dlg.Filter = "HTML Files (*.html;*.htm)|*.html;*.htm|All Files (*.*)|*.*"
+    dlg.Title = "Select Pressure Loss Report HTML"
+    if dlg.ShowDialog() == DialogResult.OK:
+        return dlg.FileName
+    return None
+
+def collect_report_elements(element_ids):
+    """One pass over the duct categories -> {element id text: element} for the ids in the report."""
+    elements = {}
+    for category in REPORT_CATEGORIES:
+        collector = FilteredElementCollector(doc).OfCategory(category).WhereElementIsNotElementType()
+        for element in collector:
+            id_text = element.Id.ToString()
+            if id_text in element_ids:
+                elements[id_text] = element
+    return elements
+
+def element_link(elements, element_id):
+    element = elements.get(element_id)
+    if element is None:
+        return "N/A"
+    return output_window.linkify(element.Id)
+
+
+#____________________________________________________________________ MAIN
+def main():
+    html_path = pick_html_file()
+    if not html_path:
+        script.exit()
+
+    report = read_report(html_path)
+    if not report.found_titles:
+        logger.error("No Pressure Loss Report tables detected in the selected HTML.")
+        script.exit()
+
+    output_window.print_md("### {}".format(action))
+    output_window.print_md("* Source: `{}`".format(html_path))
+    output_window.print_md("**Critical Path:** {}".format(" - ".join(report.critical_path) or "Not found"))
+
+    base_dir = os.path.dirname(html_path)
+    base_name = safe_filename(os.path.splitext(os.path.basename(html_path))[0])
+
+    for title in REPORT_TITLES:
+        if title not in report.found_titles:
+            output_window.print_md("* **{}**: Not found (title row not detected)".format(title))
+            continue
+        columns = ["Section"] + report.columns[title]
+        rows = [[record.get(column, "") for column in columns] for record in report.records[title]]
+        out_path = os.path.join(base_dir, base_name + CSV_SUFFIXES[title])
+        write_csv(out_path, columns, rows)
+        output_window.print_md("* **{}** → `{}`: {} sections, {} rows".format(
+            title, out_path, len(report.sections[title]), len(rows)))
+    if report.unpaired_tables:
+        logger.warning("{} element tables could not be paired with a section row.".format(report.unpaired_tables))
+
+    duct_data = combine_duct_data(report)
+    write_csv(os.path.join(base_dir, base_name + "__ductdata_all.csv"), COLUMN_ORDER,
+              [list(row.values()) for row in duct_data])
+
+    elements = collect_report_elements(report.element_ids())
+    columns = ["Element Link"] + COLUMN_ORDER
+    for title, rows in (("Duct Data", duct_data), ("Critical Path", [row for row in duct_data if row["Critical Path"]])):
+        table_data = [[element_link(elements, row["Element ID"])] + list(row.values()) for row in rows]
+        output_window.print_table(table_data=table_data, columns=columns, title=title)
+
+
+main()
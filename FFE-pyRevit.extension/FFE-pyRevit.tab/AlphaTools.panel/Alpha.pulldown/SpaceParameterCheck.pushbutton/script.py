@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 __title__     = "Space Parameter Check"
-__version__   = 'Version = v1.0'
-__doc__       = """Version = v1.0
+__version__   = 'Version = v1.2'
+__doc__       = """Version = v1.2
 Date    = 07.02.2026
 ___________________________________________________________________
 Description:
@@ -16,6 +16,8 @@ How-to:
 ___________________________________________________________________
 Last update:
 - [07.02.2026] - v1.0 RELEASE
+- [10.18.2026] - v1.1 Room lookup uses a per-level grid of room boundary polygons instead of testing every room
+- [10.18.2026] - v1.2 Link rooms are read once per link document and shared by every instance of that link
 ___________________________________________________________________
 Author: Kyle Guggenheim"""
 
@@ -31,6 +33,9 @@ from Autodesk.Revit.UI import *
 from pyrevit import revit, script, DB, UI
 from pyrevit import forms
 
+#____________________________________________________________________ IMPORTS (CUSTOM)
+from Spatial.room_locator import RoomLocator
+
 #____________________________________________________________________ VARIABLES
 uidoc  = __revit__.ActiveUIDocument
 doc    = __revit__.ActiveUIDocument.Document #type: Document
@@ -186,8 +191,110 @@ def collect_rooms(owner_doc):
         return []
 
 
+def get_room_loops(room, options):
+    """Room boundary loops as lists of (x, y) vertices; arcs and splines are tessellated."""
+    loops = []
+    try:
+        segment_loops = room.GetBoundarySegments(options)
+    except Exception:
+        return loops
+    if not segment_loops:
+        return loops
+
+    for segment_loop in segment_loops:
+        loop = []
+        for segment in segment_loop:
+            try:
+                points = list(segment.GetCurve().Tessellate())
+            except Exception:
+                continue
+            # Each curve ends where the next starts; keep the start points only.
+            for point in points[:-1]:
+                loop.append((point.X, point.Y))
+        if len(loop) >= 3:
+            loops.append(loop)
+    return loops
+
+
+def build_room_locator(rooms):
+    """Extract every placed room's boundary once and bucket it into a per-level grid."""
+    locator = RoomLocator()
+    options = DB.SpatialElementBoundaryOptions()
+
+    for room in rooms:
+        try:
+            if not room or room.Location is None or room.Area <= 0:
+                continue
+            bounding_box = room.get_BoundingBox(None)
+            if not bounding_box:
+                continue
+            level_key = room.LevelId.ToString()
+        except Exception:
+            continue
+
+        loops = get_room_loops(room, options)
+        if loops:
+            locator.add_room(room, level_key, loops, bounding_box.Min.Z, bounding_box.Max.Z)
+
+    return locator.build()
+
+
+def link_document_key(link_doc):
+    try:
+        return "doc:{}".format(link_doc.GetHashCode())
+    except Exception:
+        return "doc:{}".format(link_doc.Title)
+
+
+def transform_to_matrix(transform):
+    """Flatten a Transform into (origin, basis X, basis Y, basis Z) floats."""
+    origin = transform.Origin
+    basis_x = transform.BasisX
+    basis_y = transform.BasisY
+    basis_z = transform.BasisZ
+    return (
+        origin.X, origin.Y, origin.Z,
+        basis_x.X, basis_x.Y, basis_x.Z,
+        basis_y.X, basis_y.Y, basis_y.Z,
+        basis_z.X, basis_z.Y, basis_z.Z,
+    )
+
+
+def apply_matrix(matrix, x, y, z):
+    ox, oy, oz, xx, xy, xz, yx, yy, yz, zx, zy, zz = matrix
+    return (
+        ox + xx * x + yx * y + zx * z,
+        oy + xy * x + yy * y + zy * z,
+        oz + xz * x + yz * y + zz * z,
+    )
+
+
+def get_link_inverse_matrix(link_instance):
+    try:
+        transform = link_instance.GetTotalTransform()
+    except Exception:
+        try:
+            transform = link_instance.GetTransform()
+        except Exception:
+            transform = None
+
+    if not transform:
+        return None
+
+    try:
+        return transform_to_matrix(transform.Inverse)
+    except Exception:
+        return None
+
+
 def collect_link_contexts(host_doc):
+    """One context per placed link instance; room data is shared per link document.
+
+    Each unique link document gets a single collector pass and room locator.
+    Instances only add their own inverse transform, flattened once up front.
+    """
     contexts = []
+    documents = {}
     try:
         link_instances = (
             DB.FilteredElementCollector(host_doc)
@@ -206,33 +313,29 @@ def collect_link_contexts(host_doc):
         except Exception:
             continue
 
-        try:
-            transform = link_instance.GetTotalTransform()
-        except Exception:
-            try:
-                transform = link_instance.GetTransform()
-            except Exception:
-                transform = None
-
-        if not transform:
+        inverse_matrix = get_link_inverse_matrix(link_instance)
+        if inverse_matrix is None:
             continue
 
-        try:
-            inverse_transform = transform.Inverse
-        except Exception:
-            continue
+        key = link_document_key(link_doc)
+        document = documents.get(key)
+        if document is None:
+            document = {
+                "doc": link_doc,
+                "title": link_doc.Title,
+                "room_locator": build_room_locator(collect_rooms(link_doc))
+            }
+            documents[key] = document
 
         contexts.append({
-            "doc": link_doc,
-            "title": link_doc.Title,
-            "inverse_transform": inverse_transform,
-            "rooms": collect_rooms(link_doc)
+            "document": document,
+            "inverse_matrix": inverse_matrix
         })
 
     return contexts
 
 
-def find_room_at_point(owner_doc, point, rooms, phase=None):
+def find_room_at_point(owner_doc, point, room_locator, phase=None):
     if point is None:
         return None
 
@@ -251,14 +354,7 @@ def find_room_at_point(owner_doc, point, rooms, phase=None):
     except Exception:
         pass
 
-    for room in rooms:
-        try:
-            if room and room.IsPointInRoom(point):
-                return room
-        except Exception:
-            continue
-
-    return None
+    return room_locator.locate(point.X, point.Y, point.Z)
 
 
 def get_direct_space_room(space):
@@ -272,7 +368,7 @@ def get_direct_space_room(space):
     return None
 
 
-def find_associated_room(space, host_doc, host_rooms, link_contexts):
+def find_associated_room(space, host_doc, host_room_locator, link_contexts):
     direct_room = get_direct_space_room(space)
     if direct_room:
         return direct_room, "Direct"
@@ -282,19 +378,20 @@ def find_associated_room(space, host_doc, host_rooms, link_contexts):
         return None, "No Space location"
 
     phase = get_space_phase(space, host_doc)
-    host_room = find_room_at_point(host_doc, point, host_rooms, phase)
+    host_room = find_room_at_point(host_doc, point, host_room_locator, phase)
     if host_room:
         return host_room, host_doc.Title
 
     for context in link_contexts:
+        document = context["document"]
         try:
-            link_point = context["inverse_transform"].OfPoint(point)
+            link_point = DB.XYZ(*apply_matrix(context["inverse_matrix"], point.X, point.Y, point.Z))
         except Exception:
             continue
 
-        link_room = find_room_at_point(context["doc"], link_point, context["rooms"])
+        link_room = find_room_at_point(document["doc"], link_point, document["room_locator"])
         if link_room:
-            return link_room, context["title"]
+            return link_room, document["title"]
 
     return None, "No associated Room found"
 
@@ -377,6 +474,7 @@ def main():
         return
 
     host_rooms = collect_rooms(host_doc)
+    host_room_locator = build_room_locator(host_rooms)
     link_contexts = collect_link_contexts(host_doc)
 
     number_yes = 0
@@ -389,7 +487,7 @@ def main():
 
     with revit.Transaction("FFE Space vs Room Check"):
         for space in spaces:
-            room, room_source = find_associated_room(space, host_doc, host_rooms, link_contexts)
+            room, room_source = find_associated_room(space, host_doc, host_room_locator, link_contexts)
 
             if room:
                 number_match = values_match(get_element_number(space), get_element_number(room))
@@ -428,7 +526,8 @@ def main():
     msg = []
     msg.append("Spaces checked: {}".format(len(spaces)))
     msg.append("Host Rooms available: {}".format(len(host_rooms)))
-    msg.append("Loaded linked models checked: {}".format(len(link_contexts)))
+    link_documents = set(id(context["document"]) for context in link_contexts)
+    msg.append("Loaded linked models checked: {} ({} instances)".format(len(link_documents), len(link_contexts)))
     msg.append("")
     msg.append("{}: {} YES / {} NO".format(NUMBER_CHECK_PARAM, number_yes, number_no))
     msg.append("{}: {} YES / {} NO".format(NAME_CHECK_PARAM, name_yes, name_no))
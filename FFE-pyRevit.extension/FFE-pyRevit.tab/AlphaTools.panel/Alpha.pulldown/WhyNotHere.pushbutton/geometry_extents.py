@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""Vertical extents helpers and summary cache for Why Not Here?
+
+The geometry walk is written against two callbacks (an object's own Z
+extents and its nested geometry) so the same code runs on Revit geometry
+and on plain tuples. ExtentsCache keeps per-element summaries keyed by
+(document, element id) and a change token, filled one field at a time.
+
+Pure Python so it can be checked outside Revit: python geometry_extents.py
+"""
+
+from collections import OrderedDict
+
+
+_MISSING = object()
+
+
+# -----------------------------------------------------------------------------
+# Extents
+# -----------------------------------------------------------------------------
+
+def merge_z_extents(first, second):
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return min(first[0], second[0]), max(first[1], second[1])
+
+
+def get_box_corners(box_min, box_max):
+    corners = []
+    for x in (box_min[0], box_max[0]):
+        for y in (box_min[1], box_max[1]):
+            for z in (box_min[2], box_max[2]):
+                corners.append((x, y, z))
+    return corners
+
+
+def get_transformed_box_z_extents(box_min, box_max, transform_point=None):
+    """Z range of a box's eight corners after transform_point; None if none map."""
+    z_values = []
+    for corner in get_box_corners(box_min, box_max):
+        try:
+            point = transform_point(corner) if transform_point else corner
+            z_values.append(point[2])
+        except Exception:
+            pass
+    if not z_values:
+        return None
+    return min(z_values), max(z_values)
+
+
+def collect_z_extents(root, get_object_extents, get_nested_geometry):
+    """Merge the Z extents of every object in root and its nested geometry.
+
+    root is an iterable of geometry objects. get_object_extents(obj) returns
+    (min_z, max_z) or None; get_nested_geometry(obj) returns another iterable
+    (e.g. instance geometry) or None. Walks with an explicit stack, so deep
+    nesting does not hit the recursion limit.
+    """
+    extents = None
+    stack = [root] if root is not None else []
+    while stack:
+        for geometry_object in stack.pop():
+            extents = merge_z_extents(extents, get_object_extents(geometry_object))
+            nested = get_nested_geometry(geometry_object)
+            if nested is not None:
+                stack.append(nested)
+    return extents
+
+
+# -----------------------------------------------------------------------------
+# Summary cache
+# -----------------------------------------------------------------------------
+
+class ExtentsCache(object):
+    """Per-element extents summaries, filled lazily one field at a time.
+
+    An entry is dropped when its change token differs from the one passed to
+    get() (a None token always matches) or when invalidate() names its key.
+    The oldest entries are evicted past max_entries.
+    """
+
+    def __init__(self, max_entries=50000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, token, field, compute):
+        entry = self.entries.get(key)
+        if entry is not None and token is not None and entry["token"] != token:
+            entry = None
+        if entry is None:
+            entry = {"token": token, "fields": {}}
+            self.entries.pop(key, None)
+            self.entries[key] = entry
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        value = entry["fields"].get(field, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            value = compute()
+            entry["fields"][field] = value
+        else:
+            self.hits += 1
+        return value
+
+    def invalidate(self, keys):
+        for key in keys:
+            self.entries.pop(key, None)
+
+    def invalidate_document(self, document_key):
+        for key in [key for key in self.entries if key[0] == document_key]:
+            del self.entries[key]
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# -----------------------------------------------------------------------------
+# Self-check
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    rng = random.Random(3)
+
+    # A geometry object is (box_min, box_max, offset_z, nested); nested objects
+    # are placed offset_z higher, like instance geometry under a transform.
+    def make_geometry(depth, offset):
+        objects = []
+        for _ in range(rng.randint(2, 5)):
+            base = rng.uniform(-5.0, 20.0) + offset
+            box = ((0.0, 0.0, base), (1.0, 1.0, base + rng.uniform(0.1, 3.0)))
+            nested = make_geometry(depth - 1, offset + 2.0) if depth and rng.random() < 0.4 else None
+            objects.append((box[0], box[1], nested))
+        return objects
+
+    def object_extents(geometry_object):
+        return get_transformed_box_z_extents(geometry_object[0], geometry_object[1])
+
+    def nested_geometry(geometry_object):
+        return geometry_object[2]
+
+    def recursive_extents(objects):
+        z_values = []
+        for geometry_object in objects:
+            box_extents = object_extents(geometry_object)
+            z_values.extend(box_extents)
+            if geometry_object[2] is not None:
+                nested = recursive_extents(geometry_object[2])
+                if nested:
+                    z_values.extend(nested)
+        return (min(z_values), max(z_values)) if z_values else None
+
+    elements = dict(("e{0}".format(index), make_geometry(6, 0.0)) for index in range(2000))
+    assert all(
+        collect_z_extents(geometry, object_extents, nested_geometry) == recursive_extents(geometry)
+        for geometry in elements.values()
+    )
+
+    cache = ExtentsCache()
+    rechecks = 5
+    started = time.time()
+    for _ in range(rechecks):
+        for element_id, geometry in elements.items():
+            collect_z_extents(geometry, object_extents, nested_geometry)
+    walk_seconds = time.time() - started
+
+    started = time.time()
+    for _ in range(rechecks):
+        for element_id, geometry in elements.items():
+            cache.get(("doc", element_id), "v1", "geometry",
+                      lambda: collect_z_extents(geometry, object_extents, nested_geometry))
+    cached_seconds = time.time() - started
+
+    changed = sorted(elements)[:100]
+    cache.invalidate([("doc", element_id) for element_id in changed])
+    misses_before = cache.misses
+    for element_id, geometry in elements.items():
+        cache.get(("doc", element_id), "v1", "geometry",
+                  lambda: collect_z_extents(geometry, object_extents, nested_geometry))
+
+    deep = None
+    for _ in range(3000):
+        deep = [((0.0, 0.0, 0.0), (1.0, 1.0, 1.0), deep)]
+
+    print("2000 elements x {0} rechecks: walk {1:.3f}s, cached {2:.3f}s ({3} hits, {4} misses)".format(
+        rechecks, walk_seconds, cached_seconds, cache.hits, misses_before))
+    print("  after invalidating 100: {0} re-walked".format(cache.misses - misses_before))
+    print("  3000-deep nesting: {0}".format(collect_z_extents(deep, object_extents, nested_geometry)))
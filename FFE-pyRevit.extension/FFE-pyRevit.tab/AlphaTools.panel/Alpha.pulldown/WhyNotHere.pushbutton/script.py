@@ -19,11 +19,14 @@ How-To:
 2. Use the active view or choose a target graphical view.
 3. Analyze, review issue cards, and optionally run safe fixes.
 4. Recheck after changes.
+5. Select several elements before running to audit them against many views
+   at once; blockers are listed in the pyRevit output window.
 
 ________________________________________________________________
 Scope:
 - One picked or selected host-model element.
 - One target graphical model view.
+- Batch mode: many selected elements against many views, report only.
 - Linked-model elements and complex edge cases are not supported in v1.
 - Production views are never changed silently.
 
@@ -41,6 +44,8 @@ tmp/revert-snapshots/WhyNotHere.pushbutton-before-wpf-20260625-205216/
 
 ________________________________________________________________
 Last Updates:
+- [18.10.2026] v0.3.19 Cache element vertical extents per element and change token; walk nested geometry without recursion.
+- [18.10.2026] v0.3.18 Add a batch visibility matrix for multi-element selections, reading each view's state once per view.
 - [27.06.2026] v0.3.17 Split blocker and possible issue header statuses.
 - [27.06.2026] v0.3.16 Expand and emphasize possible issues whenever they exist.
 - [27.06.2026] v0.3.15 Highlight possible-issue results in the header and collapsed possible section.
@@ -95,6 +100,8 @@ from Autodesk.Revit.DB import (
     BuiltInCategory,
     BuiltInParameter,
     ElementId,
+    ElementType,
+    Family,
     FilteredElementCollector,
     Options,
     OverrideGraphicSettings,
@@ -117,6 +124,8 @@ from Autodesk.Revit.UI.Selection import ObjectType
 
 from pyrevit import forms, script
 
+from geometry_extents import ExtentsCache, collect_z_extents, get_transformed_box_z_extents
+
 
 uidoc = __revit__.ActiveUIDocument
 doc = uidoc.Document if uidoc else None
@@ -132,6 +141,10 @@ except NameError:
         "ui": None
     }
 
+if "extents_cache" not in _WNH_STATE:
+    _WNH_STATE["extents_cache"] = ExtentsCache()
+    _WNH_STATE["extents_watcher"] = None
+
 
 # -----------------------------------------------------------------------------
 # Constants and simple models
@@ -354,6 +367,20 @@ def get_element_label(element):
     return "{0} - ID {1}".format(category_name, get_element_id_value(element.Id))
 
 
+def get_selected_batch_elements(revit_doc):
+    """Return the selected categorized elements when more than one is selected."""
+    selected_ids = list(uidoc.Selection.GetElementIds())
+    if len(selected_ids) < 2:
+        return []
+
+    elements = []
+    for element_id in selected_ids:
+        element = revit_doc.GetElement(element_id)
+        if element is not None and element.Category is not None:
+            elements.append(element)
+    return elements if len(elements) > 1 else []
+
+
 def get_initial_element(revit_doc):
     selected_ids = list(uidoc.Selection.GetElementIds())
     if len(selected_ids) == 1:
@@ -396,9 +423,9 @@ def view_can_be_target(view):
     return True
 
 
-def collect_target_views(revit_doc):
+def collect_target_views(revit_doc, include_active=False):
     views = []
-    active_view_id = uidoc.ActiveView.Id if uidoc and uidoc.ActiveView else None
+    active_view_id = uidoc.ActiveView.Id if uidoc and uidoc.ActiveView and not include_active else None
     collector = FilteredElementCollector(revit_doc).OfClass(View)
     for view in collector:
         if active_view_id and ids_are_equal(view.Id, active_view_id):
@@ -409,6 +436,212 @@ def collect_target_views(revit_doc):
     return views
 
 
+# -----------------------------------------------------------------------------
+# Element extents cache
+# -----------------------------------------------------------------------------
+
+def get_document_key(revit_doc):
+    try:
+        return revit_doc.PathName or revit_doc.Title
+    except Exception:
+        return str(revit_doc)
+
+
+def get_element_change_token(element):
+    # Element.VersionGuid changes whenever the element is modified; older APIs
+    # fall back to the DocumentChanged invalidation alone.
+    try:
+        return str(element.VersionGuid)
+    except Exception:
+        return None
+
+
+def get_cached_element_extents(element, field, read_func):
+    try:
+        key = (get_document_key(element.Document), get_element_id_value(element.Id))
+    except Exception:
+        return read_func(element)
+
+    ensure_extents_watcher()
+    return _WNH_STATE["extents_cache"].get(
+        key,
+        get_element_change_token(element),
+        field,
+        lambda: read_func(element)
+    )
+
+
+def on_document_changed(sender, args):
+    cache = _WNH_STATE.get("extents_cache")
+    if cache is None or not cache.entries:
+        return
+    try:
+        revit_doc = args.GetDocument()
+        document_key = get_document_key(revit_doc)
+        changed_ids = list(args.GetModifiedElementIds()) + list(args.GetDeletedElementIds())
+    except Exception:
+        cache.clear()
+        return
+
+    keys = []
+    for element_id in changed_ids:
+        key = (document_key, get_element_id_value(element_id))
+        if key in cache.entries:
+            keys.append(key)
+            continue
+        # Editing a type or family changes the geometry of every instance
+        # without modifying the instances themselves.
+        try:
+            if isinstance(revit_doc.GetElement(element_id), (ElementType, Family)):
+                cache.invalidate_document(document_key)
+                return
+        except Exception:
+            pass
+    cache.invalidate(keys)
+
+
+def ensure_extents_watcher():
+    if _WNH_STATE.get("extents_watcher") is not None:
+        return
+    try:
+        application = __revit__.Application
+        application.DocumentChanged += on_document_changed
+        _WNH_STATE["extents_watcher"] = on_document_changed
+    except Exception as err:
+        # Without the watcher, cached extents are only refreshed through the
+        # element change token.
+        logger.debug("Could not watch document changes: {0}".format(err))
+        _WNH_STATE["extents_watcher"] = False
+
+
+# -----------------------------------------------------------------------------
+# View visibility context
+# -----------------------------------------------------------------------------
+
+class ViewVisibilityContext(object):
+    """View state the diagnostics read, captured once per target view.
+
+    Filters, view range planes, crop/section boxes, phase and design option
+    settings are read up front; category and workset visibility are cached as
+    each id is first asked for. Reuse one context across elements for the
+    same view, and build a new one after changing the view.
+    """
+
+    def __init__(self, revit_doc, target_view, phase_order=None):
+        self.view = target_view
+        self.view_id_value = get_element_id_value(target_view.Id)
+        self._category_hidden = {}
+        self._workset_visibility = {}
+        self._default_workset_visibility = None
+        self._capture_filters(revit_doc)
+        self._capture_phase(revit_doc, phase_order)
+        self._capture_design_option()
+        self._capture_view_range(revit_doc)
+        self._capture_boxes()
+
+    def _capture_filters(self, revit_doc):
+        self.filters = []
+        self.filters_error = None
+        self.filter_count = 0
+        try:
+            filter_ids = list(self.view.GetFilters())
+        except Exception as err:
+            self.filters_error = err
+            return
+
+        self.filter_count = len(filter_ids)
+        for filter_id in filter_ids:
+            filter_element = revit_doc.GetElement(filter_id)
+            if filter_element is None:
+                continue
+            try:
+                is_visible = self.view.GetFilterVisibility(filter_id)
+            except Exception:
+                is_visible = True
+            self.filters.append(compile_view_filter(filter_element, is_visible))
+
+    def _capture_phase(self, revit_doc, phase_order):
+        self.phase_order = phase_order if phase_order is not None else get_phase_order(revit_doc)
+        self.view_phase_id = get_parameter_element_id(self.view, BuiltInParameter.VIEW_PHASE)
+        self.phase_filter_id = get_parameter_element_id(self.view, BuiltInParameter.VIEW_PHASE_FILTER)
+        self.view_phase_order = self.phase_order.get(get_element_id_value(self.view_phase_id))
+        self.view_phase_name = get_name(revit_doc, self.view_phase_id)
+        self.phase_filter_name = get_name(revit_doc, self.phase_filter_id)
+
+    def _capture_design_option(self):
+        view_option_parameter = get_built_in_parameter("VIEWER_OPTION_VISIBILITY")
+        try:
+            if view_option_parameter is None:
+                self.view_option_id = ElementId.InvalidElementId
+            else:
+                self.view_option_id = get_parameter_element_id(self.view, view_option_parameter)
+        except Exception:
+            self.view_option_id = ElementId.InvalidElementId
+
+    def _capture_view_range(self, revit_doc):
+        self.discipline_parameter = get_view_discipline_parameter(self.view)
+        self.absolute_planes = get_view_range_absolute_planes(revit_doc, self.view)
+        self.view_range_planes = None
+        self.view_range_error = None
+        if not isinstance(self.view, ViewPlan):
+            return
+        try:
+            view_range = self.view.GetViewRange()
+            self.view_range_planes = {
+                "top": get_view_range_plane_info(revit_doc, view_range, PlanViewPlane.TopClipPlane),
+                "bottom": get_view_range_plane_info(revit_doc, view_range, PlanViewPlane.BottomClipPlane),
+                "depth": get_view_range_plane_info(revit_doc, view_range, PlanViewPlane.ViewDepthPlane),
+            }
+        except Exception as err:
+            self.view_range_error = err
+
+    def _capture_boxes(self):
+        self.section_box = None
+        self.section_box_inverse = None
+        self.section_box_error = None
+        self.crop_box = None
+        self.crop_box_inverse = None
+        self.crop_box_error = None
+
+        if isinstance(self.view, View3D):
+            try:
+                if self.view.IsSectionBoxActive:
+                    self.section_box = self.view.GetSectionBox()
+                    self.section_box_inverse = get_box_inverse_transform(self.section_box)
+            except Exception as err:
+                self.section_box_error = err
+
+        try:
+            if hasattr(self.view, "CropBoxActive") and self.view.CropBoxActive:
+                self.crop_box = self.view.CropBox
+                self.crop_box_inverse = get_box_inverse_transform(self.crop_box)
+        except Exception as err:
+            self.crop_box_error = err
+
+    def is_category_hidden(self, category_id):
+        key = get_element_id_value(category_id)
+        if key not in self._category_hidden:
+            self._category_hidden[key] = self.view.GetCategoryHidden(category_id)
+        return self._category_hidden[key]
+
+    def get_workset_visibility(self, workset_id):
+        key = get_element_id_value(workset_id)
+        if key not in self._workset_visibility:
+            self._workset_visibility[key] = self.view.GetWorksetVisibility(workset_id)
+        return self._workset_visibility[key]
+
+    def get_default_workset_visibility(self, revit_doc):
+        if self._default_workset_visibility is None:
+            self._default_workset_visibility = WorksetDefaultVisibilitySettings.GetWorksetDefaultVisibilitySettings(revit_doc)
+        return self._default_workset_visibility
+
+
+def get_view_context(revit_doc, target_view, context=None):
+    if context is not None and context.view_id_value == get_element_id_value(target_view.Id):
+        return context
+    return ViewVisibilityContext(revit_doc, target_view)
+
+
 # -----------------------------------------------------------------------------
 # Visibility diagnostics
 # -----------------------------------------------------------------------------
@@ -442,10 +675,11 @@ def check_element_hidden(element, target_view):
         )
 
 
-def check_category_hidden(element, target_view):
+def check_category_hidden(element, target_view, context=None):
     category = element.Category
     try:
-        if target_view.GetCategoryHidden(category.Id):
+        context = get_view_context(element.Document, target_view, context)
+        if context.is_category_hidden(category.Id):
             return CheckResult(
                 "confirmed",
                 "Hidden category",
@@ -472,66 +706,84 @@ def check_category_hidden(element, target_view):
         )
 
 
-def filter_applies_to_element(revit_doc, filter_element, element):
+def compile_view_filter(filter_element, is_visible):
+    """Read a view filter's element ids, categories and rule filter once."""
+    compiled = {
+        "element": filter_element,
+        "visible": is_visible,
+        "kind": None,
+        "element_ids": None,
+        "category_ids": None,
+        "element_filter": None,
+    }
+
     if isinstance(filter_element, SelectionFilterElement):
+        compiled["kind"] = "selection"
+        compiled["element_ids"] = set()
         try:
             for selected_id in filter_element.GetElementIds():
-                if ids_are_equal(selected_id, element.Id):
-                    return True
+                compiled["element_ids"].add(get_element_id_value(selected_id))
         except Exception:
             pass
-        return False
+        return compiled
 
     if isinstance(filter_element, ParameterFilterElement):
+        compiled["kind"] = "parameter"
         try:
-            category_ids = list(filter_element.GetCategories())
-            category_match = False
-            for category_id in category_ids:
-                if ids_are_equal(category_id, element.Category.Id):
-                    category_match = True
-                    break
-            if not category_match:
-                return False
+            compiled["category_ids"] = set([
+                get_element_id_value(category_id) for category_id in filter_element.GetCategories()
+            ])
         except Exception:
-            pass
+            compiled["category_ids"] = None
+        try:
+            compiled["element_filter"] = filter_element.GetElementFilter()
+        except Exception:
+            compiled["element_filter"] = None
+
+    return compiled
+
+
+def filter_applies_to_element(revit_doc, compiled_filter, element):
+    if compiled_filter["kind"] == "selection":
+        return get_element_id_value(element.Id) in compiled_filter["element_ids"]
+
+    if compiled_filter["kind"] == "parameter":
+        category_ids = compiled_filter["category_ids"]
+        if category_ids is not None:
+            try:
+                if get_element_id_value(element.Category.Id) not in category_ids:
+                    return False
+            except Exception:
+                pass
 
         try:
-            element_filter = filter_element.GetElementFilter()
-            return element_filter.PassesFilter(revit_doc, element.Id)
+            return compiled_filter["element_filter"].PassesFilter(revit_doc, element.Id)
         except Exception:
             return True
 
     return False
 
 
-def check_view_filters(revit_doc, element, target_view):
+def check_view_filters(revit_doc, element, target_view, context=None):
     results = []
-    try:
-        filter_ids = list(target_view.GetFilters())
-    except Exception as err:
+    context = get_view_context(revit_doc, target_view, context)
+    if context.filters_error is not None:
         return [CheckResult(
             "possible",
             "Could not check view filters",
             "Revit could not list filters on the target view.",
-            str(err),
+            str(context.filters_error),
             "Open Visibility/Graphics and review view filters manually."
         )]
 
     invisible_matching_filters = []
     visible_matching_filters = []
-    for filter_id in filter_ids:
-        filter_element = revit_doc.GetElement(filter_id)
-        if filter_element is None:
-            continue
-        if filter_applies_to_element(revit_doc, filter_element, element):
-            try:
-                is_visible = target_view.GetFilterVisibility(filter_id)
-            except Exception:
-                is_visible = True
-            if is_visible:
-                visible_matching_filters.append(filter_element)
+    for compiled_filter in context.filters:
+        if filter_applies_to_element(revit_doc, compiled_filter, element):
+            if compiled_filter["visible"]:
+                visible_matching_filters.append(compiled_filter["element"])
             else:
-                invisible_matching_filters.append(filter_element)
+                invisible_matching_filters.append(compiled_filter["element"])
 
     for filter_element in invisible_matching_filters:
         results.append(CheckResult(
@@ -561,12 +813,12 @@ def check_view_filters(revit_doc, element, target_view):
         "passed",
         "No hiding view filter found",
         "No invisible target-view filter was found for this element.",
-        "Checked {0} filter(s).".format(len(filter_ids)),
+        "Checked {0} filter(s).".format(context.filter_count),
         "No correction needed."
     )]
 
 
-def check_workset(revit_doc, element, target_view):
+def check_workset(revit_doc, element, target_view, context=None):
     if not revit_doc.IsWorkshared:
         return CheckResult(
             "passed",
@@ -589,8 +841,9 @@ def check_workset(revit_doc, element, target_view):
             "Check workset visibility manually."
         )
 
+    context = get_view_context(revit_doc, target_view, context)
     try:
-        view_visibility = target_view.GetWorksetVisibility(workset_id)
+        view_visibility = context.get_workset_visibility(workset_id)
         if view_visibility == WorksetVisibility.Hidden:
             return CheckResult(
                 "confirmed",
@@ -605,8 +858,8 @@ def check_workset(revit_doc, element, target_view):
         view_visibility = None
 
     try:
-        default_visibility = WorksetDefaultVisibilitySettings.GetWorksetDefaultVisibilitySettings(revit_doc)
         if view_visibility == WorksetVisibility.UseGlobalSetting:
+            default_visibility = context.get_default_workset_visibility(revit_doc)
             if not default_visibility.IsWorksetVisible(workset_id):
                 return CheckResult(
                     "confirmed",
@@ -669,9 +922,9 @@ def get_phase_order(revit_doc):
     return result
 
 
-def check_phase(revit_doc, element, target_view):
-    view_phase_id = get_parameter_element_id(target_view, BuiltInParameter.VIEW_PHASE)
-    phase_filter_id = get_parameter_element_id(target_view, BuiltInParameter.VIEW_PHASE_FILTER)
+def check_phase(revit_doc, element, target_view, context=None):
+    context = get_view_context(revit_doc, target_view, context)
+    view_phase_id = context.view_phase_id
     created_phase_id = get_parameter_element_id(element, BuiltInParameter.PHASE_CREATED)
     demolished_phase_id = get_parameter_element_id(element, BuiltInParameter.PHASE_DEMOLISHED)
 
@@ -684,15 +937,15 @@ def check_phase(revit_doc, element, target_view):
             "Open the view phase settings manually."
         )
 
-    phase_order = get_phase_order(revit_doc)
-    view_order = phase_order.get(get_element_id_value(view_phase_id))
+    phase_order = context.phase_order
+    view_order = context.view_phase_order
     created_order = phase_order.get(get_element_id_value(created_phase_id))
     demolished_order = phase_order.get(get_element_id_value(demolished_phase_id))
 
-    view_phase_name = get_name(revit_doc, view_phase_id)
+    view_phase_name = context.view_phase_name
     created_phase_name = get_name(revit_doc, created_phase_id)
     demolished_phase_name = get_name(revit_doc, demolished_phase_id)
-    phase_filter_name = get_name(revit_doc, phase_filter_id)
+    phase_filter_name = context.phase_filter_name
 
     if view_order is not None and created_order is not None and created_order > view_order:
         return CheckResult(
@@ -737,9 +990,8 @@ def check_phase(revit_doc, element, target_view):
     )
 
 
-def check_design_option(revit_doc, element, target_view):
+def check_design_option(revit_doc, element, target_view, context=None):
     design_option_parameter = get_built_in_parameter("DESIGN_OPTION_ID")
-    view_option_parameter = get_built_in_parameter("VIEWER_OPTION_VISIBILITY")
 
     if design_option_parameter is None:
         return CheckResult(
@@ -760,13 +1012,7 @@ def check_design_option(revit_doc, element, target_view):
             "No correction needed."
         )
 
-    try:
-        if view_option_parameter is None:
-            view_option_id = ElementId.InvalidElementId
-        else:
-            view_option_id = get_parameter_element_id(target_view, view_option_parameter)
-    except Exception:
-        view_option_id = ElementId.InvalidElementId
+    view_option_id = get_view_context(revit_doc, target_view, context).view_option_id
 
     element_option_name = get_name(revit_doc, element_option_id)
     if id_is_valid(view_option_id) and not ids_are_equal(view_option_id, element_option_id):
@@ -875,6 +1121,10 @@ def make_view_range_action_data(direction, plane_info, previous_offset, new_offs
 
 def get_element_location_curve_z_extents(element):
     """Return Z extents from a linear element's placement curve when available."""
+    return get_cached_element_extents(element, "location_curve", read_element_location_curve_z_extents)
+
+
+def read_element_location_curve_z_extents(element):
     try:
         location = element.Location
     except Exception:
@@ -900,6 +1150,10 @@ def get_element_location_curve_z_extents(element):
 
 
 def get_element_bounding_box_z_extents(element):
+    return get_cached_element_extents(element, "bounding_box", read_element_bounding_box_z_extents)
+
+
+def read_element_bounding_box_z_extents(element):
     try:
         element_box = element.get_BoundingBox(None)
     except Exception:
@@ -1188,48 +1442,49 @@ def is_mep_discipline_sensitive_category(element, revit_doc=None):
     }
 
 
+def get_xyz_tuple(point):
+    return point.X, point.Y, point.Z
+
+
 def get_box_z_extents_with_transform(box):
     try:
         transform = box.Transform
     except Exception:
         transform = None
 
-    z_values = []
-    for corner in get_bbox_corners(box):
-        try:
-            point = transform.OfPoint(corner) if transform else corner
-            z_values.append(point.Z)
-        except Exception:
-            pass
-    if not z_values:
+    def transform_point(corner):
+        return get_xyz_tuple(transform.OfPoint(XYZ(corner[0], corner[1], corner[2])))
+
+    try:
+        box_min = get_xyz_tuple(box.Min)
+        box_max = get_xyz_tuple(box.Max)
+    except Exception:
         return None
-    return min(z_values), max(z_values)
+    return get_transformed_box_z_extents(box_min, box_max, transform_point if transform else None)
 
 
-def collect_geometry_z_values(geometry_element, z_values):
-    if geometry_element is None:
-        return
+def get_geometry_object_z_extents(geometry_object):
+    try:
+        box = geometry_object.GetBoundingBox()
+    except Exception:
+        box = None
+    if box is None:
+        return None
+    return get_box_z_extents_with_transform(box)
 
-    for geometry_object in geometry_element:
-        try:
-            box = geometry_object.GetBoundingBox()
-        except Exception:
-            box = None
-        if box is not None:
-            extents = get_box_z_extents_with_transform(box)
-            if extents:
-                z_values.append(extents[0])
-                z_values.append(extents[1])
 
-        try:
-            instance_geometry = geometry_object.GetInstanceGeometry()
-        except Exception:
-            instance_geometry = None
-        if instance_geometry is not None:
-            collect_geometry_z_values(instance_geometry, z_values)
+def get_geometry_object_nested_geometry(geometry_object):
+    try:
+        return geometry_object.GetInstanceGeometry()
+    except Exception:
+        return None
 
 
 def get_element_geometry_z_extents(element):
+    return get_cached_element_extents(element, "geometry", read_element_geometry_z_extents)
+
+
+def read_element_geometry_z_extents(element):
     try:
         options = Options()
         options.IncludeNonVisibleObjects = False
@@ -1237,14 +1492,17 @@ def get_element_geometry_z_extents(element):
     except Exception:
         geometry = None
 
-    z_values = []
     try:
-        collect_geometry_z_values(geometry, z_values)
+        extents = collect_z_extents(
+            geometry,
+            get_geometry_object_z_extents,
+            get_geometry_object_nested_geometry
+        )
     except Exception:
         return None
 
-    if z_values:
-        return min(z_values), max(z_values), "Geometry", "calculated"
+    if extents:
+        return extents[0], extents[1], "Geometry", "calculated"
     return None
 
 
@@ -1375,8 +1633,9 @@ def make_mep_above_cut_evidence(target_view, element, discipline_parameter, mep_
     ])
 
 
-def check_mep_above_cut_plane_discipline_issue(revit_doc, element, target_view):
-    discipline_parameter = get_view_discipline_parameter(target_view)
+def check_mep_above_cut_plane_discipline_issue(revit_doc, element, target_view, context=None):
+    context = get_view_context(revit_doc, target_view, context)
+    discipline_parameter = context.discipline_parameter
 
     if not is_plan_view_with_view_range(target_view):
         return CheckResult(
@@ -1397,7 +1656,7 @@ def check_mep_above_cut_plane_discipline_issue(revit_doc, element, target_view):
             "No correction needed."
         )
 
-    planes = get_view_range_absolute_planes(revit_doc, target_view)
+    planes = context.absolute_planes
     if planes is None:
         return CheckResult(
             "possible",
@@ -1479,7 +1738,7 @@ def check_mep_above_cut_plane_discipline_issue(revit_doc, element, target_view):
     )
 
 
-def check_plan_view_range(revit_doc, element, target_view):
+def check_plan_view_range(revit_doc, element, target_view, context=None):
     if not isinstance(target_view, ViewPlan):
         return CheckResult(
             "passed",
@@ -1503,23 +1762,23 @@ def check_plan_view_range(revit_doc, element, target_view):
             "Open View Range and compare it manually."
         )
 
-    try:
-        view_range = target_view.GetViewRange()
-        top_info = get_view_range_plane_info(revit_doc, view_range, PlanViewPlane.TopClipPlane)
-        bottom_info = get_view_range_plane_info(revit_doc, view_range, PlanViewPlane.BottomClipPlane)
-        depth_info = get_view_range_plane_info(revit_doc, view_range, PlanViewPlane.ViewDepthPlane)
-        top_elevation = top_info["elevation"] if top_info else None
-        bottom_elevation = bottom_info["elevation"] if bottom_info else None
-        depth_elevation = depth_info["elevation"] if depth_info else None
-    except Exception as err:
+    context = get_view_context(revit_doc, target_view, context)
+    if context.view_range_error is not None or context.view_range_planes is None:
         return CheckResult(
             "possible",
             "Could not check view range",
             "Revit could not read the target view range.",
-            str(err),
+            str(context.view_range_error or ""),
             "Open View Range and compare it manually."
         )
 
+    top_info = context.view_range_planes["top"]
+    bottom_info = context.view_range_planes["bottom"]
+    depth_info = context.view_range_planes["depth"]
+    top_elevation = top_info["elevation"] if top_info else None
+    bottom_elevation = bottom_info["elevation"] if bottom_info else None
+    depth_elevation = depth_info["elevation"] if depth_info else None
+
     lower_candidates = []
     if bottom_elevation is not None:
         lower_candidates.append(bottom_elevation)
@@ -1621,11 +1880,16 @@ def get_bbox_corners(box):
     ]
 
 
-def boxes_intersect(model_box, view_box):
+def get_box_inverse_transform(box):
     try:
-        inverse = view_box.Transform.Inverse
+        return box.Transform.Inverse
     except Exception:
-        inverse = None
+        return None
+
+
+def boxes_intersect(model_box, view_box, inverse=None):
+    if inverse is None:
+        inverse = get_box_inverse_transform(view_box)
 
     xs = []
     ys = []
@@ -1666,7 +1930,7 @@ def get_points_extents(points):
     return XYZ(min(xs), min(ys), min(zs)), XYZ(max(xs), max(ys), max(zs))
 
 
-def check_crop_or_section_box(element, target_view):
+def check_crop_or_section_box(element, target_view, context=None):
     try:
         element_box = element.get_BoundingBox(None)
     except Exception:
@@ -1681,11 +1945,13 @@ def check_crop_or_section_box(element, target_view):
             "Try opening the target view and using Zoom to Selection."
         )
 
+    context = get_view_context(element.Document, target_view, context)
     if isinstance(target_view, View3D):
         try:
-            if target_view.IsSectionBoxActive:
-                section_box = target_view.GetSectionBox()
-                if not boxes_intersect(element_box, section_box):
+            if context.section_box_error is not None:
+                raise context.section_box_error
+            if context.section_box is not None:
+                if not boxes_intersect(element_box, context.section_box, context.section_box_inverse):
                     return CheckResult(
                         "confirmed",
                         "Outside the 3D section box",
@@ -1710,9 +1976,10 @@ def check_crop_or_section_box(element, target_view):
             )
 
     try:
-        if hasattr(target_view, "CropBoxActive") and target_view.CropBoxActive:
-            crop_box = target_view.CropBox
-            if not boxes_intersect(element_box, crop_box):
+        if context.crop_box_error is not None:
+            raise context.crop_box_error
+        if context.crop_box is not None:
+            if not boxes_intersect(element_box, context.crop_box, context.crop_box_inverse):
                 return CheckResult(
                     "confirmed",
                     "Outside the crop region",
@@ -1779,21 +2046,121 @@ def check_view_specific(revit_doc, element, target_view):
     )
 
 
-def analyze_visibility(revit_doc, element, target_view):
+def analyze_visibility(revit_doc, element, target_view, context=None):
+    context = get_view_context(revit_doc, target_view, context)
     results = []
     results.append(check_view_specific(revit_doc, element, target_view))
     results.append(check_element_hidden(element, target_view))
-    results.append(check_category_hidden(element, target_view))
-    results.extend(check_view_filters(revit_doc, element, target_view))
-    results.append(check_workset(revit_doc, element, target_view))
-    results.append(check_phase(revit_doc, element, target_view))
-    results.append(check_design_option(revit_doc, element, target_view))
-    results.append(check_plan_view_range(revit_doc, element, target_view))
-    results.append(check_mep_above_cut_plane_discipline_issue(revit_doc, element, target_view))
-    results.append(check_crop_or_section_box(element, target_view))
+    results.append(check_category_hidden(element, target_view, context))
+    results.extend(check_view_filters(revit_doc, element, target_view, context))
+    results.append(check_workset(revit_doc, element, target_view, context))
+    results.append(check_phase(revit_doc, element, target_view, context))
+    results.append(check_design_option(revit_doc, element, target_view, context))
+    results.append(check_plan_view_range(revit_doc, element, target_view, context))
+    results.append(check_mep_above_cut_plane_discipline_issue(revit_doc, element, target_view, context))
+    results.append(check_crop_or_section_box(element, target_view, context))
     return results
 
 
+# -----------------------------------------------------------------------------
+# Batch visibility matrix
+# -----------------------------------------------------------------------------
+
+class VisibilityMatrixRow(object):
+    def __init__(self, element, cells):
+        self.element = element
+        self.cells = cells
+
+    def has_blockers(self):
+        for cell in self.cells:
+            if cell:
+                return True
+        return False
+
+
+def analyze_visibility_matrix(revit_doc, elements, target_views):
+    """Check every element against every view, reading each view's state once.
+
+    Returns (contexts, rows): one ViewVisibilityContext per target view and one
+    VisibilityMatrixRow per element whose cells hold the confirmed and
+    possible CheckResults for the matching view.
+    """
+    phase_order = get_phase_order(revit_doc)
+    contexts = [ViewVisibilityContext(revit_doc, target_view, phase_order) for target_view in target_views]
+    rows = []
+    for element in elements:
+        cells = []
+        for context in contexts:
+            results = analyze_visibility(revit_doc, element, context.view, context)
+            cells.append([result for result in results if result.group != "passed"])
+        rows.append(VisibilityMatrixRow(element, cells))
+    return contexts, rows
+
+
+def format_matrix_cell(results):
+    confirmed = [result.title for result in results if result.group == "confirmed"]
+    possible = [result.title for result in results if result.group == "possible"]
+    parts = []
+    if confirmed:
+        parts.append("<b>{0}</b>".format("; ".join(confirmed)))
+    if possible:
+        parts.append("Possible: {0}".format("; ".join(possible)))
+    return "<br>".join(parts) or "Visible"
+
+
+def print_visibility_matrix(contexts, rows):
+    matrix_output = script.get_output()
+    blocked_rows = [row for row in rows if row.has_blockers()]
+    pair_count = len(rows) * len(contexts)
+    blocked_pairs = sum([len([cell for cell in row.cells if cell]) for row in blocked_rows])
+
+    matrix_output.print_md("### {0}: visibility matrix".format(TOOL_NAME))
+    matrix_output.print_md("Checked {0} element(s) in {1} view(s): {2} of {3} pair(s) report blockers or possible issues.".format(
+        len(rows),
+        len(contexts),
+        blocked_pairs,
+        pair_count
+    ))
+    if not blocked_rows:
+        return
+
+    table_data = []
+    for row in blocked_rows:
+        for context, cell in zip(contexts, row.cells):
+            if cell:
+                table_data.append([
+                    matrix_output.linkify(row.element.Id),
+                    get_element_label(row.element),
+                    context.view.Name,
+                    format_matrix_cell(cell),
+                ])
+    matrix_output.print_table(
+        table_data=table_data,
+        columns=["Element", "Category", "View", "Blockers"],
+        title="Elements not shown in target views"
+    )
+
+
+def run_visibility_matrix(revit_doc, elements):
+    view_choices = collect_target_views(revit_doc, include_active=True)
+    selected_choices = forms.SelectFromList.show(
+        view_choices,
+        title="Select Views to Audit",
+        multiselect=True,
+        name_attr="display_name",
+        button_name="Check Visibility"
+    )
+    if not selected_choices:
+        forms.alert("No views selected. Nothing was changed.", exitscript=True)
+
+    contexts, rows = analyze_visibility_matrix(
+        revit_doc,
+        elements,
+        [choice.view for choice in selected_choices]
+    )
+    print_visibility_matrix(contexts, rows)
+
+
 # -----------------------------------------------------------------------------
 # Fix actions
 # -----------------------------------------------------------------------------
@@ -2792,6 +3159,11 @@ def main():
             _WNH_STATE["ext_event"] = None
 
     revit_doc = require_active_document()
+    batch_elements = get_selected_batch_elements(revit_doc)
+    if batch_elements:
+        run_visibility_matrix(revit_doc, batch_elements)
+        return
+
     element = get_initial_element(revit_doc)
     handler = WhyNotHereExternalHandler()
     ext_event = ExternalEvent.Create(handler)
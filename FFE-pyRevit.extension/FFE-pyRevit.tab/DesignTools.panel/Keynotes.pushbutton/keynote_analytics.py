@@ -0,0 +1,531 @@
+# -*- coding: utf-8 -*-
+"""
+Keynote analytics engine: view -> sheet lookup and per-keynote aggregation.
+
+Purpose:
+-> Keep the analytics scan that runs every time the manager opens linear in
+   the number of viewports and placed annotations.
+
+Key behaviors:
+-> ViewSheetLookup keeps one ordered sheet map per view, so duplicate
+   viewports are dropped with a dict check instead of a list scan.
+-> KeynoteAnalyticsCollector takes plain placement records (key, source
+   type, element id, sheet infos, view info) and aggregates rows, sheet rows
+   and scan counters as placements arrive.
+-> finish() finalizes the rows and builds the summary in the same sweep.
+
+Design decisions:
+-> Pure Python (no Revit imports). script.py turns elements into placement
+   records; the harness below replays synthetic models through the engine
+   and the pre-v1.3 algorithm and checks the output is identical:
+   python keynote_analytics.py
+"""
+
+#____________________________________________________________________ IMPORTS (SYSTEM)
+import gc
+import json
+import random
+import time
+from collections import OrderedDict
+
+
+#____________________________________________________________________ PYTHON COMPATIBILITY
+try:
+    unicode
+except NameError:
+    unicode = str
+
+
+#____________________________________________________________________ CONSTANTS
+SOURCE_USER_KEYNOTE = "userKeynote"
+SOURCE_GENERIC_ANNOTATION = "genericAnnotation"
+
+
+#____________________________________________________________________ BASIC HELPERS
+def safe_str(value):
+    if value is None:
+        return ""
+    try:
+        return str(value)
+    except:
+        try:
+            return value.ToString()
+        except:
+            return ""
+
+
+def safe_unicode(value):
+    if value is None:
+        return u""
+    if isinstance(value, unicode):
+        return value
+    try:
+        return unicode(value, "utf-8")
+    except:
+        try:
+            return unicode(value)
+        except:
+            return u""
+
+
+def is_valid_element_id_value(value):
+    try:
+        return int(value) > 0
+    except:
+        return bool(value and safe_str(value) not in ["", "-1"])
+
+
+def sheet_analytics_key(sheet_info):
+    if not sheet_info:
+        return ""
+    return safe_str(sheet_info.get("id")).strip() or safe_unicode(sheet_info.get("number")).strip()
+
+
+#____________________________________________________________________ VIEW -> SHEET LOOKUP
+class ViewSheetLookup(object):
+    """View id value -> sheet infos, in viewport order, one per sheet key."""
+
+    def __init__(self):
+        self._sheets_by_view = {}
+        self._lists = {}
+
+    def add(self, view_id_value, sheet_info):
+        if not is_valid_element_id_value(view_id_value):
+            return
+        sheet_key = sheet_analytics_key(sheet_info)
+        if not sheet_key:
+            return
+        sheets = self._sheets_by_view.get(view_id_value)
+        if sheets is None:
+            sheets = self._sheets_by_view[view_id_value] = OrderedDict()
+        if sheet_key not in sheets:
+            sheets[sheet_key] = sheet_info
+            self._lists.pop(view_id_value, None)
+
+    def get(self, view_id_value):
+        """Sheet infos for a view (shared list; callers must not mutate it)."""
+        sheets = self._lists.get(view_id_value)
+        if sheets is None:
+            sheets = list((self._sheets_by_view.get(view_id_value) or {}).values())
+            self._lists[view_id_value] = sheets
+        return sheets
+
+
+def owner_sheet_infos(view_sheet_lookup, owner_view_id_value, owner_is_sheet, owner_sheet_info):
+    """Sheets an element shows on: its own sheet, or the sheets its owner view is placed on."""
+    if owner_is_sheet:
+        return owner_sheet_info and [owner_sheet_info] or []
+    return view_sheet_lookup.get(owner_view_id_value)
+
+
+#____________________________________________________________________ ROWS
+def make_keynote_analytics_row(key, entry):
+    return {
+        "keynoteKey": safe_unicode(key).strip(),
+        "keynoteText": safe_unicode((entry or {}).get("text")).strip(),
+        "parentKey": safe_unicode((entry or {}).get("parentKey")).strip(),
+        "inLibrary": bool(entry),
+        "placed": False,
+        "placedCount": 0,
+        "userKeynoteCount": 0,
+        "genericAnnotationCount": 0,
+        "sheetCount": 0,
+        "unsheetedCount": 0,
+        "elementIds": [],
+        "placements": [],
+        "sheets": [],
+        "_elementIdMap": {},
+        "_sheetMap": {},
+    }
+
+
+def analytics_sheet_sort_key(sheet_info):
+    if not sheet_info:
+        return ""
+    return "{0}|{1}|{2}".format(
+        safe_unicode(sheet_info.get("number")).strip(),
+        safe_unicode(sheet_info.get("name")).strip(),
+        safe_unicode(sheet_info.get("id")).strip()
+    ).lower()
+
+
+def sort_analytics_rows(rows):
+    return sorted(rows, key=lambda row: safe_unicode(row.get("keynoteKey")).lower())
+
+
+def record_sheet_analytics(row, sheet_info, source_type, view_info):
+    sheet_key = sheet_analytics_key(sheet_info)
+    if not sheet_key:
+        row["unsheetedCount"] += 1
+        return
+
+    sheet_map = row["_sheetMap"]
+    if sheet_key not in sheet_map:
+        sheet_map[sheet_key] = {
+            "id": safe_str(sheet_info.get("id")).strip(),
+            "number": safe_unicode(sheet_info.get("number")).strip(),
+            "name": safe_unicode(sheet_info.get("name")).strip(),
+            "count": 0,
+            "userKeynoteCount": 0,
+            "genericAnnotationCount": 0,
+            "viewIds": [],
+            "viewNames": [],
+            "_viewIdMap": {},
+            "_viewNameMap": {},
+        }
+
+    sheet_row = sheet_map[sheet_key]
+    sheet_row["count"] += 1
+    if source_type == SOURCE_USER_KEYNOTE:
+        sheet_row["userKeynoteCount"] += 1
+    elif source_type == SOURCE_GENERIC_ANNOTATION:
+        sheet_row["genericAnnotationCount"] += 1
+
+    if view_info:
+        view_id = safe_str(view_info.get("id")).strip()
+        view_name = safe_unicode(view_info.get("name")).strip()
+        if view_id and view_id not in sheet_row["_viewIdMap"]:
+            sheet_row["_viewIdMap"][view_id] = True
+            sheet_row["viewIds"].append(view_id)
+        if view_name and view_name not in sheet_row["_viewNameMap"]:
+            sheet_row["_viewNameMap"][view_name] = True
+            sheet_row["viewNames"].append(view_name)
+
+
+def record_keynote_analytics_placement(rows_by_key, entry_by_key, key, source_type, element_id, sheet_infos, view_info):
+    key = safe_unicode(key).strip()
+    if not key:
+        return False
+
+    if key not in rows_by_key:
+        rows_by_key[key] = make_keynote_analytics_row(key, entry_by_key.get(key))
+
+    row = rows_by_key[key]
+    row["placed"] = True
+    row["placedCount"] += 1
+    if source_type == SOURCE_USER_KEYNOTE:
+        row["userKeynoteCount"] += 1
+    elif source_type == SOURCE_GENERIC_ANNOTATION:
+        row["genericAnnotationCount"] += 1
+
+    element_id = safe_str(element_id).strip()
+    if element_id and element_id not in row["_elementIdMap"]:
+        row["_elementIdMap"][element_id] = True
+        row["elementIds"].append(element_id)
+        row["placements"].append({
+            "elementId": element_id,
+            "sourceType": source_type,
+            "view": view_info or {},
+            "sheets": sheet_infos or [],
+        })
+
+    if sheet_infos:
+        for sheet_info in sheet_infos:
+            record_sheet_analytics(row, sheet_info, source_type, view_info)
+    else:
+        row["unsheetedCount"] += 1
+
+    return True
+
+
+def finalize_keynote_analytics_row(row):
+    sheet_values = []
+    for sheet_row in row.get("_sheetMap", {}).values():
+        sheet_row.pop("_viewIdMap", None)
+        sheet_row.pop("_viewNameMap", None)
+        sheet_row["viewIds"] = sorted(sheet_row.get("viewIds") or [])
+        sheet_row["viewNames"] = sorted(sheet_row.get("viewNames") or [])
+        sheet_values.append(sheet_row)
+    row["sheetCount"] = len(sheet_values)
+    row["sheets"] = sorted(sheet_values, key=analytics_sheet_sort_key)
+    row["placed"] = bool(row.get("placedCount"))
+    row["elementIds"] = sorted(row.get("elementIds") or [])
+    row.pop("_elementIdMap", None)
+    row.pop("_sheetMap", None)
+    return row
+
+
+#____________________________________________________________________ COLLECTOR
+class KeynoteAnalyticsCollector(object):
+    """Aggregates placement records into analytics rows plus the model summary."""
+
+    def __init__(self, entries=None):
+        self.entry_by_key = {}
+        self.rows_by_key = {}
+        self.scanned = {SOURCE_USER_KEYNOTE: 0, SOURCE_GENERIC_ANNOTATION: 0}
+        self.skipped_count = 0
+        for entry in entries or []:
+            key = safe_unicode(entry.get("key")).strip()
+            if not key:
+                continue
+            self.entry_by_key[key] = entry
+            if key not in self.rows_by_key:
+                self.rows_by_key[key] = make_keynote_analytics_row(key, entry)
+
+    def add_placement(self, key, source_type, element_id, sheet_infos, view_info):
+        if record_keynote_analytics_placement(
+            self.rows_by_key,
+            self.entry_by_key,
+            key,
+            source_type,
+            element_id,
+            sheet_infos,
+            view_info
+        ):
+            self.scanned[source_type] = self.scanned.get(source_type, 0) + 1
+            return True
+        self.skipped_count += 1
+        return False
+
+    def finish(self):
+        """(sorted rows, summary) from one sweep over the aggregated rows."""
+        rows = []
+        sheet_keys = set()
+        placed_key_map = {}
+        summary = {
+            "placedKeyCount": 0,
+            "placedCount": 0,
+            "userKeynoteCount": 0,
+            "genericAnnotationCount": 0,
+            "sheetCount": 0,
+            "unsheetedCount": 0,
+            "orphanKeyCount": 0,
+        }
+
+        for row in self.rows_by_key.values():
+            for sheet_key in row["_sheetMap"]:
+                sheet_keys.add(sheet_key)
+            row = finalize_keynote_analytics_row(row)
+            rows.append(row)
+
+            if row["placed"]:
+                summary["placedKeyCount"] += 1
+                if row["keynoteKey"]:
+                    placed_key_map[row["keynoteKey"]] = True
+                if not row["inLibrary"]:
+                    summary["orphanKeyCount"] += 1
+            summary["placedCount"] += row["placedCount"]
+            summary["userKeynoteCount"] += row["userKeynoteCount"]
+            summary["genericAnnotationCount"] += row["genericAnnotationCount"]
+            summary["unsheetedCount"] += row["unsheetedCount"]
+
+        sheet_keys.discard("")
+        summary["sheetCount"] = len(sheet_keys)
+        summary["placedKeyMap"] = placed_key_map
+        return sort_analytics_rows(rows), summary
+
+
+#____________________________________________________________________ REFERENCE (PRE-v1.3)
+def _add_sheet_to_view_lookup_reference(result, view_id_value, sheet_info):
+    if not is_valid_element_id_value(view_id_value):
+        return
+    sheet_key = sheet_analytics_key(sheet_info)
+    if not sheet_key:
+        return
+    if view_id_value not in result:
+        result[view_id_value] = []
+    for existing in result[view_id_value]:
+        if sheet_analytics_key(existing) == sheet_key:
+            return
+    result[view_id_value].append(sheet_info)
+
+
+def _summarize_reference(rows):
+    sheet_keys = set()
+    placed_key_count = 0
+    placed_count = 0
+    user_keynote_count = 0
+    generic_annotation_count = 0
+    unsheeted_count = 0
+    orphan_key_count = 0
+    placed_key_map = {}
+
+    for row in rows or []:
+        key = safe_unicode(row.get("keynoteKey")).strip()
+        if row.get("placed"):
+            placed_key_count += 1
+            if key:
+                placed_key_map[key] = True
+        if row.get("placed") and not row.get("inLibrary"):
+            orphan_key_count += 1
+        placed_count += int(row.get("placedCount") or 0)
+        user_keynote_count += int(row.get("userKeynoteCount") or 0)
+        generic_annotation_count += int(row.get("genericAnnotationCount") or 0)
+        unsheeted_count += int(row.get("unsheetedCount") or 0)
+        for sheet in row.get("sheets") or []:
+            sheet_key = sheet_analytics_key(sheet)
+            if sheet_key:
+                sheet_keys.add(sheet_key)
+
+    return {
+        "placedKeyCount": placed_key_count,
+        "placedCount": placed_count,
+        "userKeynoteCount": user_keynote_count,
+        "genericAnnotationCount": generic_annotation_count,
+        "sheetCount": len(sheet_keys),
+        "unsheetedCount": unsheeted_count,
+        "orphanKeyCount": orphan_key_count,
+        "placedKeyMap": placed_key_map,
+    }
+
+
+def collect_analytics_reference(entries, viewports, placements):
+    """The v1.2 flow: list-scanned lookup, per-element resolution, separate summary pass."""
+    lookup = {}
+    for view_id_value, sheet_info in viewports:
+        _add_sheet_to_view_lookup_reference(lookup, view_id_value, sheet_info)
+
+    entry_by_key = {}
+    rows_by_key = {}
+    for entry in entries:
+        key = safe_unicode(entry.get("key")).strip()
+        if not key:
+            continue
+        entry_by_key[key] = entry
+        if key not in rows_by_key:
+            rows_by_key[key] = make_keynote_analytics_row(key, entry)
+
+    scanned = {SOURCE_USER_KEYNOTE: 0, SOURCE_GENERIC_ANNOTATION: 0}
+    skipped = 0
+    for source_type in (SOURCE_USER_KEYNOTE, SOURCE_GENERIC_ANNOTATION):
+        for placement in placements:
+            key, placement_source, element_id, owner_view_id_value, owner_is_sheet, owner_sheet_info, view_info = placement
+            if placement_source != source_type:
+                continue
+            if owner_is_sheet:
+                sheet_infos = owner_sheet_info and [owner_sheet_info] or []
+            else:
+                sheet_infos = list(lookup.get(owner_view_id_value) or [])
+            if record_keynote_analytics_placement(
+                    rows_by_key, entry_by_key, key, source_type, element_id, sheet_infos, view_info):
+                scanned[source_type] += 1
+            else:
+                skipped += 1
+
+    rows = sort_analytics_rows([finalize_keynote_analytics_row(row) for row in rows_by_key.values()])
+    return rows, _summarize_reference(rows), scanned, skipped
+
+
+def collect_analytics(entries, viewports, placements):
+    """The v1.3 flow over the same synthetic records (placements in one mixed stream)."""
+    lookup = ViewSheetLookup()
+    for view_id_value, sheet_info in viewports:
+        lookup.add(view_id_value, sheet_info)
+
+    collector = KeynoteAnalyticsCollector(entries)
+    owner_cache = {}
+    deferred = []
+    for placement in placements:
+        if placement[1] == SOURCE_GENERIC_ANNOTATION:
+            deferred.append(placement)
+            continue
+        _replay_placement(collector, lookup, owner_cache, placement)
+    for placement in deferred:
+        _replay_placement(collector, lookup, owner_cache, placement)
+
+    rows, summary = collector.finish()
+    return rows, summary, collector.scanned, collector.skipped_count
+
+
+def _replay_placement(collector, lookup, owner_cache, placement):
+    key, source_type, element_id, owner_view_id_value, owner_is_sheet, owner_sheet_info, view_info = placement
+    sheet_infos = owner_cache.get(owner_view_id_value)
+    if sheet_infos is None:
+        sheet_infos = owner_sheet_infos(lookup, owner_view_id_value, owner_is_sheet, owner_sheet_info)
+        owner_cache[owner_view_id_value] = sheet_infos
+    collector.add_placement(key, source_type, element_id, sheet_infos, view_info)
+
+
+#____________________________________________________________________ HARNESS (SYNTHETIC MODEL)
+def generate_synthetic_model(entry_count=1500, sheet_count=400, view_count=1600, placement_count=40000, seed=11):
+    """Library entries, viewports (with duplicates) and mixed placement records."""
+    rng = random.Random(seed)
+    entries = [{"key": "{0}.{1:02d}".format(index // 40 + 1, index % 40), "text": "Note {0}".format(index),
+                "parentKey": "{0}".format(index // 40 + 1)} for index in range(entry_count)]
+    entries.append({"key": "  ", "text": "blank"})
+
+    sheets = []
+    for index in range(sheet_count):
+        sheets.append({"id": str(100000 + index), "number": "A{0:03d}".format(index), "name": "Sheet {0}".format(index)})
+    sheets.append({"id": "", "number": "", "name": "Unnumbered"})
+
+    views = []
+    viewports = []
+    for index in range(view_count):
+        view_id_value = 200000 + index
+        views.append((view_id_value, {"id": str(view_id_value), "name": "View {0}".format(index % 900)}))
+        if rng.random() < 0.8:
+            for _ in range(rng.choice([1, 1, 1, 2, 3])):
+                viewports.append((view_id_value, rng.choice(sheets)))
+    viewports.append((-1, sheets[0]))
+
+    keys = [entry["key"] for entry in entries[:entry_count]]
+    placements = []
+    for index in range(placement_count):
+        roll = rng.random()
+        if roll < 0.02:
+            key = ""
+        elif roll < 0.05:
+            key = "X{0}".format(rng.randint(0, 30))
+        else:
+            key = rng.choice(keys)
+        source_type = SOURCE_USER_KEYNOTE if rng.random() < 0.6 else SOURCE_GENERIC_ANNOTATION
+        element_id = 500000 + (index if rng.random() < 0.98 else rng.randint(0, index))
+        owner = rng.random()
+        if owner < 0.1:
+            sheet_info = rng.choice(sheets)
+            sheet_id_value = int(sheet_info["id"]) if sheet_info["id"] else 99
+            placements.append((key, source_type, element_id, sheet_id_value, True, sheet_info,
+                               {"id": sheet_info["id"], "name": sheet_info["name"]}))
+        elif owner < 0.12:
+            placements.append((key, source_type, element_id, -1, False, None, None))
+        else:
+            view_id_value, view_info = rng.choice(views)
+            placements.append((key, source_type, element_id, view_id_value, False, None, view_info))
+    return entries, viewports, placements
+
+
+def time_flow(flow, entries, viewports, placements, repeats):
+    """Best-of-N seconds for one flow, plus its result as sorted JSON.
+
+    Each run starts from a collected heap with no earlier result alive, so
+    neither flow pays for the other's garbage.
+    """
+    best = None
+    result_json = None
+    for _ in range(repeats):
+        result_json = None
+        gc.collect()
+        started = time.time()
+        result = flow(entries, viewports, placements)
+        seconds = time.time() - started
+        best = seconds if best is None else min(best, seconds)
+        result_json = json.dumps(result, sort_keys=True)
+        del result
+    return best, result_json
+
+
+def run_harness(repeats=3):
+    """Best-of-N timings plus owner-view resolutions (one Revit GetElement + name reads each)."""
+    entries, viewports, placements = generate_synthetic_model()
+    reference_seconds, reference_json = time_flow(collect_analytics_reference, entries, viewports, placements, repeats)
+    engine_seconds, engine_json = time_flow(collect_analytics, entries, viewports, placements, repeats)
+
+    return {
+        "entries": len(entries),
+        "viewports": len(viewports),
+        "placements": len(placements),
+        "referenceSeconds": reference_seconds,
+        "engineSeconds": engine_seconds,
+        "referenceOwnerLookups": len(placements),
+        "engineOwnerLookups": len(set(placement[3] for placement in placements)),
+        "identical": reference_json == engine_json,
+    }
+
+
+if __name__ == "__main__":
+    result = run_harness()
+    print("{entries} entries / {viewports} viewports / {placements} placements".format(**result))
+    print("  v1.2 flow : {referenceSeconds:.3f}s, {referenceOwnerLookups} owner view lookups".format(**result))
+    print("  engine    : {engineSeconds:.3f}s, {engineOwnerLookups} owner view lookups".format(**result))
+    print("  identical : {identical}".format(**result))
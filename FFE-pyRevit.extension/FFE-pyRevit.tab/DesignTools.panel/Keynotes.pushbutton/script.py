@@ -1,9 +1,9 @@
 # -*- coding: utf-8 -*-
 __title__ = "FFE-Keynotes"
-__version__ = "v1.2"
+__version__ = "v1.3"
 __persistentengine__ = True
 __min_revit_ver__ = 2025
-__doc__ = """Version = v1.2
+__doc__ = """Version = v1.3
 Date    = 07.30.2026
 __________________________________________________________________
 Description:
@@ -36,6 +36,7 @@ Last update:
 - [07.22.2026] - v1.0 Graduating to v1.0 with a stable feature set and improved performance.
 - [07.22.2026] - v1.1 Added bounded undo/redo history for unsaved keynote edits.
 - [07.30.2026] - v1.2 Marked keynotes placed in other Revit models that share the library.
+- [10.18.2026] - v1.3 Keynote analytics collected in one pass (keynote_analytics.py, hashed view/sheet lookup).
 __________________________________________________________________
 Author: Kyle Guggenheim"""
 
@@ -112,6 +113,7 @@ from Autodesk.Revit.DB import (
     BuiltInCategory,
     BuiltInParameter,
     ElementId,
+    ElementMulticategoryFilter,
     ElementType,
     Family,
     FilteredElementCollector,
@@ -128,6 +130,16 @@ from Autodesk.Revit.UI import ExternalEvent, IExternalEventHandler, PostableComm
 
 from pyrevit import forms, revit, script
 
+# ____________________________________________________________________ IMPORTS (CUSTOM)
+from keynote_analytics import (
+    SOURCE_GENERIC_ANNOTATION,
+    SOURCE_USER_KEYNOTE,
+    KeynoteAnalyticsCollector,
+    ViewSheetLookup,
+    is_valid_element_id_value,
+    owner_sheet_infos,
+)
+
 
 # ____________________________________________________________________ PYTHON COMPATIBILITY
 try:
@@ -145,7 +157,7 @@ PATH_SUPPORT = os.path.join(PATH_SCRIPT, "support")
 PATH_INDEX = os.path.join(PATH_SUPPORT, "index.html")
 
 APP_NAME = "FFE Keynote Manager"
-APP_VERSION = "v1.2"
+APP_VERSION = "v1.3"
 LOCAL_APP_NAME = "KeynoteManager"
 GENERIC_KEYNOTE_FAMILY_NAME = "FFE_Symbol_Keynote (Type)"
 GENERIC_KEYNOTE_NUMBER_PARAMETER = "Number"
@@ -1957,13 +1969,6 @@ def collect_sheet_visible_keynotes(target_doc):
     return result
 
 
-def is_valid_element_id_value(value):
-    try:
-        return int(value) > 0
-    except:
-        return bool(value and safe_str(value) not in ["", "-1"])
-
-
 def get_document_central_path(target_doc):
     if target_doc is None:
         return ""
@@ -2080,32 +2085,8 @@ def make_view_analytics_info(view):
     }
 
 
-def sheet_analytics_key(sheet_info):
-    if not sheet_info:
-        return ""
-    return safe_str(sheet_info.get("id")).strip() or safe_unicode(sheet_info.get("number")).strip()
-
-
-def add_sheet_to_view_lookup(result, view_id_value, sheet_info):
-    if not is_valid_element_id_value(view_id_value):
-        return
-
-    sheet_key = sheet_analytics_key(sheet_info)
-    if not sheet_key:
-        return
-
-    if view_id_value not in result:
-        result[view_id_value] = []
-
-    for existing in result[view_id_value]:
-        if sheet_analytics_key(existing) == sheet_key:
-            return
-
-    result[view_id_value].append(sheet_info)
-
-
 def build_view_sheet_lookup(target_doc):
-    result = {}
+    result = ViewSheetLookup()
     if target_doc is None:
         return result
 
@@ -2118,274 +2099,113 @@ def build_view_sheet_lookup(target_doc):
     except:
         return result
 
+    sheet_info_by_id = {}
     for viewport in viewports:
         try:
-            view_id = viewport.ViewId
-            view_id_value = get_element_id_value(view_id)
-            sheet = target_doc.GetElement(viewport.SheetId)
-            sheet_info = make_sheet_analytics_info(sheet)
-            add_sheet_to_view_lookup(result, view_id_value, sheet_info)
+            view_id_value = get_element_id_value(viewport.ViewId)
+            sheet_id_value = get_element_id_value(viewport.SheetId)
+            if sheet_id_value not in sheet_info_by_id:
+                sheet_info_by_id[sheet_id_value] = make_sheet_analytics_info(target_doc.GetElement(viewport.SheetId))
+            result.add(view_id_value, sheet_info_by_id[sheet_id_value])
         except:
             continue
 
     return result
 
 
-def get_element_owner_view(target_doc, element):
+def get_owner_view_context(target_doc, element, view_sheet_lookup, owner_cache):
+    """(sheet infos, view info) for an element's owner view, resolved once per view."""
     try:
         owner_view_id = element.OwnerViewId
     except:
-        return None, None
-
-    owner_view_id_value = get_element_id_value(owner_view_id)
-    if not is_valid_element_id_value(owner_view_id_value):
-        return None, None
-
-    try:
-        return target_doc.GetElement(owner_view_id), owner_view_id_value
-    except:
-        return None, owner_view_id_value
-
-
-def get_element_sheet_infos(target_doc, element, view_sheet_lookup):
-    owner_view, owner_view_id_value = get_element_owner_view(target_doc, element)
-    if owner_view is None and not is_valid_element_id_value(owner_view_id_value):
         return [], None
 
-    view_info = make_view_analytics_info(owner_view)
-    if element_is_sheet(owner_view):
-        sheet_info = make_sheet_analytics_info(owner_view)
-        return sheet_info and [sheet_info] or [], view_info
-
-    return list(view_sheet_lookup.get(owner_view_id_value) or []), view_info
-
-
-def make_keynote_analytics_row(key, entry):
-    return {
-        "keynoteKey": safe_unicode(key).strip(),
-        "keynoteText": safe_unicode((entry or {}).get("text")).strip(),
-        "parentKey": safe_unicode((entry or {}).get("parentKey")).strip(),
-        "inLibrary": bool(entry),
-        "placed": False,
-        "placedCount": 0,
-        "userKeynoteCount": 0,
-        "genericAnnotationCount": 0,
-        "sheetCount": 0,
-        "unsheetedCount": 0,
-        "elementIds": [],
-        "placements": [],
-        "sheets": [],
-        "_elementIdMap": {},
-        "_sheetMap": {},
-    }
-
-
-def analytics_sheet_sort_key(sheet_info):
-    if not sheet_info:
-        return ""
-    return "{0}|{1}|{2}".format(
-        safe_unicode(sheet_info.get("number")).strip(),
-        safe_unicode(sheet_info.get("name")).strip(),
-        safe_unicode(sheet_info.get("id")).strip()
-    ).lower()
-
-
-def sort_analytics_rows(rows):
-    return sorted(rows, key=lambda row: safe_unicode(row.get("keynoteKey")).lower())
-
-
-def record_sheet_analytics(row, sheet_info, source_type, view_info):
-    sheet_key = sheet_analytics_key(sheet_info)
-    if not sheet_key:
-        row["unsheetedCount"] += 1
-        return
-
-    sheet_map = row["_sheetMap"]
-    if sheet_key not in sheet_map:
-        sheet_map[sheet_key] = {
-            "id": safe_str(sheet_info.get("id")).strip(),
-            "number": safe_unicode(sheet_info.get("number")).strip(),
-            "name": safe_unicode(sheet_info.get("name")).strip(),
-            "count": 0,
-            "userKeynoteCount": 0,
-            "genericAnnotationCount": 0,
-            "viewIds": [],
-            "viewNames": [],
-            "_viewIdMap": {},
-            "_viewNameMap": {},
-        }
+    owner_view_id_value = get_element_id_value(owner_view_id)
+    if owner_view_id_value in owner_cache:
+        return owner_cache[owner_view_id_value]
 
-    sheet_row = sheet_map[sheet_key]
-    sheet_row["count"] += 1
-    if source_type == "userKeynote":
-        sheet_row["userKeynoteCount"] += 1
-    elif source_type == "genericAnnotation":
-        sheet_row["genericAnnotationCount"] += 1
-
-    if view_info:
-        view_id = safe_str(view_info.get("id")).strip()
-        view_name = safe_unicode(view_info.get("name")).strip()
-        if view_id and view_id not in sheet_row["_viewIdMap"]:
-            sheet_row["_viewIdMap"][view_id] = True
-            sheet_row["viewIds"].append(view_id)
-        if view_name and view_name not in sheet_row["_viewNameMap"]:
-            sheet_row["_viewNameMap"][view_name] = True
-            sheet_row["viewNames"].append(view_name)
-
-
-def record_keynote_analytics_placement(rows_by_key, entry_by_key, key, source_type, element, target_doc, view_sheet_lookup):
-    key = safe_unicode(key).strip()
-    if not key:
-        return False
+    context = [], None
+    if is_valid_element_id_value(owner_view_id_value):
+        try:
+            owner_view = target_doc.GetElement(owner_view_id)
+        except:
+            owner_view = None
+        owner_is_sheet = element_is_sheet(owner_view)
+        context = (
+            owner_sheet_infos(
+                view_sheet_lookup,
+                owner_view_id_value,
+                owner_is_sheet,
+                owner_is_sheet and make_sheet_analytics_info(owner_view) or None
+            ),
+            make_view_analytics_info(owner_view),
+        )
+    owner_cache[owner_view_id_value] = context
+    return context
 
-    if key not in rows_by_key:
-        rows_by_key[key] = make_keynote_analytics_row(key, entry_by_key.get(key))
-
-    row = rows_by_key[key]
-    row["placed"] = True
-    row["placedCount"] += 1
-    if source_type == "userKeynote":
-        row["userKeynoteCount"] += 1
-    elif source_type == "genericAnnotation":
-        row["genericAnnotationCount"] += 1
-
-    sheet_infos, view_info = get_element_sheet_infos(target_doc, element, view_sheet_lookup)
-    element_id = safe_str(get_element_id_key(element)).strip()
-    if element_id and element_id not in row["_elementIdMap"]:
-        row["_elementIdMap"][element_id] = True
-        row["elementIds"].append(element_id)
-        row["placements"].append({
-            "elementId": element_id,
-            "sourceType": source_type,
-            "view": view_info or {},
-            "sheets": sheet_infos or [],
-        })
 
-    if sheet_infos:
-        for sheet_info in sheet_infos:
-            record_sheet_analytics(row, sheet_info, source_type, view_info)
-    else:
-        row["unsheetedCount"] += 1
+def iter_keynote_placements(target_doc):
+    """(source type, element, key) for keynote tags, then FFE keynote annotations, from one collector."""
+    categories = List[BuiltInCategory]()
+    categories.Add(BuiltInCategory.OST_KeynoteTags)
+    categories.Add(BuiltInCategory.OST_GenericAnnotation)
+    elements = (
+        FilteredElementCollector(target_doc)
+        .WherePasses(ElementMulticategoryFilter(categories))
+        .WhereElementIsNotElementType()
+    )
 
-    return True
+    keynote_tag_category_id = get_element_id_value(ElementId(BuiltInCategory.OST_KeynoteTags))
+    symbol_keys = {}
+    generic_annotations = []
+    for element in elements:
+        try:
+            category_id_value = get_element_id_value(element.Category.Id)
+        except:
+            continue
 
+        if category_id_value == keynote_tag_category_id:
+            yield SOURCE_USER_KEYNOTE, element, get_keynote_tag_key(element)
+            continue
 
-def finalize_keynote_analytics_rows(rows_by_key):
-    rows = []
-    for row in rows_by_key.values():
-        sheet_values = []
-        for sheet_row in row.get("_sheetMap", {}).values():
-            sheet_row.pop("_viewIdMap", None)
-            sheet_row.pop("_viewNameMap", None)
-            sheet_row["viewIds"] = sorted(sheet_row.get("viewIds") or [])
-            sheet_row["viewNames"] = sorted(sheet_row.get("viewNames") or [])
-            sheet_values.append(sheet_row)
-        sheet_values = sorted(sheet_values, key=analytics_sheet_sort_key)
-        row["sheetCount"] = len(sheet_values)
-        row["sheets"] = sheet_values
-        row["placed"] = bool(row.get("placedCount"))
-        row["elementIds"] = sorted(row.get("elementIds") or [])
-        row.pop("_elementIdMap", None)
-        row.pop("_sheetMap", None)
-        rows.append(row)
-
-    return sort_analytics_rows(rows)
-
-
-def summarize_keynote_analytics_rows(rows):
-    sheet_keys = set()
-    placed_key_count = 0
-    placed_count = 0
-    user_keynote_count = 0
-    generic_annotation_count = 0
-    unsheeted_count = 0
-    orphan_key_count = 0
-    placed_key_map = {}
-
-    for row in rows or []:
-        key = safe_unicode(row.get("keynoteKey")).strip()
-        if row.get("placed"):
-            placed_key_count += 1
-            if key:
-                placed_key_map[key] = True
-        if row.get("placed") and not row.get("inLibrary"):
-            orphan_key_count += 1
-        placed_count += int(row.get("placedCount") or 0)
-        user_keynote_count += int(row.get("userKeynoteCount") or 0)
-        generic_annotation_count += int(row.get("genericAnnotationCount") or 0)
-        unsheeted_count += int(row.get("unsheetedCount") or 0)
-        for sheet in row.get("sheets") or []:
-            sheet_key = sheet_analytics_key(sheet)
-            if sheet_key:
-                sheet_keys.add(sheet_key)
+        try:
+            type_id_value = get_element_id_value(element.GetTypeId())
+        except:
+            type_id_value = None
+        if type_id_value not in symbol_keys or type_id_value is None:
+            symbol = get_generic_annotation_instance_symbol(target_doc, element)
+            symbol_key = None
+            try:
+                family = symbol.Family
+                if family is not None and family.Name == GENERIC_KEYNOTE_FAMILY_NAME:
+                    symbol_key = get_generic_annotation_symbol_key(symbol)
+            except:
+                pass
+            symbol_keys[type_id_value] = symbol_key
+        if symbol_keys[type_id_value] is not None:
+            generic_annotations.append((element, symbol_keys[type_id_value]))
 
-    return {
-        "placedKeyCount": placed_key_count,
-        "placedCount": placed_count,
-        "userKeynoteCount": user_keynote_count,
-        "genericAnnotationCount": generic_annotation_count,
-        "sheetCount": len(sheet_keys),
-        "unsheetedCount": unsheeted_count,
-        "orphanKeyCount": orphan_key_count,
-        "placedKeyMap": placed_key_map,
-    }
+    for element, key in generic_annotations:
+        yield SOURCE_GENERIC_ANNOTATION, element, key
 
 
 def collect_keynote_analytics(target_doc, keynote_payload):
     keynote_payload = keynote_payload or {}
-    entry_by_key = {}
-    rows_by_key = {}
     view_sheet_lookup = build_view_sheet_lookup(target_doc)
+    collector = KeynoteAnalyticsCollector(keynote_payload.get("entries") or [])
+    owner_cache = {}
+
+    for source_type, element, key in iter_keynote_placements(target_doc):
+        sheet_infos, view_info = get_owner_view_context(target_doc, element, view_sheet_lookup, owner_cache)
+        collector.add_placement(
+            safe_unicode(key).strip(),
+            source_type,
+            get_element_id_key(element),
+            sheet_infos,
+            view_info
+        )
 
-    for entry in keynote_payload.get("entries") or []:
-        key = safe_unicode(entry.get("key")).strip()
-        if not key:
-            continue
-        entry_by_key[key] = entry
-        if key not in rows_by_key:
-            rows_by_key[key] = make_keynote_analytics_row(key, entry)
-
-    user_keynote_scanned_count = 0
-    generic_annotation_scanned_count = 0
-    skipped_count = 0
-
-    tags = (
-        FilteredElementCollector(target_doc)
-        .OfCategory(BuiltInCategory.OST_KeynoteTags)
-        .WhereElementIsNotElementType()
-    )
-    for tag in tags:
-        key = safe_unicode(get_keynote_tag_key(tag)).strip()
-        if record_keynote_analytics_placement(
-            rows_by_key,
-            entry_by_key,
-            key,
-            "userKeynote",
-            tag,
-            target_doc,
-            view_sheet_lookup
-        ):
-            user_keynote_scanned_count += 1
-        else:
-            skipped_count += 1
-
-    for instance, symbol in iter_generic_annotation_keynote_instances(target_doc):
-        key = safe_unicode(get_generic_annotation_symbol_key(symbol)).strip()
-        if record_keynote_analytics_placement(
-            rows_by_key,
-            entry_by_key,
-            key,
-            "genericAnnotation",
-            instance,
-            target_doc,
-            view_sheet_lookup
-        ):
-            generic_annotation_scanned_count += 1
-        else:
-            skipped_count += 1
-
-    rows = finalize_keynote_analytics_rows(rows_by_key)
-    summary = summarize_keynote_analytics_rows(rows)
+    rows, summary = collector.finish()
     identity = get_document_analytics_identity(target_doc)
 
     analytics = {
@@ -2401,9 +2221,9 @@ def collect_keynote_analytics(target_doc, keynote_payload):
         "analyticsRows": rows,
         "analyticsRowCount": len(rows),
         "collectedAt": get_generated_at(),
-        "userKeynoteScannedCount": user_keynote_scanned_count,
-        "genericAnnotationScannedCount": generic_annotation_scanned_count,
-        "skippedCount": skipped_count,
+        "userKeynoteScannedCount": collector.scanned.get(SOURCE_USER_KEYNOTE, 0),
+        "genericAnnotationScannedCount": collector.scanned.get(SOURCE_GENERIC_ANNOTATION, 0),
+        "skippedCount": collector.skipped_count,
     }
     analytics.update(identity)
     analytics.update(summary)
@@ -0,0 +1,244 @@
+// Node benchmark for entry_store.js: node bench/entry_store_bench.js [entryCount]
+// Renders every division of a synthetic library with the pre-store helpers
+// (linear scans, children map rebuilt per division, childCount per row) and
+// with the indexed store, checks both produce the same rows, then replays a
+// random stream of edits and checks the store still matches a fresh rebuild.
+"use strict";
+
+var createEntryStore = require("../entry_store.js").ffeKeynoteEntryStore.createEntryStore;
+
+function text(value) {
+  return value === null || value === undefined ? "" : String(value);
+}
+
+function trim(value) {
+  return text(value).replace(/^\s+|\s+$/g, "");
+}
+
+function naturalCompareText(first, second) {
+  var firstParts = trim(first).toLowerCase().match(/\d+|\D+/g) || [""];
+  var secondParts = trim(second).toLowerCase().match(/\d+|\D+/g) || [""];
+  var length = Math.max(firstParts.length, secondParts.length);
+  var index;
+  var firstPart;
+  var secondPart;
+
+  for (index = 0; index < length; index += 1) {
+    firstPart = firstParts[index] || "";
+    secondPart = secondParts[index] || "";
+    if (/^\d+$/.test(firstPart) && /^\d+$/.test(secondPart)) {
+      if (Number(firstPart) !== Number(secondPart)) {
+        return Number(firstPart) - Number(secondPart);
+      }
+      if (firstPart.length !== secondPart.length) {
+        return firstPart.length - secondPart.length;
+      }
+    } else if (firstPart !== secondPart) {
+      return firstPart < secondPart ? -1 : 1;
+    }
+  }
+  return 0;
+}
+
+function compareEntriesByKey(first, second) {
+  return naturalCompareText(first && first.key, second && second.key) ||
+    naturalCompareText(first && first.text, second && second.text) ||
+    ((first && first.originalIndex) || 0) - ((second && second.originalIndex) || 0);
+}
+
+function makeRandom(seed) {
+  var value = seed;
+  return function random() {
+    value = (value * 1103515245 + 12345) % 2147483648;
+    return value / 2147483648;
+  };
+}
+
+function generateLibrary(entryCount, random) {
+  var entries = [];
+  var parents = [];
+  var divisionCount = Math.max(4, Math.round(entryCount / 1000));
+  var index;
+  var parent;
+  var key;
+
+  for (index = 0; index < divisionCount; index += 1) {
+    entries.push({ id: "e" + index, key: String(index + 1), text: "DIVISION " + (index + 1), parentKey: "", originalIndex: index });
+    parents.push(entries[index]);
+  }
+  for (index = divisionCount; index < entryCount; index += 1) {
+    parent = parents[Math.floor(random() * parents.length)];
+    key = parent.key + "." + String(index);
+    if (random() < 0.01) {
+      parent = { key: "MISSING-" + Math.floor(random() * 20) };
+    }
+    if (random() < 0.005 && entries.length) {
+      key = entries[Math.floor(random() * entries.length)].key;
+    }
+    entries.push({ id: "e" + index, key: key, text: "NOTE " + index, parentKey: parent.key, originalIndex: index });
+    if (random() < 0.2) {
+      parents.push(entries[entries.length - 1]);
+    }
+  }
+  return entries;
+}
+
+// ---------------------------------------------------------------- pre-store helpers
+function referenceRows(entries) {
+  function entriesByKey() {
+    var map = {};
+    entries.forEach(function (entry) {
+      if (entry.key && !map[entry.key]) {
+        map[entry.key] = entry;
+      }
+    });
+    return map;
+  }
+
+  function childCount(key) {
+    var count = 0;
+    entries.forEach(function (entry) {
+      if (trim(entry.parentKey) === trim(key)) {
+        count += 1;
+      }
+    });
+    return count;
+  }
+
+  function buildChildrenMap() {
+    var children = {};
+    var byKey = entriesByKey();
+    entries.forEach(function (entry) {
+      var parentKey = entry.parentKey && byKey[entry.parentKey] ? entry.parentKey : "";
+      (children[parentKey] = children[parentKey] || []).push(entry);
+    });
+    Object.keys(children).forEach(function (parentKey) {
+      children[parentKey].sort(compareEntriesByKey);
+    });
+    return children;
+  }
+
+  function appendDescendants(children, parentKey, depth, rows, visited) {
+    (children[parentKey] || []).forEach(function (entry) {
+      if (visited[entry.id]) {
+        return;
+      }
+      visited[entry.id] = true;
+      rows.push([entry.id, depth, Boolean(childCount(entry.key))]);
+      appendDescendants(children, entry.key, depth + 1, rows, visited);
+    });
+  }
+
+  var roots = entries.filter(function (entry) {
+    return !trim(entry.parentKey);
+  }).sort(compareEntriesByKey);
+
+  return roots.map(function (root) {
+    var rows = [];
+    appendDescendants(buildChildrenMap(), root.key, 0, rows, {});
+    return rows;
+  });
+}
+
+// ---------------------------------------------------------------- store helpers
+function storeRows(store) {
+  function appendDescendants(parentKey, depth, rows, visited) {
+    store.treeChildren(parentKey).forEach(function (entry) {
+      if (visited[entry.id]) {
+        return;
+      }
+      visited[entry.id] = true;
+      rows.push([entry.id, depth, Boolean(store.childCount(entry.key))]);
+      appendDescendants(entry.key, depth + 1, rows, visited);
+    });
+  }
+
+  return store.children("").map(function (root) {
+    var rows = [];
+    appendDescendants(root.key, 0, rows, {});
+    return rows;
+  });
+}
+
+function timeIt(callback) {
+  var started = process.hrtime.bigint();
+  var result = callback();
+  return { result: result, ms: Number(process.hrtime.bigint() - started) / 1e6 };
+}
+
+function cloneEntries(entries) {
+  return entries.map(function (entry) {
+    return Object.assign({}, entry);
+  });
+}
+
+function applyRandomEdits(store, random, count) {
+  var index;
+  var entries;
+  var entry;
+  var other;
+  var roll;
+  var oldKey;
+
+  for (index = 0; index < count; index += 1) {
+    entries = store.entries;
+    entry = entries[Math.floor(random() * entries.length)];
+    other = entries[Math.floor(random() * entries.length)];
+    roll = random();
+    if (roll < 0.25) {
+      oldKey = entry.key;
+      store.setField(entry, "key", oldKey + "R");
+      store.children(oldKey).slice().forEach(function (child) {
+        store.setField(child, "parentKey", entry.key);
+      });
+    } else if (roll < 0.45) {
+      store.setField(entry, "parentKey", other.key === entry.key ? "" : other.key);
+    } else if (roll < 0.6) {
+      store.setField(entry, "text", "EDITED " + index);
+    } else if (roll < 0.8) {
+      store.add({ id: "n" + index, key: other.key + ".N" + index, text: "NEW " + index, parentKey: other.key, originalIndex: entries.length });
+    } else if (!store.childCount(entry.key)) {
+      store.removeWhere(function (candidate) {
+        return candidate.id === entry.id;
+      });
+    }
+  }
+}
+
+function main() {
+  var entryCount = Number(process.argv[2] || 20000);
+  var random = makeRandom(7);
+  var entries = generateLibrary(entryCount, random);
+  var store = createEntryStore(compareEntriesByKey);
+  var reference;
+  var indexed;
+  var build;
+  var fresh;
+
+  build = timeIt(function () {
+    return store.reset(cloneEntries(entries));
+  });
+  reference = timeIt(function () {
+    return referenceRows(entries);
+  });
+  indexed = timeIt(function () {
+    return storeRows(store);
+  });
+
+  console.log(entryCount + " entries, " + reference.result.length + " divisions");
+  console.log("  linear helpers : " + reference.ms.toFixed(1) + " ms to render every division");
+  console.log("  entry store    : " + indexed.ms.toFixed(1) + " ms (+" + build.ms.toFixed(1) + " ms index build)");
+  console.log("  identical rows : " + (JSON.stringify(reference.result) === JSON.stringify(indexed.result)));
+
+  applyRandomEdits(store, random, 2000);
+  indexed = timeIt(function () {
+    return storeRows(store);
+  });
+  fresh = createEntryStore(compareEntriesByKey);
+  fresh.reset(cloneEntries(store.entries));
+  console.log("  after 2000 edits: incremental " + indexed.ms.toFixed(1) + " ms, matches rebuild " +
+    (JSON.stringify(indexed.result) === JSON.stringify(storeRows(fresh))) + ", matches linear " +
+    (JSON.stringify(indexed.result) === JSON.stringify(referenceRows(store.entries))));
+}
+
+main();
@@ -0,0 +1,337 @@
+// Node benchmark for change_tracker.js: node bench/pending_changes_bench.js [entryCount]
+// Applies a few mass edits to a synthetic library and builds the pending
+// Supabase change batch with the pre-tracker full baseline diff (indexOf per
+// changed entry) and with the change tracker, checking both agree. Each batch
+// is then saved through db_manager.js against a local PostgREST-style stub
+// (POST /rest/v1/rpc/<function>) that counts requests and request bytes; a
+// full file snapshot sync is sent once for comparison.
+"use strict";
+
+var fs = require("fs");
+var http = require("http");
+var path = require("path");
+var vm = require("vm");
+
+var changeTrackerModule = require("../change_tracker.js").ffeKeynoteChangeTracker;
+
+function makeRandom(seed) {
+  var value = seed;
+  return function random() {
+    value = (value * 1103515245 + 12345) % 2147483648;
+    return value / 2147483648;
+  };
+}
+
+function generateLibrary(entryCount, random) {
+  var entries = [];
+  var parents = [];
+  var index;
+  var parent;
+
+  for (index = 0; index < 12; index += 1) {
+    entries.push({ id: "e" + index, key: String(index + 1), text: "DIVISION " + (index + 1), parentKey: "" });
+    parents.push(entries[index]);
+  }
+  for (index = 12; index < entryCount; index += 1) {
+    parent = parents[Math.floor(random() * parents.length)];
+    entries.push({ id: "e" + index, key: parent.key + "." + index, text: "NOTE " + index, parentKey: parent.key });
+    if (random() < 0.2) {
+      parents.push(entries[entries.length - 1]);
+    }
+  }
+  entries.forEach(function (entry, position) {
+    entry.dbId = "00000000-0000-4000-8000-" + ("000000000000" + position).slice(-12);
+    entry.rowVersion = 1;
+    entry.sortOrder = position * 10;
+  });
+  return entries;
+}
+
+function snapshotOf(entries) {
+  return entries.map(function (entry) {
+    return {
+      id: entry.id,
+      dbId: entry.dbId,
+      key: entry.key,
+      text: entry.text,
+      parentKey: entry.parentKey,
+      rowVersion: entry.rowVersion,
+      sortOrder: entry.sortOrder
+    };
+  });
+}
+
+// ---------------------------------------------------------------- pre-tracker builder
+function fullDiff(baselineEntries, entries) {
+  var byId = function (list) {
+    var map = {};
+    list.forEach(function (entry) {
+      if (entry.id) {
+        map[entry.id] = entry;
+      }
+    });
+    return map;
+  };
+  var currentById = byId(entries);
+  var seen = {};
+  var changes = { upserts: [], deletes: [] };
+
+  baselineEntries.forEach(function (baseEntry) {
+    var currentEntry = currentById[baseEntry.id];
+    seen[baseEntry.id] = true;
+    if (!currentEntry) {
+      changes.deletes.push(changeTrackerModule.makeDbDelete(baseEntry));
+    } else if (!changeTrackerModule.entryFieldsEqual(baseEntry, currentEntry)) {
+      changes.upserts.push(changeTrackerModule.makeDbUpsert(currentEntry, baseEntry, entries.indexOf(currentEntry)));
+    }
+  });
+  entries.forEach(function (entry, index) {
+    if (!seen[entry.id]) {
+      changes.upserts.push(changeTrackerModule.makeDbUpsert(entry, null, index));
+    }
+  });
+  return changes;
+}
+
+// ---------------------------------------------------------------- editing session
+// Mirrors the site.js mutation helpers: every change goes through these and
+// touches the tracker.
+function createSession(entries) {
+  var session = {
+    entries: entries,
+    byId: {},
+    tracker: changeTrackerModule.createChangeTracker(),
+    baseline: null
+  };
+
+  session.entries.forEach(function (entry) {
+    session.byId[entry.id] = entry;
+  });
+  session.findById = function (id) {
+    return session.byId[id];
+  };
+  session.setField = function (entry, field, value) {
+    if (entry[field] !== value) {
+      entry[field] = value;
+      session.tracker.touch(entry.id);
+    }
+  };
+  session.add = function (entry) {
+    session.entries.push(entry);
+    session.byId[entry.id] = entry;
+    session.tracker.touch(entry.id);
+  };
+  session.remove = function (predicate) {
+    session.entries = session.entries.filter(function (entry) {
+      if (predicate(entry)) {
+        delete session.byId[entry.id];
+        session.tracker.touch(entry.id);
+        return false;
+      }
+      return true;
+    });
+  };
+  session.rememberBaseline = function () {
+    session.baseline = snapshotOf(session.entries);
+    session.tracker.reset(session.baseline);
+  };
+  return session;
+}
+
+function descendantsOf(entries, rootKey) {
+  var childrenByParent = {};
+  var found = [];
+  var queue = [rootKey];
+  entries.forEach(function (entry) {
+    (childrenByParent[entry.parentKey] = childrenByParent[entry.parentKey] || []).push(entry);
+  });
+  while (queue.length) {
+    (childrenByParent[queue.shift()] || []).forEach(function (child) {
+      found.push(child);
+      queue.push(child.key);
+    });
+  }
+  return found;
+}
+
+var SCENARIOS = [
+  {
+    name: "edit one description",
+    apply: function (session) {
+      session.setField(session.entries[500], "text", "EDITED NOTE");
+    }
+  },
+  {
+    name: "renumber division 3",
+    apply: function (session) {
+      descendantsOf(session.entries, "3").forEach(function (entry) {
+        session.setField(entry, "key", entry.key.replace(/^3\./, "3R."));
+        session.setField(entry, "parentKey", entry.parentKey.replace(/^3(\.|$)/, "3R$1"));
+      });
+    }
+  },
+  {
+    name: "move division 7 under 8",
+    apply: function (session) {
+      var root = session.findById("e6");
+      session.setField(root, "parentKey", "8");
+    }
+  },
+  {
+    name: "delete 500, add 300",
+    apply: function (session, random) {
+      var doomed = {};
+      var index;
+      var parent;
+      session.entries.slice(-2000).forEach(function (entry) {
+        if (Object.keys(doomed).length < 500 && random() < 0.5) {
+          doomed[entry.id] = true;
+        }
+      });
+      session.remove(function (entry) {
+        return Boolean(doomed[entry.id]);
+      });
+      for (index = 0; index < 300; index += 1) {
+        parent = session.entries[Math.floor(random() * 12)];
+        session.add({ id: "n" + index, key: parent.key + ".N" + index, text: "NEW " + index, parentKey: parent.key });
+      }
+    }
+  }
+];
+
+// ---------------------------------------------------------------- PostgREST-style stub
+function startStub(callback) {
+  var stats = {};
+  var datasetVersion = 1;
+  var server = http.createServer(function (request, response) {
+    var match = /^\/rest\/v1\/rpc\/([a-z_]+)$/.exec(request.url);
+    var chunks = [];
+
+    request.on("data", function (chunk) {
+      chunks.push(chunk);
+    });
+    request.on("end", function () {
+      var body = Buffer.concat(chunks);
+      var name = match ? match[1] : request.url;
+      var status = 404;
+      var reply = { code: "PGRST202", message: "Could not find the function " + name };
+
+      stats[name] = stats[name] || { requests: 0, bytes: 0 };
+      stats[name].requests += 1;
+      stats[name].bytes += body.length;
+      if (request.method === "POST" && match && request.headers.apikey) {
+        datasetVersion += 1;
+        status = 200;
+        reply = { status: "ready", libraryId: "lib", libraryKey: "bench", datasetVersion: datasetVersion, entries: [] };
+      }
+      response.writeHead(status, { "Content-Type": "application/json" });
+      response.end(JSON.stringify(reply));
+    });
+  });
+
+  server.listen(0, "127.0.0.1", function () {
+    callback(server, "http://127.0.0.1:" + server.address().port, stats);
+  });
+}
+
+// Just enough of supabase-js for db_manager.js: rpc() posts the named
+// arguments as a JSON body, the way PostgREST expects.
+function stubSupabase() {
+  return {
+    createClient: function (url, key) {
+      return {
+        rpc: function (name, args) {
+          return fetch(url + "/rest/v1/rpc/" + name, {
+            method: "POST",
+            headers: { "Content-Type": "application/json", apikey: key, Authorization: "Bearer " + key },
+            body: JSON.stringify(args)
+          }).then(function (response) {
+            return response.json().then(function (data) {
+              return response.ok ? { data: data, error: null } : { data: null, error: data };
+            });
+          });
+        },
+        removeChannel: function () {}
+      };
+    }
+  };
+}
+
+function loadDbManager() {
+  var sandbox = { supabase: stubSupabase(), Promise: Promise };
+  sandbox.window = sandbox;
+  vm.runInNewContext(fs.readFileSync(path.join(__dirname, "..", "db_manager.js"), "utf8"), sandbox);
+  return sandbox.ffeKeynoteDb;
+}
+
+function timeIt(callback) {
+  var started = process.hrtime.bigint();
+  var result = callback();
+  return { result: result, ms: Number(process.hrtime.bigint() - started) / 1e6 };
+}
+
+function kilobytes(bytes) {
+  return (bytes / 1024).toFixed(1) + " KB";
+}
+
+function main() {
+  var entryCount = Number(process.argv[2] || 20000);
+  var random = makeRandom(5);
+  var session = createSession(generateLibrary(entryCount, random));
+  var db = loadDbManager();
+
+  session.rememberBaseline();
+  startStub(function (server, url, stats) {
+    var chain = Promise.resolve();
+
+    db.configure({ url: url, anonKey: "bench-key" });
+    console.log(entryCount + " entries");
+
+    SCENARIOS.forEach(function (scenario) {
+      chain = chain.then(function () {
+        var reference;
+        var tracked;
+        var before = stats.save_keynote_changes || { requests: 0, bytes: 0 };
+        var sent = { requests: before.requests, bytes: before.bytes };
+
+        scenario.apply(session, random);
+        reference = timeIt(function () {
+          return fullDiff(session.baseline, session.entries);
+        });
+        tracked = timeIt(function () {
+          return session.tracker.build(session.entries, session.findById);
+        });
+        return db.saveChanges({
+          libraryKey: "bench",
+          clientId: "bench-client",
+          clientName: "Bench",
+          baseDatasetVersion: 1,
+          changes: tracked.result
+        }).then(function () {
+          var after = stats.save_keynote_changes;
+          console.log("  " + scenario.name + ": " + tracked.result.upserts.length + " upserts, " +
+            tracked.result.deletes.length + " deletes");
+          console.log("    full diff " + reference.ms.toFixed(1) + " ms, tracker " + tracked.ms.toFixed(1) +
+            " ms, identical " + (JSON.stringify(reference.result) === JSON.stringify(tracked.result)));
+          console.log("    save_keynote_changes: " + (after.requests - sent.requests) + " request, " +
+            kilobytes(after.bytes - sent.bytes));
+          session.rememberBaseline();
+        });
+      });
+    });
+
+    chain.then(function () {
+      return db.syncFileSnapshot({ libraryKey: "bench", entries: snapshotOf(session.entries) });
+    }).then(function () {
+      console.log("  for comparison, sync_keynote_file_snapshot of the whole file: " +
+        stats.sync_keynote_file_snapshot.requests + " request, " + kilobytes(stats.sync_keynote_file_snapshot.bytes));
+    }).catch(function (error) {
+      console.error(error);
+      process.exitCode = 1;
+    }).then(function () {
+      server.close();
+    });
+  });
+}
+
+main();
@@ -0,0 +1,183 @@
+// Node benchmark for search_index.js: node bench/search_index_bench.js [entryCount]
+// Types a few queries one character at a time and, for every keystroke,
+// finds the matching entries plus their ancestor context rows the way the
+// pre-index filter did (lowercase concat + indexOf per entry, parent walk
+// through a freshly built key map) and with the trigram index and a cached
+// ancestor closure. Checks both agree, then edits entries and checks the
+// incremental index still matches a full scan.
+"use strict";
+
+var createSearchIndex = require("../search_index.js").ffeKeynoteSearchIndex.createSearchIndex;
+
+var QUERIES = ["note 1", "12.4", "division", "xyz", "ceiling grid", "e 99"];
+
+function makeRandom(seed) {
+  var value = seed;
+  return function random() {
+    value = (value * 1103515245 + 12345) % 2147483648;
+    return value / 2147483648;
+  };
+}
+
+function generateLibrary(entryCount, random) {
+  var words = ["CEILING", "GRID", "PAINT", "BOARD", "TRIM", "DOOR", "FRAME", "SEALANT", "TILE", "BASE"];
+  var entries = [];
+  var parents = [];
+  var index;
+  var parent;
+  var description;
+
+  for (index = 0; index < 12; index += 1) {
+    entries.push({ id: "e" + index, key: String(index + 1), text: "DIVISION " + (index + 1), parentKey: "" });
+    parents.push(entries[index]);
+  }
+  for (index = 12; index < entryCount; index += 1) {
+    parent = parents[Math.floor(random() * parents.length)];
+    description = words[Math.floor(random() * words.length)] + " " + words[Math.floor(random() * words.length)];
+    entries.push({ id: "e" + index, key: parent.key + "." + index, text: "NOTE " + index + " " + description, parentKey: parent.key });
+    if (random() < 0.2) {
+      parents.push(entries[entries.length - 1]);
+    }
+  }
+  return entries;
+}
+
+function scanMatches(entries, query) {
+  var found = {};
+  entries.forEach(function (entry) {
+    var haystack = (entry.key + " " + entry.text + " " + entry.parentKey).toLowerCase();
+    if (haystack.indexOf(query) !== -1) {
+      found[entry.id] = true;
+    }
+  });
+  return found;
+}
+
+function entriesByKey(entries) {
+  var map = {};
+  entries.forEach(function (entry) {
+    if (entry.key && !map[entry.key]) {
+      map[entry.key] = entry;
+    }
+  });
+  return map;
+}
+
+function contextFor(entries, matchIds, ancestorIds) {
+  var context = {};
+  entries.forEach(function (entry) {
+    if (matchIds[entry.id]) {
+      ancestorIds(entry).forEach(function (id) {
+        context[id] = true;
+      });
+    }
+  });
+  return context;
+}
+
+function walkAncestors(byKeyFactory) {
+  return function (entry) {
+    var ids = [];
+    var seen = {};
+    var cursor = entry;
+    var parent;
+    while (cursor && cursor.parentKey) {
+      parent = byKeyFactory()[cursor.parentKey];
+      if (!parent || seen[parent.id]) {
+        break;
+      }
+      ids.push(parent.id);
+      seen[parent.id] = true;
+      cursor = parent;
+    }
+    return ids;
+  };
+}
+
+function sameKeys(first, second) {
+  return JSON.stringify(Object.keys(first).sort()) === JSON.stringify(Object.keys(second).sort());
+}
+
+function timeIt(callback) {
+  var started = process.hrtime.bigint();
+  var result = callback();
+  return { result: result, ms: Number(process.hrtime.bigint() - started) / 1e6 };
+}
+
+function keystrokes() {
+  var strokes = [];
+  QUERIES.forEach(function (query) {
+    var length;
+    for (length = 1; length <= query.length; length += 1) {
+      strokes.push(query.slice(0, length));
+    }
+  });
+  return strokes;
+}
+
+function main() {
+  var entryCount = Number(process.argv[2] || 20000);
+  var random = makeRandom(11);
+  var entries = generateLibrary(entryCount, random);
+  var index = createSearchIndex();
+  var strokes = keystrokes();
+  var byKey = entriesByKey(entries);
+  var ancestorCache = {};
+  var cachedAncestors = walkAncestors(function () {
+    return byKey;
+  });
+  var build;
+  var reference;
+  var indexed;
+  var agree = true;
+  var editIndex;
+  var entry;
+
+  // reset only caches the lowercase text; the first trigram query builds the
+  // postings, so force that here and report it as the one-off build cost.
+  build = timeIt(function () {
+    index.reset(entries);
+    index.matches("---");
+  });
+  // The old filter rebuilt the key map for every parent lookup; one map per
+  // keystroke is already generous to it.
+  reference = timeIt(function () {
+    return strokes.map(function (query) {
+      var map = entriesByKey(entries);
+      var matches = scanMatches(entries, query);
+      return [matches, contextFor(entries, matches, walkAncestors(function () {
+        return map;
+      }))];
+    });
+  });
+  indexed = timeIt(function () {
+    return strokes.map(function (query) {
+      var matches = index.matches(query);
+      return [matches, contextFor(entries, matches, function (candidate) {
+        if (!ancestorCache[candidate.id]) {
+          ancestorCache[candidate.id] = cachedAncestors(candidate);
+        }
+        return ancestorCache[candidate.id];
+      })];
+    });
+  });
+  reference.result.forEach(function (pair, position) {
+    agree = agree && sameKeys(pair[0], indexed.result[position][0]) && sameKeys(pair[1], indexed.result[position][1]);
+  });
+
+  console.log(entryCount + " entries, " + strokes.length + " keystrokes");
+  console.log("  scan per keystroke : " + (reference.ms / strokes.length).toFixed(2) + " ms");
+  console.log("  trigram index      : " + (indexed.ms / strokes.length).toFixed(2) + " ms (+" + build.ms.toFixed(1) + " ms one-off build)");
+  console.log("  identical results  : " + agree);
+
+  for (editIndex = 0; editIndex < 2000; editIndex += 1) {
+    entry = entries[Math.floor(random() * entries.length)];
+    entry.text = random() < 0.5 ? entry.text + " GRID" : "EDITED " + editIndex;
+    index.update(entry);
+  }
+  console.log("  after 2000 edits   : " + QUERIES.every(function (query) {
+    return sameKeys(index.matches(query), scanMatches(entries, query));
+  }));
+}
+
+main();
@@ -0,0 +1,206 @@
+(function attachKeynoteChangeTracker(globalScope) {
+  "use strict";
+
+  // Tracks which keynote ids were touched since the last saved baseline so the
+  // pending Supabase change batch can be built from those ids alone instead
+  // of diffing the whole library on every save. The emitted upserts/deletes
+  // are the same, in the same order, as a full baseline diff.
+
+  function text(value) {
+    if (value === null || value === undefined) {
+      return "";
+    }
+    return String(value);
+  }
+
+  function trim(value) {
+    return text(value).replace(/^\s+|\s+$/g, "");
+  }
+
+  function entryFieldsEqual(first, second) {
+    return Boolean(first && second) &&
+      trim(first.key) === trim(second.key) &&
+      trim(first.text) === trim(second.text) &&
+      trim(first.parentKey) === trim(second.parentKey);
+  }
+
+  function numericVersion(value) {
+    var number = Number(value || 0);
+    return isNaN(number) ? 0 : number;
+  }
+
+  function nullableDbId(value) {
+    // Supabase assigns UUIDs to new rows; JSON null prevents a blank value from reaching a UUID cast.
+    var dbId = trim(value);
+    return dbId || null;
+  }
+
+  function hasSortOrder(entry) {
+    return Boolean(entry && (entry.sortOrder || entry.sortOrder === 0));
+  }
+
+  function sortOrderFor(entry, fallbackIndex, baseEntry) {
+    if (hasSortOrder(baseEntry)) {
+      return Number(baseEntry.sortOrder);
+    }
+    if (hasSortOrder(entry)) {
+      return Number(entry.sortOrder);
+    }
+    return fallbackIndex || 0;
+  }
+
+  function makeDbUpsert(entry, baseEntry, index) {
+    return {
+      dbId: nullableDbId((baseEntry && baseEntry.dbId) || entry.dbId),
+      key: trim(entry.key),
+      text: trim(entry.text),
+      parentKey: trim(entry.parentKey),
+      sortOrder: sortOrderFor(entry, index, baseEntry),
+      baseVersion: numericVersion((baseEntry && baseEntry.rowVersion) || entry.rowVersion),
+      previousKey: baseEntry ? trim(baseEntry.key) : ""
+    };
+  }
+
+  function makeDbDelete(baseEntry) {
+    return {
+      dbId: nullableDbId(baseEntry.dbId),
+      key: trim(baseEntry.key),
+      baseVersion: numericVersion(baseEntry.rowVersion)
+    };
+  }
+
+  function indexById(entries) {
+    var map = {};
+    (entries || []).forEach(function (entry) {
+      if (entry.id) {
+        map[entry.id] = entry;
+      }
+    });
+    return map;
+  }
+
+  function createChangeTracker() {
+    var tracker = {};
+    // Baseline rows are held by reference: snapshot metadata (dbId,
+    // rowVersion, sortOrder) merged into them later is picked up on build.
+    var baseline = [];
+    var baselineById = {};
+    var baselinePosition = {};
+    var touched = {};
+    var everything = true;
+
+    function reset(baselineEntries) {
+      baseline = baselineEntries || [];
+      baselineById = {};
+      baselinePosition = {};
+      baseline.forEach(function (entry, index) {
+        if (entry.id) {
+          baselineById[entry.id] = entry;
+          baselinePosition[entry.id] = index;
+        }
+      });
+      touched = {};
+      everything = false;
+    }
+
+    // Records that the entry with this id was added, removed or edited.
+    function touch(id) {
+      if (id) {
+        touched[id] = true;
+      }
+    }
+
+    // The entry list was replaced wholesale; the next build diffs everything.
+    function touchAll() {
+      everything = true;
+    }
+
+    // Builds { upserts, deletes } for entries against the baseline.
+    // findById(id) returns the current entry with that id, if any.
+    function build(entries, findById) {
+      var changes = {
+        upserts: [],
+        deletes: []
+      };
+      var positions = null;
+      var changedBase = [];
+      var added = [];
+
+      entries = entries || [];
+
+      function positionOf(entry) {
+        if (!positions) {
+          positions = {};
+          entries.forEach(function (candidate, index) {
+            if (candidate.id) {
+              positions[candidate.id] = index;
+            }
+          });
+        }
+        return positions[entry.id];
+      }
+
+      // The list position is only a fallback for rows without a sort order,
+      // so the position map is not built unless one of those is emitted.
+      function fallbackIndex(entry, baseEntry) {
+        if (hasSortOrder(baseEntry) || hasSortOrder(entry)) {
+          return 0;
+        }
+        return positionOf(entry);
+      }
+
+      if (everything) {
+        findById = (function (byId) {
+          return function (id) {
+            return byId[id];
+          };
+        }(indexById(entries)));
+        changedBase = baseline.slice();
+        added = entries.filter(function (entry) {
+          return !baselineById[entry.id];
+        });
+      } else {
+        Object.keys(touched).forEach(function (id) {
+          var current = findById(id);
+          if (baselineById[id]) {
+            changedBase.push(baselineById[id]);
+          } else if (current) {
+            added.push(current);
+          }
+        });
+        changedBase.sort(function (first, second) {
+          return baselinePosition[first.id] - baselinePosition[second.id];
+        });
+        added.sort(function (first, second) {
+          return positionOf(first) - positionOf(second);
+        });
+      }
+
+      changedBase.forEach(function (baseEntry) {
+        var currentEntry = findById(baseEntry.id);
+        if (!currentEntry) {
+          changes.deletes.push(makeDbDelete(baseEntry));
+        } else if (!entryFieldsEqual(baseEntry, currentEntry)) {
+          changes.upserts.push(makeDbUpsert(currentEntry, baseEntry, fallbackIndex(currentEntry, baseEntry)));
+        }
+      });
+      added.forEach(function (entry) {
+        changes.upserts.push(makeDbUpsert(entry, null, fallbackIndex(entry, null)));
+      });
+      return changes;
+    }
+
+    tracker.reset = reset;
+    tracker.touch = touch;
+    tracker.touchAll = touchAll;
+    tracker.build = build;
+    return tracker;
+  }
+
+  globalScope.ffeKeynoteChangeTracker = {
+    createChangeTracker: createChangeTracker,
+    entryFieldsEqual: entryFieldsEqual,
+    makeDbUpsert: makeDbUpsert,
+    makeDbDelete: makeDbDelete
+  };
+}(typeof window !== "undefined" ? window : this));
@@ -0,0 +1,330 @@
+(function attachKeynoteEntryStore(globalScope) {
+  "use strict";
+
+  // Indexed keynote entries: id, key and parentKey -> children lookups kept
+  // up to date by every mutation, so tree reads never rescan the library.
+  // store.entries stays a plain array in library order for everything else.
+  // The store also keeps an order-independent hash of the saved fields of
+  // every entry, so "does the library differ from the baseline" is O(1).
+
+  var CONTENT_FIELDS = ["id", "key", "text", "parentKey", "lineNumber"];
+
+  function text(value) {
+    if (value === null || value === undefined) {
+      return "";
+    }
+    return String(value);
+  }
+
+  function trim(value) {
+    return text(value).replace(/^\s+|\s+$/g, "");
+  }
+
+  // Two independent 32-bit string hashes (FNV-1a and a multiplicative mix).
+  function hashLanes(value) {
+    var first = 0x811c9dc5;
+    var second = 0x2545f491;
+    var index;
+    var code;
+    for (index = 0; index < value.length; index += 1) {
+      code = value.charCodeAt(index);
+      first = Math.imul(first ^ code, 0x01000193);
+      second = Math.imul(second + code, 0x5bd1e995) ^ (second >>> 15);
+    }
+    return [first >>> 0, second >>> 0];
+  }
+
+  function entryContentLanes(entry) {
+    return hashLanes(CONTENT_FIELDS.map(function (fieldName) {
+      return fieldName === "lineNumber" ? text(entry.lineNumber || "") : text(entry[fieldName]);
+    }).join("\u0001"));
+  }
+
+  function createEntryStore(compareEntries) {
+    var store = {
+      entries: [],
+      version: 0
+    };
+    var byId = {};
+    var orderById = {};
+    var nextOrder = 0;
+    var keyBuckets = {};
+    var childBuckets = {};
+    var sortedChildren = {};
+    var treeRootCache = null;
+    var contentLanes = [0, 0];
+
+    function byOrder(first, second) {
+      return orderById[first.id] - orderById[second.id];
+    }
+
+    function changed() {
+      store.version += 1;
+      treeRootCache = null;
+    }
+
+    function invalidateChildren(parentKey) {
+      delete sortedChildren[parentKey];
+    }
+
+    function addToKeyBucket(entry) {
+      var key = trim(entry.key);
+      var bucket = keyBuckets[key];
+      if (!bucket) {
+        keyBuckets[key] = [entry];
+        return;
+      }
+      bucket.push(entry);
+      if (bucket.length > 1 && byOrder(bucket[bucket.length - 2], entry) > 0) {
+        bucket.sort(byOrder);
+      }
+    }
+
+    function removeFromKeyBucket(entry) {
+      var key = trim(entry.key);
+      var bucket = keyBuckets[key];
+      var index;
+      if (!bucket) {
+        return;
+      }
+      index = bucket.indexOf(entry);
+      if (index >= 0) {
+        bucket.splice(index, 1);
+      }
+      if (!bucket.length) {
+        delete keyBuckets[key];
+      }
+    }
+
+    function addToChildBucket(entry) {
+      var parentKey = trim(entry.parentKey);
+      var bucket = childBuckets[parentKey];
+      if (!bucket) {
+        bucket = childBuckets[parentKey] = { members: {}, count: 0 };
+      }
+      if (!bucket.members[entry.id]) {
+        bucket.members[entry.id] = entry;
+        bucket.count += 1;
+      }
+      invalidateChildren(parentKey);
+    }
+
+    function removeFromChildBucket(entry) {
+      var parentKey = trim(entry.parentKey);
+      var bucket = childBuckets[parentKey];
+      if (bucket && bucket.members[entry.id]) {
+        delete bucket.members[entry.id];
+        bucket.count -= 1;
+        if (!bucket.count) {
+          delete childBuckets[parentKey];
+        }
+      }
+      invalidateChildren(parentKey);
+    }
+
+    function addContent(entry, sign) {
+      var lanes = entryContentLanes(entry);
+      contentLanes[0] = (contentLanes[0] + sign * lanes[0]) >>> 0;
+      contentLanes[1] = (contentLanes[1] + sign * lanes[1]) >>> 0;
+    }
+
+    function indexEntry(entry, order) {
+      byId[entry.id] = entry;
+      if (order === undefined) {
+        order = nextOrder;
+        nextOrder += 1;
+      }
+      orderById[entry.id] = order;
+      addToKeyBucket(entry);
+      addToChildBucket(entry);
+      addContent(entry, 1);
+    }
+
+    function unindexEntry(entry) {
+      removeFromKeyBucket(entry);
+      removeFromChildBucket(entry);
+      addContent(entry, -1);
+      delete byId[entry.id];
+      delete orderById[entry.id];
+    }
+
+    // Order value between the neighbours of position; renumbers everything
+    // when repeated inserts at one spot exhaust the gap.
+    function orderForPosition(position) {
+      var entries = store.entries;
+      var before = position > 0 ? orderById[entries[position - 1].id] : null;
+      var after = orderById[entries[position].id];
+      var order = before === null ? after - 1 : (before + after) / 2;
+      if (order === before || order === after) {
+        nextOrder = 0;
+        entries.forEach(function (entry) {
+          orderById[entry.id] = nextOrder;
+          nextOrder += 1;
+        });
+        return orderForPosition(position);
+      }
+      return order;
+    }
+
+    function reset(entries) {
+      byId = {};
+      orderById = {};
+      nextOrder = 0;
+      keyBuckets = {};
+      childBuckets = {};
+      sortedChildren = {};
+      contentLanes = [0, 0];
+      store.entries = entries || [];
+      store.entries.forEach(indexEntry);
+      changed();
+      return store.entries;
+    }
+
+    // Appends entry, or inserts it at position in library order.
+    function add(entry, position) {
+      var order;
+      if (position === undefined || position === null || position >= store.entries.length) {
+        store.entries.push(entry);
+        indexEntry(entry);
+      } else {
+        position = Math.max(position, 0);
+        order = orderForPosition(position);
+        store.entries.splice(position, 0, entry);
+        indexEntry(entry, order);
+      }
+      changed();
+      return entry;
+    }
+
+    // Drops every entry predicate(entry, index) accepts; returns the new entries array.
+    function removeWhere(predicate) {
+      var kept = [];
+      var removed = false;
+      store.entries.forEach(function (entry, index) {
+        if (predicate(entry, index)) {
+          unindexEntry(entry);
+          removed = true;
+        } else {
+          kept.push(entry);
+        }
+      });
+      if (removed) {
+        store.entries = kept;
+        changed();
+      }
+      return store.entries;
+    }
+
+    function setField(entry, fieldName, value) {
+      if (!entry || entry[fieldName] === value) {
+        return false;
+      }
+      addContent(entry, -1);
+      if (fieldName === "key") {
+        removeFromKeyBucket(entry);
+        entry.key = value;
+        addToKeyBucket(entry);
+        invalidateChildren(trim(entry.parentKey));
+      } else if (fieldName === "parentKey") {
+        removeFromChildBucket(entry);
+        entry.parentKey = value;
+        addToChildBucket(entry);
+      } else {
+        entry[fieldName] = value;
+        if (fieldName === "text") {
+          invalidateChildren(trim(entry.parentKey));
+        }
+      }
+      addContent(entry, 1);
+      changed();
+      return true;
+    }
+
+    function findById(id) {
+      return byId[id] || null;
+    }
+
+    // First entry (in library order) that uses key.
+    function findByKey(key) {
+      var bucket = keyBuckets[trim(key)];
+      return bucket && key ? bucket[0] : null;
+    }
+
+    function hasKey(key) {
+      return Boolean(findByKey(key));
+    }
+
+    function childCount(key) {
+      var bucket = childBuckets[trim(key)];
+      return bucket ? bucket.count : 0;
+    }
+
+    // Entries whose parentKey is exactly key, sorted; shared array, do not mutate.
+    function children(key) {
+      var parentKey = trim(key);
+      var bucket;
+      if (!sortedChildren[parentKey]) {
+        bucket = childBuckets[parentKey];
+        sortedChildren[parentKey] = bucket
+          ? Object.keys(bucket.members).map(function (id) {
+            return bucket.members[id];
+          }).sort(compareEntries)
+          : [];
+      }
+      return sortedChildren[parentKey];
+    }
+
+    // Children as drawn in the tree: under "" every root plus every entry whose
+    // parent key does not exist; under a missing key nothing.
+    function treeChildren(key) {
+      var parentKey = trim(key);
+      if (parentKey) {
+        return hasKey(parentKey) ? children(parentKey) : [];
+      }
+      if (!treeRootCache) {
+        treeRootCache = children("").slice();
+        Object.keys(childBuckets).forEach(function (bucketKey) {
+          if (bucketKey && !hasKey(bucketKey)) {
+            treeRootCache = treeRootCache.concat(children(bucketKey));
+          }
+        });
+        treeRootCache.sort(compareEntries);
+      }
+      return treeRootCache;
+    }
+
+    // Hash of the saved fields of every entry, independent of library order.
+    function contentHash() {
+      return contentLanes[0].toString(16) + "." + contentLanes[1].toString(16) + "." + store.entries.length;
+    }
+
+    // Entries whose parentKey names no existing entry.
+    function orphanCount() {
+      var count = 0;
+      Object.keys(childBuckets).forEach(function (bucketKey) {
+        if (bucketKey && !hasKey(bucketKey)) {
+          count += childBuckets[bucketKey].count;
+        }
+      });
+      return count;
+    }
+
+    store.reset = reset;
+    store.add = add;
+    store.removeWhere = removeWhere;
+    store.setField = setField;
+    store.findById = findById;
+    store.findByKey = findByKey;
+    store.hasKey = hasKey;
+    store.childCount = childCount;
+    store.children = children;
+    store.treeChildren = treeChildren;
+    store.orphanCount = orphanCount;
+    store.contentHash = contentHash;
+    return store;
+  }
+
+  globalScope.ffeKeynoteEntryStore = {
+    createEntryStore: createEntryStore
+  };
+}(typeof window !== "undefined" ? window : this));
@@ -0,0 +1,218 @@
+(function attachKeynoteSearchIndex(globalScope) {
+  "use strict";
+
+  // Trigram index over the searchable text of each keynote (key, text and
+  // parent key, lowercased). A query of three or more characters only
+  // verifies the entries that contain its rarest trigram instead of
+  // scanning the library; shorter queries scan the cached lowercase text.
+  // Entries are re-indexed one at a time as they change.
+
+  function text(value) {
+    if (value === null || value === undefined) {
+      return "";
+    }
+    return String(value);
+  }
+
+  function searchTextFor(entry) {
+    return (text(entry.key) + " " + text(entry.text) + " " + text(entry.parentKey)).toLowerCase();
+  }
+
+  function trigramsOf(value) {
+    var seen = {};
+    var grams = [];
+    var index;
+    var gram;
+    for (index = 0; index + 3 <= value.length; index += 1) {
+      gram = value.substr(index, 3);
+      if (!seen[gram]) {
+        seen[gram] = true;
+        grams.push(gram);
+      }
+    }
+    return grams;
+  }
+
+  function createSearchIndex() {
+    var index = {
+      version: 0
+    };
+    // Each entry owns a slot; postings map a trigram to the slots whose text
+    // contained it when indexed. Re-indexing appends fresh postings and leaves
+    // the old ones behind: every candidate is verified against the current
+    // text anyway, and the postings are rebuilt once stale ones outnumber live.
+    // Postings are built on the first query that needs them, so opening a
+    // library nobody searches only pays for the lowercase text.
+    var slotById = {};
+    var idBySlot = [];
+    var textBySlot = [];
+    var postings = null;
+    var livePostings = 0;
+    var stalePostings = 0;
+    var entryCount = 0;
+    var lastQuery = null;
+    var lastMatches = null;
+
+    function changed() {
+      index.version += 1;
+      lastQuery = null;
+      lastMatches = null;
+    }
+
+    function addPostings(slot, value) {
+      var grams;
+      if (!postings) {
+        return;
+      }
+      grams = trigramsOf(value);
+      grams.forEach(function (gram) {
+        (postings[gram] || (postings[gram] = [])).push(slot);
+      });
+      livePostings += grams.length;
+    }
+
+    function retirePostings(value) {
+      var count;
+      if (!postings) {
+        return;
+      }
+      count = trigramsOf(value).length;
+      livePostings -= count;
+      stalePostings += count;
+    }
+
+    function rebuildPostings() {
+      postings = {};
+      livePostings = 0;
+      stalePostings = 0;
+      textBySlot.forEach(function (value, slot) {
+        if (value !== null) {
+          addPostings(slot, value);
+        }
+      });
+    }
+
+    function reset(entries) {
+      slotById = {};
+      idBySlot = [];
+      textBySlot = [];
+      entryCount = 0;
+      (entries || []).forEach(function (entry) {
+        slotById[entry.id] = idBySlot.length;
+        idBySlot.push(entry.id);
+        textBySlot.push(searchTextFor(entry));
+        entryCount += 1;
+      });
+      postings = null;
+      changed();
+    }
+
+    // Adds or re-indexes entry; cheap when its searchable text is unchanged.
+    function update(entry) {
+      var value = searchTextFor(entry);
+      var slot = slotById[entry.id];
+
+      if (slot === undefined) {
+        slot = slotById[entry.id] = idBySlot.length;
+        idBySlot.push(entry.id);
+        textBySlot.push(null);
+        entryCount += 1;
+      } else if (textBySlot[slot] === value) {
+        return;
+      } else {
+        retirePostings(textBySlot[slot]);
+      }
+      textBySlot[slot] = value;
+      addPostings(slot, value);
+      if (postings && stalePostings > livePostings) {
+        rebuildPostings();
+      }
+      changed();
+    }
+
+    function remove(id) {
+      var slot = slotById[id];
+      if (slot === undefined) {
+        return;
+      }
+      retirePostings(textBySlot[slot]);
+      textBySlot[slot] = null;
+      delete slotById[id];
+      entryCount -= 1;
+      changed();
+    }
+
+    function collect(slots, query) {
+      var found = {};
+      slots.forEach(function (slot) {
+        var value = textBySlot[slot];
+        if (value !== null && value.indexOf(query) !== -1) {
+          found[idBySlot[slot]] = true;
+        }
+      });
+      return found;
+    }
+
+    function collectAll(query) {
+      var found = {};
+      textBySlot.forEach(function (value, slot) {
+        if (value !== null && value.indexOf(query) !== -1) {
+          found[idBySlot[slot]] = true;
+        }
+      });
+      return found;
+    }
+
+    // Ids whose searchable text contains query (already lowercased), as a
+    // { id: true } map. The last result is reused until the index changes.
+    function matches(query) {
+      var grams;
+      var rarest = null;
+      var gramIndex;
+      var posting;
+
+      query = text(query);
+      if (query === lastQuery && lastMatches) {
+        return lastMatches;
+      }
+
+      if (query.length < 3) {
+        lastMatches = collectAll(query);
+      } else {
+        if (!postings) {
+          rebuildPostings();
+        }
+        grams = trigramsOf(query);
+        for (gramIndex = 0; gramIndex < grams.length; gramIndex += 1) {
+          posting = postings[grams[gramIndex]];
+          if (!posting) {
+            rarest = null;
+            break;
+          }
+          if (!rarest || posting.length < rarest.length) {
+            rarest = posting;
+          }
+        }
+        lastMatches = rarest ? collect(rarest, query) : {};
+      }
+      lastQuery = query;
+      return lastMatches;
+    }
+
+    function size() {
+      return entryCount;
+    }
+
+    index.reset = reset;
+    index.update = update;
+    index.remove = remove;
+    index.matches = matches;
+    index.size = size;
+    return index;
+  }
+
+  globalScope.ffeKeynoteSearchIndex = {
+    createSearchIndex: createSearchIndex,
+    searchTextFor: searchTextFor
+  };
+}(typeof window !== "undefined" ? window : this));
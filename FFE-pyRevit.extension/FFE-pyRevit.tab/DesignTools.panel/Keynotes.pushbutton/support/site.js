@@ -9,7 +9,55 @@
   var NOTE_KEY_COLUMN_MIN_WIDTH = 96;
   var NOTE_DESCRIPTION_COLUMN_MIN_WIDTH = 180;
   var NOTE_ACTION_COLUMN_WIDTH = 64;
+  var NOTE_WINDOW_MIN_ROWS = 150;
+  var NOTE_WINDOW_OVERSCAN = 20;
+  var NOTE_WINDOW_FOCUS_REACH = 200;
+  var NOTE_WINDOW_DEFAULT_ROW_HEIGHT = 52;
+  var NOTE_WINDOW_DEFAULT_VIEWPORT = 720;
+  var SEARCH_DEBOUNCE_MS = 120;
   var activeRowActionMenu = null;
+  var noteWindow = {
+    rows: [],
+    indexById: {},
+    records: {},
+    rowHeight: 0,
+    focusedEntryId: null,
+    topSpacer: null,
+    bottomSpacer: null
+  };
+  var RENDER_REGION_ORDER = [
+    "meta",
+    "divisions",
+    "divisionSelect",
+    "divisionHeader",
+    "notes",
+    "noteWindow",
+    "validation",
+    "modelHealth",
+    "placedKeynotes",
+    "saveState",
+    "rowActions",
+    "sidebar"
+  ];
+  var renderScheduler = {
+    dirty: {},
+    frame: null
+  };
+  var regionSignatures = {};
+  var historyJournal = {
+    ops: [],
+    base: 0,
+    mutationMark: null
+  };
+  var baselineRevision = 0;
+  var searchRenderTimer = null;
+  var divisionModelCache = { version: -1, models: null };
+  var ancestorCache = { version: -1, ids: {} };
+  var entryStore = globalScope.ffeKeynoteEntryStore.createEntryStore(compareEntriesByKey);
+  var searchIndex = globalScope.ffeKeynoteSearchIndex.createSearchIndex();
+  var changeTracker = globalScope.ffeKeynoteChangeTracker.createChangeTracker();
+  var entryFieldsEqual = globalScope.ffeKeynoteChangeTracker.entryFieldsEqual;
+  var snapshotIndexCache = { entries: null, byKey: null, byDbId: null };
 
   var state = {
     payload: null,
@@ -55,7 +103,7 @@
     undoHistory: [],
     redoHistory: [],
     activeFieldEdit: null,
-    historyBaselineSignature: "",
+    historyBaselineHash: "",
     noteKeyColumnWidth: NOTE_KEY_COLUMN_DEFAULT_WIDTH
   };
 
@@ -567,14 +615,71 @@
     state.syncIssues.push(issue);
   }
 
-  function findEntryById(id) {
-    var index;
-    for (index = 0; index < state.entries.length; index += 1) {
-      if (state.entries[index].id === id) {
-        return state.entries[index];
+  // state.entries is owned by entryStore; mutate it only through these helpers.
+  function setEntries(entries) {
+    if (historyIsRecording()) {
+      recordHistoryOp({
+        type: "reset",
+        before: cloneHistoryValue(state.entries, []),
+        after: cloneHistoryValue(entries, [])
+      });
+    }
+    state.entries = entryStore.reset(entries);
+    searchIndex.reset(state.entries);
+    changeTracker.touchAll();
+    return state.entries;
+  }
+
+  function addEntry(entry, position) {
+    entryStore.add(entry, position);
+    state.entries = entryStore.entries;
+    searchIndex.update(entry);
+    changeTracker.touch(entry.id);
+    recordHistoryOp({
+      type: "add",
+      id: entry.id,
+      index: position === undefined || position === null || position >= state.entries.length - 1
+        ? state.entries.length - 1
+        : Math.max(position, 0),
+      entry: null
+    });
+    return entry;
+  }
+
+  function removeEntries(predicate) {
+    var recording = historyIsRecording();
+    var removed = [];
+
+    state.entries = entryStore.removeWhere(function (entry, index) {
+      var remove = predicate(entry);
+      if (remove) {
+        searchIndex.remove(entry.id);
+        changeTracker.touch(entry.id);
+      }
+      if (remove && recording) {
+        removed.push({ type: "remove", id: entry.id, index: index, entry: cloneHistoryValue(entry, null) });
       }
+      return remove;
+    });
+    // Positions are recorded against the list before removal; re-adding in
+    // ascending order on undo restores them exactly.
+    removed.reverse().forEach(recordHistoryOp);
+    return state.entries;
+  }
+
+  function setEntryField(entry, fieldName, value) {
+    var before = entry ? entry[fieldName] : undefined;
+    var didChange = entryStore.setField(entry, fieldName, value);
+    if (didChange) {
+      searchIndex.update(entry);
+      changeTracker.touch(entry.id);
+      recordHistoryOp({ type: "set", id: entry.id, field: fieldName, before: before, after: value });
     }
-    return null;
+    return didChange;
+  }
+
+  function findEntryById(id) {
+    return entryStore.findById(id);
   }
 
   function selectedDivisionEntry() {
@@ -592,25 +697,12 @@
     return selectedNoteEntry() || selectedDivisionEntry();
   }
 
-  function entriesByKey() {
-    var map = {};
-    state.entries.forEach(function (entry) {
-      if (entry.key && !map[entry.key]) {
-        map[entry.key] = entry;
-      }
-    });
-    return map;
+  function entryByKey(key) {
+    return entryStore.findByKey(key);
   }
 
   function childCount(key) {
-    var count = 0;
-    var parentKey = trim(key);
-    state.entries.forEach(function (entry) {
-      if (trim(entry.parentKey) === parentKey) {
-        count += 1;
-      }
-    });
-    return count;
+    return entryStore.childCount(key);
   }
 
   function entryHasChildren(entry) {
@@ -618,71 +710,52 @@
   }
 
   function rootEntries() {
-    return state.entries.filter(function (entry) {
-      return !trim(entry.parentKey);
-    }).sort(compareEntriesByKey);
+    return entryStore.children("").slice();
   }
 
-  function buildChildrenMap() {
-    var children = {};
-    var byKey = entriesByKey();
-
-    state.entries.forEach(function (entry) {
-      var parentKey = entry.parentKey && byKey[entry.parentKey] ? entry.parentKey : "";
-      if (!children[parentKey]) {
-        children[parentKey] = [];
-      }
-      children[parentKey].push(entry);
-    });
-    Object.keys(children).forEach(function (parentKey) {
-      children[parentKey].sort(compareEntriesByKey);
-    });
-
-    return children;
-  }
-
-  function appendDescendants(children, parentKey, depth, rows, visited) {
-    (children[parentKey] || []).forEach(function (entry) {
+  function appendDescendants(parentKey, depth, rows, visited) {
+    entryStore.treeChildren(parentKey).forEach(function (entry) {
       if (visited[entry.id]) {
         return;
       }
       visited[entry.id] = true;
       rows.push({ entry: entry, depth: depth });
-      appendDescendants(children, entry.key, depth + 1, rows, visited);
+      appendDescendants(entry.key, depth + 1, rows, visited);
     });
   }
 
   function buildRowsForDivision(entry) {
     var rows = [];
-    var children = buildChildrenMap();
-    appendDescendants(children, entry.key, 0, rows, {});
+    appendDescendants(entry.key, 0, rows, {});
     return rows;
   }
 
   function buildUngroupedRows() {
     var rows = [];
-    var byKey = entriesByKey();
-    var children = buildChildrenMap();
-    var roots = rootEntries();
+    var hasRoots = entryStore.childCount("") > 0;
     var visited = {};
 
+    if (hasRoots && !entryStore.orphanCount()) {
+      return rows;
+    }
+
     state.entries.forEach(function (entry) {
       var shouldStart = false;
 
-      if (!roots.length) {
-        shouldStart = !entry.parentKey || !byKey[entry.parentKey];
+      if (!hasRoots) {
+        shouldStart = !entry.parentKey || !entryByKey(entry.parentKey);
       } else {
-        shouldStart = Boolean(entry.parentKey && !byKey[entry.parentKey]);
+        shouldStart = Boolean(entry.parentKey && !entryByKey(entry.parentKey));
       }
 
       if (shouldStart && !visited[entry.id]) {
         visited[entry.id] = true;
         rows.push({ entry: entry, depth: 0 });
-        appendDescendants(children, entry.key, 1, rows, visited);
+        appendDescendants(entry.key, 1, rows, visited);
       }
     });
 
-    if (!roots.length) {
+    if (!hasRoots) {
       state.entries.forEach(function (entry) {
         if (!visited[entry.id]) {
           visited[entry.id] = true;
@@ -711,8 +784,16 @@
     return divisionCode(entry.key);
   }
 
+  // Division models depend only on the entry tree, so they are rebuilt once
+  // per store change instead of once per caller per render. Treat as read-only.
   function getDivisionModels() {
-    var models = rootEntries().map(function (entry) {
+    var models;
+
+    if (divisionModelCache.version === entryStore.version) {
+      return divisionModelCache.models;
+    }
+
+    models = rootEntries().map(function (entry) {
       return {
         id: entry.id,
         entry: entry,
@@ -733,6 +814,7 @@
       });
     }
 
+    divisionModelCache = { version: entryStore.version, models: models };
     return models;
   }
 
@@ -749,17 +831,16 @@
   }
 
   function rootAncestorFor(entry) {
-    var byKey = entriesByKey();
     var seen = {};
     var cursor = entry;
     var parent;
 
-    while (cursor && cursor.parentKey && byKey[cursor.parentKey]) {
+    while (cursor && cursor.parentKey && entryByKey(cursor.parentKey)) {
       if (seen[cursor.id]) {
         return null;
       }
       seen[cursor.id] = true;
-      parent = byKey[cursor.parentKey];
+      parent = entryByKey(cursor.parentKey);
       if (!parent.parentKey) {
         return parent;
       }
@@ -769,8 +850,37 @@
     return cursor && !cursor.parentKey ? cursor : null;
   }
 
+  // Ids of entry's ancestors, nearest first, stopping at a missing parent or
+  // a cycle. Cached per entry until the next store change.
+  function ancestorIdsFor(entry) {
+    var ids = [];
+    var seen = {};
+    var cursor = entry;
+    var parent;
+    var cached;
+
+    if (ancestorCache.version !== entryStore.version) {
+      ancestorCache = { version: entryStore.version, ids: {} };
+    }
+    cached = ancestorCache.ids[entry.id];
+    if (cached) {
+      return cached;
+    }
+
+    while (cursor && cursor.parentKey) {
+      parent = entryByKey(cursor.parentKey);
+      if (!parent || seen[parent.id]) {
+        break;
+      }
+      ids.push(parent.id);
+      seen[parent.id] = true;
+      cursor = parent;
+    }
+    ancestorCache.ids[entry.id] = ids;
+    return ids;
+  }
+
   function entryIsDescendantOf(entry, ancestor) {
-    var byKey = entriesByKey();
     var seen = {};
     var cursor = entry;
     var parent;
@@ -780,7 +890,7 @@
     }
 
     while (cursor && cursor.parentKey) {
-      parent = byKey[cursor.parentKey];
+      parent = entryByKey(cursor.parentKey);
       if (!parent || seen[parent.id]) {
         return false;
       }
@@ -795,13 +905,12 @@
   }
 
   function expandAncestorsForEntry(entry) {
-    var byKey = entriesByKey();
     var seen = {};
     var cursor = entry;
     var parent;
 
     while (cursor && cursor.parentKey) {
-      parent = byKey[cursor.parentKey];
+      parent = entryByKey(cursor.parentKey);
       if (!parent || seen[parent.id]) {
         return;
       }
@@ -924,7 +1033,7 @@
 
   function appendRealtimeConflictIssues(issues) {
     var remoteSnapshot = currentRemoteEntrySnapshot();
-    var remoteByKey = remoteSnapshot ? indexEntriesByKey(remoteSnapshot.entries) : {};
+    var remoteByKey = remoteSnapshot ? snapshotEntriesByKey(remoteSnapshot) : {};
 
     state.entries.forEach(function (entry) {
       var key = trim(entry.key);
@@ -1054,8 +1163,7 @@
   }
 
   function entryMatchesQuery(entry, query) {
-    var haystack = (entry.key + " " + entry.text + " " + entry.parentKey).toLowerCase();
-    return !query || haystack.indexOf(query) !== -1;
+    return !query || Boolean(searchIndex.matches(query)[entry.id]);
   }
 
   function rowMatchesQuery(row, query) {
@@ -1079,13 +1187,15 @@
 
   function divisionMatchesQuery(model, query) {
     var haystack = (model.title + " " + model.text).toLowerCase();
+    var matches;
 
     if (!query || haystack.indexOf(query) !== -1) {
       return true;
     }
 
+    matches = searchIndex.matches(query);
     return model.rows.some(function (row) {
-      return rowMatchesQuery(row, query);
+      return Boolean(matches[row.entry.id]);
     });
   }
 
@@ -1140,7 +1250,6 @@
   }
 
   function filteredRowsForModel(model, query, placementFilter) {
-    var byKey = entriesByKey();
     var rowIds = {};
     var matchIds = {};
     var contextIds = {};
@@ -1152,32 +1261,18 @@
     });
 
     (model.rows || []).forEach(function (row) {
-      var cursor;
-      var parent;
-      var seen = {};
-
       if (!rowMatchesFilters(row, query, placementFilter)) {
         return;
       }
 
       matchIds[row.entry.id] = true;
       includeIds[row.entry.id] = true;
-      cursor = row.entry;
-
-      while (cursor && cursor.parentKey) {
-        parent = byKey[cursor.parentKey];
-        if (!parent || seen[parent.id]) {
-          return;
-        }
-
-        if (rowIds[parent.id]) {
-          includeIds[parent.id] = true;
-          contextIds[parent.id] = true;
+      ancestorIdsFor(row.entry).forEach(function (parentId) {
+        if (rowIds[parentId]) {
+          includeIds[parentId] = true;
+          contextIds[parentId] = true;
         }
-
-        seen[parent.id] = true;
-        cursor = parent;
-      }
+      });
     });
 
     return (model.rows || []).filter(function (row) {
@@ -1200,7 +1295,6 @@
   }
 
   function collapsedAncestorForEntry(entry, model) {
-    var byKey = entriesByKey();
     var modelRowIds = {};
     var cursor = entry;
     var parent;
@@ -1212,7 +1306,7 @@
     });
 
     while (cursor && cursor.parentKey) {
-      parent = byKey[cursor.parentKey];
+      parent = entryByKey(cursor.parentKey);
       if (!parent || seen[parent.id]) {
         return result;
       }
@@ -1295,9 +1389,13 @@
     return JSON.parse(JSON.stringify(value));
   }
 
-  function captureEditorState() {
+  // Undo history is a list of patches. While a history mutation or a field
+  // edit is open, every entry mutation appends an operation to
+  // historyJournal; committing slices the operations since the mark into a
+  // patch that undo applies backwards and redo forwards. Entries are never
+  // copied wholesale, so history cost follows the size of each change.
+  function captureHistoryView() {
     return {
-      entries: cloneHistoryValue(state.entries, []),
       selectedDivisionId: state.selectedDivisionId,
       selectedNoteId: state.selectedNoteId,
       selectedId: state.selectedId,
@@ -1307,35 +1405,143 @@
     };
   }
 
-  function historyContentSignature(snapshot) {
-    var resolutions = snapshot.modelIssueResolutions || {};
-    var orderedResolutions = {};
+  function resolutionsSignature(resolutions) {
+    var ordered = {};
+    Object.keys(resolutions || {}).sort().forEach(function (key) {
+      ordered[key] = resolutions[key];
+    });
+    return JSON.stringify(ordered);
+  }
+
+  function historyContentHash() {
+    return entryStore.contentHash() + "|" + resolutionsSignature(state.modelIssueResolutions);
+  }
+
+  function historyIsRecording() {
+    return Boolean(historyJournal.mutationMark !== null || state.activeFieldEdit);
+  }
+
+  function recordHistoryOp(op) {
+    if (historyIsRecording()) {
+      historyJournal.ops.push(op);
+    }
+  }
+
+  function openHistoryMark() {
+    return historyJournal.base + historyJournal.ops.length;
+  }
+
+  // Drops journal operations no open mark can still reach.
+  function trimHistoryJournal() {
+    var marks = [];
+    var keepFrom;
 
-    Object.keys(resolutions).sort().forEach(function (key) {
-      orderedResolutions[key] = resolutions[key];
+    if (historyJournal.mutationMark !== null) {
+      marks.push(historyJournal.mutationMark);
+    }
+    if (state.activeFieldEdit) {
+      marks.push(state.activeFieldEdit.mark);
+    }
+    keepFrom = marks.length ? Math.min.apply(Math, marks) : openHistoryMark();
+    historyJournal.ops = historyJournal.ops.slice(keepFrom - historyJournal.base);
+    historyJournal.base = keepFrom;
+  }
+
+  // Merges runs of edits to one field (a typing burst) into a single step.
+  function compactHistoryOps(ops) {
+    var compacted = [];
+    ops.forEach(function (op) {
+      var last = compacted[compacted.length - 1];
+      if (op.type === "set" && last && last.type === "set" && last.id === op.id && last.field === op.field) {
+        compacted[compacted.length - 1] = { type: "set", id: op.id, field: op.field, before: last.before, after: op.after };
+        return;
+      }
+      compacted.push(op);
     });
+    return compacted.filter(function (op) {
+      return op.type !== "set" || op.before !== op.after;
+    });
+  }
 
-    return JSON.stringify({
-      entries: (snapshot.entries || []).map(function (entry) {
-        return {
-          id: text(entry.id),
-          key: text(entry.key),
-          text: text(entry.text),
-          parentKey: text(entry.parentKey),
-          lineNumber: entry.lineNumber || null
-        };
-      }),
-      modelIssueResolutions: orderedResolutions
+  function takeHistoryPatch(mark, beforeView) {
+    var ops = compactHistoryOps(historyJournal.ops.slice(Math.max(mark - historyJournal.base, 0)));
+    var afterView = captureHistoryView();
+
+    if (
+      !ops.length &&
+      resolutionsSignature(beforeView.modelIssueResolutions) === resolutionsSignature(afterView.modelIssueResolutions)
+    ) {
+      return null;
+    }
+    return { ops: ops, before: beforeView, after: afterView };
+  }
+
+  function removeEntryById(id) {
+    removeEntries(function (candidate) {
+      return candidate.id === id;
     });
   }
 
-  function historyStatesEqual(first, second) {
-    return historyContentSignature(first) === historyContentSignature(second);
+  function applyHistoryOp(op, forward) {
+    var entry;
+
+    if (op.type === "set") {
+      entry = findEntryById(op.id);
+      if (entry) {
+        setEntryField(entry, op.field, forward ? op.after : op.before);
+      }
+    } else if (op.type === "add") {
+      if (forward) {
+        if (op.entry && !findEntryById(op.id)) {
+          addEntry(cloneHistoryValue(op.entry, null), op.index);
+        }
+      } else {
+        entry = findEntryById(op.id);
+        if (entry) {
+          op.entry = cloneHistoryValue(entry, null);
+          removeEntryById(op.id);
+        }
+      }
+    } else if (op.type === "remove") {
+      if (forward) {
+        removeEntryById(op.id);
+      } else if (!findEntryById(op.id)) {
+        addEntry(cloneHistoryValue(op.entry, null), op.index);
+      }
+    } else if (op.type === "reset") {
+      setEntries(cloneHistoryValue(forward ? op.after : op.before, []));
+    }
+  }
+
+  function applyHistoryPatch(patch, forward) {
+    var view = forward ? patch.after : patch.before;
+    var index;
+
+    if (forward) {
+      patch.ops.forEach(function (op) {
+        applyHistoryOp(op, true);
+      });
+    } else {
+      for (index = patch.ops.length - 1; index >= 0; index -= 1) {
+        applyHistoryOp(patch.ops[index], false);
+      }
+    }
+
+    state.selectedDivisionId = view.selectedDivisionId;
+    state.selectedNoteId = view.selectedNoteId;
+    state.selectedId = view.selectedId;
+    state.collapsedEntryIds = cloneHistoryValue(view.collapsedEntryIds, {});
+    state.modelIssueResolutions = cloneHistoryValue(view.modelIssueResolutions, {});
+    state.reviewedModelHealthSignature = text(view.reviewedModelHealthSignature);
+    ensureSelection();
+    updateDirtyFromEditorState();
+    renderAll();
+    syncLocalEditClaims();
   }
 
   function updateDirtyFromEditorState() {
     state.allowNextLoad = false;
-    setDirty(historyContentSignature(captureEditorState()) !== state.historyBaselineSignature);
+    setDirty(historyContentHash() !== state.historyBaselineHash);
   }
 
   function trimHistoryStack(stack) {
@@ -1381,14 +1587,17 @@
     state.undoHistory = [];
     state.redoHistory = [];
     state.activeFieldEdit = null;
-    state.historyBaselineSignature = historyContentSignature(captureEditorState());
+    historyJournal.mutationMark = null;
+    trimHistoryJournal();
+    state.historyBaselineHash = historyContentHash();
     renderHistoryState();
   }
 
-  function commitHistorySnapshot(label, beforeState) {
-    var afterState = captureEditorState();
+  function commitHistoryPatch(label, mark, beforeView) {
+    var patch = takeHistoryPatch(mark, beforeView);
 
-    if (!beforeState || historyStatesEqual(beforeState, afterState)) {
+    trimHistoryJournal();
+    if (!patch) {
       updateDirtyFromEditorState();
       renderHistoryState();
       return false;
@@ -1396,7 +1605,7 @@
 
     state.undoHistory.push({
       label: label || "Change",
-      snapshot: beforeState
+      patch: patch
     });
     trimHistoryStack(state.undoHistory);
     state.redoHistory = [];
@@ -1410,10 +1619,11 @@
 
     state.activeFieldEdit = null;
     if (!activeEdit || !activeEdit.changed) {
+      trimHistoryJournal();
       renderHistoryState();
       return false;
     }
-    return commitHistorySnapshot(activeEdit.label, activeEdit.snapshot);
+    return commitHistoryPatch(activeEdit.label, activeEdit.mark, activeEdit.view);
   }
 
   function beginFieldEdit(entryId, fieldName) {
@@ -1432,7 +1642,8 @@
       entryId: entryId,
       fieldName: fieldName,
       label: historyLabelForField(fieldName),
-      snapshot: captureEditorState(),
+      mark: openHistoryMark(),
+      view: captureHistoryView(),
       changed: false
     };
     renderHistoryState();
@@ -1457,32 +1668,27 @@
     renderHistoryState();
   }
 
+  // Opens a history mutation; pass the result to completeHistoryMutation.
+  // Mutations run synchronously, so a mark left open by an early return is
+  // simply replaced by the next one.
   function beginHistoryMutation() {
     finishActiveFieldEdit();
-    return captureEditorState();
+    historyJournal.mutationMark = openHistoryMark();
+    return { mark: historyJournal.mutationMark, view: captureHistoryView() };
   }
 
   function completeHistoryMutation(label, beforeState) {
-    return commitHistorySnapshot(label, beforeState);
-  }
-
-  function restoreEditorState(snapshot) {
-    state.entries = cloneHistoryValue(snapshot.entries, []);
-    state.selectedDivisionId = snapshot.selectedDivisionId;
-    state.selectedNoteId = snapshot.selectedNoteId;
-    state.selectedId = snapshot.selectedId;
-    state.collapsedEntryIds = cloneHistoryValue(snapshot.collapsedEntryIds, {});
-    state.modelIssueResolutions = cloneHistoryValue(snapshot.modelIssueResolutions, {});
-    state.reviewedModelHealthSignature = text(snapshot.reviewedModelHealthSignature);
-    ensureSelection();
-    updateDirtyFromEditorState();
-    renderAll();
-    syncLocalEditClaims();
+    if (!beforeState) {
+      return false;
+    }
+    if (historyJournal.mutationMark === beforeState.mark) {
+      historyJournal.mutationMark = null;
+    }
+    return commitHistoryPatch(label, beforeState.mark, beforeState.view);
   }
 
   function undoEditorChange() {
     var item;
-    var currentState;
 
     if (state.saving) {
       return;
@@ -1495,16 +1701,15 @@
       return;
     }
 
-    currentState = captureEditorState();
-    state.redoHistory.push({ label: item.label, snapshot: currentState });
+    state.redoHistory.push(item);
     trimHistoryStack(state.redoHistory);
-    restoreEditorState(item.snapshot);
+    applyHistoryPatch(item.patch, false);
+    renderHistoryState();
     setStatus({ status: "ready", message: "Undid " + item.label + "." });
   }
 
   function redoEditorChange() {
     var item;
-    var currentState;
 
     if (state.saving) {
       return;
@@ -1517,10 +1722,10 @@
       return;
     }
 
-    currentState = captureEditorState();
-    state.undoHistory.push({ label: item.label, snapshot: currentState });
+    state.undoHistory.push(item);
     trimHistoryStack(state.undoHistory);
-    restoreEditorState(item.snapshot);
+    applyHistoryPatch(item.patch, true);
+    renderHistoryState();
     setStatus({ status: "ready", message: "Redid " + item.label + "." });
   }
 
@@ -1532,6 +1737,28 @@
     setText("entry-count", formatNumber(state.entries.length));
   }
 
+  // True when region was last drawn from the same signature; otherwise
+  // records signature so the caller rebuilds the region's DOM.
+  function regionIsCurrent(region, signature) {
+    if (regionSignatures[region] === signature) {
+      return true;
+    }
+    regionSignatures[region] = signature;
+    return false;
+  }
+
+  function divisionModelSignature(model, selectedModel) {
+    return [
+      model.id,
+      model.title,
+      model.text,
+      model.rows.length,
+      Boolean(selectedModel && model.id === selectedModel.id),
+      model.entry ? editClaimTitle(model.entry) : "",
+      model.entry ? noteUsageSignature(model.entry) : ""
+    ];
+  }
+
   function renderDivisions() {
     var list = byId("division-list");
     var query = trim(byId("search-input") ? byId("search-input").value : "").toLowerCase();
@@ -1544,8 +1771,16 @@
       return;
     }
 
-    clearElement(list);
     setText("filter-summary", formatNumber(models.length) + " divisions");
+    if (regionIsCurrent("divisions", JSON.stringify([
+      state.entries.length ? 1 : 0,
+      models.map(function (model) {
+        return divisionModelSignature(model, selectedModel);
+      })
+    ]))) {
+      return;
+    }
+    clearElement(list);
 
     if (!models.length) {
       var empty = document.createElement("div");
@@ -1600,7 +1835,7 @@
         menuButton.addEventListener("click", function (event) {
           event.preventDefault();
           event.stopPropagation();
-          openParentActionMenu(model.entry, menuButton, false);
+          openParentActionMenu(findEntryById(model.entry.id) || model.entry, menuButton, false);
         });
         actionControls.appendChild(menuButton);
       }
@@ -1629,6 +1864,11 @@
       selectedModel ? "Select division, current " + selectedModel.title : "Select division"
     );
 
+    if (regionIsCurrent("divisionSelect", JSON.stringify(models.map(function (model) {
+      return divisionModelSignature(model, selectedModel);
+    })))) {
+      return;
+    }
     clearElement(menu);
     models.forEach(function (model) {
       var item = document.createElement("li");
@@ -1935,7 +2175,7 @@
     var safeMode = isModelSafeModeActive();
     var claimed = isEntryRemotelyClaimed(entry);
     var parentKey = trim(entry && entry.parentKey);
-    var sequenceParent = parentKey ? entriesByKey()[parentKey] || null : null;
+    var sequenceParent = parentKey ? entryByKey(parentKey) : null;
     var sequenceParentClaimed = sequenceParent && isEntryRemotelyClaimed(sequenceParent);
     var editingDisabled = safeMode || claimed;
     var sequenceDisabled = safeMode || !sequenceParent || sequenceParentClaimed;
@@ -2013,18 +2253,39 @@
   }
 
   function descendantEntriesFor(entry) {
+    var found = {};
+    var queue;
+    var cursor;
+
     if (!entry) {
       return [];
     }
+    found[entry.id] = true;
+    queue = [entry];
+    while (queue.length) {
+      cursor = queue.shift();
+      if (!cursor.key || entryByKey(cursor.key) !== cursor) {
+        continue;
+      }
+      entryStore.children(cursor.key).forEach(function (child) {
+        if (!found[child.id]) {
+          found[child.id] = true;
+          queue.push(child);
+        }
+      });
+    }
     return state.entries.filter(function (candidate) {
-      return entryIsDescendantOf(candidate, entry);
+      return candidate.id !== entry.id && found[candidate.id];
     });
   }
 
   function directChildEntriesFor(entry) {
-    var parentKey = trim(entry && entry.key);
+    var members = {};
+    entryStore.children(entry && entry.key).forEach(function (child) {
+      members[child.id] = true;
+    });
     return state.entries.filter(function (candidate) {
-      return trim(candidate.parentKey) === parentKey;
+      return members[candidate.id];
     });
   }
 
@@ -2298,11 +2559,11 @@
     }
 
     if (dbId) {
-      remoteEntry = indexEntriesByDbId(remoteSnapshot.entries)[dbId];
+      remoteEntry = snapshotEntriesByDbId(remoteSnapshot)[dbId];
       return Boolean(remoteEntry && trim(remoteEntry.key) === key);
     }
 
-    return Boolean(indexEntriesByKey(remoteSnapshot.entries)[key]);
+    return Boolean(snapshotEntriesByKey(remoteSnapshot)[key]);
   }
 
   function placementBlockedByRemoteDelete(entry) {
@@ -2404,21 +2665,395 @@
     renderAll();
   }
 
+  // The note table is windowed: only rows near the viewport of the
+  // scrolling shell are in the DOM, between two spacer rows that keep the
+  // scrollbar honest. Rows are keyed by entry id and patched in place when
+  // their signature changes, so a render after an edit touches only the rows
+  // that actually differ and never steals focus from the row being typed in.
+  function noteUsageSignature(entry) {
+    var usage = otherModelUsageForKey(entry.key);
+    return [entry.key, keyPlacementCount(entry.key), usage ? JSON.stringify(usage) : ""].join("\u0001");
+  }
+
+  function noteRowSignature(row) {
+    var entry = row.entry;
+    return [
+      entry.key,
+      entry.text,
+      row.depth,
+      row.hasChildren ? 1 : 0,
+      row.isCollapsed ? 1 : 0,
+      row.isSearchContext ? 1 : 0,
+      row.isSearchMatch ? 1 : 0,
+      entry.id === state.selectedNoteId ? 1 : 0,
+      editClaimTitle(entry),
+      entryCanPlaceKeynote(entry) ? 1 : 0,
+      placementModeLabel(),
+      isModelSafeModeActive() ? 1 : 0,
+      noteUsageSignature(entry)
+    ].join("\u0001");
+  }
+
+  function createNoteRowRecord(entryId) {
+    var record = {
+      entryId: entryId,
+      signature: null,
+      usageSignature: null,
+      item: document.createElement("tr"),
+      keyWrap: document.createElement("div"),
+      placeButton: document.createElement("button"),
+      menuButton: document.createElement("button"),
+      treeControl: null,
+      keyInput: document.createElement("input"),
+      textInput: document.createElement("textarea")
+    };
+    var item = record.item;
+    var actionCell = document.createElement("td");
+    var actionWrap = document.createElement("div");
+    var keyCell = document.createElement("td");
+    var textCell = document.createElement("td");
+    var keyInput = record.keyInput;
+    var textInput = record.textInput;
+
+    function currentEntry() {
+      return findEntryById(entryId);
+    }
+
+    item.tabIndex = -1;
+    item.setAttribute("data-entry-id", entryId);
+    actionCell.className = "note-cell note-action-cell";
+    actionWrap.className = "note-action-wrap";
+    keyCell.className = "note-cell note-key-cell";
+    textCell.className = "note-cell note-text-cell";
+    record.keyWrap.className = "note-key-wrap";
+
+    record.placeButton.type = "button";
+    record.placeButton.appendChild(createPlaceKeynoteIcon());
+    record.placeButton.addEventListener("click", function (event) {
+      event.preventDefault();
+      event.stopPropagation();
+      placeKeynote(currentEntry());
+    });
+
+    record.menuButton.type = "button";
+    record.menuButton.className = "note-more-button";
+    record.menuButton.appendChild(createEllipsisVerticalIcon());
+    record.menuButton.setAttribute("aria-haspopup", "menu");
+    record.menuButton.setAttribute("aria-expanded", "false");
+    record.menuButton.setAttribute("title", "More actions");
+    record.menuButton.addEventListener("click", function (event) {
+      var entry = currentEntry();
+      event.preventDefault();
+      event.stopPropagation();
+      if (entry) {
+        openRowActionMenu(entry, record.menuButton);
+      }
+    });
+
+    keyInput.type = "text";
+    keyInput.className = "form-control form-control-sm note-input note-key-input";
+    lockKeyInput(keyInput);
+    textInput.className = "form-control form-control-sm note-input note-text-input";
+    textInput.rows = 2;
+
+    [keyInput, textInput].forEach(function (input) {
+      input.addEventListener("focus", function () {
+        selectNote(entryId, false);
+      });
+      input.addEventListener("blur", function () {
+        if (input === keyInput) {
+          lockKeyInput(keyInput);
+        }
+        deferRenderAllWhenEditingSettles();
+      });
+    });
+
+    keyInput.addEventListener("dblclick", function (event) {
+      event.preventDefault();
+      unlockKeyInput(keyInput);
+    });
+
+    keyInput.addEventListener("focus", function () {
+      beginFieldEdit(entryId, "key");
+    });
+
+    textInput.addEventListener("focus", function () {
+      beginFieldEdit(entryId, "text");
+    });
+
+    keyInput.addEventListener("blur", finishActiveFieldEdit);
+    textInput.addEventListener("blur", finishActiveFieldEdit);
+
+    keyInput.addEventListener("input", function () {
+      updateEntryField(entryId, "key", keyInput.value, false);
+    });
+
+    textInput.addEventListener("input", function () {
+      updateEntryField(entryId, "text", textInput.value, false);
+      // resizeNoteTextInput(textInput);
+    });
+
+    item.addEventListener("click", function (event) {
+      if (
+        event.target.tagName !== "INPUT" &&
+        event.target.tagName !== "TEXTAREA" &&
+        event.target.tagName !== "BUTTON"
+      ) {
+        selectNote(entryId, true);
+      }
+    });
+
+    record.keyWrap.appendChild(keyInput);
+    actionWrap.appendChild(record.placeButton);
+    actionWrap.appendChild(record.menuButton);
+    actionCell.appendChild(actionWrap);
+    keyCell.appendChild(record.keyWrap);
+    textCell.appendChild(textInput);
+    item.appendChild(actionCell);
+    item.appendChild(keyCell);
+    item.appendChild(textCell);
+    return record;
+  }
+
+  function patchNoteTreeControl(record, row) {
+    var entryId = record.entryId;
+    var control = record.treeControl;
+    var wantsButton = Boolean(row.hasChildren);
+
+    if (!control || (control.tagName === "BUTTON") !== wantsButton) {
+      if (wantsButton) {
+        control = document.createElement("button");
+        control.type = "button";
+        control.className = "note-tree-toggle";
+        control.addEventListener("click", function (event) {
+          event.preventDefault();
+          event.stopPropagation();
+          toggleTreeRow(entryId);
+        });
+      } else {
+        control = document.createElement("span");
+        control.className = "note-tree-spacer";
+        control.setAttribute("aria-hidden", "true");
+      }
+      if (record.treeControl && record.treeControl.parentNode) {
+        record.treeControl.parentNode.replaceChild(control, record.treeControl);
+      } else {
+        record.keyWrap.insertBefore(control, record.keyWrap.firstChild);
+      }
+      record.treeControl = control;
+    }
+
+    if (wantsButton) {
+      control.textContent = row.isCollapsed ? ">" : "v";
+      control.setAttribute("aria-expanded", row.isCollapsed ? "false" : "true");
+      control.setAttribute(
+        "aria-label",
+        (row.isCollapsed ? "Expand " : "Collapse ") + (row.entry.key || "keynote group")
+      );
+    }
+  }
+
+  function patchNoteInputValue(input, value) {
+    if (input.value !== value && document.activeElement !== input) {
+      input.value = value;
+    }
+  }
+
+  function patchNoteRow(record, row, signature) {
+    var entry = row.entry;
+    var item = record.item;
+    var keyInput = record.keyInput;
+    var textInput = record.textInput;
+    var claimTitle = editClaimTitle(entry);
+    var canPlaceKeynote = entryCanPlaceKeynote(entry);
+    var placementLabel = placementModeLabel();
+    var safeMode = isModelSafeModeActive();
+    var usageSignature = noteUsageSignature(entry);
+    var placeTitle = canPlaceKeynote
+      ? "Place " + placementLabel + " " + (entry.key || "")
+      : "Save this keynote before placing it in Revit";
+    if (safeMode) {
+      placeTitle = "Review model issues before placing keynotes.";
+    }
+
+    item.className = "note-row" +
+      (row.hasChildren ? " is-parent-row" : "") +
+      (row.isCollapsed ? " is-collapsed" : "") +
+      (row.isSearchContext ? " is-search-context" : "") +
+      (row.isSearchMatch ? " is-search-match" : "") +
+      (entry.id === state.selectedNoteId ? " is-selected" : "") +
+      (claimTitle ? " is-claimed" : "");
+    item.setAttribute("title", claimTitle || "");
+    item.setAttribute("aria-level", String(row.depth + 1));
+    if (row.hasChildren) {
+      item.setAttribute("aria-expanded", row.isCollapsed ? "false" : "true");
+    } else {
+      item.removeAttribute("aria-expanded");
+    }
+    item.style.setProperty("--depth", row.depth);
+    record.keyWrap.style.setProperty("--depth", row.depth);
+
+    record.placeButton.className = "note-place-button" + (canPlaceKeynote && !safeMode ? "" : " needs-save");
+    record.placeButton.setAttribute("aria-label", "Place " + placementLabel + " " + (entry.key || "new keynote"));
+    record.placeButton.setAttribute("title", placeTitle);
+    record.placeButton.disabled = safeMode;
+    record.menuButton.setAttribute("aria-label", "More actions for keynote " + (entry.key || "new keynote"));
+
+    patchNoteTreeControl(record, row);
+
+    patchNoteInputValue(keyInput, entry.key);
+    keyInput.setAttribute("aria-label", "Key for " + (entry.key || "new keynote"));
+    keyInput.disabled = safeMode || Boolean(claimTitle);
+    if (document.activeElement !== keyInput) {
+      lockKeyInput(keyInput);
+    }
+    keyInput.setAttribute("title", safeMode ? "Review model issues before editing." : (claimTitle || "Double-click to edit key"));
+
+    patchNoteInputValue(textInput, entry.text);
+    textInput.setAttribute("aria-label", "Description for " + (entry.key || "new keynote"));
+    textInput.disabled = safeMode || Boolean(claimTitle);
+    textInput.setAttribute("title", safeMode ? "Review model issues before editing." : (claimTitle || ""));
+
+    if (record.usageSignature !== usageSignature) {
+      clearKeyUsageBadges(record.keyWrap);
+      appendPlacedKeyBadge(record.keyWrap, entry.key);
+      record.usageSignature = usageSignature;
+    }
+    record.signature = signature;
+  }
+
+  function createNoteSpacerRow() {
+    var spacer = document.createElement("tr");
+    var cell = document.createElement("td");
+    spacer.className = "note-spacer-row";
+    spacer.setAttribute("aria-hidden", "true");
+    cell.setAttribute("colspan", "3");
+    spacer.appendChild(cell);
+    return spacer;
+  }
+
+  function setNoteSpacerHeight(spacer, height) {
+    var value = Math.max(Math.round(height), 0) + "px";
+    if (spacer.firstChild.style.height !== value) {
+      spacer.firstChild.style.height = value;
+    }
+  }
+
+  function noteWindowRange(body, rowCount) {
+    var shell = body.closest ? body.closest(".note-table-shell") : null;
+    var rowHeight = noteWindow.rowHeight || NOTE_WINDOW_DEFAULT_ROW_HEIGHT;
+    var viewportHeight;
+    var scrollTop;
+    var start;
+    var end;
+    var focusIndex;
+
+    if (!shell || rowCount <= NOTE_WINDOW_MIN_ROWS) {
+      return { start: 0, end: rowCount };
+    }
+
+    viewportHeight = shell.clientHeight || NOTE_WINDOW_DEFAULT_VIEWPORT;
+    scrollTop = Math.max(shell.scrollTop - body.offsetTop, 0);
+    start = Math.max(Math.floor(scrollTop / rowHeight) - NOTE_WINDOW_OVERSCAN, 0);
+    end = Math.min(Math.ceil((scrollTop + viewportHeight) / rowHeight) + NOTE_WINDOW_OVERSCAN, rowCount);
+
+    // Keep the row being edited mounted while it scrolls a short way out of view.
+    focusIndex = noteWindow.focusedEntryId ? noteWindow.indexById[noteWindow.focusedEntryId] : undefined;
+    if (focusIndex !== undefined) {
+      if (focusIndex < start && start - focusIndex <= NOTE_WINDOW_FOCUS_REACH) {
+        start = focusIndex;
+      } else if (focusIndex >= end && focusIndex - end < NOTE_WINDOW_FOCUS_REACH) {
+        end = focusIndex + 1;
+      }
+    }
+    return { start: start, end: Math.max(end, start) };
+  }
+
+  function focusedNoteEntryId(body) {
+    var active = document.activeElement;
+    var row = active && active.closest && body.contains(active) ? active.closest(".note-row") : null;
+    return row ? row.getAttribute("data-entry-id") : null;
+  }
+
+  function renderNoteWindow() {
+    var body = byId("keynote-table-body");
+    var rows = noteWindow.rows;
+    var range;
+    var desired = [];
+    var records = {};
+    var rowHeight = noteWindow.rowHeight || NOTE_WINDOW_DEFAULT_ROW_HEIGHT;
+    var index;
+    var row;
+    var record;
+    var signature;
+
+    if (!body || !rows.length) {
+      return;
+    }
+
+    noteWindow.focusedEntryId = focusedNoteEntryId(body);
+    range = noteWindowRange(body, rows.length);
+    if (range.start > 0) {
+      noteWindow.topSpacer = noteWindow.topSpacer || createNoteSpacerRow();
+      setNoteSpacerHeight(noteWindow.topSpacer, range.start * rowHeight);
+      desired.push(noteWindow.topSpacer);
+    }
+
+    for (index = range.start; index < range.end; index += 1) {
+      row = rows[index];
+      record = noteWindow.records[row.entry.id] || createNoteRowRecord(row.entry.id);
+      signature = noteRowSignature(row);
+      if (record.signature !== signature) {
+        patchNoteRow(record, row, signature);
+      }
+      records[row.entry.id] = record;
+      desired.push(record.item);
+    }
+
+    if (range.end < rows.length) {
+      noteWindow.bottomSpacer = noteWindow.bottomSpacer || createNoteSpacerRow();
+      setNoteSpacerHeight(noteWindow.bottomSpacer, (rows.length - range.end) * rowHeight);
+      desired.push(noteWindow.bottomSpacer);
+    }
+
+    // Drop rows that left the window, then insert the ones that entered it;
+    // rows that stay keep their nodes and are never moved.
+    Array.prototype.slice.call(body.childNodes).forEach(function (node) {
+      if (desired.indexOf(node) < 0) {
+        body.removeChild(node);
+      }
+    });
+    desired.forEach(function (node, position) {
+      if (body.childNodes[position] !== node) {
+        body.insertBefore(node, body.childNodes[position] || null);
+      }
+    });
+    noteWindow.records = records;
+
+    if (!noteWindow.rowHeight && range.end > range.start) {
+      noteWindow.rowHeight = records[rows[range.start].entry.id].item.offsetHeight || 0;
+    }
+  }
+
   function renderNotes() {
     var body = byId("keynote-table-body");
     var rows = selectedRows();
     var placementFilter = currentPlacementFilter();
+    var indexById = {};
 
     if (!body) {
       return;
     }
 
     closeRowActionMenu(false);
-    clearElement(body);
 
     if (!rows.length) {
       var emptyRow = document.createElement("tr");
       var empty = document.createElement("td");
+      noteWindow.rows = [];
+      noteWindow.indexById = {};
+      noteWindow.records = {};
+      clearElement(body);
       empty.className = "empty-cell";
       empty.setAttribute("colspan", "3");
       if (!state.entries.length) {
@@ -2435,175 +3070,28 @@
       return;
     }
 
-    rows.forEach(function (row) {
-      var entry = row.entry;
-      var item = document.createElement("tr");
-      var actionCell = document.createElement("td");
-      var actionWrap = document.createElement("div");
-      var keyCell = document.createElement("td");
-      var textCell = document.createElement("td");
-      var keyWrap = document.createElement("div");
-      var placeButton = document.createElement("button");
-      var menuButton = document.createElement("button");
-      var treeControl;
-      var keyInput = document.createElement("input");
-      var textInput = document.createElement("textarea");
-      var claimTitle = editClaimTitle(entry);
-      var canPlaceKeynote = entryCanPlaceKeynote(entry);
-      var placementLabel = placementModeLabel();
-      var safeMode = isModelSafeModeActive();
-      var placeTitle = canPlaceKeynote
-        ? "Place " + placementLabel + " " + (entry.key || "")
-        : "Save this keynote before placing it in Revit";
-      if (safeMode) {
-        placeTitle = "Review model issues before placing keynotes.";
-      }
-
-      item.className = "note-row" +
-        (row.hasChildren ? " is-parent-row" : "") +
-        (row.isCollapsed ? " is-collapsed" : "") +
-        (row.isSearchContext ? " is-search-context" : "") +
-        (row.isSearchMatch ? " is-search-match" : "") +
-        (entry.id === state.selectedNoteId ? " is-selected" : "") +
-        (claimTitle ? " is-claimed" : "");
-      item.setAttribute("data-entry-id", entry.id);
-      item.setAttribute("title", claimTitle || "");
-      item.setAttribute("aria-level", String(row.depth + 1));
-      if (row.hasChildren) {
-        item.setAttribute("aria-expanded", row.isCollapsed ? "false" : "true");
-      }
-      item.tabIndex = -1;
-      item.style.setProperty("--depth", row.depth);
-
-      actionCell.className = "note-cell note-action-cell";
-      actionWrap.className = "note-action-wrap";
-      keyCell.className = "note-cell note-key-cell";
-      textCell.className = "note-cell note-text-cell";
-      keyWrap.className = "note-key-wrap";
-      keyWrap.style.setProperty("--depth", row.depth);
-
-      placeButton.type = "button";
-      placeButton.className = "note-place-button" + (canPlaceKeynote && !safeMode ? "" : " needs-save");
-      placeButton.setAttribute("aria-label", "Place " + placementLabel + " " + (entry.key || "new keynote"));
-      placeButton.setAttribute("title", placeTitle);
-      placeButton.disabled = safeMode;
-      placeButton.appendChild(createPlaceKeynoteIcon());
-      placeButton.addEventListener("click", function (event) {
-        event.preventDefault();
-        event.stopPropagation();
-        placeKeynote(entry);
-      });
-
-      menuButton.type = "button";
-      menuButton.className = "note-more-button";
-      menuButton.appendChild(createEllipsisVerticalIcon());
-      menuButton.setAttribute("aria-label", "More actions for keynote " + (entry.key || "new keynote"));
-      menuButton.setAttribute("aria-haspopup", "menu");
-      menuButton.setAttribute("aria-expanded", "false");
-      menuButton.setAttribute("title", "More actions");
-      menuButton.addEventListener("click", function (event) {
-        event.preventDefault();
-        event.stopPropagation();
-        openRowActionMenu(entry, menuButton);
-      });
-
-      if (row.hasChildren) {
-        treeControl = document.createElement("button");
-        treeControl.type = "button";
-        treeControl.className = "note-tree-toggle";
-        treeControl.textContent = row.isCollapsed ? ">" : "v";
-        treeControl.setAttribute("aria-expanded", row.isCollapsed ? "false" : "true");
-        treeControl.setAttribute(
-          "aria-label",
-          (row.isCollapsed ? "Expand " : "Collapse ") + (entry.key || "keynote group")
-        );
-        treeControl.addEventListener("click", function (event) {
-          event.preventDefault();
-          event.stopPropagation();
-          toggleTreeRow(entry.id);
-        });
-      } else {
-        treeControl = document.createElement("span");
-        treeControl.className = "note-tree-spacer";
-        treeControl.setAttribute("aria-hidden", "true");
-      }
-
-      keyInput.type = "text";
-      keyInput.className = "form-control form-control-sm note-input note-key-input";
-      keyInput.value = entry.key;
-      keyInput.setAttribute("aria-label", "Key for " + (entry.key || "new keynote"));
-      keyInput.disabled = safeMode || Boolean(claimTitle);
-      lockKeyInput(keyInput);
-      keyInput.setAttribute("title", safeMode ? "Review model issues before editing." : (claimTitle || "Double-click to edit key"));
-
-      textInput.className = "form-control form-control-sm note-input note-text-input";
-      textInput.rows = 2;
-      textInput.value = entry.text;
-      textInput.setAttribute("aria-label", "Description for " + (entry.key || "new keynote"));
-      textInput.disabled = safeMode || Boolean(claimTitle);
-      textInput.setAttribute("title", safeMode ? "Review model issues before editing." : (claimTitle || ""));
-
-      [keyInput, textInput].forEach(function (input) {
-        input.addEventListener("focus", function () {
-          selectNote(entry.id, false);
-        });
-        input.addEventListener("blur", function () {
-          if (input === keyInput) {
-            lockKeyInput(keyInput);
-          }
-          deferRenderAllWhenEditingSettles();
-        });
-      });
-
-      keyInput.addEventListener("dblclick", function (event) {
-        event.preventDefault();
-        unlockKeyInput(keyInput);
-      });
-
-      keyInput.addEventListener("focus", function () {
-        beginFieldEdit(entry.id, "key");
-      });
-
-      textInput.addEventListener("focus", function () {
-        beginFieldEdit(entry.id, "text");
-      });
-
-      keyInput.addEventListener("blur", finishActiveFieldEdit);
-      textInput.addEventListener("blur", finishActiveFieldEdit);
-
-      keyInput.addEventListener("input", function () {
-        updateEntryField(entry.id, "key", keyInput.value, false);
-      });
-
-      textInput.addEventListener("input", function () {
-        updateEntryField(entry.id, "text", textInput.value, false);
-        // resizeNoteTextInput(textInput);
-      });
+    rows.forEach(function (row, index) {
+      indexById[row.entry.id] = index;
+    });
+    noteWindow.rows = rows;
+    noteWindow.indexById = indexById;
+    renderNoteWindow();
+  }
 
-      item.addEventListener("click", function (event) {
-        if (
-          event.target.tagName !== "INPUT" &&
-          event.target.tagName !== "TEXTAREA" &&
-          event.target.tagName !== "BUTTON"
-        ) {
-          selectNote(entry.id, true);
-        }
-      });
+  // Scrolls the note shell so entryId's row is inside the rendered window.
+  function revealNoteRow(entryId) {
+    var body = byId("keynote-table-body");
+    var shell = body && body.closest ? body.closest(".note-table-shell") : null;
+    var index = noteWindow.indexById[entryId];
+    var rowHeight = noteWindow.rowHeight || NOTE_WINDOW_DEFAULT_ROW_HEIGHT;
+    var rowTop;
 
-      keyWrap.appendChild(treeControl);
-      keyWrap.appendChild(keyInput);
-      appendPlacedKeyBadge(keyWrap, entry.key);
-      actionWrap.appendChild(placeButton);
-      actionWrap.appendChild(menuButton);
-      actionCell.appendChild(actionWrap);
-      keyCell.appendChild(keyWrap);
-      textCell.appendChild(textInput);
-      item.appendChild(actionCell);
-      item.appendChild(keyCell);
-      item.appendChild(textCell);
-      body.appendChild(item);
-      // resizeNoteTextInput(textInput);
-    });
+    if (!shell || index === undefined || noteWindow.records[entryId]) {
+      return;
+    }
+    rowTop = body.offsetTop + index * rowHeight;
+    shell.scrollTop = Math.max(rowTop - Math.max(shell.clientHeight - rowHeight, 0) / 2, 0);
+    renderNoteWindow();
   }
 
   function renderValidation() {
@@ -2627,6 +3115,11 @@
       return;
     }
 
+    if (regionIsCurrent("validation", JSON.stringify(issues.map(function (issue) {
+      return [issue.severity, issue.message, issue.key, issue.lineNumber];
+    })))) {
+      return;
+    }
     clearElement(container);
 
     if (!issues.length) {
@@ -2757,7 +3250,7 @@
 
   function applyModelIssueResolution(issue, source, replacementKey) {
     var resolution = issue && issue.resolution;
-    var entry = issue && entriesByKey()[issue.key];
+    var entry = issue && entryByKey(issue.key);
     var resolutionId = modelIssueResolutionId(issue);
     var previousResolution = state.modelIssueResolutions[resolutionId] || {};
     var createdEntry;
@@ -2781,13 +3274,13 @@
     historyState = beginHistoryMutation();
 
     if (previousResolution.createdEntryId) {
-      state.entries = state.entries.filter(function (candidate) {
-        return candidate.id !== previousResolution.createdEntryId;
+      removeEntries(function (candidate) {
+        return candidate.id === previousResolution.createdEntryId;
       });
     }
 
     if (resolution.resolutionType === "genericAnnotationTextMismatch") {
-      entry = entriesByKey()[issue.key];
+      entry = entryByKey(issue.key);
       if (!entry) {
         setStatus({ status: "warning", message: "Keynote " + issue.key + " is no longer in the text file." });
         completeHistoryMutation("Resolve model issue", historyState);
@@ -2798,9 +3291,9 @@
       originalText = Object.prototype.hasOwnProperty.call(previousResolution, "originalText")
         ? previousResolution.originalText
         : entry.text;
-      entry.text = originalText;
+      setEntryField(entry, "text", originalText);
       if (source === "familyType") {
-        entry.text = text(resolution.familyTypeText);
+        setEntryField(entry, "text", text(resolution.familyTypeText));
       } else if (source === "keepBoth") {
         newKey = trim(entry.parentKey)
           ? makeChildKey(entry.parentKey)
@@ -2813,7 +3306,7 @@
           sortOrder: state.entries.length,
           lineNumber: null
         }, state.entries.length);
-        state.entries.push(createdEntry);
+        addEntry(createdEntry);
       }
 
       state.modelIssueResolutions[resolutionId] = {
@@ -2851,14 +3344,14 @@
           sortOrder: state.entries.length,
           lineNumber: null
         }, state.entries.length);
-        state.entries.push(entry);
+        addEntry(entry);
       } else {
-        entry.text = text(resolution.familyTypeText);
+        setEntryField(entry, "text", text(resolution.familyTypeText));
       }
       replacementKey = "";
     } else {
       replacementKey = trim(replacementKey);
-      replacementEntry = entriesByKey()[replacementKey];
+      replacementEntry = entryByKey(replacementKey);
       if (!replacementEntry) {
         setStatus({ status: "warning", message: "Select a keynote entry from the text file first." });
         return;
@@ -2866,8 +3359,8 @@
       if (entry && !state.baselineEntries.some(function (baselineEntry) {
         return baselineEntry.key === issue.key;
       })) {
-        state.entries = state.entries.filter(function (candidate) {
-          return candidate.id !== entry.id;
+        removeEntries(function (candidate) {
+          return candidate.id === entry.id;
         });
       }
     }
@@ -2982,6 +3475,17 @@
     return controls;
   }
 
+  function modelIssueListSignature(health) {
+    return JSON.stringify([
+      health.issues,
+      state.modelIssueResolutions,
+      baselineRevision,
+      (health.issues || []).map(function (issue) {
+        return Boolean(issue.key && entryByKey(issue.key));
+      })
+    ]);
+  }
+
   function renderModelHealth() {
     var health = currentModelHealth();
     var issueCount = modelIssueCount();
@@ -3030,7 +3534,7 @@
       stats.appendChild(createModelHealthStat("Sheets", formatNumber(health.sheetCount)));
     }
 
-    if (list) {
+    if (list && !regionIsCurrent("modelHealth", modelIssueListSignature(health))) {
       clearElement(list);
       if (!issueCount) {
         var empty = document.createElement("div");
@@ -3040,7 +3544,7 @@
       } else {
         var lastGroupTitle = "";
         health.issues.forEach(function (issue) {
-          var canJump = Boolean(issue.key && entriesByKey()[issue.key]);
+          var canJump = Boolean(issue.key && entryByKey(issue.key));
           var canResolve = Boolean(issue.resolution);
           var item = document.createElement(canResolve ? "div" : "button");
           var label = document.createElement("span");
@@ -3151,7 +3655,7 @@
       stats.appendChild(createModelHealthStat("Generic annotations", formatNumber(row && row.genericAnnotationCount)));
     }
 
-    if (!list) {
+    if (!list || regionIsCurrent("placedKeynotes", JSON.stringify(row))) {
       return;
     }
 
@@ -3397,19 +3901,66 @@
     setWarningSidebarOpen(!state.warningSidebarOpen);
   }
 
+  function regionRenderers() {
+    return {
+      meta: renderMeta,
+      divisions: renderDivisions,
+      divisionSelect: renderDivisionSelect,
+      divisionHeader: renderDivisionHeader,
+      notes: renderNotes,
+      noteWindow: renderNoteWindow,
+      validation: renderValidation,
+      modelHealth: renderModelHealth,
+      placedKeynotes: renderPlacedKeynotes,
+      saveState: renderSaveState,
+      rowActions: renderRowActions,
+      sidebar: syncSidebarState
+    };
+  }
+
+  // Renders every region marked dirty since the last flush, in paint order.
+  function flushRender() {
+    var dirty = renderScheduler.dirty;
+    var renderers = regionRenderers();
+
+    renderScheduler.dirty = {};
+    if (dirty.notes) {
+      delete dirty.noteWindow;
+    }
+    RENDER_REGION_ORDER.forEach(function (region) {
+      if (dirty[region]) {
+        renderers[region]();
+      }
+    });
+  }
+
+  // Marks regions dirty and renders them together on the next animation
+  // frame, so a burst of keystrokes or scroll events costs one render.
+  function scheduleRender(regions) {
+    var requestFrame = typeof globalScope.requestAnimationFrame === "function"
+      ? globalScope.requestAnimationFrame
+      : function (callback) {
+        return globalScope.setTimeout(callback, 16);
+      };
+
+    regions.forEach(function (region) {
+      renderScheduler.dirty[region] = true;
+    });
+    if (renderScheduler.frame !== null) {
+      return;
+    }
+    renderScheduler.frame = requestFrame.call(globalScope, function () {
+      renderScheduler.frame = null;
+      flushRender();
+    });
+  }
+
   function renderAll() {
     ensureSelection();
-    renderMeta();
-    renderDivisions();
-    renderDivisionSelect();
-    renderDivisionHeader();
-    renderNotes();
-    renderValidation();
-    renderModelHealth();
-    renderPlacedKeynotes();
-    renderSaveState();
-    renderRowActions();
-    syncSidebarState();
+    RENDER_REGION_ORDER.forEach(function (region) {
+      renderScheduler.dirty[region] = region !== "noteWindow";
+    });
+    flushRender();
   }
 
   function deferRenderAllWhenEditingSettles() {
@@ -3476,7 +4027,11 @@
 
     if (shouldScroll) {
       globalScope.setTimeout(function () {
-        var selector = match.parentKey
+        var selector;
+        if (match.parentKey) {
+          revealNoteRow(match.id);
+        }
+        selector = match.parentKey
           ? '.note-row[data-entry-id="' + match.id + '"]'
           : '.division-row[data-entry-id="' + match.id + '"]';
         var element = document.querySelector(selector);
@@ -3961,16 +4516,6 @@
     });
   }
 
-  function indexEntriesById(entries) {
-    var map = {};
-    (entries || []).forEach(function (entry) {
-      if (entry.id) {
-        map[entry.id] = entry;
-      }
-    });
-    return map;
-  }
-
   function indexEntriesByKey(entries) {
     var map = {};
     (entries || []).forEach(function (entry) {
@@ -3982,6 +4527,32 @@
     return map;
   }
 
+  // Remote snapshots are replaced, never edited in place, so their key and
+  // dbId maps are built once per snapshot instead of once per lookup.
+  function snapshotIndexFor(snapshot) {
+    var entries = (snapshot && snapshot.entries) || null;
+    if (snapshotIndexCache.entries !== entries || !entries) {
+      snapshotIndexCache = {
+        entries: entries,
+        byKey: indexEntriesByKey(entries),
+        byDbId: null
+      };
+    }
+    return snapshotIndexCache;
+  }
+
+  function snapshotEntriesByKey(snapshot) {
+    return snapshotIndexFor(snapshot).byKey;
+  }
+
+  function snapshotEntriesByDbId(snapshot) {
+    var index = snapshotIndexFor(snapshot);
+    if (!index.byDbId) {
+      index.byDbId = indexEntriesByDbId(index.entries);
+    }
+    return index.byDbId;
+  }
+
   function indexEntriesByDbId(entries) {
     var map = {};
     (entries || []).forEach(function (entry) {
@@ -3993,88 +4564,9 @@
     return map;
   }
 
-  function entryFieldsEqual(first, second) {
-    return Boolean(first && second) &&
-      trim(first.key) === trim(second.key) &&
-      trim(first.text) === trim(second.text) &&
-      trim(first.parentKey) === trim(second.parentKey);
-  }
-
-  function numericVersion(value) {
-    var number = Number(value || 0);
-    return isNaN(number) ? 0 : number;
-  }
-
-  function nullableDbId(value) {
-    // Supabase assigns UUIDs to new rows; JSON null prevents a blank value from reaching a UUID cast.
-    var dbId = trim(value);
-    return dbId || null;
-  }
-
-  function sortOrderFor(entry, fallbackIndex, baseEntry) {
-    if (baseEntry && (baseEntry.sortOrder || baseEntry.sortOrder === 0)) {
-      return Number(baseEntry.sortOrder);
-    }
-    if (entry && (entry.sortOrder || entry.sortOrder === 0)) {
-      return Number(entry.sortOrder);
-    }
-    return fallbackIndex || 0;
-  }
-
-  function makeDbUpsert(entry, baseEntry, index) {
-    return {
-      dbId: nullableDbId((baseEntry && baseEntry.dbId) || entry.dbId),
-      key: trim(entry.key),
-      text: trim(entry.text),
-      parentKey: trim(entry.parentKey),
-      sortOrder: sortOrderFor(entry, index, baseEntry),
-      baseVersion: numericVersion((baseEntry && baseEntry.rowVersion) || entry.rowVersion),
-      previousKey: baseEntry ? trim(baseEntry.key) : ""
-    };
-  }
-
-  function makeDbDelete(baseEntry) {
-    return {
-      dbId: nullableDbId(baseEntry.dbId),
-      key: trim(baseEntry.key),
-      baseVersion: numericVersion(baseEntry.rowVersion)
-    };
-  }
-
+  // Only ids touched since rememberBaseline are compared; see change_tracker.js.
   function buildPendingDbChanges() {
-    var baselineById = indexEntriesById(state.baselineEntries);
-    var currentById = indexEntriesById(state.entries);
-    var seen = {};
-    var changes = {
-      upserts: [],
-      deletes: []
-    };
-
-    state.baselineEntries.forEach(function (baseEntry) {
-      var currentEntry = currentById[baseEntry.id];
-      seen[baseEntry.id] = true;
-
-      if (!currentEntry) {
-        changes.deletes.push(makeDbDelete(baseEntry));
-        return;
-      }
-
-      if (!entryFieldsEqual(baseEntry, currentEntry)) {
-        changes.upserts.push(makeDbUpsert(
-          currentEntry,
-          baseEntry,
-          state.entries.indexOf(currentEntry)
-        ));
-      }
-    });
-
-    state.entries.forEach(function (entry, index) {
-      if (!seen[entry.id]) {
-        changes.upserts.push(makeDbUpsert(entry, null, index));
-      }
-    });
-
-    return changes;
+    return changeTracker.build(state.entries, findEntryById);
   }
 
   function addFileMetadataToChanges(changes, payload) {
@@ -4091,7 +4583,7 @@
   }
 
   function mergeSnapshotMetadataInto(entries, snapshot) {
-    var snapshotByKey = indexEntriesByKey(snapshot && snapshot.entries);
+    var snapshotByKey = snapshotEntriesByKey(snapshot);
     var count = 0;
 
     (entries || []).forEach(function (entry) {
@@ -4147,6 +4639,7 @@
   }
 
   function rememberBaseline() {
+    baselineRevision += 1;
     state.baselineEntries = state.entries.map(function (entry) {
       return {
         id: entry.id,
@@ -4159,6 +4652,7 @@
         lineNumber: entry.lineNumber || null
       };
     });
+    changeTracker.reset(state.baselineEntries);
   }
 
   function markRemoteEntriesPending() {
@@ -4326,7 +4820,7 @@
       return true;
     }
 
-    snapshotByKey = indexEntriesByKey(snapshotEntries);
+    snapshotByKey = snapshotEntriesByKey(snapshot);
     fileEntries.forEach(function (entry) {
       var match = snapshotByKey[trim(entry.key)];
       if (!match || !entryFieldsEqual(entry, match)) {
@@ -4692,7 +5186,7 @@
     state.payload = payload || {};
     preferences = state.payload.preferences || {};
     setPlacementMode(preferences.placementMode || state.payload.placementMode || state.placementMode);
-    state.entries = (state.payload.entries || []).map(normalizeEntry);
+    setEntries((state.payload.entries || []).map(normalizeEntry));
     state.modelHealth = normalizeModelHealth(state.payload.modelHealth || {});
     state.modelIssueResolutions = {};
     state.placedKeynotesOpen = false;
@@ -4781,18 +5275,16 @@
 
     if (fieldName === "key") {
       oldKey = entry.key;
-      entry.key = nextValue;
+      setEntryField(entry, "key", nextValue);
       if (oldKey && oldKey !== nextValue) {
-        state.entries.forEach(function (candidate) {
+        entryStore.children(oldKey).slice().forEach(function (candidate) {
           if (candidate.parentKey === oldKey) {
-            candidate.parentKey = nextValue;
+            setEntryField(candidate, "parentKey", nextValue);
           }
         });
       }
-    } else if (fieldName === "text") {
-      entry.text = nextValue;
-    } else if (fieldName === "parentKey") {
-      entry.parentKey = nextValue;
+    } else if (fieldName === "text" || fieldName === "parentKey") {
+      setEntryField(entry, fieldName, nextValue);
     }
 
     updateDirtyFromEditorState();
@@ -4805,10 +5297,8 @@
       return true;
     }
 
-    renderMeta();
-    renderValidation();
-    renderSaveState();
     syncSelectionClasses();
+    scheduleRender(["meta", "validation", "saveState"]);
     return true;
   }
 
@@ -4962,7 +5452,7 @@
       lineNumber: null,
       originalIndex: state.entries.length
     };
-    state.entries.push(entry);
+    addEntry(entry);
     state.selectedDivisionId = entry.id;
     state.selectedNoteId = null;
     state.selectedId = entry.id;
@@ -4981,7 +5471,7 @@
     }
 
     parentKey = trim(selectedNote.parentKey);
-    return parentKey ? entriesByKey()[parentKey] || null : null;
+    return parentKey ? entryByKey(parentKey) : null;
   }
 
   function addNoteUnderParent(parent, missingParentMessage) {
@@ -5014,7 +5504,7 @@
       lineNumber: null,
       originalIndex: state.entries.length
     };
-    state.entries.push(entry);
+    addEntry(entry);
     setSelectionForEntry(entry);
     markDirty();
     syncLocalEditClaims();
@@ -5036,7 +5526,7 @@
 
   function addNoteInSequenceForEntry(entry) {
     var parentKey = trim(entry && entry.parentKey);
-    var parent = parentKey ? entriesByKey()[parentKey] || null : null;
+    var parent = parentKey ? entryByKey(parentKey) : null;
     var missingParentMessage = "Select a keynote with a parent before adding a note in sequence.";
 
     if (entry) {
@@ -5086,7 +5576,7 @@
       lineNumber: null,
       originalIndex: state.entries.length
     };
-    state.entries.push(copy);
+    addEntry(copy);
     setSelectionForEntry(copy);
     markDirty();
     syncLocalEditClaims();
@@ -5118,8 +5608,8 @@
     }
 
     historyState = beginHistoryMutation();
-    state.entries = state.entries.filter(function (candidate) {
-      return candidate.id !== entry.id;
+    removeEntries(function (candidate) {
+      return candidate.id === entry.id;
     });
     delete state.collapsedEntryIds[entry.id];
 
@@ -5172,7 +5662,7 @@
     }
 
     historyState = beginHistoryMutation();
-    entry.parentKey = division.key;
+    setEntryField(entry, "parentKey", division.key);
     setSelectionForEntry(entry);
     markDirty();
     syncLocalEditClaims();
@@ -5201,7 +5691,7 @@
     }
 
     historyState = beginHistoryMutation();
-    entry.parentKey = "";
+    setEntryField(entry, "parentKey", "");
     setSelectionForEntry(entry);
     markDirty();
     syncLocalEditClaims();
@@ -5230,7 +5720,7 @@
     }
 
     historyState = beginHistoryMutation();
-    entry.parentKey = destination.key;
+    setEntryField(entry, "parentKey", destination.key);
     setSelectionForEntry(entry);
     markDirty();
     syncLocalEditClaims();
@@ -5271,8 +5761,8 @@
       deleteIds[candidate.id] = true;
       delete state.collapsedEntryIds[candidate.id];
     });
-    state.entries = state.entries.filter(function (candidate) {
-      return !deleteIds[candidate.id];
+    removeEntries(function (candidate) {
+      return deleteIds[candidate.id];
     });
     if (deleteIds[state.selectedDivisionId]) {
       state.selectedDivisionId = null;
@@ -5325,10 +5815,10 @@
 
     historyState = beginHistoryMutation();
     directChildren.forEach(function (child) {
-      child.parentKey = destination.key;
+      setEntryField(child, "parentKey", destination.key);
     });
-    state.entries = state.entries.filter(function (candidate) {
-      return candidate.id !== entry.id;
+    removeEntries(function (candidate) {
+      return candidate.id === entry.id;
     });
     delete state.collapsedEntryIds[entry.id];
     setSelectionForEntry(destination);
@@ -5821,7 +6311,11 @@
 
     if (searchInput) {
       searchInput.addEventListener("input", function () {
-        renderAll();
+        globalScope.clearTimeout(searchRenderTimer);
+        searchRenderTimer = globalScope.setTimeout(function () {
+          searchRenderTimer = null;
+          renderAll();
+        }, SEARCH_DEBOUNCE_MS);
       });
     }
 
@@ -5886,10 +6380,12 @@
     globalScope.addEventListener("resize", function () {
       closeRowActionMenu(false);
       setNoteKeyColumnWidth(state.noteKeyColumnWidth);
+      scheduleRender(["noteWindow"]);
     });
     if (byId("notes-section-body")) {
       byId("notes-section-body").addEventListener("scroll", function () {
         closeRowActionMenu(false);
+        scheduleRender(["noteWindow"]);
       });
     }
     if (document.querySelector(".division-list-wrap")) {
@@ -1,26 +1,30 @@
 # -*- coding: utf-8 -*-
 __title__     = "Text Leader \nPosition"
-__version__   = 'Version = 1.0'
-__doc__       = """Version = 1.0
+__version__   = 'Version = 1.1'
+__doc__       = """Version = 1.1
 Date    = 06.11.2025
 # _____________________________________________________________________
 # Description:
-# - This script allows you to change the left/right 
+# - This script allows you to change the left/right
 #   attachment position of text leaders in Revit.
-# - The script will prompt you to select the 
-#   attachment position
+# - The script will prompt you for a scope (selection,
+#   active view, selected views/sheets or whole project)
+#   and the text note types to include.
 # - The available positions are Top, Middle, and Bottom.
-# 
+#
 # _____________________________________________________________________
 # How-to:
 #
-# -> Select the text elements you want to change
+# -> Optionally select the text elements you want to change
 # -> Click the button
+# -> Choose the scope and the text note types
 # -> Choose the Left Attachment position from the list
 # -> Choose the Right Attachment position from the list
+# -> Confirm the summary of notes that will change
 # _____________________________________________________________________
 # Last update:
 # - [06.05.2025] - 1.0 RELEASE
+# - [10.18.2026] - 1.1 Scoped bulk edit, only changed notes, one summary
 # _____________________________________________________________________
 Inspiration: Olivia Bates
 Author: Kyle Guggenheim"""
@@ -28,11 +32,9 @@ Author: Kyle Guggenheim"""
 
 #____________________________________________________________________ IMPORTS (AUTODESK)
 
-from logging import Filter
-from requests import get
 import clr
 clr.AddReference("System")
-from System.Collections.Generic import List
+from collections import OrderedDict
 from Autodesk.Revit.DB import *
 from Autodesk.Revit.UI import *
 from Autodesk.Revit.UI.Selection import Selection
@@ -40,7 +42,7 @@ from Autodesk.Revit.UI.Selection import Selection
 
 #____________________________________________________________________ IMPORTS (PYREVIT)
 
-from pyrevit import revit, DB, forms
+from pyrevit import revit, DB, forms, script
 
 
 #____________________________________________________________________ VARIABLES
@@ -48,99 +50,187 @@ app         = __revit__.Application
 uidoc       = __revit__.ActiveUIDocument
 doc         = __revit__.ActiveUIDocument.Document   #type: Document
 selection   = uidoc.Selection                       #type: Selection
+output      = script.get_output()
 
+SCOPE_SELECTION      = "Current Selection"
+SCOPE_ACTIVE_VIEW    = "Active View"
+SCOPE_SELECTED_VIEWS = "Selected Views"
+SCOPE_SELECTED_SHEETS = "Selected Sheets (incl. placed views)"
+SCOPE_PROJECT        = "Whole Project"
 
-#____________________________________________________________________ MAIN
+KEEP_CURRENT = "Keep Current"
 
-### NOTES ###
 # LeaderAtachement Enumeration
 # https://www.revitapidocs.com/2026/82ed0368-6da3-53a3-8c07-4061efd0be56.htm
+attachment_map = OrderedDict([
+    ("Top", 0),
+    ("Middle", 1),
+    ("Bottom", 2)
+])
+attachment_names = dict((value, name) for name, value in attachment_map.items())
 
+log_status = "Cancelled"
 
 
-# GET SELECTION
-selected_elements = selection.GetElementIds()
-
-print("Selected Elements: ", len(selected_elements))
-
-# CONTAINER
-elements_list = []
-param_Left_List = []
-param_Right_List = []
+#____________________________________________________________________ FUNCTIONS
 
-# LOOP THROUGH SELECTED ELEMENTS
-for element_id in selected_elements:
-    element = doc.GetElement(element_id)
-    elements_list.append(element)
-    param_Left_List.append(element.get_Parameter(BuiltInParameter.LEADER_LEFT_ATTACHMENT))
-    param_Right_List.append(element.get_Parameter(BuiltInParameter.LEADER_RIGHT_ATTACHMENT))
-
-    # print("Element ID: ", element.Id, " Element Parameters: ", element.GetParameters('Left Attachment')[0].AsValueString())
-    # print("get_Parameter: ", element.get_Parameter(BuiltInParameter.LEADER_LEFT_ATTACHMENT).AsValueString())
+def id_value(element_id):
+    """Returns the numeric value of an ElementId (Value in 2024+, IntegerValue before)"""
+    try:
+        return element_id.Value
+    except Exception:
+        return element_id.IntegerValue
+
+
+def get_selected_text_notes():
+    notes = []
+    for element_id in selection.GetElementIds():
+        element = doc.GetElement(element_id)
+        if isinstance(element, TextNote):
+            notes.append(element)
+    return notes
+
+
+def get_scope_view_ids(scope):
+    """Owner view ids to include, or None for the whole project."""
+    if scope == SCOPE_ACTIVE_VIEW:
+        return set([id_value(doc.ActiveView.Id)])
+    if scope == SCOPE_SELECTED_VIEWS:
+        views = forms.select_views(title="Select Views", multiple=True)
+        if not views:
+            return set()
+        return set(id_value(view.Id) for view in views)
+    if scope == SCOPE_SELECTED_SHEETS:
+        sheets = forms.select_sheets(title="Select Sheets", multiple=True)
+        view_ids = set()
+        for sheet in sheets or []:
+            view_ids.add(id_value(sheet.Id))
+            for view_id in sheet.GetAllPlacedViews():
+                view_ids.add(id_value(view_id))
+        return view_ids
+    return None
+
+
+def collect_text_notes(scope):
+    """One project-wide TextNote pass, kept when the note's owner view is in scope."""
+    if scope == SCOPE_SELECTION:
+        return get_selected_text_notes()
+    view_ids = get_scope_view_ids(scope)
+    collector = FilteredElementCollector(doc).OfClass(TextNote).WhereElementIsNotElementType()
+    if view_ids is None:
+        return list(collector)
+    return [note for note in collector if id_value(note.OwnerViewId) in view_ids]
+
+
+def filter_by_type(notes):
+    """Ask for the text note types to include when the scope holds more than one."""
+    notes_by_type = OrderedDict()
+    for note in notes:
+        notes_by_type.setdefault(id_value(note.GetTypeId()), []).append(note)
+    if len(notes_by_type) < 2:
+        return notes
+
+    labels = {}
+    for type_id, type_notes in notes_by_type.items():
+        note_type = doc.GetElement(type_notes[0].GetTypeId())
+        type_name = Element.Name.GetValue(note_type) if note_type else "<No Type>"
+        labels["{} ({})".format(type_name, len(type_notes))] = type_id
+    chosen = forms.SelectFromList.show(sorted(labels), title="Select Text Note Types", multiselect=True, button_name="Select Types")
+    if not chosen:
+        return []
+    return [note for label in chosen for note in notes_by_type[labels[label]]]
+
+
+def ask_attachment(side):
+    choice = forms.SelectFromList.show([KEEP_CURRENT] + list(attachment_map), title="Select {} Leader Attachment Position".format(side), button_name="Apply")
+    return attachment_map.get(choice)
+
+
+def read_attachment(param):
+    if param is None or param.IsReadOnly:
+        return None
+    return param.AsInteger()
+
+
+def plan_changes(notes, target_left, target_right):
+    """
+    Returns (changes, groups, skipped):
+    changes - (left param or None, right param or None) per note that needs a change
+    groups  - {(current left, current right): count} for those notes
+    skipped - notes whose attachment parameters could not be read
+    """
+    changes = []
+    groups = OrderedDict()
+    skipped = 0
+    for note in notes:
+        param_left = note.get_Parameter(BuiltInParameter.LEADER_LEFT_ATTACHMENT)
+        param_right = note.get_Parameter(BuiltInParameter.LEADER_RIGHT_ATTACHMENT)
+        current_left = read_attachment(param_left)
+        current_right = read_attachment(param_right)
+        if current_left is None and current_right is None:
+            skipped += 1
+            continue
+
+        set_left = param_left if target_left is not None and current_left is not None and current_left != target_left else None
+        set_right = param_right if target_right is not None and current_right is not None and current_right != target_right else None
+        if set_left is None and set_right is None:
+            continue
+
+        changes.append((set_left, set_right))
+        state = (attachment_names.get(current_left, "-"), attachment_names.get(current_right, "-"))
+        groups[state] = groups.get(state, 0) + 1
+    return changes, groups, skipped
 
 
+#____________________________________________________________________ MAIN
 
+# Step 1: Scope
+scopes = [SCOPE_ACTIVE_VIEW, SCOPE_SELECTED_VIEWS, SCOPE_SELECTED_SHEETS, SCOPE_PROJECT]
+if get_selected_text_notes():
+    scopes.insert(0, SCOPE_SELECTION)
+scope = forms.CommandSwitchWindow.show(scopes, message="Change text leaders in:")
+if not scope:
+    script.exit()
 
-# Step 1: Ask user for Top, Middle, or Bottom attachment
-options = ["Top", "Middle", "Bottom"]
-attachment_choice_left = forms.SelectFromList.show(options, title="Select Left Leader Attachment Position", button_name="Apply")
-attachment_choice_right = forms.SelectFromList.show(options, title="Select Right Leader Attachment Position", button_name="Apply")
+notes = filter_by_type(collect_text_notes(scope))
+if not notes:
+    forms.alert("No text notes found in: {}".format(scope), exitscript=True)
 
-print("Left Attachment Position: ", attachment_choice_left)
-print("Right Attachment Position: ", attachment_choice_right)
 
+# Step 2: Ask user for Top, Middle, or Bottom attachment
+attachment_value_left = ask_attachment("Left")
+attachment_value_right = ask_attachment("Right")
 
 ### If not selected, exit the script
-if not attachment_choice_left and not attachment_choice_right:
+if attachment_value_left is None and attachment_value_right is None:
     forms.alert("No attachment selected. Exiting.", exitscript=True)
 
 
+# Step 3: Only notes whose attachment differs from the target
+changes, groups, skipped = plan_changes(notes, attachment_value_left, attachment_value_right)
+if not changes:
+    forms.alert("All {} text notes already use the selected attachment.".format(len(notes)), exitscript=True)
 
-# Step 2: Use raw int for AttachmentType enum
-attachment_map = {
-    "Top": 0,
-    "Middle": 1,
-    "Bottom": 2
-}
-
-if attachment_choice_left not in attachment_map:
-    attachment_value_left = ""
-else:
-    attachment_value_left = attachment_map[attachment_choice_left]
-
-
-if attachment_choice_right not in attachment_map:
-    attachment_value_right = ""
-else:
-    attachment_value_right = attachment_map[attachment_choice_right]
+summary = "{} of {} text notes will change.".format(len(changes), len(notes))
+if not forms.alert(summary, sub_msg="Left: {}\nRight: {}".format(attachment_names.get(attachment_value_left, KEEP_CURRENT), attachment_names.get(attachment_value_right, KEEP_CURRENT)), yes=True, no=True):
+    script.exit()
 
 
 #____________________________________________________________________ 🤖 Transaction
 
 # Set Attachment Parameters
+failed = 0
 transaction = Transaction(doc, "Text Leader")
 transaction.Start()
 try:
-    print("Changing text leader position...")
-    for param_left, param_right in zip(param_Left_List, param_Right_List):
-        ## Set the Left Attachment parameter to the selected attachment position
-        if attachment_value_left == "":
-            print("Left Attachment not set, skipping...")
-        else:
-            param_left.Set(attachment_value_left)
-            print("Left Leader position changed to: ", attachment_choice_left)
-        
-        ## Set the Right Attachment parameter to the selected attachment position
-        if attachment_value_right == "":
-            print("Right Attachment not set, skipping...")
-        else:
-            param_right.Set(attachment_value_right)
-            print("Right Leader position changed to: ", attachment_choice_right)
-
-
-        ##
-        # print("Left Leader position changed to: ", attachment_choice_left)
-        # print("Right Leader position changed to: ", attachment_choice_right)
+    for param_left, param_right in changes:
+        try:
+            if param_left is not None:
+                param_left.Set(attachment_value_left)
+            if param_right is not None:
+                param_right.Set(attachment_value_right)
+        except Exception:
+            failed += 1
 
     transaction.Commit()
     log_status = "Success"
@@ -151,6 +241,20 @@ except Exception as e:
     print("Error ", "Failed to change leader position: ", str(e))
 
 
+#____________________________________________________________________ SUMMARY
+if log_status == "Success":
+    output.print_md("### Text Leader Position - {}".format(scope))
+    output.print_md("- Left: **{}**, Right: **{}**".format(attachment_names.get(attachment_value_left, KEEP_CURRENT), attachment_names.get(attachment_value_right, KEEP_CURRENT)))
+    output.print_md("- Text notes in scope: **{}**, changed: **{}**, already set: **{}**".format(len(notes), len(changes) - failed, len(notes) - len(changes) - skipped))
+    if skipped or failed:
+        output.print_md("- Skipped (no attachment parameters): **{}**, failed: **{}**".format(skipped, failed))
+    output.print_table(
+        table_data=[[left, right, count] for (left, right), count in groups.items()],
+        columns=["Current Left", "Current Right", "Notes Changed"],
+        title="Changed by Current State"
+    )
+
+
 
 #______________________________________________________ LOG ACTION
 action = "Text Leader Position"
@@ -187,7 +291,7 @@ def log_action(action, log_status):
     # Function to write JSON data
     def write_json(dataEntry, filename=log_file):
         with open(filename,'r+') as file:
-            file_data = json.load(file)                 # First we load existing data into a dict.   
+            file_data = json.load(file)                 # First we load existing data into a dict.
             file_data['action'].append(dataEntry)       # Join new_data with file_data inside emp_details
             file.seek(0)                                # Sets file's current position at offset.
             json.dump(file_data, file, indent = 4)      # convert back to json.
@@ -198,9 +302,9 @@ def log_action(action, log_status):
     if not os.path.exists(log_file):
         if not os.path.exists(log_dir):
             os.makedirs(log_dir)
-        with open(log_file, 'w') as file:    
+        with open(log_file, 'w') as file:
             file.write('{"action": []}')                # create json structure
-        
+
         # output_window.print_md("### **Created log file:** `{}`".format(log_file))
 
     with open(log_file,'r+') as file:
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory bounding box overlap engine for AT vs Lights.
+
+Purpose:
+-> Find every overlapping (A, B) pair between two sets of cached bounding
+   boxes without asking Revit for a new FilteredElementCollector per element.
+
+Key behaviors:
+-> Sort-and-sweep on X: both sets are sorted once by Min.X and swept
+   together, so only boxes whose X intervals overlap are ever compared.
+-> Y and Z are plain interval checks on the surviving candidates.
+-> Cost is O((n + m) log(n + m) + k) for n, m boxes and k X-overlaps.
+
+Design decisions:
+-> Boxes are plain tuples (min_x, min_y, min_z, max_x, max_y, max_z, key)
+   so the engine has no Revit imports and can be benchmarked on Linux
+   (python overlap_engine.py).
+-> The tolerance is applied to the A boxes only, matching the original
+   Outline expansion around each air terminal. A negative tolerance shrinks
+   the box; boxes that collapse to nothing never match.
+-> Plan (XY) and vertical (Z) tolerances are separate: ceiling devices are
+   often under a foot deep, so shrinking Z by the plan tolerance would
+   collapse every box and hide real clashes.
+"""
+
+# ____________________________________________________________________ IMPORTS (SYSTEM)
+import random
+import time
+
+
+# ____________________________________________________________________ BOX HELPERS
+def make_box(min_pt, max_pt, key):
+    return (min_pt[0], min_pt[1], min_pt[2], max_pt[0], max_pt[1], max_pt[2], key)
+
+
+def inflate_box(box, tolerance, z_tolerance=0.0):
+    """Grow (or shrink, for negative tolerance) a box on every side. None if it collapses."""
+    inflated = (
+        box[0] - tolerance, box[1] - tolerance, box[2] - z_tolerance,
+        box[3] + tolerance, box[4] + tolerance, box[5] + z_tolerance,
+        box[6],
+    )
+    if inflated[0] > inflated[3] or inflated[1] > inflated[4] or inflated[2] > inflated[5]:
+        return None
+    return inflated
+
+
+def boxes_overlap_yz(a, b):
+    return (a[1] <= b[4] and a[4] >= b[1] and
+            a[2] <= b[5] and a[5] >= b[2])
+
+
+# ____________________________________________________________________ SWEEP
+def find_overlaps(boxes_a, boxes_b, tolerance=0.0, z_tolerance=0.0):
+    """Return a list of (key_a, key_b) pairs whose boxes intersect (inclusive).
+
+    Every A box is inflated by `tolerance` in plan and `z_tolerance` in Z
+    first. Pairs come back ordered by the sweep position, each pair once.
+    """
+    prepared_a = []
+    for box in boxes_a:
+        inflated = inflate_box(box, tolerance, z_tolerance)
+        if inflated is not None:
+            prepared_a.append(inflated)
+
+    if not prepared_a or not boxes_b:
+        return []
+
+    # Tag each box with its set so one sorted pass drives the sweep.
+    events = [(box[0], 0, box) for box in prepared_a]
+    events.extend((box[0], 1, box) for box in boxes_b)
+    events.sort(key=lambda event: (event[0], event[1]))
+
+    active = ([], [])
+    pairs = []
+
+    for start_x, side, box in events:
+        other_side = 1 - side
+        survivors = []
+        for other in active[other_side]:
+            if other[3] < start_x:
+                continue
+            survivors.append(other)
+            if boxes_overlap_yz(box, other):
+                if side == 0:
+                    pairs.append((box[6], other[6]))
+                else:
+                    pairs.append((other[6], box[6]))
+        active[other_side][:] = survivors
+        active[side].append(box)
+
+    return pairs
+
+
+def find_overlaps_brute_force(boxes_a, boxes_b, tolerance=0.0, z_tolerance=0.0):
+    """Reference O(n * m) implementation used by the benchmark."""
+    pairs = []
+    for box in boxes_a:
+        inflated = inflate_box(box, tolerance, z_tolerance)
+        if inflated is None:
+            continue
+        for other in boxes_b:
+            if inflated[0] <= other[3] and inflated[3] >= other[0] and boxes_overlap_yz(inflated, other):
+                pairs.append((inflated[6], other[6]))
+    return pairs
+
+
+# ____________________________________________________________________ SYNTHETIC RCP BENCHMARK
+def generate_synthetic_rcp(tile_rows, tile_cols, light_ratio=0.35, terminal_ratio=0.12, seed=7):
+    """Build a reflected ceiling plan on a 2' x 2' tile grid.
+
+    Lights are 2x4 troffers and air terminals 2x2 diffusers, each nudged off
+    the tile grid a little so a realistic share of them clash.
+    """
+    rng = random.Random(seed)
+    ceiling_z = 9.0
+    lights = []
+    terminals = []
+
+    for row in range(tile_rows):
+        for col in range(tile_cols):
+            x = col * 2.0
+            y = row * 2.0
+            roll = rng.random()
+            if roll < light_ratio:
+                dx = rng.uniform(-0.4, 0.4)
+                lights.append(make_box(
+                    (x + dx, y, ceiling_z - 0.5),
+                    (x + dx + 2.0, y + 4.0, ceiling_z),
+                    "L{0}-{1}".format(row, col),
+                ))
+            elif roll < light_ratio + terminal_ratio:
+                dy = rng.uniform(-0.4, 0.4)
+                terminals.append(make_box(
+                    (x, y + dy, ceiling_z - 0.75),
+                    (x + 2.0, y + dy + 2.0, ceiling_z),
+                    "AT{0}-{1}".format(row, col),
+                ))
+
+    return terminals, lights
+
+
+def run_benchmark(sizes=((40, 40), (120, 120), (250, 250)), tolerance=-0.5, brute_force_limit=10000000):
+    rows = []
+    for tile_rows, tile_cols in sizes:
+        terminals, lights = generate_synthetic_rcp(tile_rows, tile_cols)
+
+        started = time.time()
+        sweep_pairs = find_overlaps(terminals, lights, tolerance)
+        sweep_seconds = time.time() - started
+
+        brute_seconds = None
+        matches = None
+        if len(terminals) * len(lights) <= brute_force_limit:
+            started = time.time()
+            brute_pairs = find_overlaps_brute_force(terminals, lights, tolerance)
+            brute_seconds = time.time() - started
+            matches = sorted(brute_pairs) == sorted(sweep_pairs)
+
+        rows.append({
+            "tiles": tile_rows * tile_cols,
+            "terminals": len(terminals),
+            "lights": len(lights),
+            "overlaps": len(sweep_pairs),
+            "sweepSeconds": sweep_seconds,
+            "bruteSeconds": brute_seconds,
+            "matches": matches,
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    for result in run_benchmark():
+        print("{tiles:>7} tiles | {terminals:>6} AT | {lights:>6} lights | {overlaps:>6} overlaps | "
+              "sweep {sweepSeconds:.4f}s | brute {brute} | match {matches}".format(
+                  brute="{0:.4f}s".format(result["bruteSeconds"]) if result["bruteSeconds"] is not None else "skipped",
+                  **result))
@@ -1,17 +1,20 @@
 # -*- coding: utf-8 -*-
 __title__     = "AT vs Lights"
-__version__   = 'Version = v0.1'
-__doc__       = """Version = v0.1
+__version__   = 'Version = v0.2'
+__doc__       = """Version = v0.2
 Date    = 03.03.2026
 ______________________________________________________________
 Description:
--> 
+-> Reports bounding box overlaps between ceiling device categories
+   (air terminals, lights, sprinklers, fire alarm devices).
 ______________________________________________________________
 How-to:
--> 
+-> Pick the category pairs to check, then the scope:
+   active view, selected views or the whole model.
 ______________________________________________________________
 Last update:
 - [03.03.2026] - v0.1 BETA RELEASE
+- [18.10.2026] - v0.2 IN-MEMORY SWEEP OVERLAP ENGINE, MULTI-VIEW / WHOLE MODEL, CATEGORY PAIRS
 ______________________________________________________________
 Author: Kyle Guggenheim"""
 
@@ -54,64 +57,62 @@ Author: Kyle Guggenheim"""
 
 
 
-from pyrevit import revit
+from pyrevit import revit, forms
 from pyrevit.script import output
 
 from Autodesk.Revit.DB import (
     BuiltInCategory,
     FilteredElementCollector,
-    BoundingBoxIntersectsFilter,
-    Outline,
-    XYZ
 )
 
+from overlap_engine import find_overlaps
+
 doc = revit.doc
 view = doc.ActiveView
 out = output.get_output()
-out.set_title("Air Terminals vs Lighting Fixtures - Active View")
 
 # ------------------------------------------------------
 # Settings
 # ------------------------------------------------------
 # Revit internal units (feet)
 # 0.10 ft ≈ 1.2 inches
+# Negative values shrink the first category's box in plan, so only real
+# overlaps (not touching edges) are reported.
 TOL_FT = -0.50
+TOL_Z_FT = 0.0
+
+# (first category, second category) pairs offered to the user.
+# The first category of each pair receives the tolerance.
+CATEGORY_PAIRS = [
+    ("Air Terminals", BuiltInCategory.OST_DuctTerminal, "Lighting Fixtures", BuiltInCategory.OST_LightingFixtures),
+    ("Air Terminals", BuiltInCategory.OST_DuctTerminal, "Sprinklers", BuiltInCategory.OST_Sprinklers),
+    ("Lighting Fixtures", BuiltInCategory.OST_LightingFixtures, "Sprinklers", BuiltInCategory.OST_Sprinklers),
+    ("Air Terminals", BuiltInCategory.OST_DuctTerminal, "Fire Alarm Devices", BuiltInCategory.OST_FireAlarmDevices),
+    ("Lighting Fixtures", BuiltInCategory.OST_LightingFixtures, "Fire Alarm Devices", BuiltInCategory.OST_FireAlarmDevices),
+]
+
+SCOPE_ACTIVE_VIEW = "Active View"
+SCOPE_SELECTED_VIEWS = "Selected Views"
+SCOPE_WHOLE_MODEL = "Whole Model"
 
 
 # ------------------------------------------------------
 # Utility Functions
 # ------------------------------------------------------
 
-def get_bbox(elem):
+def get_bbox(elem, scope_view):
     try:
-        return elem.get_BoundingBox(view)
+        return elem.get_BoundingBox(scope_view)
     except:
         return None
 
 
-def bbox_intersects(bbA, bbB):
-    if not bbA or not bbB:
-        return False
-
-    a0, a1 = bbA.Min, bbA.Max
-    b0, b1 = bbB.Min, bbB.Max
-
-    return (a0.X <= b1.X and a1.X >= b0.X and
-            a0.Y <= b1.Y and a1.Y >= b0.Y and
-            a0.Z <= b1.Z and a1.Z >= b0.Z)
-
-
-def bbox_to_outline(bb, tol):
+def bbox_to_box(bb, key):
     if not bb:
         return None
-
     mn = bb.Min
     mx = bb.Max
-
-    min_pt = XYZ(mn.X - tol, mn.Y - tol, mn.Z - tol)
-    max_pt = XYZ(mx.X + tol, mx.Y + tol, mx.Z + tol)
-
-    return Outline(min_pt, max_pt)
+    return (mn.X, mn.Y, mn.Z, mx.X, mx.Y, mx.Z, key)
 
 
 def elem_name(e):
@@ -126,99 +127,119 @@ def elem_name(e):
     return e.Name if hasattr(e, "Name") else "<Unnamed>"
 
 
+def pair_label(pair):
+    return "{} vs {}".format(pair[0], pair[2])
+
+
+def collect_category(category, scope_view):
+    """Collect instances of a category in a view (or the whole model when scope_view is None)."""
+    if scope_view is None:
+        collector = FilteredElementCollector(doc)
+    else:
+        collector = FilteredElementCollector(doc, scope_view.Id)
+    return list(collector.OfCategory(category).WhereElementIsNotElementType())
+
+
+def cache_boxes(elements, scope_view, elements_by_key):
+    """Read every bounding box exactly once; the sweep runs on these tuples only."""
+    boxes = []
+    for e in elements:
+        key = e.Id.ToString()
+        box = bbox_to_box(get_bbox(e, scope_view), key)
+        if box is None:
+            continue
+        elements_by_key[key] = e
+        boxes.append(box)
+    return boxes
+
+
 # ------------------------------------------------------
-# Collect Elements (ACTIVE VIEW ONLY)
+# User Options
 # ------------------------------------------------------
 
-air_terms = list(
-    FilteredElementCollector(doc, view.Id)
-    .OfCategory(BuiltInCategory.OST_DuctTerminal)
-    .WhereElementIsNotElementType()
+pair_options = dict((pair_label(pair), pair) for pair in CATEGORY_PAIRS)
+selected_pair_labels = forms.SelectFromList.show(
+    [pair_label(pair) for pair in CATEGORY_PAIRS],
+    title="Select Category Pairs to Check",
+    multiselect=True,
+    button_name="Select Pairs"
 )
+if not selected_pair_labels:
+    raise SystemExit
+selected_pairs = [pair_options[label] for label in selected_pair_labels]
 
-lights = list(
-    FilteredElementCollector(doc, view.Id)
-    .OfCategory(BuiltInCategory.OST_LightingFixtures)
-    .WhereElementIsNotElementType()
+scope = forms.CommandSwitchWindow.show(
+    [SCOPE_ACTIVE_VIEW, SCOPE_SELECTED_VIEWS, SCOPE_WHOLE_MODEL],
+    message="Check overlaps in:"
 )
-
-out.print_md("### Active View: **{}**".format(view.Name))
-out.print_md("- Air Terminals: **{}**".format(len(air_terms)))
-out.print_md("- Lighting Fixtures: **{}**".format(len(lights)))
-
-if not air_terms or not lights:
-    out.print_md("\nNo elements found in one or both categories.")
+if not scope:
     raise SystemExit
 
+if scope == SCOPE_ACTIVE_VIEW:
+    scope_views = [view]
+elif scope == SCOPE_SELECTED_VIEWS:
+    scope_views = forms.select_views(title="Select Views to Check", multiple=True)
+    if not scope_views:
+        raise SystemExit
+else:
+    # None = model bounding boxes, collected from the whole document once.
+    scope_views = [None]
 
-# Pre-cache lighting bounding boxes
-light_bboxes = {}
-for l in lights:
-    bb = get_bbox(l)
-    if bb:
-        light_bboxes[l.Id.ToString()] = bb
+out.set_title("Overlap Check - {}".format(scope))
 
 
 # ------------------------------------------------------
 # Overlap Detection
 # ------------------------------------------------------
 
-results = []
-seen = set()
+total_overlaps = 0
 
-for at in air_terms:
+for scope_view in scope_views:
+    scope_name = scope_view.Name if scope_view is not None else "Whole Model"
+    out.print_md("## {}: **{}**".format("View" if scope_view is not None else "Scope", scope_name))
 
-    at_bb = get_bbox(at)
-    if not at_bb:
-        continue
+    for pair in selected_pairs:
+        name_a, category_a, name_b, category_b = pair
+        elements_by_key = {}
 
-    outline = bbox_to_outline(at_bb, TOL_FT)
-    if not outline:
-        continue
+        boxes_a = cache_boxes(collect_category(category_a, scope_view), scope_view, elements_by_key)
+        boxes_b = cache_boxes(collect_category(category_b, scope_view), scope_view, elements_by_key)
 
-    bb_filter = BoundingBoxIntersectsFilter(outline)
+        out.print_md("### {}".format(pair_label(pair)))
+        out.print_md("- {}: **{}**".format(name_a, len(boxes_a)))
+        out.print_md("- {}: **{}**".format(name_b, len(boxes_b)))
 
-    candidates = (
-        FilteredElementCollector(doc, view.Id)
-        .OfCategory(BuiltInCategory.OST_LightingFixtures)
-        .WherePasses(bb_filter)
-        .WhereElementIsNotElementType()
-        .ToElements()
-    )
-
-    for l in candidates:
-        l_bb = light_bboxes.get(l.Id.ToString())
-        if not l_bb:
+        if not boxes_a or not boxes_b:
+            out.print_md("No elements found in one or both categories.")
             continue
 
-        if bbox_intersects(at_bb, l_bb):
-            key = (at.Id.ToString(), l.Id.ToString())
-            if key in seen:
-                continue
-            seen.add(key)
-
+        results = []
+        for key_a, key_b in find_overlaps(boxes_a, boxes_b, TOL_FT, TOL_Z_FT):
+            elem_a = elements_by_key[key_a]
+            elem_b = elements_by_key[key_b]
             results.append([
-                out.linkify(at.Id),
-                elem_name(at),
-                out.linkify(l.Id),
-                elem_name(l)
+                out.linkify(elem_a.Id),
+                elem_name(elem_a),
+                out.linkify(elem_b.Id),
+                elem_name(elem_b)
             ])
 
+        total_overlaps += len(results)
+        out.print_md("Overlaps Found: **{}**".format(len(results)))
+
+        if results:
+            out.print_table(
+                table_data=results,
+                columns=["{} Id".format(name_a), name_a, "{} Id".format(name_b), name_b],
+                title="Overlapping (Bounding Box) Pairs"
+            )
+
 
 # ------------------------------------------------------
 # Output
 # ------------------------------------------------------
 
-out.print_md("\n### Overlaps Found: **{}**".format(len(results)))
-
-if results:
-    out.print_table(
-        table_data=results,
-        columns=["Air Terminal Id", "Air Terminal", "Light Fixture Id", "Light Fixture"],
-        title="Overlapping (Bounding Box) Pairs"
-    )
-else:
-    out.print_md("No overlaps detected in active view.")
+out.print_md("\n### Total Overlaps Found: **{}**".format(total_overlaps))
 
 
 
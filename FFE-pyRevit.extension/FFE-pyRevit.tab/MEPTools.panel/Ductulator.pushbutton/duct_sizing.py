@@ -0,0 +1,455 @@
+# -*- coding: utf-8 -*-
+"""
+Batch duct sizing engine for the Ductulator.
+
+Purpose:
+-> Propose equal-friction / max-velocity sizes for every duct in a system
+   in one pass, using the same Darcy-Weisbach + Colebrook maths as
+   support/app.js so Revit and the web app always agree.
+
+Key behaviors:
+-> Candidate size tables (area, hydraulic diameter) are built once per run.
+-> Pressure drop and velocity both fall as a duct grows at constant flow, so
+   the smallest passing size is found with a binary search per size band.
+-> Ducts that share shape / flow / held height are solved once and reused.
+
+Design decisions:
+-> Pure Python with no Revit imports so the engine can be checked against
+   app.js fixtures outside Revit (python duct_sizing.py).
+-> Shape is never changed; the Revit apply step only supports same-shape
+   resizes, matching the single-duct MVP.
+"""
+
+# ____________________________________________________________________ IMPORTS (SYSTEM)
+import json
+import math
+import os
+
+
+# ____________________________________________________________________ CONSTANTS (MIRROR app.js)
+FT_TO_M = 0.3048
+IN_TO_M = 0.0254
+FPM_TO_MPS = FT_TO_M / 60
+IN_WC_TO_PA = 249.08891
+AIR_DENSITY = 1.204
+AIR_VISCOSITY = 1.81e-5
+GALVANIZED_STEEL_ROUGHNESS_M = 0.00015
+RE_LAMINAR_MAX = 2300
+RE_TURBULENT_FLOOR = 4000
+LENGTH_100_FT_M = 100 * FT_TO_M
+
+DUCT_SIZE_MIN_IN = 4
+DUCT_SIZE_STEP_IN = 2
+
+SIZE_TOLERANCE_IN = 0.01
+
+PATH_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "support", "sizing_fixtures.json")
+
+
+# ____________________________________________________________________ GEOMETRY
+def round_area_sq_ft(diameter_in):
+    diameter_ft = diameter_in / 12.0
+    return (math.pi * diameter_ft * diameter_ft) / 4.0
+
+
+def rectangular_area_sq_ft(width_in, height_in):
+    return (width_in * height_in) / 144.0
+
+
+def hydraulic_diameter_rectangular_in(width_in, height_in):
+    return (2.0 * width_in * height_in) / (width_in + height_in)
+
+
+def rectangular_aspect_ratio(width_in, height_in):
+    return max(width_in, height_in) / float(min(width_in, height_in))
+
+
+def round_geometry(diameter_in):
+    return {
+        "areaSqFt": round_area_sq_ft(diameter_in),
+        "hydraulicDiameterIn": float(diameter_in),
+        "hydraulicDiameterM": diameter_in * IN_TO_M,
+    }
+
+
+def rectangular_geometry(width_in, height_in):
+    hydraulic_diameter_in = hydraulic_diameter_rectangular_in(width_in, height_in)
+    return {
+        "areaSqFt": rectangular_area_sq_ft(width_in, height_in),
+        "hydraulicDiameterIn": hydraulic_diameter_in,
+        "hydraulicDiameterM": hydraulic_diameter_in * IN_TO_M,
+    }
+
+
+# ____________________________________________________________________ FLOW MATHS
+def reynolds_number(velocity_mps, hydraulic_diameter_m):
+    return (AIR_DENSITY * velocity_mps * hydraulic_diameter_m) / AIR_VISCOSITY
+
+
+def flow_regime(reynolds):
+    if reynolds < RE_LAMINAR_MAX:
+        return "laminar"
+    if reynolds < RE_TURBULENT_FLOOR:
+        return "transitional"
+    return "turbulent"
+
+
+def colebrook_friction_factor(reynolds, hydraulic_diameter_m):
+    """Iterate Colebrook-White from a Haaland seed, exactly as app.js does."""
+    relative_roughness = GALVANIZED_STEEL_ROUGHNESS_M / hydraulic_diameter_m
+    friction = 1.0 / math.pow(
+        -1.8 * math.log10(math.pow(relative_roughness / 3.7, 1.11) + 6.9 / reynolds),
+        2
+    )
+
+    for _ in range(25):
+        inverse_root = -2.0 * math.log10(
+            (relative_roughness / 3.7) + (2.51 / (reynolds * math.sqrt(friction)))
+        )
+        next_friction = 1.0 / (inverse_root * inverse_root)
+
+        if abs(next_friction - friction) / max(next_friction, 1e-9) < 1e-8:
+            return next_friction
+
+        friction = next_friction
+
+    return friction
+
+
+def friction_factor(reynolds, hydraulic_diameter_m):
+    if reynolds < RE_LAMINAR_MAX:
+        return 64.0 / reynolds
+    return colebrook_friction_factor(reynolds, hydraulic_diameter_m)
+
+
+def pressure_drop_from_velocity_mps(velocity_mps, hydraulic_diameter_m):
+    reynolds = reynolds_number(velocity_mps, hydraulic_diameter_m)
+    friction = friction_factor(reynolds, hydraulic_diameter_m)
+    delta_p = (
+        friction *
+        (LENGTH_100_FT_M / hydraulic_diameter_m) *
+        ((AIR_DENSITY * velocity_mps * velocity_mps) / 2.0)
+    )
+    return {
+        "pressureDropPa": delta_p,
+        "pressureDropInWc": delta_p / IN_WC_TO_PA,
+        "reynolds": reynolds,
+        "friction": friction,
+        "regime": flow_regime(reynolds),
+    }
+
+
+def compute_from_velocity(velocity_fpm, geometry):
+    pressure = pressure_drop_from_velocity_mps(velocity_fpm * FPM_TO_MPS, geometry["hydraulicDiameterM"])
+    return {
+        "pressureDrop": pressure["pressureDropInWc"],
+        "velocity": velocity_fpm,
+        "flowRate": velocity_fpm * geometry["areaSqFt"],
+        "reynolds": pressure["reynolds"],
+        "frictionFactor": pressure["friction"],
+        "flowRegime": pressure["regime"],
+        "hydraulicDiameterIn": geometry["hydraulicDiameterIn"],
+        "areaSqFt": geometry["areaSqFt"],
+    }
+
+
+def compute_from_flow_rate(flow_rate_cfm, geometry):
+    return compute_from_velocity(flow_rate_cfm / geometry["areaSqFt"], geometry)
+
+
+# ____________________________________________________________________ SIZE SERIES
+def ceil_duct_size(value_in):
+    return max(DUCT_SIZE_MIN_IN, int(math.ceil(value_in / float(DUCT_SIZE_STEP_IN))) * DUCT_SIZE_STEP_IN)
+
+
+def rectangular_grid_step(size_in):
+    band_index = max(0, int(math.floor(size_in / 100.0)))
+    return DUCT_SIZE_STEP_IN * int(math.pow(2, band_index))
+
+
+def generate_round_sizes(max_size_in):
+    return list(range(DUCT_SIZE_MIN_IN, ceil_duct_size(max_size_in) + 1, DUCT_SIZE_STEP_IN))
+
+
+def generate_rectangular_grid_sizes(max_size_in):
+    """Same banded series as app.js: 2 in steps below 100 in, doubling per 100 in band."""
+    max_dimension_in = ceil_duct_size(max_size_in)
+    sizes = [DUCT_SIZE_MIN_IN]
+
+    while sizes[-1] < max_dimension_in:
+        current_size = sizes[-1]
+        next_size = current_size + rectangular_grid_step(current_size)
+        next_boundary = (int(math.floor(current_size / 100.0)) + 1) * 100
+        if current_size < next_boundary < next_size:
+            next_size = next_boundary
+        sizes.append(min(next_size, max_dimension_in))
+
+    return sizes
+
+
+# ____________________________________________________________________ SIZING RULES
+class SizingRules(object):
+    """Equal-friction / velocity limits applied to every duct in a batch.
+
+    max_friction      -> in. w.c. per 100 ft (None = no friction limit)
+    max_velocity      -> fpm (None = no velocity limit)
+    max_aspect_ratio  -> rectangular only, >= 1.0
+    max_size_in       -> largest diameter / side considered
+    hold_height       -> rectangular ducts keep their current height when it can
+                         carry the flow, otherwise the smallest-area size wins
+    """
+
+    def __init__(self, max_friction=0.08, max_velocity=None, max_aspect_ratio=4.0, max_size_in=120, hold_height=True):
+        self.max_friction = max_friction
+        self.max_velocity = max_velocity
+        self.max_aspect_ratio = max_aspect_ratio
+        self.max_size_in = max_size_in
+        self.hold_height = hold_height
+
+    def validate(self):
+        if self.max_friction is None and self.max_velocity is None:
+            raise ValueError("Provide a friction rate or a maximum velocity to size against.")
+        if self.max_friction is not None and self.max_friction <= 0:
+            raise ValueError("Friction rate must be greater than zero.")
+        if self.max_velocity is not None and self.max_velocity <= 0:
+            raise ValueError("Maximum velocity must be greater than zero.")
+        if self.max_aspect_ratio < 1:
+            raise ValueError("Maximum aspect ratio must be 1.00 or greater.")
+        if self.max_size_in <= 0:
+            raise ValueError("Maximum duct size must be greater than zero.")
+
+    def passes(self, result):
+        if self.max_velocity is not None and result["velocity"] > self.max_velocity + 1e-9:
+            return False
+        if self.max_friction is not None and result["pressureDrop"] > self.max_friction + 1e-12:
+            return False
+        return True
+
+
+class CandidateTable(object):
+    """Precomputed size geometry for one batch, shared by every duct."""
+
+    def __init__(self, rules):
+        self.round_sizes = [(size, round_geometry(size)) for size in generate_round_sizes(rules.max_size_in)]
+
+        rect_sizes = generate_rectangular_grid_sizes(rules.max_size_in)
+        self.rect_sizes = rect_sizes
+        self.rect_rows = {}
+        for height_in in rect_sizes:
+            min_width_in = height_in / float(rules.max_aspect_ratio)
+            max_width_in = min(rect_sizes[-1], height_in * rules.max_aspect_ratio)
+            row = []
+            for width_in in rect_sizes:
+                if width_in < min_width_in:
+                    continue
+                if width_in > max_width_in:
+                    break
+                row.append((width_in, rectangular_geometry(width_in, height_in)))
+            self.rect_rows[height_in] = row
+
+
+# ____________________________________________________________________ SEARCH
+def first_passing(options, flow_cfm, rules):
+    """Binary search the smallest passing option in an ascending size row.
+
+    Velocity and friction are both monotonically decreasing with size at a
+    fixed flow, so the passing options form a suffix of the row.
+    """
+    low = 0
+    high = len(options)
+    found = None
+    while low < high:
+        mid = (low + high) // 2
+        result = compute_from_flow_rate(flow_cfm, options[mid][1])
+        if rules.passes(result):
+            found = (options[mid][0], result)
+            high = mid
+        else:
+            low = mid + 1
+    return found
+
+
+def nearest_grid_size(sizes, value_in):
+    best = None
+    for size in sizes:
+        if best is None or abs(size - value_in) < abs(best - value_in):
+            best = size
+    return best
+
+
+def solve_round(flow_cfm, table, rules):
+    found = first_passing(table.round_sizes, flow_cfm, rules)
+    if found is None:
+        return None
+    diameter_in, result = found
+    return {"shape": "round", "diameterIn": diameter_in}, result
+
+
+def solve_rectangular(flow_cfm, held_height_in, table, rules):
+    if held_height_in is not None:
+        found = first_passing(table.rect_rows.get(held_height_in, []), flow_cfm, rules)
+        if found is not None:
+            width_in, result = found
+            return {"shape": "rectangular", "widthIn": width_in, "heightIn": held_height_in}, result
+
+    best = None
+    for height_in in table.rect_sizes:
+        found = first_passing(table.rect_rows[height_in], flow_cfm, rules)
+        if found is None:
+            continue
+        width_in, result = found
+        rank = (width_in * height_in, rectangular_aspect_ratio(width_in, height_in), height_in)
+        if best is None or rank < best[0]:
+            best = (rank, {"shape": "rectangular", "widthIn": width_in, "heightIn": height_in}, result)
+
+    if best is None:
+        return None
+    return best[1], best[2]
+
+
+def is_same_size(duct, size):
+    if size["shape"] == "round":
+        return abs(float(duct.get("diameterIn") or 0) - size["diameterIn"]) <= SIZE_TOLERANCE_IN
+    return (
+        abs(float(duct.get("widthIn") or 0) - size["widthIn"]) <= SIZE_TOLERANCE_IN and
+        abs(float(duct.get("heightIn") or 0) - size["heightIn"]) <= SIZE_TOLERANCE_IN
+    )
+
+
+# ____________________________________________________________________ BATCH ENGINE
+def propose_sizes(ducts, rules):
+    """Propose a size for every duct dict (as produced by read_duct_data).
+
+    Returns one proposal dict per input duct, in input order, with a status of
+    "resize", "unchanged" or "skipped" plus the solved velocity / friction.
+    """
+    rules.validate()
+    table = CandidateTable(rules)
+    solved = {}
+    proposals = []
+
+    for duct in ducts:
+        proposal = {
+            "elementId": duct.get("elementId"),
+            "shape": duct.get("shape"),
+            "flowCfm": duct.get("flowCfm"),
+            "status": "skipped",
+            "reason": "",
+            "size": None,
+            "velocity": None,
+            "pressureDrop": None,
+        }
+        proposals.append(proposal)
+
+        try:
+            flow_cfm = float(duct.get("flowCfm"))
+        except (TypeError, ValueError):
+            proposal["reason"] = "No calculated flow."
+            continue
+        if flow_cfm <= 0:
+            proposal["reason"] = "No calculated flow."
+            continue
+
+        shape = duct.get("shape")
+        if shape == "round":
+            key = ("round", round(flow_cfm, 3))
+        elif shape == "rectangular":
+            held_height_in = None
+            if rules.hold_height and duct.get("heightIn"):
+                held_height_in = nearest_grid_size(table.rect_sizes, float(duct.get("heightIn")))
+            key = ("rectangular", round(flow_cfm, 3), held_height_in)
+        else:
+            proposal["reason"] = "Unsupported duct shape."
+            continue
+
+        if key not in solved:
+            if shape == "round":
+                solved[key] = solve_round(flow_cfm, table, rules)
+            else:
+                solved[key] = solve_rectangular(flow_cfm, key[2], table, rules)
+
+        answer = solved[key]
+        if answer is None:
+            proposal["reason"] = "No size up to {0:g} in meets the limits.".format(rules.max_size_in)
+            continue
+
+        size, result = answer
+        proposal["size"] = dict(size)
+        proposal["velocity"] = result["velocity"]
+        proposal["pressureDrop"] = result["pressureDrop"]
+        proposal["status"] = "unchanged" if is_same_size(duct, size) else "resize"
+
+    return proposals
+
+
+def summarize_proposals(proposals):
+    counts = {"resize": 0, "unchanged": 0, "skipped": 0}
+    for proposal in proposals:
+        counts[proposal["status"]] = counts.get(proposal["status"], 0) + 1
+    return counts
+
+
+# ____________________________________________________________________ FIXTURE CHECK (app.js PARITY)
+def relative_error(expected, actual):
+    scale = max(abs(expected), abs(actual), 1e-12)
+    return abs(expected - actual) / scale
+
+
+def verify_fixtures(fixtures, tolerance=1e-9):
+    """Compare the engine with app.js outputs captured in sizing_fixtures.json.
+
+    Returns a list of mismatch descriptions; an empty list means parity.
+    """
+    mismatches = []
+
+    for case in fixtures.get("flowCases", []):
+        if case["shape"] == "round":
+            geometry = round_geometry(case["diameterIn"])
+        else:
+            geometry = rectangular_geometry(case["widthIn"], case["heightIn"])
+        result = compute_from_flow_rate(case["flowCfm"], geometry)
+        for field in ("velocity", "pressureDrop", "reynolds", "frictionFactor", "hydraulicDiameterIn", "areaSqFt"):
+            if relative_error(case["expected"][field], result[field]) > tolerance:
+                mismatches.append("{0} {1}: expected {2!r}, got {3!r}".format(
+                    case["label"], field, case["expected"][field], result[field]))
+        if case["expected"]["flowRegime"] != result["flowRegime"]:
+            mismatches.append("{0} flowRegime: expected {1}, got {2}".format(
+                case["label"], case["expected"]["flowRegime"], result["flowRegime"]))
+
+    for case in fixtures.get("sizeSeries", []):
+        sizes = generate_rectangular_grid_sizes(case["maxSizeIn"])
+        if sizes != case["expected"]:
+            mismatches.append("rectangular sizes up to {0}: expected {1}, got {2}".format(
+                case["maxSizeIn"], case["expected"], sizes))
+
+    for case in fixtures.get("roundGrids", []):
+        rules = SizingRules(max_friction=case["maxFriction"], max_size_in=case["maxSizeIn"])
+        proposal = propose_sizes([{"shape": "round", "flowCfm": case["flowCfm"]}], rules)[0]
+        proposed = proposal["size"]["diameterIn"] if proposal["size"] else None
+        if proposed != case["expectedDiameterIn"]:
+            mismatches.append("round sizing {0} cfm @ {1}: expected {2}, got {3}".format(
+                case["flowCfm"], case["maxFriction"], case["expectedDiameterIn"], proposed))
+
+    for case in fixtures.get("rectGrids", []):
+        rules = SizingRules(max_friction=case["maxFriction"], max_size_in=case["maxSizeIn"],
+                            max_aspect_ratio=case["maxAspectRatio"], hold_height=case["holdHeight"])
+        proposal = propose_sizes([{"shape": "rectangular", "flowCfm": case["flowCfm"], "heightIn": case["heightIn"]}], rules)[0]
+        proposed = (proposal["size"]["widthIn"], proposal["size"]["heightIn"]) if proposal["size"] else (None, None)
+        expected = (case["expectedWidthIn"], case["expectedHeightIn"])
+        if proposed != expected:
+            mismatches.append("rectangular sizing {0} cfm @ {1} (held height {2}): expected {3}, got {4}".format(
+                case["flowCfm"], case["maxFriction"], case["heightIn"], expected, proposed))
+
+    return mismatches
+
+
+def load_fixtures(path=PATH_FIXTURES):
+    with open(path, "r") as fixture_file:
+        return json.load(fixture_file)
+
+
+if __name__ == "__main__":
+    problems = verify_fixtures(load_fixtures())
+    for problem in problems:
+        print(problem)
+    print("{0} mismatches against app.js fixtures.".format(len(problems)))
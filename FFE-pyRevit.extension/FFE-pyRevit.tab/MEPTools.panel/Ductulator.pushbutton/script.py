@@ -11,12 +11,15 @@ Description:
 ______________________________________________________________
 How-to:
 -> Pick one rigid duct, generate/select a size, then Apply to Revit.
+-> Size System resizes every rigid duct in the loaded duct's system
+   against the grid's friction / velocity bounds in one transaction.
 ______________________________________________________________
 Last update:
 - [07.08.2025] - v0.1 BETA RELEASE
 - [05.07.2026] - v0.2 WEBVIEW2 REVIT MVP
 - [05.11.2026] - v0.3 ENABLED OPENING WITHOUT SELECTION, BETTER ERROR HANDLING, LOGGING, AND CODE REFACTORING
 - [05.11.2026] - v1.0 FINALIZED MVP RELEASE
+- [18.10.2026] - v1.1 WHOLE-SYSTEM BATCH SIZING (duct_sizing.py), PROPOSALS SHOWN AND CONFIRMED BEFORE APPLY
 ______________________________________________________________
 Author: Kyle Guggenheim"""
 
@@ -42,6 +45,7 @@ from Autodesk.Revit.DB import (
     BuiltInCategory,
     BuiltInParameter,
     ElementId,
+    SubTransaction,
     Transaction,
     UnitTypeId,
     UnitUtils,
@@ -55,6 +59,10 @@ from Autodesk.Revit.UI.Selection import ISelectionFilter, ObjectType
 from pyrevit import forms, script
 
 
+# ____________________________________________________________________ IMPORTS (CUSTOM)
+from duct_sizing import SizingRules, propose_sizes, summarize_proposals
+
+
 # ____________________________________________________________________ VARIABLES
 revit_app   = __revit__.Application
 uidoc       = __revit__.ActiveUIDocument
@@ -486,6 +494,231 @@ def apply_duct_size(element, payload):
     return "Updated duct {0} to {1:g} x {2:g} in.".format(current_data["elementId"], width_in, height_in)
 
 
+def collect_system_ducts(element):
+    """Return every rigid duct in the element's duct system (or just the element)."""
+    try:
+        mep_system = element.MEPSystem
+    except:
+        mep_system = None
+
+    if mep_system is None:
+        return [element]
+
+    ducts = []
+    try:
+        for member in mep_system.DuctNetwork:
+            if is_duct_curve_element(member):
+                ducts.append(member)
+    except:
+        return [element]
+
+    return ducts or [element]
+
+
+def optional_positive(payload, key):
+    try:
+        value = float(payload.get(key))
+    except:
+        return None
+    return value if value > 0 else None
+
+
+def read_sizing_rules(payload):
+    if payload is None:
+        raise Exception("No sizing limits were provided by the web app.")
+
+    max_friction = optional_positive(payload, "maxFrictionInWc")
+    max_velocity = optional_positive(payload, "maxVelocityFpm")
+    rules = SizingRules(
+        max_friction=max_friction,
+        max_velocity=max_velocity,
+        max_aspect_ratio=optional_positive(payload, "maxAspectRatio") or 4.0,
+        max_size_in=optional_positive(payload, "maxDuctSizeIn") or 120,
+    )
+    try:
+        rules.validate()
+    except ValueError as exc:
+        raise Exception(safe_str(exc))
+    return rules
+
+
+def resolve_size_parameters(element, size):
+    """Return [(parameter, internal value)] for a proposed size.
+
+    Every parameter is checked before anything is written, so a duct with a
+    read-only height is skipped instead of keeping a new width.
+    """
+    if element is None:
+        raise Exception("The duct is no longer in the model.")
+
+    if size["shape"] == "round":
+        return [
+            (ensure_writable_parameter(element, BuiltInParameter.RBS_CURVE_DIAMETER_PARAM, "diameter"),
+             inches_to_internal_feet(size["diameterIn"])),
+        ]
+
+    return [
+        (ensure_writable_parameter(element, BuiltInParameter.RBS_CURVE_WIDTH_PARAM, "width"),
+         inches_to_internal_feet(size["widthIn"])),
+        (ensure_writable_parameter(element, BuiltInParameter.RBS_CURVE_HEIGHT_PARAM, "height"),
+         inches_to_internal_feet(size["heightIn"])),
+    ]
+
+
+def apply_size_proposals(elements_by_id, proposals):
+    """Write every "resize" proposal in one transaction with a single regenerate.
+
+    Each duct is written inside its own SubTransaction, so a failed height
+    after a successful width rolls that duct back to its original size.
+    Failures are recorded and skipped so one locked or read-only duct does
+    not abort the whole system.
+    """
+    applied = []
+    failed = []
+
+    pending = [proposal for proposal in proposals if proposal["status"] == "resize"]
+    if not pending:
+        return applied, failed
+
+    def skip(proposal, exc):
+        proposal["status"] = "skipped"
+        proposal["reason"] = safe_str(exc) or "Could not write size."
+        failed.append(proposal)
+
+    transaction = Transaction(doc, "Resize Ductulator System")
+    try:
+        transaction.Start()
+        for proposal in pending:
+            try:
+                writes = resolve_size_parameters(elements_by_id.get(proposal["elementId"]), proposal["size"])
+            except Exception as exc:
+                skip(proposal, exc)
+                continue
+
+            sub_transaction = SubTransaction(doc)
+            sub_transaction.Start()
+            try:
+                for param, value in writes:
+                    if not param.Set(value):
+                        raise Exception("Revit rejected the new size.")
+                sub_transaction.Commit()
+                applied.append(proposal)
+            except Exception as exc:
+                try:
+                    sub_transaction.RollBack()
+                except:
+                    pass
+                skip(proposal, exc)
+        doc.Regenerate()
+        transaction.Commit()
+    except:
+        try:
+            transaction.RollBack()
+        except:
+            pass
+        raise
+
+    return applied, failed
+
+
+def describe_size(size):
+    if not size:
+        return "-"
+    if size["shape"] == "round":
+        return "{0:g} round".format(size["diameterIn"])
+    return "{0:g} x {1:g}".format(size["widthIn"], size["heightIn"])
+
+
+def report_system_sizing(system_label, elements_by_id, ducts_by_id, proposals):
+    rows = []
+    for proposal in proposals:
+        if proposal["status"] == "unchanged":
+            continue
+        current = ducts_by_id.get(proposal["elementId"], {})
+        current_size = {"shape": current.get("shape"), "diameterIn": current.get("diameterIn"),
+                        "widthIn": current.get("widthIn"), "heightIn": current.get("heightIn")}
+        rows.append([
+            OUTPUT.linkify(elements_by_id[proposal["elementId"]].Id),
+            describe_size(current_size) if current.get("shape") else "-",
+            describe_size(proposal["size"]),
+            "{0:.0f}".format(proposal["velocity"]) if proposal["velocity"] is not None else "-",
+            "{0:.3f}".format(proposal["pressureDrop"]) if proposal["pressureDrop"] is not None else "-",
+            proposal["status"],
+            proposal["reason"],
+        ])
+
+    if not rows:
+        return
+
+    OUTPUT.print_md("### Ductulator System Sizing: {0}".format(system_label or "Unnamed system"))
+    OUTPUT.print_table(
+        table_data=rows,
+        columns=["Duct", "Current", "Proposed", "Velocity (fpm)", "Friction (in/100ft)", "Status", "Note"],
+    )
+
+
+def confirm_size_proposals(system_label, counts):
+    """Ask before writing; the proposal table is already in the output window."""
+    return forms.alert(
+        "Apply {0} proposed duct sizes to {1}?".format(counts.get("resize", 0), system_label or "the selected duct"),
+        sub_msg="{0} unchanged, {1} skipped. Review the proposals in the output window.".format(
+            counts.get("unchanged", 0), counts.get("skipped", 0)),
+        title="Ductulator System Sizing",
+        yes=True,
+        no=True,
+    )
+
+
+def size_duct_system(element, payload):
+    """Propose a size for every duct in the system, show them, and write only after confirmation."""
+    rules = read_sizing_rules(payload)
+    system_name, _ = get_system_context(element)
+
+    elements_by_id = {}
+    ducts = []
+    unreadable = 0
+    for duct_element in collect_system_ducts(element):
+        try:
+            duct_data = read_duct_data(duct_element)
+        except:
+            unreadable += 1
+            continue
+        elements_by_id[duct_data["elementId"]] = duct_element
+        ducts.append(duct_data)
+
+    proposals = propose_sizes(ducts, rules)
+    counts = summarize_proposals(proposals)
+    counts["skipped"] = counts.get("skipped", 0) + unreadable
+    ducts_by_id = dict((duct["elementId"], duct) for duct in ducts)
+
+    report_system_sizing(system_name, elements_by_id, ducts_by_id, proposals)
+    OUTPUT.print_md("**Proposed:** {0} resize, {1} unchanged, {2} skipped.".format(
+        counts.get("resize", 0), counts.get("unchanged", 0), counts["skipped"]))
+
+    summary = "{0} ducts in {1}: {2} to resize, {3} unchanged, {4} skipped".format(
+        len(ducts) + unreadable,
+        system_name or "the selected duct",
+        counts.get("resize", 0),
+        counts.get("unchanged", 0),
+        counts["skipped"],
+    )
+    if not counts.get("resize"):
+        return "Sized {0}. Nothing to apply.".format(summary)
+    if not confirm_size_proposals(system_name, counts):
+        return "Proposed {0}. No sizes were applied.".format(summary)
+
+    applied, failed = apply_size_proposals(elements_by_id, proposals)
+    if failed:
+        report_system_sizing(system_name, elements_by_id, ducts_by_id, failed)
+    OUTPUT.print_md("**Applied:** {0} resized, {1} could not be written.".format(len(applied), len(failed)))
+
+    return "Sized {0}. Applied {1}{2}.".format(
+        summary,
+        len(applied),
+        " ({0} could not be written)".format(len(failed)) if failed else "",
+    )
+
+
 # ____________________________________________________________________ EXTERNAL EVENT
 class DuctResizeHandler(IExternalEventHandler):
     def __init__(self, duct):
@@ -505,6 +738,10 @@ class DuctResizeHandler(IExternalEventHandler):
         self.pending_action = "resize"
         self.pending_payload = payload
 
+    def queue_size_system(self, payload):
+        self.pending_action = "size_system"
+        self.pending_payload = payload
+
     def clear_pending(self):
         self.pending_action = None
         self.pending_payload = None
@@ -567,6 +804,28 @@ class DuctResizeHandler(IExternalEventHandler):
                 except:
                     pass
 
+        elif action == "size_system":
+            try:
+                if self.duct is None:
+                    raise Exception("No Revit duct is loaded. Click Select Duct first.")
+
+                message = size_duct_system(self.duct, payload)
+                duct_data = read_duct_data(self.duct)
+                result = {
+                    "status": "ready",
+                    "message": message,
+                    "duct": duct_data,
+                }
+            except Exception as exc:
+                result = {
+                    "status": "error",
+                    "message": safe_str(exc) or "Revit could not size the duct system.",
+                }
+                try:
+                    LOGGER.debug(traceback.format_exc())
+                except:
+                    pass
+
         try:
             if self.window is not None and result.get("duct"):
                 self.window.set_duct_data(result.get("duct"))
@@ -752,6 +1011,20 @@ class DuctulatorWindow(Window):
                 })
             return
 
+        if message_type == "sizeSystem":
+            self.resize_handler.queue_size_system(message.get("payload"))
+            self.send_status("warning", "Sizing every duct in the system...")
+
+            try:
+                self.resize_event.Raise()
+            except Exception as exc:
+                self.resize_handler.clear_pending()
+                self.send_resize_result({
+                    "status": "error",
+                    "message": "Could not raise the Revit sizing event: {0}".format(exc),
+                })
+            return
+
         if message_type != "applyDuctSize":
             return
 
@@ -151,6 +151,7 @@
     var selectionSummary = document.querySelector("#revit-selection-summary");
     var applyButton = document.querySelector("#revit-apply-button");
     var selectButton = document.querySelector("#revit-select-button");
+    var sizeSystemButton = document.querySelector("#revit-size-system-button");
     var selectedSize = revitBridge.selectedSize;
     var duct = revitBridge.duct;
     var hasSameShapeSelection = Boolean(
@@ -170,6 +171,10 @@
     if (selectButton) {
       selectButton.disabled = revitBridge.selectionPending;
     }
+
+    if (sizeSystemButton) {
+      sizeSystemButton.disabled = !duct || revitBridge.selectionPending;
+    }
   }
 
   function clearRevitSelection() {
@@ -286,6 +291,51 @@
     });
   }
 
+  function readSystemSizingLimits() {
+    var form = typeof document !== "undefined"
+      ? document.querySelector("#grid-form")
+      : null;
+    if (!form) {
+      return { error: "The solution grid form is not available." };
+    }
+
+    var metricInput = form.querySelector('input[name="gridMetric"]:checked');
+    var maxValue = parseOptionalPositive(form.querySelector("#gridMaxValue").value);
+    var maxDuctSize = parseOptionalPositive(form.querySelector("#gridMaxDuctSize").value);
+    var maxAspectRatio = parseOptionalPositive(form.querySelector("#gridMaxAspectRatio").value);
+
+    if (!maxValue.provided || !maxValue.valid) {
+      return { error: "Enter a valid maximum bound to size the system against." };
+    }
+
+    var isVelocity = metricInput && metricInput.value === "velocity";
+    return {
+      maxFrictionInWc: isVelocity ? null : maxValue.value,
+      maxVelocityFpm: isVelocity ? maxValue.value : null,
+      maxDuctSizeIn: maxDuctSize.valid ? maxDuctSize.value : null,
+      maxAspectRatio: maxAspectRatio.valid ? maxAspectRatio.value : null
+    };
+  }
+
+  function requestRevitSystemSizing() {
+    if (!revitBridge.duct) {
+      setRevitStatus("error", "No Revit duct is loaded.");
+      return;
+    }
+
+    var limits = readSystemSizingLimits();
+    if (limits.error) {
+      setRevitStatus("error", limits.error);
+      return;
+    }
+
+    setRevitStatus("warning", "Sending system sizing limits to Revit...");
+    postRevitMessage({
+      type: "sizeSystem",
+      payload: limits
+    });
+  }
+
   function requestRevitDuctSelection() {
     showRevitPanel();
     revitBridge.available = true;
@@ -1583,6 +1633,11 @@
       revitSelectButton.addEventListener("click", requestRevitDuctSelection);
     }
 
+    var revitSizeSystemButton = document.querySelector("#revit-size-system-button");
+    if (revitSizeSystemButton) {
+      revitSizeSystemButton.addEventListener("click", requestRevitSystemSizing);
+    }
+
     updateLabels();
     updateRevitApplyUi();
   }
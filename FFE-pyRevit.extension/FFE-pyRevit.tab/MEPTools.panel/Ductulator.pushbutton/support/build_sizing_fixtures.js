@@ -0,0 +1,136 @@
+// Regenerates sizing_fixtures.json from app.js so duct_sizing.py can be
+// checked for parity outside Revit:  node support/build_sizing_fixtures.js
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const calculator = require("./app.js");
+
+const IN_TO_M = 0.0254;
+
+function roundGeometry(diameterIn) {
+  const diameterFt = diameterIn / 12;
+  return {
+    areaSqFt: (Math.PI * diameterFt * diameterFt) / 4,
+    hydraulicDiameterIn: diameterIn,
+    hydraulicDiameterM: diameterIn * IN_TO_M
+  };
+}
+
+function rectangularGeometry(widthIn, heightIn) {
+  const hydraulicDiameterIn = calculator.hydraulicDiameterRectangularIn(widthIn, heightIn);
+  return {
+    areaSqFt: (widthIn * heightIn) / 144,
+    hydraulicDiameterIn,
+    hydraulicDiameterM: hydraulicDiameterIn * IN_TO_M
+  };
+}
+
+function pickResult(result) {
+  return {
+    velocity: result.velocity,
+    pressureDrop: result.pressureDrop,
+    reynolds: result.reynolds,
+    frictionFactor: result.frictionFactor,
+    flowRegime: result.flowRegime,
+    hydraulicDiameterIn: result.hydraulicDiameterIn,
+    areaSqFt: result.areaSqFt
+  };
+}
+
+const flows = [5, 40, 150, 600, 2400, 9000, 32000];
+const flowCases = [];
+
+[4, 8, 14, 24, 48].forEach(function (diameterIn) {
+  flows.forEach(function (flowCfm) {
+    flowCases.push({
+      label: "round " + diameterIn + " @ " + flowCfm,
+      shape: "round",
+      diameterIn,
+      flowCfm,
+      expected: pickResult(calculator.computeFromFlowRate(flowCfm, roundGeometry(diameterIn)))
+    });
+  });
+});
+
+[[6, 4], [12, 8], [24, 12], [48, 16], [96, 24]].forEach(function (size) {
+  flows.forEach(function (flowCfm) {
+    flowCases.push({
+      label: "rect " + size[0] + "x" + size[1] + " @ " + flowCfm,
+      shape: "rectangular",
+      widthIn: size[0],
+      heightIn: size[1],
+      flowCfm,
+      expected: pickResult(calculator.computeFromFlowRate(flowCfm, rectangularGeometry(size[0], size[1])))
+    });
+  });
+});
+
+const sizeSeries = [10, 99, 100, 150, 260, 420].map(function (maxSizeIn) {
+  const grid = calculator.generateRectangularSolutionGrid(1, "velocity", 1000, maxSizeIn, 0, 1e12);
+  const sizes = grid.widths.slice();
+  return { maxSizeIn, expected: sizes };
+});
+
+const roundGrids = [];
+[0.05, 0.08, 0.1, 0.15].forEach(function (maxFriction) {
+  [50, 250, 1200, 4000, 15000].forEach(function (flowCfm) {
+    const grid = calculator.generateRoundSolutionGrid(flowCfm, "pressure_drop", 120, 0, maxFriction);
+    roundGrids.push({
+      flowCfm,
+      maxFriction,
+      maxSizeIn: 120,
+      expectedDiameterIn: grid.status === "ready" ? grid.rows[0].diameterIn : null
+    });
+  });
+});
+
+// Rectangular sizing: the smallest-area cell (ties -> squarer, then lower),
+// or with a held height the narrowest cell in that row when one passes.
+function aspectRatio(cell) {
+  return Math.max(cell.widthIn, cell.heightIn) / Math.min(cell.widthIn, cell.heightIn);
+}
+
+function smallestCell(cells) {
+  let best = null;
+  cells.forEach(function (cell) {
+    const rank = [cell.widthIn * cell.heightIn, aspectRatio(cell), cell.heightIn];
+    if (best === null || rank[0] < best.rank[0] ||
+        (rank[0] === best.rank[0] && (rank[1] < best.rank[1] || (rank[1] === best.rank[1] && rank[2] < best.rank[2])))) {
+      best = { rank, cell };
+    }
+  });
+  return best ? best.cell : null;
+}
+
+const rectGrids = [];
+[0.05, 0.1].forEach(function (maxFriction) {
+  [50, 600, 4000, 15000].forEach(function (flowCfm) {
+    const grid = calculator.generateRectangularSolutionGrid(flowCfm, "pressure_drop", 4, 120, 0, maxFriction);
+    const cells = grid.status === "ready" ? grid.cells : [];
+    [null, 4, 12, 24].forEach(function (heightIn) {
+      let cell = null;
+      if (heightIn !== null) {
+        const row = cells.filter(function (c) { return c.heightIn === heightIn; });
+        row.sort(function (a, b) { return a.widthIn - b.widthIn; });
+        cell = row.length ? row[0] : null;
+      }
+      cell = cell || smallestCell(cells);
+      rectGrids.push({
+        flowCfm,
+        maxFriction,
+        maxSizeIn: 120,
+        maxAspectRatio: 4,
+        holdHeight: heightIn !== null,
+        heightIn,
+        expectedWidthIn: cell ? cell.widthIn : null,
+        expectedHeightIn: cell ? cell.heightIn : null
+      });
+    });
+  });
+});
+
+fs.writeFileSync(
+  path.join(__dirname, "sizing_fixtures.json"),
+  JSON.stringify({ flowCases, sizeSeries, roundGrids, rectGrids }, null, 2) + "\n"
+);
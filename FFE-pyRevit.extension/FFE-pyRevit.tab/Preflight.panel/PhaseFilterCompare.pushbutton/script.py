@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 __title__     = "Phase Filter\nComparison"
-__version__   = 'Version = v1.1'
-__doc__       = """Version = v1.1
+__version__   = 'Version = v1.2'
+__doc__       = """Version = v1.2
 Date    = 10.31.2025
 ________________________________________________________________
 Tested Revit Versions: 2026, 2024
@@ -18,26 +18,22 @@ Last update:
  - [09.13.2025] - v0.1 Beta Release
  - [09.14.2025] - v1.0 First Release
  - [10.31.2025] - v1.1 Updated logging to include status of action
+ - [10.18.2026] - v1.2 Reads filters from the shared Preflight snapshot; each link document is read once
 ______________________________________________________________
 Author: Kyle Guggenheim"""
 
 from math import log
 import re
 import sys
-from collections import OrderedDict
 #____________________________________________________________________ IMPORTS (AUTODESK)
 import clr
 clr.AddReference("System")
 from Autodesk.Revit.DB import *
 from Autodesk.Revit.UI import TaskDialog
-from Autodesk.Revit.DB import FilteredElementCollector, RevitLinkInstance, PhaseFilter
 
-# Newer API enums (safe-import with fallback)
-try:
-    from Autodesk.Revit.DB import ElementOnPhaseStatus, PhaseStatusPresentation
-except Exception:
-    ElementOnPhaseStatus = None
-    PhaseStatusPresentation = None
+#____________________________________________________________________ IMPORTS (CUSTOM)
+from Preflight.compare import compare_phase_filters
+from Preflight.snapshot import clear_snapshots, get_snapshot, get_linked_documents
 
 #____________________________________________________________________ IMPORTS (PYREVIT)
 from pyrevit import revit, DB
@@ -81,114 +77,17 @@ def sanitize(v):
     return str(v)
 
 
-def _try_bool_show_prop(pf, label):
-    """Try classic bool properties: ShowNew/Existing/Demolished/Temporary."""
-    # Direct property
-    try:
-        val = getattr(pf, "Show" + label)
-        if isinstance(val, bool):
-            return val
-    except Exception:
-        pass
-    # Common getter variants
-    for name in ("get_Show" + label, "GetShow" + label, "Is" + label + "Shown"):
-        try:
-            m = getattr(pf, name)
-            if callable(m):
-                v = m()
-                if isinstance(v, bool):
-                    return v
-        except Exception:
-            pass
-    return None
-
-
-def _try_get_phase_status_presentation(pf, status_enum):
-    """Try PhaseFilter.GetPhaseStatusPresentation(ElementOnPhaseStatus)."""
-    if ElementOnPhaseStatus is None:
-        return None
-    try:
-        getter = getattr(pf, "GetPhaseStatusPresentation")
-    except Exception:
-        return None
-    if not callable(getter):
-        return None
-    try:
-        return getter(status_enum)
-    except Exception:
-        return None
-
-
-def _read_cell(pf, label, status_enum):
-    """Best-effort read for one column (New/Existing/Demolished/Temporary)."""
-    # Prefer the modern enum-based API when available
-    v = _try_get_phase_status_presentation(pf, status_enum)
-    if v is not None:
-        return v
-    # Fallback to legacy bools
-    b = _try_bool_show_prop(pf, label)
-    if isinstance(b, bool):
-        return b
-    return None
-
-
-def get_phase_filters_map(rvt_doc):
-    """Return dict: { filter_name: {New, Existing, Demolished, Temporary} }.
-       Values are PhaseStatusPresentation enums or bools (or None if unknown).
-    """
-    data = OrderedDict()
-    col = FilteredElementCollector(rvt_doc).OfClass(PhaseFilter)
-    for pf in col:
-        name = pf.Name
-        # Map labels to enum members (if available)
-        new_enum        = getattr(ElementOnPhaseStatus, "New", None) if ElementOnPhaseStatus else None
-        existing_enum   = getattr(ElementOnPhaseStatus, "Existing", None) if ElementOnPhaseStatus else None
-        demolished_enum = getattr(ElementOnPhaseStatus, "Demolished", None) if ElementOnPhaseStatus else None
-        temporary_enum  = getattr(ElementOnPhaseStatus, "Temporary", None) if ElementOnPhaseStatus else None
-
-        entry = {
-            "New":         _read_cell(pf, "New",         new_enum),
-            "Existing":    _read_cell(pf, "Existing",    existing_enum),
-            "Demolished":  _read_cell(pf, "Demolished",  demolished_enum),
-            "Temporary":   _read_cell(pf, "Temporary",   temporary_enum),
-        }
-        data[name] = entry
-    return data
-
-
-def compare_phase_filters(host_map, link_map):
-    """Return (missing_in_link, extra_in_link, diffs).
-       diffs: [(filter_name, column, host_val, link_val)]
-    """
-    host_names = set(host_map.keys())
-    link_names = set(link_map.keys())
-
-    missing_in_link = sorted(list(host_names - link_names), key=lambda s: s.lower())
-    extra_in_link   = sorted(list(link_names - host_names), key=lambda s: s.lower())
-
-    diffs = []
-    cols = ("New", "Existing", "Demolished", "Temporary")
-    for fname in sorted(host_names & link_names, key=lambda s: s.lower()):
-        for colname in cols:
-            hv = host_map[fname].get(colname, None)
-            lv = link_map[fname].get(colname, None)
-            # Only compare when both sides have a real value
-            if hv is None or lv is None:
-                continue
-            if str(hv) != str(lv):
-                diffs.append((fname, colname, hv, lv))
-    return missing_in_link, extra_in_link, diffs
-
-
-
 #____________________________________________________________________ MAIN
+# Snapshots live on the module between commands; start every run fresh
+clear_snapshots()
+
 # Host data
-host_title = doc.Title
-host_map = get_phase_filters_map(doc)
+host_snapshot = get_snapshot(doc)
+host_title = host_snapshot.title
+host_map = host_snapshot.phase_filters
 
-# Link data
-link_instances = list(FilteredElementCollector(doc).OfClass(RevitLinkInstance))
-loaded_links = [(li, li.GetLinkDocument()) for li in link_instances if li.GetLinkDocument()]
+# Link data (one entry per unique loaded link document)
+loaded_links = get_linked_documents(doc)
 
 if not loaded_links:
     TaskDialog.Show(__title__, "No loaded Revit links found in this model.")
@@ -209,12 +108,12 @@ host_rows = [
 output_window.print_table(table_data=host_rows, columns=host_columns, title="Host Phase Filters ({})".format(len(host_map)))
 
 ### Per-link
-for li, ldoc in loaded_links:
-    link_name = ldoc.Title
+for linked in loaded_links:
+    link_name = linked.title
     output_window.print_md("---")
     output_window.print_md("## Link: `{}`".format(link_name))
 
-    link_map = get_phase_filters_map(ldoc)
+    link_map = linked.snapshot.phase_filters
     output_window.print_md("**Link Phase Filters ({}):**".format(len(link_map)))
 
     # Compute diffs early so we can tag mismatched filters with ❌ in the link table
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+__title__     = "Preflight\nComparison"
+__version__   = 'Version = v1.0'
+__doc__       = """Version = v1.0
+Date    = 10.18.2026
+________________________________________________________________
+Tested Revit Versions: 
+______________________________________________________________
+Description:
+This tool runs every Preflight comparison in one pass: Phase Filters,
+Revisions (Per Project or Per Sheet), Project Information and Sheet
+Numbers in the host model against each loaded Revit link.
+Each document is read once and every check uses the same snapshot.
+______________________________________________________________
+How-to:
+ -> Click the button
+ -> Review the summary table, then the differences for each link
+ -> Run the single comparison tools for the full host / link tables
+______________________________________________________________
+Last update:
+ - [10.18.2026] - v1.0 RELEASE
+______________________________________________________________
+Author: Kyle Guggenheim"""
+
+#____________________________________________________________________ IMPORTS (SYSTEM)
+from collections import OrderedDict
+#____________________________________________________________________ IMPORTS (AUTODESK)
+import clr
+clr.AddReference("System")
+from Autodesk.Revit.DB import *
+
+#____________________________________________________________________ IMPORTS (CUSTOM)
+from Preflight.compare import (
+    compare_phase_filters,
+    compare_project_info,
+    compare_revisions,
+    compare_sheets,
+)
+from Preflight.snapshot import clear_snapshots, get_snapshot, get_linked_documents
+
+#____________________________________________________________________ IMPORTS (PYREVIT)
+from pyrevit.script import output
+from pyrevit import forms
+
+
+#____________________________________________________________________ VARIABLES
+app         = __revit__.Application
+uidoc       = __revit__.ActiveUIDocument
+doc         = __revit__.ActiveUIDocument.Document   #type: Document
+selection   = uidoc.Selection                       #type: Selection
+
+log_status = ""
+action = "Preflight Comparison"
+
+output_window = output.get_output()
+
+
+#____________________________________________________________________ FUNCTIONS
+def sanitize(v):
+    """Return a friendly string for table cells."""
+    if v is True:  return "True"
+    if v is False: return "False"
+    if v is None:  return "N/A"
+    return str(v)
+
+
+def status_cell(count):
+    return "✅" if not count else "❌ {}".format(count)
+
+
+def revisions_for(snapshot, per_sheet):
+    """Per Sheet columns when either side numbers per sheet (no project-wide Revision Number)."""
+    return snapshot.revisions_per_sheet if per_sheet else snapshot.revisions
+
+
+def revision_label(revision):
+    if revision is None:
+        return "Missing"
+    return u"{} - {}".format(sanitize(revision.get("Revision Date")), sanitize(revision.get("Description")))
+
+
+def compare_link(host_snapshot, link_snapshot):
+    """Every Preflight diff for one link, read off the two snapshots."""
+    result = OrderedDict()
+    result["phase_filters"] = compare_phase_filters(host_snapshot.phase_filters, link_snapshot.phase_filters)
+
+    host_numbering = host_snapshot.revision_numbering
+    link_numbering = link_snapshot.revision_numbering
+    per_sheet = "PerSheet" in (host_numbering, link_numbering)
+    result["numbering"] = (host_numbering, link_numbering)
+    result["revisions"] = compare_revisions(revisions_for(host_snapshot, per_sheet), revisions_for(link_snapshot, per_sheet))
+
+    result["project_info"] = compare_project_info(host_snapshot.project_info, link_snapshot.project_info)
+    result["sheets"] = compare_sheets(host_snapshot.sheets, link_snapshot.sheets)
+    return result
+
+
+def print_link_details(title, result):
+    missing, extra, diffs = result["phase_filters"]
+    host_numbering, link_numbering = result["numbering"]
+    if not (missing or extra or diffs or result["revisions"] or result["project_info"] or result["sheets"]) and host_numbering == link_numbering:
+        return
+
+    output_window.print_md("---")
+    output_window.print_md("## Link: `{}`".format(title))
+
+    rows = [["Missing in Link", name, "", ""] for name in missing]
+    rows += [["Extra in Link", name, "", ""] for name in extra]
+    rows += [["Setting Mismatch", fname, col, "{} / {}".format(sanitize(hv), sanitize(lv))] for (fname, col, hv, lv) in diffs]
+    if rows:
+        output_window.print_table(table_data=rows, columns=["Issue", "Filter", "Column", "Host / Link"], title="Phase Filters")
+
+    if host_numbering != link_numbering:
+        output_window.print_md("**Revision Numbering:** Host `{}` | ❌ | Link `{}`".format(host_numbering, link_numbering))
+    if result["revisions"]:
+        rows = [[key, revision_label(host_rev), revision_label(link_rev)] for (key, host_rev, link_rev) in result["revisions"]]
+        output_window.print_table(table_data=rows, columns=["Sequence Number", "Host", "Link"], title="Revisions")
+
+    if result["project_info"]:
+        rows = [[key, sanitize(host_value), sanitize(link_value)] for (key, host_value, link_value) in result["project_info"]]
+        output_window.print_table(table_data=rows, columns=["Parameter", "Host", "Link"], title="Project Information")
+
+    if result["sheets"]:
+        rows = [[number, host_name, link_name] for (number, host_name, link_name) in result["sheets"]]
+        output_window.print_table(table_data=rows, columns=["Sheet Number", "Host Sheet", "Link Sheet"], title="Sheet Numbers in Both Models")
+
+
+#____________________________________________________________________ MAIN
+
+def main():
+    global log_status
+
+    # Snapshots live on the module between commands; start every run fresh
+    clear_snapshots()
+    host_snapshot = get_snapshot(doc)
+
+    # One entry per unique loaded link document
+    loaded_links = get_linked_documents(doc)
+
+    if not loaded_links:
+        forms.alert("No linked Revit models found in the current project.", title=action)
+        return
+
+    results = [(linked.title, compare_link(host_snapshot, linked.snapshot)) for linked in loaded_links]
+
+    output_window.print_md("# {action}".format(action=action))
+    output_window.print_md("## **Host Model:** `{}`".format(host_snapshot.title))
+    output_window.print_md("**Revision Numbering Settings:** `{}` | **Sheets:** {}".format(host_snapshot.revision_numbering, len(host_snapshot.sheets)))
+
+    summary_rows = []
+    for title, result in results:
+        missing, extra, diffs = result["phase_filters"]
+        host_numbering, link_numbering = result["numbering"]
+        summary_rows.append([
+            title,
+            status_cell(len(missing) + len(extra) + len(diffs)),
+            status_cell(len(result["revisions"]) + (1 if host_numbering != link_numbering else 0)),
+            status_cell(len(result["project_info"])),
+            status_cell(len(result["sheets"])),
+        ])
+    output_window.print_table(
+        table_data=summary_rows,
+        columns=["Link", "Phase Filters", "Revisions", "Project Info", "Shared Sheet Numbers"],
+        title="Differences per Link ({})".format(len(results))
+    )
+
+    for title, result in results:
+        print_link_details(title, result)
+
+    log_status = "Success"
+    output_window.print_md("---")
+
+
+#____________________________________________________________________ RUN
+if __name__ == "__main__":
+    main()
+
+
+
+#______________________________________________________ LOG ACTION
+# action = "Preflight Comparison"
+def log_action(action, log_status):
+    """Log action to user JSON log file."""
+    import os, json, time
+    from pyrevit import revit
+
+    doc = revit.doc
+    doc_path = doc.PathName or "<Untitled>"
+
+    doc_title = doc.Title
+    version_build = doc.Application.VersionBuild
+    version_number = doc.Application.VersionNumber
+    username = doc.Application.Username
+    action = action
+
+    # json log location
+    # \FFE Inc\FFE Revit Users - Documents\00-General\Revit_Add-Ins\FFE-pyRevit\Logs
+    log_dir = os.path.join(os.path.expanduser("~"), "FFE Inc", "FFE Revit Users - Documents", "00-General", "Revit_Add-Ins", "FFE-pyRevit", "Logs")
+    log_file = os.path.join(log_dir, username + "_revit_log.json")
+
+    dataEntry = {
+        "datetime": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "username": username,
+        "doc_title": doc_title,
+        "doc_path": doc_path,
+        "revit_version_number": version_number,
+        "revit_build": version_build,
+        "action": action,
+        "status": log_status
+    }
+
+    # Function to write JSON data
+    def write_json(dataEntry, filename=log_file):
+        with open(filename,'r+') as file:
+            file_data = json.load(file)                 # First we load existing data into a dict.   
+            file_data['action'].append(dataEntry)       # Join new_data with file_data inside emp_details
+            file.seek(0)                                # Sets file's current position at offset.
+            json.dump(file_data, file, indent = 4)      # convert back to json.
+
+
+    # Check if log file exists, if not create it
+    logcheck = False
+    if not os.path.exists(log_file):
+        if not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+        with open(log_file, 'w') as file:    
+            file.write('{"action": []}')                # create json structure
+        
+        # output_window.print_md("### **Created log file:** `{}`".format(log_file))
+
+    # If it does exist, write to it
+    # Check if "action" key exists, if not create it
+    with open(log_file,'r+') as file:
+        file_data = json.load(file)
+        if 'action' not in file_data:
+            file_data['action'] = []
+            file.seek(0)
+            json.dump(file_data, file, indent = 4)
+
+    try:
+        write_json(dataEntry)
+        logcheck = True
+        # output_window.print_md("### **Logged sync to JSON:** `{}`".format(log_file))
+    except Exception as e:
+        logcheck = False
+
+    return dataEntry
+
+log_action(action, log_status)
+# output_window.print_md("Logging action: {}".format(log_action(action, log_status)))
\ No newline at end of file
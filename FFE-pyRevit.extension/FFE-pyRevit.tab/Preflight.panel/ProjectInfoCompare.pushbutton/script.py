@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 __title__     = "Project Info\nComparison"
-__version__   = 'Version = v1.0'
-__doc__       = """Version = v1.0
+__version__   = 'Version = v1.1'
+__doc__       = """Version = v1.1
 Date    = 11.04.2025
 ________________________________________________________________
 Tested Revit Versions: 
@@ -16,6 +16,7 @@ How-to:
 ______________________________________________________________
 Last update:
  - [11.04.2025] - v1.0 RELEASE
+ - [10.18.2026] - v1.1 Project Info comes from the shared Preflight snapshot; duplicate link instances are read once.
 ______________________________________________________________
 Author: Kyle Guggenheim"""
 
@@ -28,8 +29,9 @@ import clr
 clr.AddReference("System")
 from Autodesk.Revit.DB import *
 from Autodesk.Revit.UI import TaskDialog
-from Autodesk.Revit.DB import FilteredElementCollector, RevitLinkInstance
 
+#____________________________________________________________________ IMPORTS (CUSTOM)
+from Preflight.snapshot import clear_snapshots, get_snapshot, get_linked_documents
 
 #____________________________________________________________________ IMPORTS (PYREVIT)
 from pyrevit import revit, DB
@@ -49,31 +51,19 @@ action = "Project Info Comparison"
 output_window = output.get_output()
 
 
-#____________________________________________________________________ FUNCTIONS
-def get_project_info_elements(document):
-    """Get Project Information elements from the given document."""
-    project_info = {}
-    pi = document.ProjectInformation
-    if pi:
-        project_info['FFE_Sheet_Project Number'] = pi.GetParameters("FFE_Sheet_Project Number")[0].AsString() if pi.GetParameters("FFE_Sheet_Project Number") else "N/A"
-        project_info['FFE_Sheet_Campus Name'] = pi.GetParameters("FFE_Sheet_Campus Name")[0].AsString() if pi.GetParameters("FFE_Sheet_Campus Name") else "N/A"
-        project_info['FFE_Sheet_Project Location'] = pi.GetParameters("FFE_Sheet_Project Location")[0].AsString() if pi.GetParameters("FFE_Sheet_Project Location") else "N/A"
-        project_info['FFE_Sheet_Project Phase'] = pi.GetParameters("FFE_Sheet_Project Phase")[0].AsString() if pi.GetParameters("FFE_Sheet_Project Phase") else "N/A"
-        project_info['FFE_Sheet_Project Title'] = pi.GetParameters("FFE_Sheet_Project Title")[0].AsString() if pi.GetParameters("FFE_Sheet_Project Title") else "N/A"
-        project_info['Issue Date'] = pi.IssueDate
-    return project_info
-
-
 #____________________________________________________________________ MAIN
 
 def main():
     global log_status
 
-    host_project_info = get_project_info_elements(doc)
+    # Snapshots live on the module between commands; start every run fresh
+    clear_snapshots()
+    host_project_info = get_snapshot(doc).project_info
 
-    link_instances = FilteredElementCollector(doc).OfClass(RevitLinkInstance).ToElements()
+    # One entry per unique loaded link document
+    loaded_links = get_linked_documents(doc)
 
-    if not link_instances:
+    if not loaded_links:
         forms.alert("No linked Revit models found in the current project.", title=action)
         return
 
@@ -84,19 +74,17 @@ def main():
 
     output_window.print_md("---")
 
-    for link_instance in link_instances:
-        link_doc = link_instance.GetLinkDocument()
-        if link_doc:
-            link_project_info = get_project_info_elements(link_doc)
-            output_window.print_md("## Linked Model: {link_doc}".format(link_doc=link_doc.Title))
-            for key in host_project_info.keys():
-                host_value = host_project_info.get(key, "N/A")
-                link_value = link_project_info.get(key, "N/A")
-                if host_value != link_value:
-                    # output_window.print_md("- **{key}:** Host = {host_value} | (❌) | Link = {link_value}".format(key=key, host_value=host_value, link_value=link_value))
-                    output_window.print_md("- **{key}:** {link_value} | ❌ | Host = {host_value}".format(key=key, host_value=host_value, link_value=link_value))
-                else:
-                    output_window.print_md("- **{key}:** {link_value} | ✅".format(key=key, link_value=link_value))
+    for linked in loaded_links:
+        link_project_info = linked.snapshot.project_info
+        output_window.print_md("## Linked Model: {link_doc}".format(link_doc=linked.title))
+        for key in host_project_info.keys():
+            host_value = host_project_info.get(key, "N/A")
+            link_value = link_project_info.get(key, "N/A")
+            if host_value != link_value:
+                # output_window.print_md("- **{key}:** Host = {host_value} | (❌) | Link = {link_value}".format(key=key, host_value=host_value, link_value=link_value))
+                output_window.print_md("- **{key}:** {link_value} | ❌ | Host = {host_value}".format(key=key, host_value=host_value, link_value=link_value))
+            else:
+                output_window.print_md("- **{key}:** {link_value} | ✅".format(key=key, link_value=link_value))
 
     log_status = "Success"
     output_window.print_md("---")
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 __title__     = "Revision\nComparison"
-__version__   = 'Version = v1.1'
-__doc__       = """Version = v1.1
+__version__   = 'Version = v1.2'
+__doc__       = """Version = v1.2
 Date    = 11.07.2025
 ________________________________________________________________
 Tested Revit Versions: 
@@ -18,6 +18,7 @@ Last update:
  - [11.07.2025] - v1.0 RELEASE
  - [11.10.2025] - v1.0.1 Temporarily updated to handle models set to "Per Sheet".
  - [11.14.2025] - v1.1 Updated to fully support "Per Sheet" revision numbering.
+ - [10.18.2026] - v1.2 Revisions come from the shared Preflight snapshot (one collector pass per document, links deduped by type).
 ______________________________________________________________
 Author: Kyle Guggenheim"""
 
@@ -25,13 +26,15 @@ Author: Kyle Guggenheim"""
 from json import load
 import re
 import sys
-from collections import OrderedDict
 #____________________________________________________________________ IMPORTS (AUTODESK)
 import clr
 clr.AddReference("System")
 from Autodesk.Revit.DB import *
 from Autodesk.Revit.UI import TaskDialog
-from Autodesk.Revit.DB import FilteredElementCollector, RevitLinkInstance, Revision
+
+#____________________________________________________________________ IMPORTS (CUSTOM)
+from Preflight.compare import compare_revisions
+from Preflight.snapshot import clear_snapshots, get_snapshot, get_linked_documents
 
 #____________________________________________________________________ IMPORTS (PYREVIT)
 from pyrevit import revit, DB
@@ -58,89 +61,6 @@ def sanitize(v):
     if v is None:  return "N/A"
     return str(v)
 
-def check_revision_settings(document):
-    """ Check if the document is set to by project or by sheet."""
-    rev_settings = FilteredElementCollector(document).OfClass(RevisionSettings).FirstElement()
-    if rev_settings:
-        return rev_settings.RevisionNumbering
-    return None
-
-def get_revisions(document):
-    """Get Revisions from the given document for Per Project numbering."""
-    data = OrderedDict()
-    rev_collector = FilteredElementCollector(document).OfClass(Revision)
-    rev_numbering_sequence = FilteredElementCollector(document).OfClass(RevisionNumberingSequence)
-
-    # Create a dictionary of Revision Numbering Sequences for easy lookup
-    NumberingSequence = {}
-    for rev_seq in rev_numbering_sequence:    
-        NumberingSequence[rev_seq.Id.ToString()] = rev_seq.Name
-
-    # Collect revision data
-    for rev in rev_collector:
-        revisions = {}
-        rev_num_seq = rev.RevisionNumberingSequenceId.ToString()
-        
-        revisions['Sequence Number'] = rev.SequenceNumber
-        revisions['Revision Number'] = rev.RevisionNumber
-        revisions['Numbering'] = NumberingSequence[rev_num_seq] if rev_num_seq in NumberingSequence else "None"
-        revisions['Revision Date'] = rev.RevisionDate
-        revisions['Description'] = rev.Description
-        revisions['Issued'] = rev.Issued
-        revisions['Issued To'] = rev.IssuedTo
-        revisions['Issued By'] = rev.IssuedBy
-        revisions['Show'] = rev.Visibility
-
-        data[rev.SequenceNumber] = revisions
-    
-    return data
-
-def get_revisions_PerSheet(document):
-    """Get Revisions from the given document for Per Sheet numbering."""
-    data = OrderedDict()
-    rev_collector = FilteredElementCollector(document).OfClass(Revision)
-    rev_numbering_sequence = FilteredElementCollector(document).OfClass(RevisionNumberingSequence)
-
-    # Create a dictionary of Revision Numbering Sequences for easy lookup
-    NumberingSequence = {}
-    for rev_seq in rev_numbering_sequence:    
-        NumberingSequence[rev_seq.Id.ToString()] = rev_seq.Name
-
-    # Collect revision data
-    for rev in rev_collector:
-        revisions = {}
-        rev_num_seq = rev.RevisionNumberingSequenceId.ToString()
-        
-        revisions['Sequence Number'] = rev.SequenceNumber
-        # revisions['Revision Number'] = rev.RevisionNumber
-        revisions['Numbering'] = NumberingSequence[rev_num_seq] if rev_num_seq in NumberingSequence else "None"
-        revisions['Revision Date'] = rev.RevisionDate
-        revisions['Description'] = rev.Description
-        revisions['Issued'] = rev.Issued
-        revisions['Issued To'] = rev.IssuedTo
-        revisions['Issued By'] = rev.IssuedBy
-        revisions['Show'] = rev.Visibility
-
-        data[rev.SequenceNumber] = revisions
-    
-    return data
-
-
-def compare_revisions(host_revisions, link_revisions):
-    """Compare Revisions between host and link documents."""
-    comparison = []
-    all_keys = set(host_revisions.keys()).union(set(link_revisions.keys()))
-
-    for key in all_keys:
-        host_rev = host_revisions.get(key)
-        link_rev = link_revisions.get(key)
-
-        if host_rev != link_rev:
-            comparison.append((key, host_rev, link_rev))
-    
-    return comparison
-
-
 def compare_values(host_value, link_value):
     """Compare two values and return a status icon."""
     if host_value != link_value:
@@ -152,12 +72,11 @@ def compare_values(host_value, link_value):
 
 def Main_PerProject():
     # Host Data
-    host_title = doc.Title
-    host_revisions = get_revisions(doc)
+    host_title = host_snapshot.title
+    host_revisions = host_snapshot.revisions
 
-    # Link Data
-    link_instances = list(FilteredElementCollector(doc).OfClass(RevitLinkInstance))
-    loaded_links = [(li, li.GetLinkDocument()) for li in link_instances if li.GetLinkDocument()]
+    # Link Data (one entry per unique loaded link document)
+    loaded_links = get_linked_documents(doc)
 
     # Exit if no links found
     if not loaded_links:
@@ -182,10 +101,11 @@ def Main_PerProject():
 
 
     ### Per-Link
-    for li, ldoc in loaded_links:
-        link_name = ldoc.Title
+    for linked in loaded_links:
+        link_name = linked.title
+        link_snapshot = linked.snapshot
         
-        link_rev_numbering = check_revision_settings(ldoc).ToString()
+        link_rev_numbering = link_snapshot.revision_numbering
         if link_rev_numbering == "PerSheet":
             output_window.print_md("---")
             output_window.print_md("## Link: `{}` Revision Settings is set to 'PerSheet'".format(link_name))
@@ -196,7 +116,7 @@ def Main_PerProject():
             output_window.print_md("## Link: `{}`".format(link_name))
             
             # Get Link Revisions
-            link_revisions = get_revisions(ldoc)
+            link_revisions = link_snapshot.revisions
             # output_window.print_md("**Link Revisions ({}):**".format(len(link_revisions)))
 
             # Compute Differences early so we can tag mismatches in the table
@@ -224,12 +144,11 @@ def Main_PerProject():
 
 def Main_PerSheet():
     # Host Data
-    host_title = doc.Title
-    host_revisions = get_revisions_PerSheet(doc)
+    host_title = host_snapshot.title
+    host_revisions = host_snapshot.revisions_per_sheet
 
-    # Link Data
-    link_instances = list(FilteredElementCollector(doc).OfClass(RevitLinkInstance))
-    loaded_links = [(li, li.GetLinkDocument()) for li in link_instances if li.GetLinkDocument()]
+    # Link Data (one entry per unique loaded link document)
+    loaded_links = get_linked_documents(doc)
 
     # Exit if no links found
     if not loaded_links:
@@ -254,10 +173,11 @@ def Main_PerSheet():
 
 
     ### Per-Link
-    for li, ldoc in loaded_links:
-        link_name = ldoc.Title
+    for linked in loaded_links:
+        link_name = linked.title
+        link_snapshot = linked.snapshot
 
-        link_rev_numbering = check_revision_settings(ldoc).ToString()
+        link_rev_numbering = link_snapshot.revision_numbering
         if link_rev_numbering == "PerProject":
             output_window.print_md("---")
             output_window.print_md("## Link: `{}` Revision Settings is set to 'PerSheet'".format(link_name))
@@ -268,7 +188,7 @@ def Main_PerSheet():
             output_window.print_md("## Link: `{}`".format(link_name))
             
             # Get Link Revisions
-            link_revisions = get_revisions_PerSheet(ldoc)
+            link_revisions = link_snapshot.revisions_per_sheet
             # output_window.print_md("**Link Revisions ({}):**".format(len(link_revisions)))
 
             # Compute Differences early so we can tag mismatches in the table
@@ -295,8 +215,12 @@ def Main_PerSheet():
 
 
 #____________________________________________________________________ RUN
+# Snapshots live on the module between commands; start every run fresh
+clear_snapshots()
+
 # Check Revision Settings
-rev_numbering = check_revision_settings(doc).ToString()
+host_snapshot = get_snapshot(doc)
+rev_numbering = host_snapshot.revision_numbering
 if rev_numbering == "PerSheet":
     Main_PerSheet()
 else:
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""Export planner and manifest for PDF Export Settings.
+
+The manifest sits next to the dated export folders and records, per sheet
+(keyed by UniqueId), the fingerprint and PDF written by the last export:
+{"fingerprint": ..., "expectedName": ..., "fileName": ..., "folder": ..., "status": ...}.
+expectedName is what the naming rule predicts and is used to detect renames;
+fileName is the file Revit actually wrote and is what gets copied.
+A run copies PDFs whose sheet fingerprint is unchanged and whose file still
+exists, and exports the rest in chunks, saving the manifest after each chunk
+so an interrupted run resumes where it stopped.
+
+Pure Python so it can be checked outside Revit: python export_planner.py
+"""
+
+#____________________________________________________________________ IMPORTS (SYSTEM)
+import hashlib
+import json
+import os
+import re
+
+
+#____________________________________________________________________ VARIABLES
+MANIFEST_VERSION = 1
+
+STATUS_EXPORTED = "exported"
+STATUS_FAILED = "failed"
+
+# Characters Windows does not allow in a file name; Revit replaces them when writing the PDF.
+INVALID_FILE_NAME_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+
+#____________________________________________________________________ FUNCTIONS
+
+# ---------------- Fingerprints / names ----------------
+def make_fingerprint(state):
+    """Return a short hash of a sheet's state (revisions, parameters, views, content token)."""
+    text = json.dumps(state, sort_keys=True, separators=(",", ":"))
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+def sanitize_file_name(name, replacement=u"-"):
+    return INVALID_FILE_NAME_CHARS.sub(replacement, name)
+
+
+def expected_file_name(blocks, separator, prefix="", suffix="", replacement=u"-"):
+    """
+    Mirror the PDF naming rule: blocks is a list of values in NAMING_ORDER,
+    None for a block the rule skipped. Separators follow the block position,
+    as the rule builder does, so a skipped last block leaves its separator.
+    Characters that cannot appear in a file name become replacement.
+    """
+    parts = []
+    for index, value in enumerate(blocks):
+        if value is None:
+            continue
+        parts.append(value)
+        if index < len(blocks) - 1:
+            parts.append(separator)
+    name = u"{}{}{}".format(prefix or u"", u"".join(parts), suffix or u"")
+    return sanitize_file_name(name, replacement) + u".pdf"
+
+
+def _loose_name(file_name):
+    """Name with case, punctuation and spacing dropped, for pairing leftovers."""
+    return re.sub(r"[\W_]+", u"", file_name.lower(), flags=re.UNICODE)
+
+
+# ---------------- Manifest ----------------
+def get_manifest_path(folder, file_name="pdf_export_manifest.json"):
+    return os.path.join(folder, file_name)
+
+
+def new_manifest(document_key):
+    return {"version": MANIFEST_VERSION, "documentKey": document_key, "sheets": {}, "lastRun": None}
+
+
+def load_manifest(path, document_key):
+    """Return the manifest for document_key, or an empty one if missing / unreadable / outdated."""
+    try:
+        with open(path, "r") as manifest_file:
+            data = json.load(manifest_file)
+    except Exception:
+        return new_manifest(document_key)
+    if data.get("version") != MANIFEST_VERSION or data.get("documentKey") != document_key:
+        return new_manifest(document_key)
+    data.setdefault("sheets", {})
+    data.setdefault("lastRun", None)
+    return data
+
+
+def save_manifest(path, manifest):
+    """Write through a temp file so a failed write keeps the previous manifest."""
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=1, sort_keys=True)
+    if os.path.exists(path):
+        os.remove(path)
+    os.rename(temp_path, path)
+
+
+# ---------------- Planning ----------------
+def plan_export(sheets, manifest, file_exists=os.path.isfile):
+    """
+    Split sheets into {"reuse": [...], "export": [...]}.
+    sheets: dicts with "key", "fingerprint" and "fileName" (extra keys are kept).
+    A None fingerprint means the sheet state could not be read; it is always
+    exported. Export entries get a "reason": new, unreadable, changed,
+    renamed, failed or missing. Reuse entries get "source" and "storedName",
+    the file written last time.
+    """
+    plan = {"reuse": [], "export": []}
+    for sheet in sheets:
+        previous = manifest["sheets"].get(sheet["key"])
+        reason = None
+        if previous is None:
+            reason = "new"
+        elif sheet["fingerprint"] is None:
+            reason = "unreadable"
+        elif previous.get("fingerprint") != sheet["fingerprint"]:
+            reason = "changed"
+        elif previous.get("expectedName", previous.get("fileName")) != sheet["fileName"]:
+            reason = "renamed"
+        elif previous.get("status") != STATUS_EXPORTED:
+            reason = "failed"
+        elif not file_exists(os.path.join(previous.get("folder") or "", previous.get("fileName") or "")):
+            reason = "missing"
+
+        if reason is None:
+            item = dict(sheet)
+            item["source"] = os.path.join(previous["folder"], previous["fileName"])
+            item["storedName"] = previous["fileName"]
+            plan["reuse"].append(item)
+        else:
+            item = dict(sheet)
+            item["reason"] = reason
+            plan["export"].append(item)
+    return plan
+
+
+def make_chunks(items, chunk_size):
+    chunk_size = max(1, int(chunk_size))
+    return [items[index:index + chunk_size] for index in range(0, len(items), chunk_size)]
+
+
+def match_exported_files(chunk, new_files):
+    """
+    Return {sheet key: file name} for a finished chunk. Sheets are matched on
+    their expected name, then leftovers on a loose name (case and
+    punctuation ignored) when that pairs them one-to-one; if exactly one
+    sheet and one new file are still left, they are paired.
+    """
+    matched = {}
+    remaining_files = set(new_files)
+    unmatched = []
+    for sheet in chunk:
+        if sheet["fileName"] in remaining_files:
+            matched[sheet["key"]] = sheet["fileName"]
+            remaining_files.discard(sheet["fileName"])
+        else:
+            unmatched.append(sheet)
+
+    files_by_loose = {}
+    for file_name in remaining_files:
+        files_by_loose.setdefault(_loose_name(file_name), []).append(file_name)
+    sheets_by_loose = {}
+    for sheet in unmatched:
+        sheets_by_loose.setdefault(_loose_name(sheet["fileName"]), []).append(sheet)
+    still_unmatched = []
+    for sheet in unmatched:
+        loose = _loose_name(sheet["fileName"])
+        if len(files_by_loose.get(loose, [])) == 1 and len(sheets_by_loose[loose]) == 1:
+            file_name = files_by_loose[loose][0]
+            matched[sheet["key"]] = file_name
+            remaining_files.discard(file_name)
+        else:
+            still_unmatched.append(sheet)
+
+    if len(still_unmatched) == 1 and len(remaining_files) == 1:
+        matched[still_unmatched[0]["key"]] = remaining_files.pop()
+    return matched
+
+
+# ---------------- Recording ----------------
+def start_run(manifest, folder, started_at, plan):
+    manifest["lastRun"] = {
+        "folder": folder,
+        "startedAt": started_at,
+        "reused": len(plan["reuse"]),
+        "toExport": len(plan["export"]),
+        "chunks": [],
+    }
+
+
+def record_reused(manifest, sheet, folder, file_name):
+    entry = manifest["sheets"].setdefault(sheet["key"], {})
+    entry.update({"fingerprint": sheet["fingerprint"], "expectedName": sheet["fileName"], "fileName": file_name,
+                  "folder": folder, "status": STATUS_EXPORTED})
+
+
+def record_chunk(manifest, index, chunk, folder, matched_files, error=None, seconds=0.0):
+    """Store per-sheet results and a chunk status line; unmatched sheets count as failed."""
+    for sheet in chunk:
+        file_name = matched_files.get(sheet["key"])
+        entry = manifest["sheets"].setdefault(sheet["key"], {})
+        entry["fingerprint"] = sheet["fingerprint"]
+        entry["expectedName"] = sheet["fileName"]
+        entry["folder"] = folder
+        if file_name and error is None:
+            entry.update({"fileName": file_name, "status": STATUS_EXPORTED})
+        else:
+            entry.update({"fileName": sheet["fileName"], "status": STATUS_FAILED})
+    manifest["lastRun"]["chunks"].append({
+        "index": index,
+        "sheets": len(chunk),
+        "exported": len([sheet for sheet in chunk if matched_files.get(sheet["key"])]) if error is None else 0,
+        "status": "failed" if error is not None else "done",
+        "error": error,
+        "seconds": round(seconds, 2),
+    })
+
+
+def forget_missing_sheets(manifest, document_keys):
+    """Drop sheets deleted from the document so the manifest does not grow forever.
+
+    document_keys holds every sheet in the document, not just the current
+    sheet set: the manifest is shared by every set exported from the project
+    folder, and a sheet outside this run's set keeps its fingerprint.
+    """
+    document_keys = set(document_keys)
+    for key in [key for key in manifest["sheets"] if key not in document_keys]:
+        del manifest["sheets"][key]
+
+
+#____________________________________________________________________ SELF-CHECK
+if __name__ == "__main__":
+    import random
+    import shutil
+    import tempfile
+    import time
+
+    rng = random.Random(8)
+    root = tempfile.mkdtemp()
+    manifest_path = get_manifest_path(root)
+
+    def make_sheets(states):
+        # revitName is what the export writes: Revit's own replacement for
+        # characters a file name cannot hold need not match ours.
+        return [{"key": key, "fingerprint": make_fingerprint(state),
+                 "fileName": expected_file_name([key, state["name"]], " - "),
+                 "revitName": sanitize_file_name(u"{} - {}".format(key, state["name"]), u"_") + u".pdf"}
+                for key, state in sorted(states.items())]
+
+    def fake_export(manifest, plan, folder, fail_chunk=None, chunk_size=25):
+        """Copies reusable PDFs and 'exports' the rest; fail_chunk raises mid-run."""
+        os.makedirs(folder)
+        start_run(manifest, folder, time.time(), plan)
+        for sheet in plan["reuse"]:
+            shutil.copy(sheet["source"], os.path.join(folder, sheet["storedName"]))
+            record_reused(manifest, sheet, folder, sheet["storedName"])
+        save_manifest(manifest_path, manifest)
+        for index, chunk in enumerate(make_chunks(plan["export"], chunk_size)):
+            if index == fail_chunk:
+                record_chunk(manifest, index, chunk, folder, {}, error="Export failed")
+                save_manifest(manifest_path, manifest)
+                return len(plan["reuse"]), index * chunk_size
+            before = set(os.listdir(folder))
+            for sheet in chunk:
+                with open(os.path.join(folder, sheet["revitName"]), "w") as pdf:
+                    pdf.write(sheet["fingerprint"] or "")
+            record_chunk(manifest, index, chunk, folder, match_exported_files(chunk, set(os.listdir(folder)) - before))
+            save_manifest(manifest_path, manifest)
+        return len(plan["reuse"]), len(plan["export"])
+
+    states = dict(("A{:03d}".format(index), {"name": "SHEET {}".format(index), "rev": 1}) for index in range(300))
+    for index in (101, 102, 103):
+        states["A{:03d}".format(index)]["name"] = "LEVEL {} / PART: {}".format(index, index % 2)
+    try:
+        reports = []
+        manifest = load_manifest(manifest_path, "project")
+        reports.append(("first issue, fails in chunk 4", fake_export(
+            manifest, plan_export(make_sheets(states), manifest), os.path.join(root, "run1"), fail_chunk=4)))
+
+        manifest = load_manifest(manifest_path, "project")
+        reports.append(("rerun after failure", fake_export(
+            manifest, plan_export(make_sheets(states), manifest), os.path.join(root, "run2"))))
+
+        for key in rng.sample(sorted(states), 12):
+            states[key]["rev"] += 1
+        failed = [key for key, entry in manifest["sheets"].items() if entry["status"] != STATUS_EXPORTED]
+
+        manifest = load_manifest(manifest_path, "project")
+        sheets = make_sheets(states)
+        sheets[0]["fingerprint"] = None
+        plan = plan_export(sheets, manifest)
+        reports.append(("next issue, 12 revised, 1 unreadable", fake_export(manifest, plan, os.path.join(root, "run3"))))
+
+        # Two sheet sets sharing one manifest: exporting B must not forget A
+        sets = {"A": make_sheets(dict((key, states[key]) for key in sorted(states)[:150])),
+                "B": make_sheets(dict((key, states[key]) for key in sorted(states)[150:]))}
+        # (set A holds the sheet that was unreadable last run, so it exports once)
+        for set_name in ("B", "A"):
+            manifest = load_manifest(manifest_path, "project")
+            set_plan = plan_export(sets[set_name], manifest)
+            forget_missing_sheets(manifest, states.keys())
+            reports.append(("set {} only".format(set_name), fake_export(
+                manifest, set_plan, os.path.join(root, "set-" + set_name))))
+        manifest = load_manifest(manifest_path, "project")
+        deleted = sorted(states)[-5:]
+        forget_missing_sheets(manifest, [key for key in states if key not in deleted])
+        kept_both_sets = len(manifest["sheets"]) == len(states) - len(deleted)
+
+        for label, (reused, exported) in reports:
+            print("{}: reused {}, exported {}".format(label, reused, exported))
+        print("  complete folder: {}".format(len(os.listdir(os.path.join(root, "run3"))) == len(states)))
+        print("  reasons: {}".format(sorted(set(sheet["reason"] for sheet in plan["export"]))))
+        print("  failed after rerun: {} (3 sheets with / or : in one chunk)".format(len(failed)))
+        print("  two sheet sets, 5 sheets deleted: manifest keeps {} of {} ({})".format(
+            len(manifest["sheets"]), len(states), kept_both_sets))
+    finally:
+        shutil.rmtree(root)
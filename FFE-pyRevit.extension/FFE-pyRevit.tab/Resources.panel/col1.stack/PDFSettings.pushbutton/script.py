@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
 __title__     = "PDF Export \nSettings"
-__version__   = 'Version = v0.1'
-__doc__       = """Version = v0.1
-Date    = 10.30.2025
+__version__   = 'Version = v0.2'
+__doc__       = """Version = v0.2
+Date    = 10.18.2026
 ________________________________________________________________
 Tested Revit Versions: 
 ______________________________________________________________
@@ -11,9 +11,13 @@ Description:
 ______________________________________________________________
 How-to:
  -> Click the button
+ -> Unchanged sheets are copied from the last export; only new or changed
+    sheets are exported, in chunks. If an export stops part-way, run it
+    again to pick up where it stopped.
 
 ______________________________________________________________
 Last update:
+ - [10.18.2026] - v0.2 Incremental, resumable export with a per-project manifest
  - [10.30.2025] - v0.1 Beta Release
  - [MM.DD.2025] - v1.0 First Release
 ______________________________________________________________
@@ -23,13 +27,15 @@ Author: Kyle Guggenheim"""
 #____________________________________________________________________ IMPORTS (SYSTEM)
 import os
 import datetime
+import shutil
+import time
 import clr
 
 #____________________________________________________________________ IMPORTS (AUTODESK)
 clr.AddReference("RevitAPI")
 from Autodesk.Revit.DB import (
     Transaction, ElementId, ViewSheet, BuiltInCategory,
-    FilteredElementCollector,  # not used for sheets; only for ParameterElement lookup
+    FilteredElementCollector,  # ParameterElement lookup, placed-view contents (fingerprints), manifest pruning
     ParameterElement,
     # Print / sheet set
     PrintManager, ViewSheetSetting,
@@ -47,6 +53,12 @@ from pyrevit import revit, DB
 from pyrevit.script import output
 from pyrevit import forms
 
+#____________________________________________________________________ IMPORTS (LOCAL)
+from export_planner import (
+    expected_file_name, forget_missing_sheets, get_manifest_path, load_manifest,
+    make_chunks, make_fingerprint, match_exported_files, new_manifest, plan_export,
+    record_chunk, record_reused, save_manifest, start_run
+)
 
 output_window = output.get_output()
 
@@ -93,9 +105,24 @@ GLOBAL_SEPARATOR = " - "                  # Placed *between* blocks in NAMING_OR
 GLOBAL_PREFIX = ""                        # Optional prefix for entire filename
 GLOBAL_SUFFIX = ""                        # Optional suffix for entire filename
 
+# 7) Incremental export
+INCREMENTAL_EXPORT = True                 # False re-exports every sheet in the set
+CHUNK_SIZE = 20                           # Sheets per doc.Export call; the manifest is saved after each
+MANIFEST_FILE_NAME = "pdf_export_manifest.json"  # Kept in Downloads\<ProjectName>, next to the dated folders
+HASH_VISIBLE_ELEMENTS = True              # Include elements shown in placed views in the sheet fingerprint
+FILE_NAME_REPLACEMENT = "-"               # Stands in for \ / : * ? " < > | when predicting PDF names
+
 
 #____________________________________________________________________ FUNCTIONS
 
+# ---------------- Helpers: ids ----------------
+def _id_value(element_id):
+    """Numeric value of an ElementId (Value in 2024+, IntegerValue before)."""
+    try:
+        return element_id.Value
+    except Exception:
+        return element_id.IntegerValue
+
 # ---------------- Helpers: filesystem ----------------
 def _downloads_folder():
     """Return user's Downloads folder path (Windows/macOS)."""
@@ -107,8 +134,8 @@ def _downloads_folder():
     except:
         return os.path.expanduser("~/Downloads")
 
-def _output_folder():
-    """Build the output folder path per settings."""
+def _project_folder():
+    """Folder holding the dated export folders and the manifest."""
     if CUSTOM_OUTPUT_FOLDER.strip():
         base = CUSTOM_OUTPUT_FOLDER
     elif USE_DEFAULT_DOWNLOADS:
@@ -116,8 +143,12 @@ def _output_folder():
     else:
         base = os.path.expanduser("~/Desktop")
     proj_name = doc.Title.replace(".rvt", "")
+    return os.path.join(base, proj_name)
+
+def _output_folder():
+    """Build the output folder path per settings."""
     ts = datetime.datetime.now().strftime("%Y-%m-%d_%H%M")
-    folder = os.path.join(base, proj_name, ts)
+    folder = os.path.join(_project_folder(), ts)
     if not os.path.exists(folder):
         os.makedirs(folder)
     return folder
@@ -186,7 +217,7 @@ def _build_naming_rule_for_sheets(naming_items, global_sep):
             items.Add(_build_table_cell_param_data_for_builtin(BuiltInParameter.SHEET_NAME, sheet_cat_id, separator=sep))
         else:
             peid = _find_parameter_element_id_by_name(token, sheet_cat_id)
-            if peid and peid.IntegerValue != -1:
+            if peid and _id_value(peid) != -1:
                 d = TableCellCombinedParameterData.Create()
                 d.ParamId = peid
                 d.CategoryId = sheet_cat_id
@@ -244,6 +275,122 @@ def _pdf_options():
 
     return opt
 
+# ---------------- Helpers: sheet fingerprints ----------------
+def _param_text(param):
+    """Return a parameter value as text (None when unset)."""
+    if param is None or not param.HasValue:
+        return None
+    value = param.AsString()
+    if value is None:
+        value = param.AsValueString()
+    return value
+
+def _version_token(element):
+    """Element.VersionGuid changes whenever the element is modified."""
+    try:
+        return str(element.VersionGuid)
+    except:
+        return None
+
+def _visible_elements_token(view):
+    """Hash of the ids and versions of everything shown in a view; None if it cannot be read."""
+    tokens = []
+    try:
+        for el in FilteredElementCollector(doc, view.Id).WhereElementIsNotElementType():
+            tokens.append("{}:{}".format(_id_value(el.Id), _version_token(el)))
+    except Exception:
+        return None
+    tokens.sort()
+    return make_fingerprint(tokens)
+
+def _sheet_state(sheet):
+    """
+    Everything that should trigger a re-export: revisions on the sheet,
+    sheet parameter values, placed views and a content token built from the
+    sheet, its views and (optionally) the elements those views show.
+    Returns None when the shown elements cannot be read, so the planner
+    exports the sheet instead of trusting a partial fingerprint.
+    """
+    revisions = []
+    for rev_id in sheet.GetAllRevisionIds():
+        rev = doc.GetElement(rev_id)
+        if rev is not None:
+            revisions.append([rev.SequenceNumber, rev.RevisionDate, rev.Description, rev.Issued])
+
+    params = {}
+    for param in sheet.Parameters:
+        try:
+            params[param.Definition.Name] = _param_text(param)
+        except:
+            pass
+
+    views = []
+    content = [_version_token(sheet)]
+    shown_views = [sheet]
+    for view_id in sorted(sheet.GetAllPlacedViews(), key=_id_value):
+        view = doc.GetElement(view_id)
+        views.append(_id_value(view_id))
+        if view is None:
+            continue
+        content.append(_version_token(view))
+        shown_views.append(view)
+
+    if HASH_VISIBLE_ELEMENTS:
+        for view in shown_views:
+            token = _visible_elements_token(view)
+            if token is None:
+                return None
+            content.append(token)
+
+    return {
+        "revisions": revisions,
+        "revisionSequence": _param_text(sheet.get_Parameter(DB.BuiltInParameter.SHEET_CURRENT_REVISION)),
+        "params": params,
+        "views": views,
+        "content": make_fingerprint(content),
+    }
+
+def _resolved_naming_tokens():
+    """NAMING_ORDER tokens the naming rule keeps (missing parameters are skipped by the rule)."""
+    sheet_cat_id = ElementId(BuiltInCategory.OST_Sheets)
+    resolved = []
+    for token in NAMING_ORDER:
+        if token in ("SHEET_NUMBER", "SHEET_NAME"):
+            resolved.append(True)
+        else:
+            resolved.append(_id_value(_find_parameter_element_id_by_name(token, sheet_cat_id)) != -1)
+    return resolved
+
+def _naming_blocks(sheet, resolved):
+    """Values the naming rule writes for a sheet, in NAMING_ORDER (None = block skipped)."""
+    blocks = []
+    for token, is_resolved in zip(NAMING_ORDER, resolved):
+        if token == "SHEET_NUMBER":
+            blocks.append(sheet.SheetNumber)
+        elif token == "SHEET_NAME":
+            blocks.append(sheet.Name)
+        elif not is_resolved:
+            blocks.append(None)
+        else:
+            blocks.append(_param_text(sheet.LookupParameter(token)) or "")
+    return blocks
+
+def _plan_items(sheet_ids):
+    """Planner input per sheet: UniqueId, ElementId, fingerprint (None if unreadable) and expected PDF name."""
+    resolved = _resolved_naming_tokens()
+    items = []
+    for sheet_id in sheet_ids:
+        sheet = doc.GetElement(sheet_id)
+        state = _sheet_state(sheet)
+        items.append({
+            "key": sheet.UniqueId,
+            "id": sheet_id,
+            "fingerprint": make_fingerprint(state) if state is not None else None,
+            "fileName": expected_file_name(_naming_blocks(sheet, resolved), GLOBAL_SEPARATOR, GLOBAL_PREFIX, GLOBAL_SUFFIX,
+                                           FILE_NAME_REPLACEMENT),
+        })
+    return items
+
 #____________________________________________________________________ MAIN
 
 def _get_current_sheet_set_ids_only():
@@ -268,8 +415,56 @@ def _get_current_sheet_set_ids_only():
             ids.append(v.Id)
     return ids
 
+def _copy_reused(plan, out_folder, manifest):
+    """Copy unchanged PDFs into this run's folder; failures fall back to export."""
+    reused = 0
+    for item in list(plan["reuse"]):
+        try:
+            shutil.copy2(item["source"], os.path.join(out_folder, item["storedName"]))
+            record_reused(manifest, item, out_folder, item["storedName"])
+            reused += 1
+        except Exception:
+            item["reason"] = "copy failed"
+            plan["export"].append(item)
+    return reused
+
+def _export_chunks(plan, out_folder, opt, manifest, manifest_path):
+    """Export in CHUNK_SIZE batches, saving the manifest after each one."""
+    exported = 0
+    failed_chunks = 0
+    for index, chunk in enumerate(make_chunks(plan["export"], CHUNK_SIZE)):
+        before = set(os.listdir(out_folder))
+        started = time.time()
+        error = None
+        t = Transaction(doc, "Export Sheets to PDF (Native via Current Set)")
+        t.Start()
+        try:
+            doc.Export(out_folder, [item["id"] for item in chunk], opt)
+        except Exception as ex:
+            error = str(ex)
+        finally:
+            t.Commit()
+
+        matched = match_exported_files(chunk, set(os.listdir(out_folder)) - before)
+        record_chunk(manifest, index, chunk, out_folder, matched, error, time.time() - started)
+        save_manifest(manifest_path, manifest)
+
+        status = manifest["lastRun"]["chunks"][-1]
+        output_window.print_md(u"Chunk {}: {} of {} sheet(s) exported ({}s){}".format(
+            index + 1, status["exported"], len(chunk), status["seconds"],
+            u" — **failed**: {}".format(error) if error else u""))
+        exported += status["exported"]
+        if error:
+            failed_chunks += 1
+            if STOP_ON_ERROR:
+                break
+    return exported, failed_chunks
+
+def _document_sheet_keys():
+    """UniqueId of every sheet in the model; the manifest also serves other sheet sets."""
+    return [sheet.UniqueId for sheet in FilteredElementCollector(doc).OfClass(ViewSheet)]
+
 def main():
-    out_folder = _output_folder()
     ids = _get_current_sheet_set_ids_only()
     if not ids:
         output_window.print_md(
@@ -279,16 +474,29 @@ def main():
         return
 
     opt = _pdf_options()
-
-    # Native Export > PDF (file names are produced by the naming rule; we do not log sheet names)
-    t = Transaction(doc, "Export Sheets to PDF (Native via Current Set)")
-    t.Start()
-    try:
-        doc.Export(out_folder, ids, opt)
-    finally:
-        t.Commit()
-
-    output_window.print_md(u"**Export complete** → `{}`  \nExported {} PDF file(s).".format(out_folder, len(ids)))
+    out_folder = _output_folder()
+    manifest_path = get_manifest_path(_project_folder(), MANIFEST_FILE_NAME)
+    document_key = doc.PathName or doc.Title
+    manifest = load_manifest(manifest_path, document_key) if INCREMENTAL_EXPORT else new_manifest(document_key)
+
+    items = _plan_items(ids)
+    plan = plan_export(items, manifest)
+
+    start_run(manifest, out_folder, datetime.datetime.now().isoformat(), plan)
+    forget_missing_sheets(manifest, _document_sheet_keys())
+    reused = _copy_reused(plan, out_folder, manifest)
+    save_manifest(manifest_path, manifest)
+
+    output_window.print_md(u"**Export plan** → {} unchanged sheet(s) copied, {} to export in chunks of {}.".format(
+        reused, len(plan["export"]), CHUNK_SIZE))
+    exported, failed_chunks = _export_chunks(plan, out_folder, opt, manifest, manifest_path)
+
+    # File names are produced by the naming rule; we do not log sheet names
+    output_window.print_md(u"**Export complete** → `{}`  \nExported {} PDF file(s), copied {} unchanged.".format(
+        out_folder, exported, reused))
+    if failed_chunks or exported < len(plan["export"]):
+        output_window.print_md(u"⚠️ {} sheet(s) were not exported. Run the command again to export only those.".format(
+            len(plan["export"]) - exported))
 
 
 #_____________________________________________________________________ 🏃‍➡️ RUN 
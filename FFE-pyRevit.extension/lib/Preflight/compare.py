@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Host vs link diffs for the Preflight compare tools.
+
+Purpose:
+-> Phase Filter, Revision, Project Info and the combined Preflight run
+   compare the same snapshot sections. The diffs live here so every tool
+   reports a mismatch the same way.
+
+Key behaviors:
+-> Inputs are the plain dicts a DocumentSnapshot hands out; nothing here
+   touches the Revit API, so it can be checked outside Revit:
+   python compare.py
+"""
+
+#____________________________________________________________________ IMPORTS (SYSTEM)
+from collections import OrderedDict
+
+
+#____________________________________________________________________ CONSTANTS
+PHASE_FILTER_COLUMNS = ("New", "Existing", "Demolished", "Temporary")
+
+
+#____________________________________________________________________ DIFFS
+def compare_phase_filters(host_map, link_map, columns=PHASE_FILTER_COLUMNS):
+    """Return (missing_in_link, extra_in_link, diffs).
+       diffs: [(filter_name, column, host_val, link_val)]
+    """
+    host_names = set(host_map.keys())
+    link_names = set(link_map.keys())
+
+    missing_in_link = sorted(list(host_names - link_names), key=lambda s: s.lower())
+    extra_in_link   = sorted(list(link_names - host_names), key=lambda s: s.lower())
+
+    diffs = []
+    for fname in sorted(host_names & link_names, key=lambda s: s.lower()):
+        for colname in columns:
+            hv = host_map[fname].get(colname, None)
+            lv = link_map[fname].get(colname, None)
+            # Only compare when both sides have a real value
+            if hv is None or lv is None:
+                continue
+            if str(hv) != str(lv):
+                diffs.append((fname, colname, hv, lv))
+    return missing_in_link, extra_in_link, diffs
+
+
+def compare_revisions(host_revisions, link_revisions):
+    """Return [(sequence_number, host_rev, link_rev)] for revisions that differ or exist on one side."""
+    comparison = []
+    for key in sorted(set(host_revisions.keys()).union(set(link_revisions.keys()))):
+        host_rev = host_revisions.get(key)
+        link_rev = link_revisions.get(key)
+        if host_rev != link_rev:
+            comparison.append((key, host_rev, link_rev))
+    return comparison
+
+
+def compare_project_info(host_info, link_info):
+    """Return [(parameter, host_value, link_value)] for host parameters the link does not match."""
+    diffs = []
+    for key in host_info.keys():
+        host_value = host_info.get(key, "N/A")
+        link_value = link_info.get(key, "N/A")
+        if host_value != link_value:
+            diffs.append((key, host_value, link_value))
+    return diffs
+
+
+def compare_sheets(host_sheets, link_sheets):
+    """Return [(sheet_number, host_name, link_name)] for sheet numbers used in both models."""
+    return [
+        (number, host_sheets[number], link_sheets[number])
+        for number in sorted(set(host_sheets.keys()) & set(link_sheets.keys()))
+    ]
+
+
+#____________________________________________________________________ SELF-CHECK
+if __name__ == "__main__":
+    host_filters = OrderedDict([
+        ("Show All", {"New": "ByCategory", "Existing": "ByCategory", "Demolished": "ByCategory", "Temporary": "ByCategory"}),
+        ("Show New", {"New": "ByCategory", "Existing": "NotDisplayed", "Demolished": "NotDisplayed", "Temporary": None}),
+    ])
+    link_filters = OrderedDict([
+        ("Show All", {"New": "ByCategory", "Existing": "Overridden", "Demolished": "ByCategory", "Temporary": "ByCategory"}),
+        ("Show Demo", {"New": "NotDisplayed", "Existing": "NotDisplayed", "Demolished": "ByCategory", "Temporary": None}),
+    ])
+    missing, extra, diffs = compare_phase_filters(host_filters, link_filters)
+    assert missing == ["Show New"] and extra == ["Show Demo"]
+    assert diffs == [("Show All", "Existing", "ByCategory", "Overridden")]
+
+    host_revs = OrderedDict([(1, {"Description": "IFC"}), (2, {"Description": "ASI 1"})])
+    link_revs = OrderedDict([(1, {"Description": "IFC"}), (3, {"Description": "ASI 2"})])
+    assert [key for key, _, _ in compare_revisions(host_revs, link_revs)] == [2, 3]
+
+    info = compare_project_info(OrderedDict([("Number", "24-001"), ("Phase", "CD")]), {"Number": "24-001"})
+    assert info == [("Phase", "CD", "N/A")]
+
+    sheets = compare_sheets({"M101": "Level 1", "M102": "Level 2"}, {"M102": "Roof", "E101": "Power"})
+    assert sheets == [("M102", "Level 2", "Roof")]
+
+    print("phase filters: missing {}, extra {}, diffs {}".format(len(missing), len(extra), len(diffs)))
+    print("revisions / project info / sheet collisions: {} / {} / {}".format(
+        len(compare_revisions(host_revs, link_revs)), len(info), len(sheets)))
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""
+Shared link snapshot layer for the Preflight compare tools.
+
+Purpose:
+-> Phase Filter, Revision and Project Info Comparison all need the same
+   per-document data from the host and every loaded link. This module
+   collects it once per unique document and hands out cached snapshots.
+
+Key behaviors:
+-> get_linked_documents() collects RevitLinkInstances once and groups them
+   by link type, so several instances of one link cost one GetLinkDocument
+   and one snapshot.
+-> get_snapshot() memoizes a DocumentSnapshot per document for the run.
+   pyRevit keeps this module alive between commands, so every command
+   calls clear_snapshots() first; a run never sees a previous run's data.
+-> Each snapshot section (phase filters, revisions, revision settings,
+   project info, sheets) is extracted lazily on first use and then reused;
+   Revision / RevisionNumberingSequence are collected once per section.
+-> The combined Preflight Comparison reads every section off the same
+   snapshots, so one run feeds the phase filter, revision, project info
+   and sheet checks.
+
+Revit API notes:
+-> Documents are keyed by GetHashCode(), falling back to Title, the same
+   way SheetDisciplineOrder keys linked documents.
+"""
+
+#____________________________________________________________________ IMPORTS (SYSTEM)
+from collections import OrderedDict
+
+#____________________________________________________________________ IMPORTS (AUTODESK)
+from Autodesk.Revit.DB import (
+    FilteredElementCollector,
+    PhaseFilter,
+    RevitLinkInstance,
+    Revision,
+    RevisionNumberingSequence,
+    RevisionSettings,
+    ViewSheet,
+)
+
+# Newer API enums (safe-import with fallback)
+try:
+    from Autodesk.Revit.DB import ElementOnPhaseStatus
+except Exception:
+    ElementOnPhaseStatus = None
+
+
+#____________________________________________________________________ IMPORTS (CUSTOM)
+from Preflight.compare import PHASE_FILTER_COLUMNS
+
+
+#____________________________________________________________________ CONSTANTS
+PROJECT_INFO_PARAMETERS = (
+    "FFE_Sheet_Project Number",
+    "FFE_Sheet_Campus Name",
+    "FFE_Sheet_Project Location",
+    "FFE_Sheet_Project Phase",
+    "FFE_Sheet_Project Title",
+)
+
+
+#____________________________________________________________________ DOCUMENT KEYS
+def document_key(document):
+    try:
+        return "doc:{}".format(document.GetHashCode())
+    except Exception:
+        return "doc:{}".format(document.Title)
+
+
+#____________________________________________________________________ PHASE FILTERS
+def _try_bool_show_prop(pf, label):
+    """Try classic bool properties: ShowNew/Existing/Demolished/Temporary."""
+    # Direct property
+    try:
+        val = getattr(pf, "Show" + label)
+        if isinstance(val, bool):
+            return val
+    except Exception:
+        pass
+    # Common getter variants
+    for name in ("get_Show" + label, "GetShow" + label, "Is" + label + "Shown"):
+        try:
+            m = getattr(pf, name)
+            if callable(m):
+                v = m()
+                if isinstance(v, bool):
+                    return v
+        except Exception:
+            pass
+    return None
+
+
+def _try_get_phase_status_presentation(pf, status_enum):
+    """Try PhaseFilter.GetPhaseStatusPresentation(ElementOnPhaseStatus)."""
+    if ElementOnPhaseStatus is None:
+        return None
+    try:
+        getter = getattr(pf, "GetPhaseStatusPresentation")
+    except Exception:
+        return None
+    if not callable(getter):
+        return None
+    try:
+        return getter(status_enum)
+    except Exception:
+        return None
+
+
+def _read_phase_cell(pf, label):
+    """Best-effort read for one column (New/Existing/Demolished/Temporary)."""
+    status_enum = getattr(ElementOnPhaseStatus, label, None) if ElementOnPhaseStatus else None
+    # Prefer the modern enum-based API when available
+    v = _try_get_phase_status_presentation(pf, status_enum)
+    if v is not None:
+        return v
+    # Fallback to legacy bools
+    b = _try_bool_show_prop(pf, label)
+    if isinstance(b, bool):
+        return b
+    return None
+
+
+def read_phase_filters(document):
+    """Return { filter_name: {New, Existing, Demolished, Temporary} }.
+       Values are PhaseStatusPresentation enums or bools (or None if unknown).
+    """
+    data = OrderedDict()
+    for pf in FilteredElementCollector(document).OfClass(PhaseFilter):
+        data[pf.Name] = dict((label, _read_phase_cell(pf, label)) for label in PHASE_FILTER_COLUMNS)
+    return data
+
+
+#____________________________________________________________________ REVISIONS
+def read_revision_numbering(document):
+    """RevisionNumbering enum as text ("PerProject" / "PerSheet"), or None."""
+    rev_settings = FilteredElementCollector(document).OfClass(RevisionSettings).FirstElement()
+    if rev_settings:
+        return rev_settings.RevisionNumbering.ToString()
+    return None
+
+
+def read_revisions(document, include_revision_number=True):
+    """Return { SequenceNumber: {column: value} } in one Revision + one sequence pass.
+
+    Per Sheet numbering has no project-wide Revision Number, so that column
+    is left out when include_revision_number is False.
+    """
+    numbering_names = {}
+    for rev_seq in FilteredElementCollector(document).OfClass(RevisionNumberingSequence):
+        numbering_names[rev_seq.Id.ToString()] = rev_seq.Name
+
+    data = OrderedDict()
+    for rev in FilteredElementCollector(document).OfClass(Revision):
+        revision = OrderedDict()
+        revision['Sequence Number'] = rev.SequenceNumber
+        if include_revision_number:
+            revision['Revision Number'] = rev.RevisionNumber
+        revision['Numbering'] = numbering_names.get(rev.RevisionNumberingSequenceId.ToString(), "None")
+        revision['Revision Date'] = rev.RevisionDate
+        revision['Description'] = rev.Description
+        revision['Issued'] = rev.Issued
+        revision['Issued To'] = rev.IssuedTo
+        revision['Issued By'] = rev.IssuedBy
+        revision['Show'] = rev.Visibility
+        data[rev.SequenceNumber] = revision
+    return data
+
+
+#____________________________________________________________________ PROJECT INFO + SHEETS
+def read_project_info(document):
+    """Project Information values compared across models."""
+    project_info = OrderedDict()
+    pi = document.ProjectInformation
+    if pi:
+        for name in PROJECT_INFO_PARAMETERS:
+            params = pi.GetParameters(name)
+            project_info[name] = params[0].AsString() if params else "N/A"
+        project_info['Issue Date'] = pi.IssueDate
+    return project_info
+
+
+def read_sheets(document):
+    """Return { SheetNumber: SheetName } for every non-placeholder sheet."""
+    sheets = OrderedDict()
+    for sheet in FilteredElementCollector(document).OfClass(ViewSheet):
+        try:
+            if sheet.IsPlaceholder:
+                continue
+            sheets[sheet.SheetNumber] = sheet.Name
+        except Exception:
+            continue
+    return sheets
+
+
+#____________________________________________________________________ SNAPSHOT
+class DocumentSnapshot(object):
+    """Lazily extracted, cached preflight data for one document."""
+
+    def __init__(self, document):
+        self.document = document
+        self.title = document.Title
+        self._cache = {}
+
+    def _get(self, name, reader):
+        if name not in self._cache:
+            self._cache[name] = reader()
+        return self._cache[name]
+
+    @property
+    def phase_filters(self):
+        return self._get("phase_filters", lambda: read_phase_filters(self.document))
+
+    @property
+    def revision_numbering(self):
+        return self._get("revision_numbering", lambda: read_revision_numbering(self.document))
+
+    @property
+    def revisions(self):
+        """Per Project columns, including the project-wide Revision Number."""
+        return self._get("revisions", lambda: read_revisions(self.document))
+
+    @property
+    def revisions_per_sheet(self):
+        """Per Sheet columns; RevisionNumber is never read for these documents."""
+        return self._get("revisions_per_sheet", lambda: read_revisions(self.document, include_revision_number=False))
+
+    @property
+    def project_info(self):
+        return self._get("project_info", lambda: read_project_info(self.document))
+
+    @property
+    def sheets(self):
+        return self._get("sheets", lambda: read_sheets(self.document))
+
+
+_SNAPSHOTS = {}
+
+
+def get_snapshot(document):
+    """One DocumentSnapshot per document until the next clear_snapshots()."""
+    key = document_key(document)
+    snapshot = _SNAPSHOTS.get(key)
+    if snapshot is None:
+        snapshot = DocumentSnapshot(document)
+        _SNAPSHOTS[key] = snapshot
+    return snapshot
+
+
+def clear_snapshots():
+    """Drop every cached snapshot; call at the start of each command."""
+    _SNAPSHOTS.clear()
+
+
+#____________________________________________________________________ LINKS
+class LinkedDocument(object):
+    """A loaded link document and every host instance that places it."""
+
+    def __init__(self, document, instances):
+        self.document = document
+        self.instances = instances
+
+    @property
+    def title(self):
+        return self.document.Title
+
+    @property
+    def snapshot(self):
+        return get_snapshot(self.document)
+
+
+def get_linked_documents(host_doc):
+    """Unique loaded link documents, deduplicated by link type then document."""
+    instances_by_type = OrderedDict()
+    for instance in FilteredElementCollector(host_doc).OfClass(RevitLinkInstance):
+        try:
+            type_key = instance.GetTypeId().ToString()
+        except Exception:
+            type_key = instance.Id.ToString()
+        instances_by_type.setdefault(type_key, []).append(instance)
+
+    linked = OrderedDict()
+    for instances in instances_by_type.values():
+        link_doc = None
+        for instance in instances:
+            try:
+                link_doc = instance.GetLinkDocument()
+            except Exception:
+                link_doc = None
+            if link_doc is not None:
+                break
+        if link_doc is None:
+            continue
+
+        key = document_key(link_doc)
+        if key in linked:
+            linked[key].instances.extend(instances)
+        else:
+            linked[key] = LinkedDocument(link_doc, list(instances))
+
+    return list(linked.values())
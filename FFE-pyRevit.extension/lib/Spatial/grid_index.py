@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Uniform 2D grid index over axis-aligned boxes.
+
+Purpose:
+-> Answer "which boxes contain this XY point?" without testing every box,
+   so expensive Revit checks (Room.IsPointInRoom, polygon tests) only run on
+   a handful of candidates.
+
+Key behaviors:
+-> Each box is registered in every grid cell its XY extents touch.
+-> A point query looks up one cell and returns the boxes whose extents
+   contain the point (inclusive), in insertion order.
+-> The cell size defaults to the mean box extent, which keeps both the
+   per-cell lists and the per-box cell count small for room-like layouts.
+
+Design decisions:
+-> Pure Python (no Revit imports) so it runs under IronPython and CPython
+   and can be benchmarked on Linux: python grid_index.py
+"""
+
+#____________________________________________________________________ IMPORTS (SYSTEM)
+import math
+import random
+import time
+
+
+#____________________________________________________________________ GRID INDEX
+class BoxGridIndex(object):
+    """Uniform XY grid of boxes -> items."""
+
+    def __init__(self, cell_size):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be greater than zero.")
+        self.cell_size = float(cell_size)
+        self.cells = {}
+        self.count = 0
+
+    @classmethod
+    def build(cls, entries, cell_size=None):
+        """Build an index from (item, min_x, min_y, max_x, max_y) entries."""
+        entries = list(entries)
+        if cell_size is None:
+            cell_size = suggest_cell_size(entries)
+        index = cls(cell_size)
+        for entry in entries:
+            index.insert(*entry)
+        return index
+
+    def cell_of(self, x, y):
+        return (int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size)))
+
+    def insert(self, item, min_x, min_y, max_x, max_y):
+        first = self.cell_of(min_x, min_y)
+        last = self.cell_of(max_x, max_y)
+        record = (min_x, min_y, max_x, max_y, self.count, item)
+        self.count += 1
+        for ix in range(first[0], last[0] + 1):
+            for iy in range(first[1], last[1] + 1):
+                self.cells.setdefault((ix, iy), []).append(record)
+
+    def query_point(self, x, y):
+        """Items whose XY extents contain (x, y)."""
+        found = []
+        for min_x, min_y, max_x, max_y, _order, item in self.cells.get(self.cell_of(x, y), ()):
+            if min_x <= x <= max_x and min_y <= y <= max_y:
+                found.append(item)
+        return found
+
+
+def suggest_cell_size(entries, fallback=10.0):
+    """Mean of the larger box side; falls back for empty or degenerate input."""
+    total = 0.0
+    counted = 0
+    for _item, min_x, min_y, max_x, max_y in entries:
+        extent = max(max_x - min_x, max_y - min_y)
+        if extent > 0:
+            total += extent
+            counted += 1
+    if not counted:
+        return fallback
+    return total / counted
+
+
+#____________________________________________________________________ BENCHMARK (SYNTHETIC HOSPITAL)
+def generate_synthetic_floors(room_count=2000, equipment_count=20000, levels=5, seed=11):
+    """Rectangular rooms tiled per level plus equipment points scattered inside them."""
+    rng = random.Random(seed)
+    rooms_per_level = int(math.ceil(room_count / float(levels)))
+    columns = int(math.ceil(math.sqrt(rooms_per_level)))
+    rooms_by_level = {}
+
+    for index in range(room_count):
+        level = index % levels
+        slot = index // levels
+        width = rng.uniform(10.0, 30.0)
+        depth = rng.uniform(10.0, 30.0)
+        min_x = (slot % columns) * 32.0
+        min_y = (slot // columns) * 32.0
+        rooms_by_level.setdefault(level, []).append(("room-{0}".format(index), min_x, min_y, min_x + width, min_y + depth))
+
+    equipment = []
+    for index in range(equipment_count):
+        level = rng.randrange(levels)
+        _name, min_x, min_y, max_x, max_y = rng.choice(rooms_by_level[level])
+        if rng.random() < 0.1:
+            # Corridor / unplaced equipment that falls outside every room.
+            point = (max_x + 1.0, max_y + 1.0)
+        else:
+            point = (rng.uniform(min_x, max_x), rng.uniform(min_y, max_y))
+        equipment.append((level, point))
+
+    return rooms_by_level, equipment
+
+
+def run_benchmark(room_count=2000, equipment_count=20000):
+    """Compare containment tests per equipment: every room on the level vs grid candidates."""
+    rooms_by_level, equipment = generate_synthetic_floors(room_count, equipment_count)
+
+    def exact_test(room, point):
+        return room[1] <= point[0] <= room[3] and room[2] <= point[1] <= room[4]
+
+    started = time.time()
+    naive_tests = 0
+    naive_hits = []
+    for level, point in equipment:
+        for room in rooms_by_level[level]:
+            naive_tests += 1
+            if exact_test(room, point):
+                naive_hits.append(room[0])
+    naive_seconds = time.time() - started
+
+    started = time.time()
+    indexes = dict(
+        (level, BoxGridIndex.build((room, room[1], room[2], room[3], room[4]) for room in rooms))
+        for level, rooms in rooms_by_level.items()
+    )
+    build_seconds = time.time() - started
+
+    started = time.time()
+    grid_tests = 0
+    grid_hits = []
+    for level, point in equipment:
+        for room in indexes[level].query_point(point[0], point[1]):
+            grid_tests += 1
+            if exact_test(room, point):
+                grid_hits.append(room[0])
+    grid_seconds = time.time() - started
+
+    return {
+        "rooms": room_count,
+        "equipment": equipment_count,
+        "naiveTests": naive_tests,
+        "naiveSeconds": naive_seconds,
+        "gridTests": grid_tests,
+        "gridBuildSeconds": build_seconds,
+        "gridSeconds": grid_seconds,
+        "identical": naive_hits == grid_hits,
+    }
+
+
+if __name__ == "__main__":
+    result = run_benchmark()
+    print("{rooms} rooms / {equipment} equipment".format(**result))
+    print("  per-level scan : {naiveTests:>9} containment tests  {naiveSeconds:.3f}s".format(**result))
+    print("  grid index     : {gridTests:>9} containment tests  {gridSeconds:.3f}s (+{gridBuildSeconds:.3f}s build)".format(**result))
+    print("  identical hits : {identical}".format(**result))
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Room point-location engine: boundary polygons + per-level grid index.
+
+Purpose:
+-> Answer "which room contains this point?" for thousands of points without
+   calling Room.IsPointInRoom on every room in the model.
+
+Key behaviors:
+-> Each room is registered once with its boundary loops (outer + holes, as
+   lists of (x, y) vertices), its level key and its vertical extents.
+-> Rooms are bucketed into one BoxGridIndex per level; a query only tests
+   the few rooms whose bounding boxes share the point's grid cell.
+-> The exact test is even-odd point-in-polygon over every loop, so holes
+   (shafts, courtyards) are excluded. Points on an edge count as inside.
+-> Z filters levels first: a point is only tested against levels whose
+   room extents contain it (within z_tolerance), like IsPointInRoom.
+
+Design decisions:
+-> Pure Python (no Revit imports). The Revit side tessellates boundary
+   segments into vertex loops and hands them in, so the engine can be
+   benchmarked on Linux with synthetic layouts (from lib/):
+   python -m Spatial.room_locator
+"""
+
+#____________________________________________________________________ IMPORTS (SYSTEM)
+import math
+import random
+import time
+
+#____________________________________________________________________ IMPORTS (CUSTOM)
+from Spatial.grid_index import BoxGridIndex, suggest_cell_size
+
+
+#____________________________________________________________________ POLYGON TESTS
+def point_on_segment(x, y, ax, ay, bx, by, tolerance=1e-9):
+    cross = (bx - ax) * (y - ay) - (by - ay) * (x - ax)
+    if abs(cross) > tolerance * max(1.0, abs(bx - ax) + abs(by - ay)):
+        return False
+    return (min(ax, bx) - tolerance <= x <= max(ax, bx) + tolerance and
+            min(ay, by) - tolerance <= y <= max(ay, by) + tolerance)
+
+
+def point_in_loops(x, y, loops):
+    """Even-odd test over every loop; boundary points are inside."""
+    inside = False
+    for loop in loops:
+        count = len(loop)
+        if count < 3:
+            continue
+        ax, ay = loop[count - 1]
+        for bx, by in loop:
+            if point_on_segment(x, y, ax, ay, bx, by):
+                return True
+            if (ay > y) != (by > y):
+                cross_x = ax + (y - ay) * (bx - ax) / (by - ay)
+                if x < cross_x:
+                    inside = not inside
+            ax, ay = bx, by
+    return inside
+
+
+def loops_extents(loops):
+    xs = [point[0] for loop in loops for point in loop]
+    ys = [point[1] for loop in loops for point in loop]
+    if not xs:
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+#____________________________________________________________________ LOCATOR
+class RoomLocator(object):
+    """Per-level grid of room polygons -> room items."""
+
+    def __init__(self, z_tolerance=0.01, cell_size=None):
+        self.z_tolerance = z_tolerance
+        self.cell_size = cell_size
+        self._pending = {}
+        self.levels = {}
+        self.room_count = 0
+        self.tests = 0
+
+    def add_room(self, item, level_key, loops, z_min, z_max):
+        """Register a room. Rooms without a usable boundary are ignored."""
+        loops = [list(loop) for loop in loops if len(loop) >= 3]
+        extents = loops_extents(loops)
+        if extents is None:
+            return False
+        min_x, min_y, max_x, max_y = extents
+        self._pending.setdefault(level_key, []).append(
+            ((item, loops, z_min, z_max), min_x, min_y, max_x, max_y))
+        self.room_count += 1
+        return True
+
+    def build(self):
+        """Bucket every pending room into its level grid. Safe to call again after add_room."""
+        for level_key, entries in self._pending.items():
+            level = self.levels.get(level_key)
+            if level is None:
+                cell_size = self.cell_size or suggest_cell_size(entries)
+                level = {"index": BoxGridIndex(cell_size), "z_min": None, "z_max": None}
+                self.levels[level_key] = level
+            for entry in entries:
+                record = entry[0]
+                level["index"].insert(*entry)
+                if level["z_min"] is None or record[2] < level["z_min"]:
+                    level["z_min"] = record[2]
+                if level["z_max"] is None or record[3] > level["z_max"]:
+                    level["z_max"] = record[3]
+        self._pending = {}
+        return self
+
+    def _levels_for(self, z, level_key):
+        if level_key is not None:
+            level = self.levels.get(level_key)
+            return [level] if level else []
+        if z is None:
+            return list(self.levels.values())
+        tolerance = self.z_tolerance
+        return [level for level in self.levels.values()
+                if level["z_min"] - tolerance <= z <= level["z_max"] + tolerance]
+
+    def locate(self, x, y, z=None, level_key=None):
+        """First candidate room whose polygon contains the point, or None."""
+        if self._pending:
+            self.build()
+        tolerance = self.z_tolerance
+        for level in self._levels_for(z, level_key):
+            for item, loops, z_min, z_max in level["index"].query_point(x, y):
+                if z is not None and not (z_min - tolerance <= z <= z_max + tolerance):
+                    continue
+                self.tests += 1
+                if point_in_loops(x, y, loops):
+                    return item
+        return None
+
+
+#____________________________________________________________________ BENCHMARK (SYNTHETIC LAYOUT)
+def generate_synthetic_layout(room_count=3000, point_count=6000, levels=6, seed=5):
+    """Rectangles, L-shapes and rooms with a shaft hole tiled per level, plus query points."""
+    rng = random.Random(seed)
+    story = 14.0
+    rooms_per_level = int(math.ceil(room_count / float(levels)))
+    columns = int(math.ceil(math.sqrt(rooms_per_level)))
+    rooms = []
+
+    for index in range(room_count):
+        level = index % levels
+        slot = index // levels
+        x0 = (slot % columns) * 30.0
+        y0 = (slot // columns) * 30.0
+        w = rng.uniform(12.0, 28.0)
+        d = rng.uniform(12.0, 28.0)
+        shape = index % 3
+        if shape == 0:
+            loops = [[(x0, y0), (x0 + w, y0), (x0 + w, y0 + d), (x0, y0 + d)]]
+        elif shape == 1:
+            loops = [[(x0, y0), (x0 + w, y0), (x0 + w, y0 + d / 2.0),
+                      (x0 + w / 2.0, y0 + d / 2.0), (x0 + w / 2.0, y0 + d), (x0, y0 + d)]]
+        else:
+            loops = [[(x0, y0), (x0 + w, y0), (x0 + w, y0 + d), (x0, y0 + d)],
+                     [(x0 + w * 0.4, y0 + d * 0.4), (x0 + w * 0.6, y0 + d * 0.4),
+                      (x0 + w * 0.6, y0 + d * 0.6), (x0 + w * 0.4, y0 + d * 0.6)]]
+        z = level * story
+        rooms.append(("room-{0}".format(index), level, loops, z, z + 10.0))
+
+    points = []
+    for _ in range(point_count):
+        name, level, loops, z_min, z_max = rng.choice(rooms)
+        min_x, min_y, max_x, max_y = loops_extents(loops)
+        points.append((rng.uniform(min_x - 2.0, max_x + 2.0),
+                       rng.uniform(min_y - 2.0, max_y + 2.0),
+                       z_min + 1.0))
+    return rooms, points
+
+
+def run_benchmark(room_count=3000, point_count=6000):
+    """Polygon tests per point: every room (the old IsPointInRoom loop) vs grid candidates."""
+    rooms, points = generate_synthetic_layout(room_count, point_count)
+
+    started = time.time()
+    naive_tests = 0
+    naive_hits = []
+    for x, y, z in points:
+        hit = None
+        for name, _level, loops, z_min, z_max in rooms:
+            if not (z_min <= z <= z_max):
+                continue
+            naive_tests += 1
+            if point_in_loops(x, y, loops):
+                hit = name
+                break
+        naive_hits.append(hit)
+    naive_seconds = time.time() - started
+
+    started = time.time()
+    locator = RoomLocator()
+    for name, level, loops, z_min, z_max in rooms:
+        locator.add_room(name, level, loops, z_min, z_max)
+    locator.build()
+    build_seconds = time.time() - started
+
+    started = time.time()
+    grid_hits = [locator.locate(x, y, z) for x, y, z in points]
+    grid_seconds = time.time() - started
+
+    return {
+        "rooms": room_count,
+        "points": point_count,
+        "naiveTests": naive_tests,
+        "naiveSeconds": naive_seconds,
+        "gridTests": locator.tests,
+        "gridBuildSeconds": build_seconds,
+        "gridSeconds": grid_seconds,
+        "located": sum(1 for hit in grid_hits if hit is not None),
+        "identical": naive_hits == grid_hits,
+    }
+
+
+if __name__ == "__main__":
+    result = run_benchmark()
+    print("{rooms} rooms / {points} points ({located} inside a room)".format(**result))
+    print("  every room   : {naiveTests:>9} polygon tests  {naiveSeconds:.3f}s".format(**result))
+    print("  level grid   : {gridTests:>9} polygon tests  {gridSeconds:.3f}s (+{gridBuildSeconds:.3f}s build)".format(**result))
+    print("  identical    : {identical}".format(**result))